@@ -0,0 +1,79 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { createServerSupabaseClient } from '@/lib/supabase-server'
+import { cachedJson, etagMatches, notModified } from '@/lib/http-cache'
+import { fetchTableVersions, tableVersionsEtag, type VersionedTable } from '@/lib/table-versions'
+
+// Comments plus users, which supplies the author and drives RLS
+const COMMENT_TABLES: VersionedTable[] = ['comments', 'users']
+
+// GET /api/comments?taskId=<id> or ?subtaskId=<id>
+// Returns the comments on one task or subtask, oldest first, with their author. Carries a
+// weak ETag built from the table versions (migration 054); a matching If-None-Match gets
+// an empty 304 without querying the comments.
+export async function GET(request: NextRequest) {
+  try {
+    const authorization = request.headers.get('authorization')
+
+    if (!authorization?.startsWith('Bearer ')) {
+      return NextResponse.json(
+        { error: 'Missing bearer token' },
+        { status: 401 }
+      )
+    }
+
+    const taskId = request.nextUrl.searchParams.get('taskId')
+    const subtaskId = request.nextUrl.searchParams.get('subtaskId')
+
+    if (!taskId && !subtaskId) {
+      return NextResponse.json(
+        { error: 'taskId or subtaskId is required' },
+        { status: 400 }
+      )
+    }
+
+    const supabase = createServerSupabaseClient(authorization.slice('Bearer '.length))
+
+    const { data: versions, error: versionsError } = await fetchTableVersions(supabase, COMMENT_TABLES)
+
+    if (versionsError) {
+      console.error('❌ Error reading table versions:', versionsError)
+      return NextResponse.json(
+        { error: versionsError.message || 'Failed to fetch comments' },
+        { status: 500 }
+      )
+    }
+
+    const etag = tableVersionsEtag(COMMENT_TABLES, versions!, authorization + request.nextUrl.search)
+    if (etagMatches(request, etag)) {
+      return notModified(etag)
+    }
+
+    let query = supabase
+      .from('comments')
+      .select(`
+        *,
+        users!comments_author_id_fkey(id, email, full_name)
+      `)
+      .order('created_at', { ascending: true })
+
+    query = taskId ? query.eq('task_id', taskId) : query.eq('subtask_id', subtaskId!)
+
+    const { data, error } = await query
+
+    if (error) {
+      console.error('❌ Error fetching comments:', error)
+      return NextResponse.json(
+        { error: error.message || 'Failed to fetch comments' },
+        { status: 500 }
+      )
+    }
+
+    return cachedJson(request, data || [], { etag })
+  } catch (error) {
+    console.error('❌ Error in comments API route:', error)
+    return NextResponse.json(
+      { error: error instanceof Error ? error.message : 'Internal server error' },
+      { status: 500 }
+    )
+  }
+}
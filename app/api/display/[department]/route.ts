@@ -0,0 +1,66 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { isDisplayKeyValid, subscribeDisplay } from '@/lib/display-hub'
+
+// Long-lived stream held by this server process
+export const dynamic = 'force-dynamic'
+export const runtime = 'nodejs'
+
+// GET /api/display/<department>?key=<DISPLAY_ACCESS_KEY>
+// Server-Sent Events stream of read-only board snapshots for wall displays. Every display of
+// a department shares one server-side snapshot (lib/display-hub.ts); EventSource reconnects
+// send Last-Event-ID and skip the resend when their snapshot is still current.
+export async function GET(
+  request: NextRequest,
+  { params }: { params: Promise<{ department: string }> }
+) {
+  if (!process.env.DISPLAY_ACCESS_KEY || !process.env.SUPABASE_SERVICE_ROLE_KEY) {
+    return NextResponse.json(
+      { error: 'Display mode is not configured' },
+      { status: 503 }
+    )
+  }
+
+  if (!isDisplayKeyValid(request.nextUrl.searchParams.get('key'))) {
+    return NextResponse.json(
+      { error: 'Invalid display key' },
+      { status: 401 }
+    )
+  }
+
+  const { department } = await params
+  const lastEventId = request.headers.get('last-event-id')
+  let unsubscribe = () => {}
+
+  const stream = new ReadableStream<Uint8Array>({
+    start(controller) {
+      unsubscribe = subscribeDisplay(decodeURIComponent(department), (frame) => {
+        try {
+          controller.enqueue(frame)
+        } catch {
+          unsubscribe() // stream already closed
+        }
+      }, lastEventId)
+
+      request.signal.addEventListener('abort', () => {
+        unsubscribe()
+        try {
+          controller.close()
+        } catch {
+          // already closed
+        }
+      })
+    },
+    cancel() {
+      unsubscribe()
+    },
+  })
+
+  return new Response(stream, {
+    headers: {
+      'Content-Type': 'text/event-stream; charset=utf-8',
+      'Cache-Control': 'no-cache, no-transform',
+      Connection: 'keep-alive',
+      'X-Accel-Buffering': 'no', // stop nginx from buffering the stream
+    },
+  })
+}
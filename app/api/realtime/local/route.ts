@@ -0,0 +1,47 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { isFeedTable, isScopeTable, publishLocalChange, type FeedChange } from '@/lib/change-feed'
+
+export const dynamic = 'force-dynamic'
+export const runtime = 'nodejs'
+
+const EVENT_TYPES = ['INSERT', 'UPDATE', 'DELETE']
+
+// POST /api/realtime/local  { table, eventType, new?, old? }
+// Publishes a change on the local stand-in feed (REALTIME_FEED=local), so tests can drive
+// /api/realtime without a database. task_assignments changes are not streamed; they decide
+// which viewers (connected with ?teamMemberIds=) see the task. Not available in production.
+export async function POST(request: NextRequest) {
+  if (process.env.REALTIME_FEED !== 'local' || process.env.NODE_ENV === 'production') {
+    return NextResponse.json(
+      { error: 'Local change feed is not enabled' },
+      { status: 404 }
+    )
+  }
+
+  try {
+    const body = await request.json()
+
+    if (!(isFeedTable(body?.table) || isScopeTable(body?.table)) || !EVENT_TYPES.includes(body?.eventType)) {
+      return NextResponse.json(
+        { error: 'table must be tasks, subtasks, comments, team_members or task_assignments and eventType INSERT, UPDATE or DELETE' },
+        { status: 400 }
+      )
+    }
+
+    const change: FeedChange = {
+      table: body.table,
+      eventType: body.eventType,
+      new: body.new || {},
+      old: body.old || {},
+      commit_timestamp: new Date().toISOString(),
+    }
+    publishLocalChange(change)
+
+    return NextResponse.json({ published: true })
+  } catch (error) {
+    return NextResponse.json(
+      { error: error instanceof Error ? error.message : 'Invalid request body' },
+      { status: 400 }
+    )
+  }
+}
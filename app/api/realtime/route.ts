@@ -0,0 +1,124 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { createServerSupabaseClient, getServerAccessToken } from '@/lib/supabase-server'
+import { isFeedTable, type FeedTable } from '@/lib/change-feed'
+import { getRealtimeGateway, type Viewer } from '@/lib/realtime-gateway'
+
+// Long-lived stream held by this server process
+export const dynamic = 'force-dynamic'
+export const runtime = 'nodejs'
+
+/**
+ * Resolves who is connecting: the signed-in user (bearer header, or the access token cookie
+ * an EventSource sends) with their role and department from public.users.
+ * Assignees are team members, so the viewer also carries the team_members rows sharing their email.
+ * On the local stand-in feed outside production, ?role=&department=&userId=&teamMemberIds= stand
+ * in for a session.
+ */
+async function resolveViewer(request: NextRequest): Promise<Viewer | null> {
+  const params = request.nextUrl.searchParams
+  if (getRealtimeGateway().feedKind === 'local' && process.env.NODE_ENV !== 'production') {
+    return {
+      id: params.get('userId') || 'local-user',
+      role: params.get('role') || 'administrator',
+      department: params.get('department'),
+      teamMemberIds: params.get('teamMemberIds')?.split(',').filter(Boolean) ?? [],
+    }
+  }
+
+  const authorization = request.headers.get('authorization')
+  const accessToken = authorization?.startsWith('Bearer ')
+    ? authorization.slice('Bearer '.length)
+    : await getServerAccessToken()
+  if (!accessToken) return null
+
+  const supabase = createServerSupabaseClient(accessToken)
+  const { data: { user }, error } = await supabase.auth.getUser(accessToken)
+  if (error || !user) return null
+
+  const [{ data: profile }, { data: teamMembers }] = await Promise.all([
+    supabase
+      .from('users')
+      .select('role, department')
+      .eq('id', user.id)
+      .maybeSingle(),
+    user.email
+      ? supabase
+        .from('team_members')
+        .select('id')
+        .ilike('email', user.email)
+      : Promise.resolve({ data: [] as { id: string }[] }),
+  ])
+
+  return {
+    id: user.id,
+    role: profile?.role || 'viewer',
+    department: profile?.department ?? null,
+    teamMemberIds: (teamMembers || []).map((member: { id: string }) => member.id),
+  }
+}
+
+// GET /api/realtime?tables=tasks,comments&department=<department>
+// Server-Sent Events stream of tasks/subtasks/comments/team_members changes the caller may
+// see (lib/realtime-gateway.ts). `change` events carry { table, eventType, new, old } like a
+// postgres_changes payload; `reset` means events were missed and the client must resync.
+// Reconnects resume from Last-Event-ID (or ?lastEventId=).
+export async function GET(request: NextRequest) {
+  try {
+    const viewer = await resolveViewer(request)
+
+    if (!viewer) {
+      return NextResponse.json(
+        { error: 'Not signed in' },
+        { status: 401 }
+      )
+    }
+
+    const params = request.nextUrl.searchParams
+    const tables = params.get('tables')?.split(',').filter(isFeedTable) as FeedTable[] | undefined
+    const filter = {
+      tables: tables && tables.length > 0 ? tables : undefined,
+      department: params.get('department'),
+    }
+    const lastEventId = request.headers.get('last-event-id') || params.get('lastEventId')
+    let disconnect = () => {}
+
+    const stream = new ReadableStream<Uint8Array>({
+      start(controller) {
+        disconnect = getRealtimeGateway().connect(viewer, filter, (frame) => {
+          try {
+            controller.enqueue(frame)
+          } catch {
+            disconnect() // stream already closed
+          }
+        }, lastEventId)
+
+        request.signal.addEventListener('abort', () => {
+          disconnect()
+          try {
+            controller.close()
+          } catch {
+            // already closed
+          }
+        })
+      },
+      cancel() {
+        disconnect()
+      },
+    })
+
+    return new Response(stream, {
+      headers: {
+        'Content-Type': 'text/event-stream; charset=utf-8',
+        'Cache-Control': 'no-cache, no-transform',
+        Connection: 'keep-alive',
+        'X-Accel-Buffering': 'no', // stop nginx from buffering the stream
+      },
+    })
+  } catch (error) {
+    console.error('❌ Error in realtime API route:', error)
+    return NextResponse.json(
+      { error: error instanceof Error ? error.message : 'Internal server error' },
+      { status: 500 }
+    )
+  }
+}
@@ -0,0 +1,56 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { createServerSupabaseClient } from '@/lib/supabase-server'
+import { fetchBoardChanges, parseWatermark, BOARD_CHANGES_PAGE_SIZE } from '@/lib/board-sync'
+import { cachedJson } from '@/lib/http-cache'
+
+// GET /api/sync?since=<watermark>&limit=<n>
+// Returns board changes after the watermark (see get_board_changes), or a full card
+// snapshot when since is omitted. The caller's access token is forwarded so RLS applies.
+// Private and revalidated on every request: an unchanged page answers 304 via its ETag.
+export async function GET(request: NextRequest) {
+  try {
+    const authorization = request.headers.get('authorization')
+
+    if (!authorization?.startsWith('Bearer ')) {
+      return NextResponse.json(
+        { error: 'Missing bearer token' },
+        { status: 401 }
+      )
+    }
+
+    const sinceParam = request.nextUrl.searchParams.get('since')
+    const since = parseWatermark(sinceParam)
+
+    if (sinceParam !== null && since === null) {
+      return NextResponse.json(
+        { error: 'since must be a non-negative integer watermark' },
+        { status: 400 }
+      )
+    }
+
+    const limit = Math.min(
+      parseWatermark(request.nextUrl.searchParams.get('limit')) || BOARD_CHANGES_PAGE_SIZE,
+      BOARD_CHANGES_PAGE_SIZE
+    )
+
+    const supabase = createServerSupabaseClient(authorization.slice('Bearer '.length))
+
+    const { data, error } = await fetchBoardChanges(supabase, since, limit)
+
+    if (error) {
+      console.error('❌ Error fetching board changes:', error)
+      return NextResponse.json(
+        { error: error.message || 'Failed to fetch board changes' },
+        { status: 500 }
+      )
+    }
+
+    return cachedJson(request, data)
+  } catch (error) {
+    console.error('❌ Error in sync API route:', error)
+    return NextResponse.json(
+      { error: error instanceof Error ? error.message : 'Internal server error' },
+      { status: 500 }
+    )
+  }
+}
@@ -0,0 +1,79 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { createServerSupabaseClient } from '@/lib/supabase-server'
+import { TASK_BOARD_CARD_COLUMNS, mapBoardCardToUITask } from '@/lib/task-mappers'
+import { cachedJson, etagMatches, notModified } from '@/lib/http-cache'
+import { fetchTableVersions, tableVersionsEtag, type VersionedTable } from '@/lib/table-versions'
+
+// Everything a board card is aggregated from (see the task_board_cards view), plus users for RLS
+const TASK_TABLES: VersionedTable[] = [
+  'tasks',
+  'task_assignments',
+  'subtasks',
+  'comments',
+  'task_attachments',
+  'team_members',
+  'users',
+]
+
+// GET /api/tasks?status=<status>&department=<department>
+// Returns the board cards visible to the caller, newest first. Carries a weak ETag built
+// from the table versions (migration 054); a matching If-None-Match gets an empty 304
+// without querying the board.
+export async function GET(request: NextRequest) {
+  try {
+    const authorization = request.headers.get('authorization')
+
+    if (!authorization?.startsWith('Bearer ')) {
+      return NextResponse.json(
+        { error: 'Missing bearer token' },
+        { status: 401 }
+      )
+    }
+
+    const supabase = createServerSupabaseClient(authorization.slice('Bearer '.length))
+
+    const { data: versions, error: versionsError } = await fetchTableVersions(supabase, TASK_TABLES)
+
+    if (versionsError) {
+      console.error('❌ Error reading table versions:', versionsError)
+      return NextResponse.json(
+        { error: versionsError.message || 'Failed to fetch tasks' },
+        { status: 500 }
+      )
+    }
+
+    const etag = tableVersionsEtag(TASK_TABLES, versions!, authorization + request.nextUrl.search)
+    if (etagMatches(request, etag)) {
+      return notModified(etag)
+    }
+
+    const status = request.nextUrl.searchParams.get('status')
+    const department = request.nextUrl.searchParams.get('department')
+
+    let query = supabase
+      .from('task_board_cards')
+      .select(TASK_BOARD_CARD_COLUMNS)
+      .order('updated_at', { ascending: false })
+
+    if (status) query = query.eq('status', status)
+    if (department) query = query.eq('department', department)
+
+    const { data, error } = await query
+
+    if (error) {
+      console.error('❌ Error fetching tasks:', error)
+      return NextResponse.json(
+        { error: error.message || 'Failed to fetch tasks' },
+        { status: 500 }
+      )
+    }
+
+    return cachedJson(request, (data || []).map(mapBoardCardToUITask), { etag })
+  } catch (error) {
+    console.error('❌ Error in tasks API route:', error)
+    return NextResponse.json(
+      { error: error instanceof Error ? error.message : 'Internal server error' },
+      { status: 500 }
+    )
+  }
+}
@@ -0,0 +1,66 @@
+import { NextRequest, NextResponse } from 'next/server'
+import { createServerSupabaseClient } from '@/lib/supabase-server'
+import { cachedJson, etagMatches, notModified } from '@/lib/http-cache'
+import { fetchTableVersions, tableVersionsEtag, type VersionedTable } from '@/lib/table-versions'
+
+const TEAM_MEMBER_TABLES: VersionedTable[] = ['team_members', 'users']
+
+// GET /api/team-members?department=<department>
+// Returns the team directory, newest first. Carries a weak ETag built from the table
+// versions (migration 054); a matching If-None-Match gets an empty 304 without querying.
+export async function GET(request: NextRequest) {
+  try {
+    const authorization = request.headers.get('authorization')
+
+    if (!authorization?.startsWith('Bearer ')) {
+      return NextResponse.json(
+        { error: 'Missing bearer token' },
+        { status: 401 }
+      )
+    }
+
+    const supabase = createServerSupabaseClient(authorization.slice('Bearer '.length))
+
+    const { data: versions, error: versionsError } = await fetchTableVersions(supabase, TEAM_MEMBER_TABLES)
+
+    if (versionsError) {
+      console.error('❌ Error reading table versions:', versionsError)
+      return NextResponse.json(
+        { error: versionsError.message || 'Failed to fetch team members' },
+        { status: 500 }
+      )
+    }
+
+    const etag = tableVersionsEtag(TEAM_MEMBER_TABLES, versions!, authorization + request.nextUrl.search)
+    if (etagMatches(request, etag)) {
+      return notModified(etag)
+    }
+
+    const department = request.nextUrl.searchParams.get('department')
+
+    let query = supabase
+      .from('team_members')
+      .select('*')
+      .order('created_at', { ascending: false })
+
+    if (department) query = query.eq('department', department)
+
+    const { data, error } = await query
+
+    if (error) {
+      console.error('❌ Error fetching team members:', error)
+      return NextResponse.json(
+        { error: error.message || 'Failed to fetch team members' },
+        { status: 500 }
+      )
+    }
+
+    return cachedJson(request, data || [], { etag })
+  } catch (error) {
+    console.error('❌ Error in team members API route:', error)
+    return NextResponse.json(
+      { error: error instanceof Error ? error.message : 'Internal server error' },
+      { status: 500 }
+    )
+  }
+}
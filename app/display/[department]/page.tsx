@@ -0,0 +1,22 @@
+import type { Metadata } from "next"
+import { AndonBoard } from "@/components/andon-board"
+
+export const metadata: Metadata = {
+  title: "Canopus Works - Display",
+  robots: { index: false, follow: false },
+}
+
+// Read-only wall display for one department, e.g. /display/Engineering?key=...
+// Needs no sign-in: the display key authorizes the snapshot stream it subscribes to.
+export default async function DisplayPage({
+  params,
+  searchParams,
+}: {
+  params: Promise<{ department: string }>
+  searchParams: Promise<{ key?: string }>
+}) {
+  const { department } = await params
+  const { key } = await searchParams
+
+  return <AndonBoard department={decodeURIComponent(department)} displayKey={key ?? ""} />
+}
@@ -3,8 +3,7 @@
 import { useState, memo } from "react"
 import { Plus } from "lucide-react"
 import { Button } from "@/components/ui/button"
-import { TaskModal } from "@/components/task-modal"
-import { useTaskContext } from "@/contexts/task-context"
+import { TaskModal, preloadTaskModal } from "@/components/lazy-components"
 import { useAuth } from "@/contexts/auth-context"
 import { LoadingSpinner } from "@/components/ui/loading-spinner"
 
@@ -12,8 +11,6 @@ function AddTaskButtonComponent() {
   const [isTaskModalOpen, setIsTaskModalOpen] = useState(false)
   const [isOpening, setIsOpening] = useState(false)
   
-  // Get context for task operations
-  const context = useTaskContext()
   const { user } = useAuth()
 
   // Check if user has permission to create tasks
@@ -21,6 +18,7 @@ function AddTaskButtonComponent() {
 
   const handleOpenModal = () => {
     setIsOpening(true)
+    preloadTaskModal()
     // Small delay to show loading state
     setTimeout(() => {
       setIsTaskModalOpen(true)
@@ -39,6 +37,7 @@ function AddTaskButtonComponent() {
           size="lg"
           className="rounded-full w-14 h-14 shadow-lg hover:shadow-xl transition-shadow bg-primary hover:bg-primary/90"
           onClick={handleOpenModal}
+          onPointerEnter={preloadTaskModal}
           disabled={isOpening}
         >
           {isOpening ? (
@@ -50,7 +49,9 @@ function AddTaskButtonComponent() {
         </Button>
       </div>
 
-      <TaskModal open={isTaskModalOpen} onOpenChange={setIsTaskModalOpen} mode="create" />
+      {isTaskModalOpen && (
+        <TaskModal open={isTaskModalOpen} onOpenChange={setIsTaskModalOpen} mode="create" />
+      )}
     </>
   )
 }
@@ -0,0 +1,142 @@
+"use client"
+
+import { useEffect, useState } from "react"
+import { AlertTriangle, CheckCircle, Clock, WifiOff } from "lucide-react"
+import { cn } from "@/lib/utils"
+import type { DisplayCard, DisplaySnapshot } from "@/lib/display-hub"
+
+const COLUMNS = [
+  { status: "Todo", title: "To Do" },
+  { status: "In Progress", title: "In Progress" },
+  { status: "Completed", title: "Completed" },
+]
+
+// Readable from across the shop floor
+const priorityColors: Record<string, string> = {
+  Low: "border-l-gray-400",
+  Medium: "border-l-blue-400",
+  High: "border-l-orange-400",
+  Critical: "border-l-red-500",
+}
+
+// Cards shown per column; the count in the column header stays exact
+const MAX_CARDS_PER_COLUMN = 12
+
+interface AndonBoardProps {
+  department: string
+  displayKey: string
+}
+
+function isOverdue(card: DisplayCard) {
+  return !!card.dueDate && card.status !== "Completed" && card.dueDate.slice(0, 10) < new Date().toISOString().slice(0, 10)
+}
+
+function AndonCard({ card }: { card: DisplayCard }) {
+  const overdue = isOverdue(card)
+  return (
+    <div
+      className={cn(
+        "rounded-lg border-l-8 bg-gray-800 px-4 py-3",
+        priorityColors[card.priority] || "border-l-gray-400",
+        overdue && "ring-2 ring-red-500",
+      )}
+    >
+      <div className="flex items-start justify-between gap-3">
+        <p className="text-xl font-semibold leading-snug text-white line-clamp-2">{card.title}</p>
+        {card.priority === "Critical" && <AlertTriangle className="h-6 w-6 shrink-0 text-red-400" />}
+      </div>
+      <div className="mt-2 flex items-center justify-between text-base text-gray-300">
+        <span>{card.assigneeInitials.join(" ") || "Unassigned"}</span>
+        <span className="flex items-center gap-3">
+          {card.subtaskTotal > 0 && <span>{card.subtaskDone}/{card.subtaskTotal}</span>}
+          {card.dueDate && (
+            <span className={cn(overdue && "font-semibold text-red-400")}>{card.dueDate.slice(5, 10)}</span>
+          )}
+        </span>
+      </div>
+    </div>
+  )
+}
+
+// Read-only board for always-on shop-floor screens. Holds one EventSource to the
+// department's shared snapshot stream instead of the signed-in client's realtime channels.
+export function AndonBoard({ department, displayKey }: AndonBoardProps) {
+  const [snapshot, setSnapshot] = useState<DisplaySnapshot | null>(null)
+  const [connected, setConnected] = useState(false)
+
+  useEffect(() => {
+    const url = `/api/display/${encodeURIComponent(department)}?key=${encodeURIComponent(displayKey)}`
+    const source = new EventSource(url)
+
+    source.onopen = () => setConnected(true)
+    // EventSource reconnects by itself, sending Last-Event-ID so an unchanged snapshot is not resent
+    source.onerror = () => setConnected(false)
+    source.addEventListener("snapshot", (event) => {
+      setSnapshot(JSON.parse((event as MessageEvent<string>).data))
+      setConnected(true)
+    })
+
+    return () => source.close()
+  }, [department, displayKey])
+
+  const counts = snapshot?.counts
+  const stats = [
+    { label: "Open", value: counts ? counts.total - counts.completed : "-", icon: Clock, color: "text-blue-400" },
+    { label: "Completed", value: counts?.completed ?? "-", icon: CheckCircle, color: "text-green-400" },
+    { label: "Critical", value: counts?.critical ?? "-", icon: AlertTriangle, color: "text-red-400" },
+    { label: "Overdue", value: counts?.overdue ?? "-", icon: Clock, color: "text-orange-400" },
+  ]
+
+  return (
+    <div className="min-h-screen bg-gray-950 p-6 text-white" data-testid="andon-board">
+      <header className="mb-6 flex items-center justify-between">
+        <div>
+          <h1 className="text-4xl font-bold">{department}</h1>
+          <p className="text-lg text-gray-400">
+            {snapshot ? `Updated ${new Date(snapshot.generatedAt).toLocaleTimeString()}` : "Connecting..."}
+          </p>
+        </div>
+        {!connected && (
+          <div className="flex items-center gap-2 rounded-lg bg-red-900/60 px-4 py-2 text-lg text-red-200">
+            <WifiOff className="h-6 w-6" />
+            Reconnecting
+          </div>
+        )}
+      </header>
+
+      <div className="mb-6 grid grid-cols-4 gap-4">
+        {stats.map((stat) => (
+          <div key={stat.label} className="flex items-center justify-between rounded-xl bg-gray-900 px-6 py-4">
+            <div>
+              <p className="text-lg text-gray-400">{stat.label}</p>
+              <p className="text-5xl font-bold">{stat.value}</p>
+            </div>
+            <stat.icon className={cn("h-12 w-12", stat.color)} />
+          </div>
+        ))}
+      </div>
+
+      <div className="grid grid-cols-3 gap-6">
+        {COLUMNS.map((column) => {
+          const cards = snapshot?.columns[column.status] ?? []
+          return (
+            <section key={column.status} className="rounded-xl bg-gray-900 p-4">
+              <h2 className="mb-4 flex items-center justify-between text-2xl font-semibold">
+                {column.title}
+                <span className="rounded-full bg-gray-800 px-3 py-1 text-xl">{cards.length}</span>
+              </h2>
+              <div className="space-y-3">
+                {cards.slice(0, MAX_CARDS_PER_COLUMN).map((card) => (
+                  <AndonCard key={card.id} card={card} />
+                ))}
+                {cards.length > MAX_CARDS_PER_COLUMN && (
+                  <p className="text-center text-lg text-gray-400">+{cards.length - MAX_CARDS_PER_COLUMN} more</p>
+                )}
+              </div>
+            </section>
+          )
+        })}
+      </div>
+    </div>
+  )
+}
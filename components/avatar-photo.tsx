@@ -0,0 +1,35 @@
+"use client"
+
+import Image from "next/image"
+
+// Only Supabase Storage URLs are allowed through the optimizer (see images in next.config.mjs)
+const storageOrigin = process.env.NEXT_PUBLIC_SUPABASE_URL
+  ? new URL(process.env.NEXT_PUBLIC_SUPABASE_URL).origin
+  : null
+
+export function isOptimizableImage(src: string) {
+  return !!storageOrigin && src.startsWith(`${storageOrigin}/storage/v1/object/public/`)
+}
+
+interface AvatarPhotoProps {
+  src: string
+  alt: string
+  size: number // rendered width/height in CSS pixels
+  className?: string
+}
+
+// Profile photo resized and re-encoded (AVIF/WebP) by the app's image endpoint.
+// Data URLs from a local upload preview and other hosts are shown as-is.
+export function AvatarPhoto({ src, alt, size, className }: AvatarPhotoProps) {
+  return (
+    <Image
+      src={src}
+      alt={alt}
+      width={size}
+      height={size}
+      sizes={`${size}px`}
+      className={className}
+      unoptimized={!isOptimizableImage(src)}
+    />
+  )
+}
@@ -11,8 +11,9 @@ import { Card, CardContent } from "@/components/ui/card"
 import { Send, Trash2, RotateCcw, Check, X } from "lucide-react"
 import { formatDistanceToNow } from "date-fns"
 import { useAuth } from "@/contexts/auth-context"
-import { useTaskContext } from "@/contexts/task-context"
+import { useTaskActions } from "@/contexts/task-context"
 import { cn } from "@/lib/utils"
+import { newClientId } from "@/lib/mutation-queue"
 
 interface DatabaseComment {
   id: string
@@ -61,7 +62,7 @@ export function CommentsSection({
 }: CommentsSectionProps) {
   const safeComments = Array.isArray(comments) ? comments : []
   const { user } = useAuth()
-  const { addComment, updateComment, deleteComment } = useTaskContext()
+  const { addComment, updateComment, deleteComment } = useTaskActions()
 
   const [newComment, setNewComment] = useState("")
   const [editingComment, setEditingComment] = useState<{ commentId: string; text: string } | null>(null)
@@ -89,6 +90,7 @@ export function CommentsSection({
   // Convert UI comment to database format
   const mapUIToDatabase = (uiComment: UIComment): Partial<DatabaseComment> => {
     return {
+      id: uiComment.id, // client-generated, so a retry upserts the same row
       content: uiComment.content,
       task_id: subtaskId ? undefined : taskId,  // Only set task_id if this is NOT a subtask comment
       subtask_id: subtaskId || undefined,       // Only set subtask_id if this IS a subtask comment
@@ -115,7 +117,7 @@ export function CommentsSection({
     console.log('📝 Creating optimistic UI comment...')
     // Create optimistic UI comment
     const tempComment: UIComment = {
-      id: `temp-comment-${Date.now()}`,
+      id: newClientId(), // final id; the server row keeps it
       author: {
         id: user.id,
         name: (user as any)?.user_metadata?.full_name || user.email || 'Current User',
@@ -328,7 +330,7 @@ export function CommentsSection({
   }
 
   return (
-    <div className="space-y-4">
+    <div className="space-y-4" data-testid="comments-section">
       <div className="space-y-3 max-h-96 overflow-y-auto">
         {safeComments
           .filter(comment => comment.content !== undefined)
@@ -336,7 +338,7 @@ export function CommentsSection({
           <Card key={comment.id} className={cn(
             "border-border/50",
             comment.uploadStatus === 'failed' && "border-red-200 bg-red-50"
-          )}>
+          )} data-testid="comment-item" data-comment-id={comment.id} data-upload-status={comment.uploadStatus}>
             <CardContent className="p-4">
               <div className="flex items-start gap-3">
                 <Avatar className="w-8 h-8 flex-shrink-0">
@@ -363,6 +365,7 @@ export function CommentsSection({
                           variant="ghost"
                           size="sm"
                           onClick={() => retryComment(comment.id)}
+                          data-testid="comment-retry"
                           className="h-5 w-5 p-0 text-red-500 hover:text-red-700"
                           title="Retry upload"
                         >
@@ -379,12 +382,14 @@ export function CommentsSection({
                         onChange={(e) => setEditingComment({ ...editingComment, text: e.target.value })}
                         className="text-sm min-h-[60px] resize-none"
                         placeholder="Edit your comment..."
+                        data-testid="comment-edit-input"
                       />
                       <div className="flex gap-1">
                         <Button
                           variant="ghost"
                           size="sm"
                           onClick={() => saveEditedComment(comment.id)}
+                          data-testid="comment-edit-save"
                           className="h-6 px-2 text-xs text-blue-600 hover:text-blue-800"
                         >
                           Save
@@ -401,7 +406,7 @@ export function CommentsSection({
                     </div>
                   ) : (
                     <div className="space-y-1">
-                      <p className="text-sm text-foreground break-words whitespace-pre-wrap overflow-hidden leading-relaxed">
+                      <p className="text-sm text-foreground break-words whitespace-pre-wrap overflow-hidden leading-relaxed" data-testid="comment-content">
                         {comment.content || "No content"}
                       </p>
                       {comment.content && comment.content.length > 100 && (
@@ -419,6 +424,7 @@ export function CommentsSection({
                       variant="ghost"
                       size="sm"
                       onClick={() => startEditingComment(comment.id, comment.content || "")}
+                      data-testid="comment-edit"
                       className="h-6 w-6 p-0 text-muted-foreground hover:text-blue-600"
                       title="Edit comment"
                     >
@@ -432,6 +438,7 @@ export function CommentsSection({
                       variant="ghost"
                       size="sm"
                       onClick={() => deleteCommentHandler(comment.id)}
+                      data-testid="comment-delete"
                       className="h-6 w-6 p-0 text-muted-foreground hover:text-destructive"
                       title="Delete comment"
                     >
@@ -454,12 +461,14 @@ export function CommentsSection({
             onKeyDown={handleKeyPress}
             className="min-h-[80px] resize-none"
             disabled={!user}
+            data-testid="comment-input"
           />
         </div>
         <Button
           onClick={addCommentHandler}
           disabled={!newComment.trim() || !user}
           className="self-end h-10 px-3"
+          data-testid="comment-submit"
         >
           <Send className="w-4 h-4" />
         </Button>
@@ -4,18 +4,18 @@ import { useState } from "react"
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { Clock, CheckCircle, AlertTriangle, Users } from "lucide-react"
-import { useTaskContext } from "@/contexts/task-context"
-import { TeamMembersModal } from "./team-members-modal"
+import { useTaskActions, useTaskSelector } from "@/contexts/task-context"
+import { selectTaskCounts, shallowEqual } from "@/lib/task-store"
+import { TeamMembersModal, preloadTeamMembersModal } from "./lazy-components"
 import { useTeamMembers } from "@/hooks/use-team-members"
 
 export function DashboardSummary() {
   const [isTeamModalOpen, setIsTeamModalOpen] = useState(false)
-  const { tasks, setFilter, setSearchQuery } = useTaskContext()
+  const { setFilter, setSearchQuery } = useTaskActions()
+  // Re-renders only when one of the three totals changes, not on every task edit
+  const { total: totalTasks, completed: completedTasks, critical: attentionTasks } = useTaskSelector(selectTaskCounts, shallowEqual)
   const { teamMembers = [] } = useTeamMembers()
 
-  const totalTasks = tasks?.length || 0
-  const completedTasks = tasks?.filter((task) => task?.status === "Completed")?.length || 0
-  const attentionTasks = tasks?.filter((task) => task?.priority === "Critical")?.length || 0
   const teamMembersCount = teamMembers?.length || 0
 
   const kpiData = [
@@ -77,6 +77,7 @@ export function DashboardSummary() {
             key={kpi.id}
             className="cursor-pointer hover:shadow-md transition-all duration-200 border-[--border] hover:scale-[1.02]"
             onClick={() => handleCardClick(kpi.id)}
+            onPointerEnter={kpi.id === "team-members" ? preloadTeamMembersModal : undefined}
           >
             <CardContent className="p-6">
               <div className="flex items-center justify-between">
@@ -99,10 +100,12 @@ export function DashboardSummary() {
         ))}
       </div>
 
-      <TeamMembersModal
-        isOpen={isTeamModalOpen}
-        onClose={() => setIsTeamModalOpen(false)}
-      />
+      {isTeamModalOpen && (
+        <TeamMembersModal
+          isOpen={isTeamModalOpen}
+          onClose={() => setIsTeamModalOpen(false)}
+        />
+      )}
     </div>
   )
 }
@@ -2,7 +2,7 @@
 
 import { useState } from "react"
 import { AddTaskButton } from "./add-task-button"
-import { UserProfileDropdown } from "./user-profile-dropdown"
+import { UserProfileDropdown } from "./lazy-components"
 
 export function Header() {
   const [showTaskModal, setShowTaskModal] = useState(false)
@@ -0,0 +1,41 @@
+import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
+import { Skeleton } from "@/components/ui/skeleton"
+
+const COLUMN_TITLES = ["To Do", "In Progress", "Completed"]
+
+// Server-renderable placeholder with the same layout as the kanban page, shown
+// while the board snapshot streams in (no spinner, no layout shift)
+export function KanbanBoardSkeleton() {
+  return (
+    <div className="min-h-screen bg-gradient-to-br from-slate-50 via-blue-50 to-indigo-100 dark:from-gray-900 dark:via-gray-800 dark:to-gray-900">
+      <div className="h-16 border-b bg-background/80" />
+
+      <main className="max-w-7xl mx-auto px-4 sm:px-6 lg:px-8 py-8">
+        <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-4">
+          {Array.from({ length: 4 }).map((_, index) => (
+            <Skeleton key={index} className="h-24" />
+          ))}
+        </div>
+
+        <div className="mt-8 space-y-4">
+          <Skeleton className="h-[72px]" />
+
+          <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4 sm:gap-6">
+            {COLUMN_TITLES.map((title) => (
+              <Card key={title} className="border-[--border]">
+                <CardHeader className="pb-2 sm:pb-3">
+                  <CardTitle className="text-base sm:text-lg font-semibold">{title}</CardTitle>
+                </CardHeader>
+                <CardContent className="pt-0 space-y-2 sm:space-y-3">
+                  {Array.from({ length: 3 }).map((_, index) => (
+                    <Skeleton key={index} className="h-28" />
+                  ))}
+                </CardContent>
+              </Card>
+            ))}
+          </div>
+        </div>
+      </main>
+    </div>
+  )
+}
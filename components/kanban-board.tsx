@@ -3,16 +3,29 @@
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { ChevronDown, ChevronRight } from "lucide-react"
-import { useState, useEffect } from "react"
+import { useState, useEffect, useCallback, memo } from "react"
 import { TaskCard } from "@/components/task-card"
-import { useTaskContext } from "@/contexts/task-context"
-import { TaskModal } from "@/components/task-modal"
+import { useBoardFilter, useTask, useTaskActions, useTaskSelector } from "@/contexts/task-context"
+import { TaskModal, preloadTaskModal } from "@/components/lazy-components"
 import { LoadingSpinner } from "@/components/ui/loading-spinner"
 import { cn } from "@/lib/utils"
 import { supabase } from "@/lib/supabase"
+import { selectColumnTaskIds, shallowEqual, type TaskStoreState } from "@/lib/task-store"
+
+// Module-level selectors so each column subscription stays stable across renders
+const selectTodoIds = (state: TaskStoreState) => selectColumnTaskIds(state, "Todo")
+const selectInProgressIds = (state: TaskStoreState) => selectColumnTaskIds(state, "In Progress")
+const selectCompletedIds = (state: TaskStoreState) => selectColumnTaskIds(state, "Completed")
 
 export function KanbanBoard() {
-  const { getTasksByStatus, filter, getFilteredTasks, setFilter, searchQuery, setSearchQuery, tasks, updateTask, fetchTasks } = useTaskContext()
+  const { filter, setFilter, searchQuery, setSearchQuery } = useBoardFilter()
+  const { updateTask } = useTaskActions()
+
+  // The board only re-renders when a column's membership or order changes;
+  // edits to a task's fields re-render just that card (see TaskCard/CompactTaskRow)
+  const todoIds = useTaskSelector(selectTodoIds, shallowEqual)
+  const inProgressIds = useTaskSelector(selectInProgressIds, shallowEqual)
+  const completedIds = useTaskSelector(selectCompletedIds, shallowEqual)
 
   const [expandedColumns, setExpandedColumns] = useState<Record<string, boolean>>({
     todo: false,
@@ -36,35 +49,16 @@ export function KanbanBoard() {
     }
   }
 
-  const getColumnTasks = (status: string) => {
-
-    // Always apply search filtering if there's a search query
-    if (searchQuery.trim()) {
-      const filteredTasks = getFilteredTasks()
-      return filteredTasks.filter((task) => {
-        const taskStatus = getStatusFromColumnId(status)
-        return task.status === taskStatus
-      })
-    }
-    
-    // Apply other filters if no search query
-    if (filter.type !== "all") {
-      const filteredTasks = getFilteredTasks()
-      return filteredTasks.filter((task) => {
-        const taskStatus = getStatusFromColumnId(status)
-        return task.status === taskStatus
-      })
-    }
-    
-    // No search or filter - return all tasks for this status using getTasksByStatus
-    const taskStatus = getStatusFromColumnId(status)
-    return getTasksByStatus(taskStatus)
+  const columnTaskIds: Record<string, string[]> = {
+    Todo: todoIds,
+    "In Progress": inProgressIds,
+    Completed: completedIds,
   }
 
   const columns = [
-    { id: "todo", title: "To Do", tasks: getColumnTasks("todo") },
-    { id: "inProgress", title: "In Progress", tasks: getColumnTasks("inProgress") },
-    { id: "completed", title: "Completed", tasks: getColumnTasks("completed") },
+    { id: "todo", title: "To Do", taskIds: todoIds },
+    { id: "inProgress", title: "In Progress", taskIds: inProgressIds },
+    { id: "completed", title: "Completed", taskIds: completedIds },
   ]
 
   const toggleColumn = (columnId: string) => {
@@ -74,19 +68,20 @@ export function KanbanBoard() {
     }))
   }
 
-  const toggleTask = (taskId: string) => {
+  // Stable callbacks so memoized cards and rows skip re-rendering
+  const toggleTask = useCallback((taskId: string) => {
     setExpandedTasks((prev) => ({
       ...prev,
       [taskId]: !prev[taskId],
     }))
-  }
+  }, [])
 
-  const handleDragStart = (e: React.DragEvent, taskId: string, taskStatus: string) => {
+  const handleDragStart = useCallback((e: React.DragEvent, taskId: string, taskStatus: string) => {
     e.dataTransfer.setData('taskId', taskId)
     e.dataTransfer.setData('taskStatus', taskStatus)
     setDraggingTaskId(taskId)
     setDraggingTaskStatus(taskStatus)
-  }
+  }, [])
 
   const handleDragOver = (e: React.DragEvent, targetStatus: string) => {
     e.preventDefault()
@@ -111,8 +106,8 @@ export function KanbanBoard() {
         setUpdatingTaskId(taskId)
         
         // Get the current tasks in this column
-        const currentTasks = getColumnTasks(targetStatus)
-        const draggedTaskIndex = currentTasks.findIndex(task => task.id === taskId)
+        const currentTasks = columnTaskIds[targetStatus] || []
+        const draggedTaskIndex = currentTasks.indexOf(taskId)
         
         // Calculate the new position based on drop location
         const dropY = e.clientY
@@ -123,7 +118,7 @@ export function KanbanBoard() {
         // Find the task at the drop position
         let newIndex = 0
         for (let i = 0; i < currentTasks.length; i++) {
-          const taskElement = columnElement.querySelector(`[data-task-id="${currentTasks[i].id}"]`) as HTMLElement
+          const taskElement = columnElement.querySelector(`[data-task-id="${currentTasks[i]}"]`) as HTMLElement
           if (taskElement) {
             const taskRect = taskElement.getBoundingClientRect()
             const taskCenter = taskRect.top + taskRect.height / 2
@@ -153,10 +148,10 @@ export function KanbanBoard() {
         const positionOffset = (currentTasks.length - newIndex) * 1000 // 1 second per position
         now.setMilliseconds(now.getMilliseconds() + positionOffset)
         
-        await updateTask(taskId, { updated_at: now.toISOString() })
-        
-        // Refresh the tasks to show the new order
-        await fetchTasks()
+        // Applied optimistically (the card moves now); the mutation queue reconciles the
+        // server row by id or rolls the move back, so no board re-sync is needed.
+        // Sent at once rather than through the write-behind delay, which would hold the spinner
+        await updateTask(taskId, { updated_at: now.toISOString() }, { immediate: true })
         
       } catch (error) {
         console.error('Error updating task order:', error)
@@ -178,9 +173,9 @@ export function KanbanBoard() {
   }
 
   return (
-    <div className="space-y-4">
+    <div className="space-y-4" data-testid="kanban-board">
       {(filter.type !== "all" || searchQuery.trim()) && (
-        <div className="flex items-center gap-2 p-3 bg-muted/50 rounded-lg border">
+        <div className="flex items-center gap-2 p-3 bg-muted/50 rounded-lg border" data-testid="board-filter-banner">
           <span className="text-sm font-medium">
             {searchQuery.trim() && <>Searching for: "{searchQuery}"</>}
             {searchQuery.trim() && filter.type !== "all" && <> • </>}
@@ -194,6 +189,7 @@ export function KanbanBoard() {
               setSearchQuery("")
             }}
             className="text-xs text-muted-foreground hover:text-foreground underline"
+            data-testid="board-clear-filters"
           >
             Clear{" "}
             {searchQuery.trim() && filter.type !== "all" ? "all filters" : searchQuery.trim() ? "search" : "filter"}
@@ -209,6 +205,7 @@ export function KanbanBoard() {
             placeholder="Search tasks..."
             value={searchQuery}
             onChange={(e) => setSearchQuery(e.target.value)}
+            data-testid="board-search"
             className="w-full pl-10 pr-4 py-2 border border-input rounded-md bg-background text-foreground placeholder:text-muted-foreground focus:outline-none focus:ring-2 focus:ring-ring focus:border-transparent"
           />
           <svg
@@ -227,6 +224,7 @@ export function KanbanBoard() {
           {searchQuery && (
             <button
               onClick={() => setSearchQuery("")}
+              data-testid="board-search-clear"
               className="absolute right-3 top-2.5 h-4 w-4 text-muted-foreground hover:text-foreground"
             >
               <svg fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -242,6 +240,9 @@ export function KanbanBoard() {
         </div>
         <button
           onClick={() => setShowTaskModal(true)}
+          onPointerEnter={preloadTaskModal}
+          onFocus={preloadTaskModal}
+          data-testid="board-add-task"
           className="px-4 py-2 bg-primary text-primary-foreground rounded-md hover:bg-primary/90 transition-colors flex items-center gap-2"
         >
           <svg className="h-4 w-4" fill="none" stroke="currentColor" viewBox="0 0 24 24">
@@ -253,11 +254,13 @@ export function KanbanBoard() {
 
       {/* Drag & Drop Info */}
       {/* Task Modal */}
-      <TaskModal 
-        open={showTaskModal} 
-        onOpenChange={setShowTaskModal} 
-        mode="create" 
-      />
+      {showTaskModal && (
+        <TaskModal
+          open={showTaskModal}
+          onOpenChange={setShowTaskModal}
+          mode="create"
+        />
+      )}
 
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-4 sm:gap-6">
         {columns.map((column) => (
@@ -271,17 +274,21 @@ export function KanbanBoard() {
             onDragOver={(e) => handleDragOver(e, getStatusFromColumnId(column.id))}
             onDrop={(e) => handleDrop(e, getStatusFromColumnId(column.id))}
             onDragEnd={handleDragEnd}
+            data-testid="kanban-column"
+            data-column-id={column.id}
           >
             <CardHeader className="pb-2 sm:pb-3">
               <div className="flex items-center justify-between">
                 <CardTitle className="text-base sm:text-lg font-semibold flex items-center gap-2">
                   {column.title}
-                  <Badge variant="secondary" className="text-xs">
-                    {column.tasks.length}
+                  <Badge variant="secondary" className="text-xs" data-testid="kanban-column-count">
+                    {column.taskIds.length}
                   </Badge>
                 </CardTitle>
                 <button
                   onClick={() => toggleColumn(column.id)}
+                  data-testid="kanban-column-toggle"
+                  aria-expanded={!!expandedColumns[column.id]}
                   className="p-1 hover:bg-muted rounded transition-colors"
                 >
                   {expandedColumns[column.id] ? (
@@ -294,92 +301,57 @@ export function KanbanBoard() {
             </CardHeader>
             <CardContent className="pt-0">
               <div className="space-y-2 sm:space-y-3">
-                                {column.tasks.map((task, index) => (
-                  <div key={`${column.id}-${task.id}-${index}`} className="transition-all duration-200 ease-in-out">
+                {column.taskIds.map((taskId) => (
+                  <div key={`${column.id}-${taskId}`} className="transition-all duration-200 ease-in-out">
                     {expandedColumns[column.id] ? (
-                      expandedTasks[task.id] ? (
+                      expandedTasks[taskId] ? (
                         <div className="space-y-2">
-                        <div key={task.id} data-task-id={task.id}>
+                        <div key={taskId} data-task-id={taskId}>
                           <TaskCard 
-                            task={task} 
-                            onDragStart={(e) => handleDragStart(e, task.id, getStatusFromColumnId(column.id))}
-                            isUpdating={updatingTaskId === task.id}
+                            taskId={taskId} 
+                            onDragStart={handleDragStart}
+                            isUpdating={updatingTaskId === taskId}
                           />
                         </div>
                           <button
-                            onClick={() => toggleTask(task.id)}
+                            onClick={() => toggleTask(taskId)}
+                            data-testid="kanban-task-toggle"
                             className="w-full p-1 hover:bg-muted rounded transition-colors flex items-center justify-center"
                           >
                             <ChevronDown className="w-4 h-4" />
                           </button>
                         </div>
                       ) : (
-                        <div key={task.id} data-task-id={task.id}>
+                        <div key={taskId} data-task-id={taskId}>
                           <TaskCard 
-                            task={task} 
-                            onDragStart={(e) => handleDragStart(e, task.id, getStatusFromColumnId(column.id))}
-                            isUpdating={updatingTaskId === task.id}
+                            taskId={taskId} 
+                            onDragStart={handleDragStart}
+                            isUpdating={updatingTaskId === taskId}
                           />
                         </div>
                       )
-                    ) : expandedTasks[task.id] ? (
-                      <div className="space-y-2">
+                    ) : expandedTasks[taskId] ? (
+                      <div className="space-y-2" data-task-id={taskId}>
                         <TaskCard 
-                          task={task} 
-                          onDragStart={(e) => handleDragStart(e, task.id, getStatusFromColumnId(column.id))}
-                          isUpdating={updatingTaskId === task.id}
+                          taskId={taskId} 
+                          onDragStart={handleDragStart}
+                          isUpdating={updatingTaskId === taskId}
                         />
                         <button
-                          onClick={() => toggleTask(task.id)}
+                          onClick={() => toggleTask(taskId)}
+                          data-testid="kanban-task-toggle"
                           className="w-full p-1 hover:bg-muted rounded transition-colors flex items-center justify-center"
                         >
                           <ChevronDown className="w-4 h-4" />
                         </button>
                       </div>
                     ) : (
-                      <div 
-                        key={task.id} 
-                        data-task-id={task.id}
-                        className={cn(
-                          "p-2 sm:p-2.5 bg-muted/50 rounded-md border-[--border] hover:bg-muted/70 transition-colors relative cursor-move",
-                          updatingTaskId === task.id && "bg-blue-50 dark:bg-blue-950/20"
-                        )}
-                        draggable={true}
-                        onDragStart={(e) => handleDragStart(e, task.id, getStatusFromColumnId(column.id))}
-                      >
-                        {updatingTaskId === task.id && (
-                          <div className="absolute inset-0 bg-blue-100/50 dark:bg-blue-900/20 rounded-md flex items-center justify-center">
-                            <LoadingSpinner size="sm" />
-                          </div>
-                        )}
-                        <div className="flex items-center justify-between gap-2">
-                          <p className="text-xs sm:text-sm font-medium text-foreground truncate flex-1 min-w-0">
-                            {task.title}
-                          </p>
-                          <div className="flex items-center gap-2 shrink-0">
-                            <Badge
-                              variant={
-                                task.priority === "Critical"
-                                  ? "destructive"
-                                  : task.priority === "High"
-                                    ? "default"
-                                    : task.priority === "Medium"
-                                      ? "secondary"
-                                      : "outline"
-                              }
-                              className="text-xs px-1.5 py-0.5 h-auto"
-                            >
-                              {task.priority}
-                            </Badge>
-                            <button
-                              onClick={() => toggleTask(task.id)}
-                              className="p-1 hover:bg-muted rounded transition-colors"
-                            >
-                              <ChevronRight className="w-4 h-4" />
-                            </button>
-                          </div>
-                        </div>
-                      </div>
+                      <CompactTaskRow
+                        taskId={taskId}
+                        isUpdating={updatingTaskId === taskId}
+                        onDragStart={handleDragStart}
+                        onToggle={toggleTask}
+                      />
                     )}
                   </div>
                 ))}
@@ -391,3 +363,63 @@ export function KanbanBoard() {
     </div>
   )
 }
+
+interface CompactTaskRowProps {
+  taskId: string
+  isUpdating: boolean
+  onDragStart: (e: React.DragEvent, taskId: string, taskStatus: string) => void
+  onToggle: (taskId: string) => void
+}
+
+// Collapsed-column row; subscribes to its own task like TaskCard does
+const CompactTaskRow = memo(function CompactTaskRow({ taskId, isUpdating, onDragStart, onToggle }: CompactTaskRowProps) {
+  const task = useTask(taskId)
+  if (!task) return null
+
+  return (
+    <div 
+      data-task-id={task.id}
+      data-testid="kanban-task-row"
+      className={cn(
+        "p-2 sm:p-2.5 bg-muted/50 rounded-md border-[--border] hover:bg-muted/70 transition-colors relative cursor-move",
+        isUpdating && "bg-blue-50 dark:bg-blue-950/20"
+      )}
+      draggable={true}
+      onDragStart={(e) => onDragStart(e, task.id, task.status)}
+    >
+      {isUpdating && (
+        <div className="absolute inset-0 bg-blue-100/50 dark:bg-blue-900/20 rounded-md flex items-center justify-center">
+          <LoadingSpinner size="sm" />
+        </div>
+      )}
+      <div className="flex items-center justify-between gap-2">
+        <p className="text-xs sm:text-sm font-medium text-foreground truncate flex-1 min-w-0">
+          {task.title}
+        </p>
+        <div className="flex items-center gap-2 shrink-0">
+          <Badge
+            variant={
+              task.priority === "Critical"
+                ? "destructive"
+                : task.priority === "High"
+                  ? "default"
+                  : task.priority === "Medium"
+                    ? "secondary"
+                    : "outline"
+            }
+            className="text-xs px-1.5 py-0.5 h-auto"
+          >
+            {task.priority}
+          </Badge>
+          <button
+            onClick={() => onToggle(task.id)}
+            data-testid="kanban-task-toggle"
+            className="p-1 hover:bg-muted rounded transition-colors"
+          >
+            <ChevronRight className="w-4 h-4" />
+          </button>
+        </div>
+      </div>
+    </div>
+  )
+})
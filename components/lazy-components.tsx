@@ -0,0 +1,57 @@
+"use client"
+
+import dynamic from "next/dynamic"
+
+// Heavy client components, split out of the board's first-load bundle.
+// Each is fetched the first time it renders; the preload helpers start that
+// fetch earlier (on hover/focus of the control that opens it), so the chunk is
+// usually in cache by the time the user clicks.
+
+const loadTaskModal = () => import("@/components/task-modal")
+const loadTeamMembersModal = () => import("@/components/team-members-modal")
+const loadSubtaskCommentsModal = () => import("@/components/subtask-comments-modal")
+const loadUserProfileDropdown = () => import("@/components/user-profile-dropdown")
+const loadPhotoUpload = () => import("@/components/photo-upload")
+
+export const TaskModal = dynamic(() => loadTaskModal().then((m) => m.TaskModal), { ssr: false })
+
+export const TeamMembersModal = dynamic(() => loadTeamMembersModal().then((m) => m.TeamMembersModal), {
+  ssr: false,
+})
+
+export const SubtaskCommentsModal = dynamic(
+  () => loadSubtaskCommentsModal().then((m) => m.SubtaskCommentsModal),
+  { ssr: false },
+)
+
+export const PhotoUpload = dynamic(() => loadPhotoUpload().then((m) => m.PhotoUpload), { ssr: false })
+
+// Same footprint as the profile button, so the header does not shift when it loads
+function UserProfileDropdownPlaceholder() {
+  return (
+    <div className="flex items-center space-x-3 p-2" aria-hidden="true">
+      <div className="h-10 w-10 rounded-full bg-muted animate-pulse" />
+      <div className="hidden md:block space-y-1">
+        <div className="h-3 w-24 rounded bg-muted animate-pulse" />
+        <div className="h-2 w-16 rounded bg-muted animate-pulse" />
+      </div>
+    </div>
+  )
+}
+
+export const UserProfileDropdown = dynamic(
+  () => loadUserProfileDropdown().then((m) => m.UserProfileDropdown),
+  { ssr: false, loading: UserProfileDropdownPlaceholder },
+)
+
+export function preloadTaskModal() {
+  void loadTaskModal()
+}
+
+export function preloadTeamMembersModal() {
+  void loadTeamMembersModal()
+}
+
+export function preloadSubtaskCommentsModal() {
+  void loadSubtaskCommentsModal()
+}
@@ -2,6 +2,7 @@
 
 import { useState, useRef } from "react"
 import { Camera, X } from "lucide-react"
+import { AvatarPhoto } from "./avatar-photo"
 
 interface PhotoUploadProps {
   currentPhotoUrl?: string
@@ -19,6 +20,12 @@ export function PhotoUpload({ currentPhotoUrl, onPhotoChange, size = "md" }: Pho
     lg: "h-20 w-20"
   }
 
+  const sizePixels = {
+    sm: 40,
+    md: 64,
+    lg: 80
+  }
+
   const handleFileSelect = (event: React.ChangeEvent<HTMLInputElement>) => {
     const file = event.target.files?.[0]
     if (!file) return
@@ -63,9 +70,10 @@ export function PhotoUpload({ currentPhotoUrl, onPhotoChange, size = "md" }: Pho
       {/* Photo Display */}
       <div className={`${sizeClasses[size]} rounded-full overflow-hidden border-2 border-gray-200 dark:border-gray-700 relative`}>
         {currentPhotoUrl ? (
-          <img
+          <AvatarPhoto
             src={currentPhotoUrl}
             alt="Profile"
+            size={sizePixels[size]}
             className="w-full h-full object-cover"
           />
         ) : (
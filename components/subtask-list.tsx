@@ -3,7 +3,7 @@
 import type React from "react"
 
 import { cn } from "@/lib/utils"
-import { useState } from "react"
+import { useRef, useState } from "react"
 import { Button } from "@/components/ui/button"
 import { Input } from "@/components/ui/input"
 import { Checkbox } from "@/components/ui/checkbox"
@@ -15,11 +15,12 @@ import { Trash2, MessageCircle, Users, CalendarIcon, Send, X, Plus, RotateCcw, C
 import { format } from "date-fns"
 import { useTeamMembers } from "@/hooks/use-team-members"
 import { useSubtaskAssignments } from "@/hooks/use-subtask-assignments"
-import { useTaskContext } from "@/contexts/task-context"
+import { useTaskActions } from "@/contexts/task-context"
+import { newClientId } from "@/lib/mutation-queue"
 import { Textarea } from "@/components/ui/textarea"
 import { Card, CardContent } from "@/components/ui/card"
 import { useAuth } from "@/contexts/auth-context"
-import { SubtaskCommentsModal } from "@/components/subtask-comments-modal"
+import { SubtaskCommentsModal, preloadSubtaskCommentsModal } from "@/components/lazy-components"
 
 interface SubtaskComment {
   id: string
@@ -69,10 +70,9 @@ export function SubtaskList({
   const { teamMembers, loading: teamMembersLoading } = useTeamMembers()
   const { 
     getSubtaskAssignments, 
-    assignTeamMembersToSubtask, 
     loading: assignmentLoading 
   } = useSubtaskAssignments()
-  const { addSubtask, updateSubtask: updateSubtaskInDB, addComment: addCommentDB, updateComment: updateCommentDB, deleteComment: deleteCommentDB, deleteSubtask: deleteSubtaskFromDB } = useTaskContext()
+  const { addSubtask, updateSubtask: updateSubtaskInDB, addComment: addCommentDB, updateComment: updateCommentDB, deleteComment: deleteCommentDB, deleteSubtask: deleteSubtaskFromDB } = useTaskActions()
   const { user } = useAuth()
 
   // New subtask creation state
@@ -87,6 +87,8 @@ export function SubtaskList({
   
   // Existing subtask state
   const [assigneeDropdown, setAssigneeDropdown] = useState<string | null>(null)
+  // Assignees before the first of a burst of toggles still waiting to be written
+  const assigneeBaseRef = useRef(new Map<string, string[]>())
   const [datePickerOpen, setDatePickerOpen] = useState<{ subtaskId: string; type: "start" | "end" } | null>(null)
   const [assigneeSearchTerm, setAssigneeSearchTerm] = useState("")
   const [commentModalOpen, setCommentModalOpen] = useState<string | null>(null)
@@ -365,13 +367,15 @@ export function SubtaskList({
         return
       }
       
-      // Update backend assignments
-      try {
-        await assignTeamMembersToSubtask(subtaskId, newAssignees)
-      } catch (error) {
-        console.error('Failed to update subtask assignments:', error)
-        // Revert local state on error
-        updateSubtask(subtaskId, { assignees: currentAssignees })
+      // Rapid clicks are merged into one write of the final set; the server adds and removes
+      // only the difference. A failure reverts to the assignees before the first click.
+      if (!assigneeBaseRef.current.has(subtaskId)) assigneeBaseRef.current.set(subtaskId, currentAssignees)
+      const result = await updateSubtaskInDB(subtaskId, { assignees: newAssignees })
+      const base = assigneeBaseRef.current.get(subtaskId)
+      assigneeBaseRef.current.delete(subtaskId)
+      if (!result && base) {
+        console.error('Failed to update subtask assignments')
+        updateSubtask(subtaskId, { assignees: base })
       }
     }
   }
@@ -396,7 +400,7 @@ export function SubtaskList({
 
     // Create optimistic UI comment
     const tempComment: SubtaskComment = {
-      id: `temp-comment-${Date.now()}`,
+      id: newClientId(), // final id; the server row keeps it
       content: newCommentText.trim(),
       author: {
         id: user.id,
@@ -435,6 +439,7 @@ export function SubtaskList({
       try {
         // Save to database
         const commentData = {
+          id: tempComment.id,
           subtask_id: subtaskId,
           content: tempComment.content,
           author_id: user.id,
@@ -539,6 +544,7 @@ export function SubtaskList({
     try {
       // Retry save to database
       const commentData = {
+        id: comment.id, // same row as the failed attempt, so the retry cannot duplicate it
         subtask_id: subtaskId,
         content: comment.content,
         author_id: user?.id || '',
@@ -685,7 +691,7 @@ export function SubtaskList({
   }
 
   return (
-    <div className="space-y-4">
+    <div className="space-y-4" data-testid="subtask-list">
       {safeSubtasks.length > 0 && (
         <div className="flex justify-between items-center">
           <div className="flex items-center gap-4">
@@ -717,6 +723,7 @@ export function SubtaskList({
                 }}
                 disabled={safeSubtasks.every(s => s.completed)}
                 className="h-7 px-2 text-xs"
+                data-testid="subtask-complete-all"
               >
                 Complete All
               </Button>
@@ -742,13 +749,14 @@ export function SubtaskList({
 
       <div className="space-y-3">
         {safeSubtasks.map((subtask, index) => (
-          <div key={subtask.id} className="space-y-2">
+          <div key={subtask.id} className="space-y-2" data-testid="subtask-item" data-subtask-id={subtask.id}>
             <div className="flex items-center gap-4 p-4 border-[--border] rounded-lg bg-background">
               <div className="flex items-center gap-3 min-w-0 flex-1">
                 <span className="text-xs text-muted-foreground font-medium w-6 flex-shrink-0">{index + 1}.</span>
                 <Checkbox
                   checked={subtask.completed}
                   onCheckedChange={(checked) => updateSubtask(subtask.id, { completed: !!checked })}
+                  data-testid="subtask-toggle"
                   disabled={updatingSubtask === subtask.id}
                   className={cn(
                     "flex-shrink-0 border-2 border-gray-400 hover:border-gray-500 data-[state=checked]:border-primary data-[state=checked]:bg-primary data-[state=checked]:text-primary-foreground",
@@ -764,6 +772,7 @@ export function SubtaskList({
                   value={subtask.title}
                   onChange={(e) => updateSubtask(subtask.id, { title: e.target.value })}
                   onKeyDown={handleSubtaskTitleKeyDown}
+                  data-testid="subtask-title"
                   className={cn(
                     "flex-1 min-w-0 border-none bg-transparent p-0 focus-visible:ring-0 text-sm transition-all duration-200",
                     subtask.completed && "line-through text-muted-foreground opacity-70"
@@ -859,7 +868,7 @@ export function SubtaskList({
                   }}
                 >
                   <PopoverTrigger asChild>
-                    <Button variant="ghost" size="sm" className="h-8">
+                    <Button variant="ghost" size="sm" className="h-8" data-testid="subtask-assignee-trigger">
                       {subtask.assignees && subtask.assignees.length > 0 ? (
                         <div className="w-6 h-6 rounded-full bg-primary text-primary-foreground flex items-center justify-center">
                           <span className="text-xs font-medium">+{subtask.assignees.length}</span>
@@ -903,6 +912,9 @@ export function SubtaskList({
                                 key={member.id}
                                 type="button"
                                 onClick={() => toggleSubtaskAssignee(subtask.id, member.id)}
+                                data-testid="subtask-assignee-option"
+                                data-member-id={member.id}
+                                aria-pressed={!!isSelected}
                                 className={cn(
                                   "flex items-center gap-3 w-full p-2 rounded-md text-left text-sm transition-colors hover:bg-muted/50",
                                   isSelected ? "bg-primary/10 text-primary" : "text-foreground"
@@ -961,6 +973,8 @@ export function SubtaskList({
                   variant="ghost"
                   size="sm"
                   onClick={() => handleCommentClick(subtask.id)}
+                  onPointerEnter={preloadSubtaskCommentsModal}
+                  data-testid="subtask-comments"
                   className={cn(
                     "h-8 px-2 text-muted-foreground hover:text-foreground",
                     selectedCommentSubtask === subtask.id && "bg-primary/10 text-primary",
@@ -977,6 +991,7 @@ export function SubtaskList({
                   variant="ghost"
                   size="sm"
                   onClick={() => deleteSubtask(subtask.id)}
+                  data-testid="subtask-delete"
                   className="h-8 px-2 text-muted-foreground hover:text-destructive"
                 >
                   <Trash2 className="w-3 h-3" />
@@ -999,6 +1014,7 @@ export function SubtaskList({
               placeholder="Add a new subtask"
               onClick={startCreatingSubtask}
               className="flex-1 cursor-pointer"
+              data-testid="subtask-new"
               readOnly
             />
             <Button 
@@ -1021,6 +1037,7 @@ export function SubtaskList({
                 onChange={(e) => setNewSubtaskData(prev => ({ ...prev, title: e.target.value }))}
                 placeholder="Enter subtask title..."
                 className="flex-1"
+                data-testid="subtask-new-title"
                 onKeyDown={(e) => {
                   if (e.key === "Enter") {
                     e.preventDefault()
@@ -1177,6 +1194,7 @@ export function SubtaskList({
                   size="sm"
                   disabled={!newSubtaskData.title.trim()}
                   className="bg-blue-600 hover:bg-blue-700 h-8 px-3"
+                  data-testid="subtask-add"
                 >
                   Add Subtask
                 </Button>
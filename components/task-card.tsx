@@ -4,14 +4,14 @@ import { Card, CardContent } from "@/components/ui/card"
 import { Badge } from "@/components/ui/badge"
 import { Avatar, AvatarFallback } from "@/components/ui/avatar"
 import { Progress } from "@/components/ui/progress"
-import { MessageCircle, AlertTriangle, Calendar, ChevronDown, ChevronRight } from "lucide-react"
-import { useState } from "react"
-import { TaskModal } from "./task-modal"
-import { SubtaskList } from "./subtask-list"
-import { useTeamMembers } from "@/hooks/use-team-members"
+import { MessageCircle, AlertTriangle, Calendar, ChevronDown, ChevronRight, Paperclip } from "lucide-react"
+import { memo, useState } from "react"
+import { TaskModal, preloadTaskModal } from "./lazy-components"
 import { useAuth } from "@/contexts/auth-context"
+import { useTask } from "@/contexts/task-context"
 import { LoadingSpinner } from "@/components/ui/loading-spinner"
 import { cn } from "@/lib/utils"
+import { supabase } from "@/lib/supabase"
 
 interface Task {
   id: string
@@ -23,13 +23,18 @@ interface Task {
   dueDate?: string
   department?: string
   assignees: string[]
+  assigneeInitials?: string[]
   subtasks: any[]
   comments: any[]
+  subtaskCount?: number
+  completedSubtaskCount?: number
+  commentCount?: number
+  attachmentCount?: number
 }
 
 interface TaskCardProps {
-  task: Task
-  onDragStart?: (e: React.DragEvent) => void
+  taskId: string
+  onDragStart?: (e: React.DragEvent, taskId: string, taskStatus: string) => void
   isUpdating?: boolean
 }
 
@@ -40,29 +45,30 @@ const priorityColors = {
   Critical: "bg-red-100 text-red-800 border-red-200",
 }
 
-export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProps) {
-  const { teamMembers, loading: teamMembersLoading } = useTeamMembers()
+// Subscribes to its own task, so a realtime update re-renders this card only
+function TaskCardComponent({ taskId, onDragStart, isUpdating = false }: TaskCardProps) {
   const { user } = useAuth()
+  const task: Task | null = useTask(taskId)
   
   // Permission checks
   const canEditTasks = user?.role === 'administrator' || user?.role === 'manager'
-  
-  const completedSubtasks = task.subtasks.filter((st) => st.completed).length
-  const totalSubtasks = task.subtasks.length
-  const progressPercentage = totalSubtasks > 0 ? (completedSubtasks / totalSubtasks) * 100 : 0
 
   const [isEditModalOpen, setIsEditModalOpen] = useState(false)
   const [showSubtasks, setShowSubtasks] = useState(false)
+  const [subtaskPreview, setSubtaskPreview] = useState<any[] | null>(null)
+
+  const [isDragging, setIsDragging] = useState(false)
 
-  const currentSubtask =
-    completedSubtasks < totalSubtasks ? `Subtask ${completedSubtasks + 1}` : "All subtasks completed"
+  // Deleted while the board still lists it; the column drops it on the next render
+  if (!task) return null
 
-  // Get all assignees for this task using dynamic team member data
-  const assignees = task.assignees.length > 0 && teamMembers.length > 0
-    ? teamMembers.filter((member) => task.assignees.includes(member.id))
-    : []
+  // Counts come from the board projection; fall back to loaded subtasks if present
+  const completedSubtasks = task.completedSubtaskCount ?? task.subtasks.filter((st) => st.completed).length
+  const totalSubtasks = task.subtaskCount ?? task.subtasks.length
+  const progressPercentage = totalSubtasks > 0 ? (completedSubtasks / totalSubtasks) * 100 : 0
+  const commentCount = task.commentCount ?? task.comments.length
 
-  const [isDragging, setIsDragging] = useState(false)
+  const assigneeInitials = task.assigneeInitials || []
 
   const handleDoubleClick = () => {
     if (canEditTasks && !isDragging) {
@@ -79,7 +85,7 @@ export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProp
   const handleDragStart = (e: React.DragEvent) => {
     setIsDragging(true)
     if (onDragStart) {
-      onDragStart(e)
+      onDragStart(e, task.id, task.status)
     }
   }
 
@@ -87,7 +93,32 @@ export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProp
     setIsDragging(false)
   }
 
-  const toggleSubtasks = () => {
+  // Subtask titles are not part of the board projection, load the first few on demand
+  const loadSubtaskPreview = async () => {
+    if (task.subtasks.length > 0) {
+      setSubtaskPreview(task.subtasks)
+      return
+    }
+
+    const { data, error } = await supabase
+      .from('subtasks')
+      .select('id, title, completed')
+      .eq('task_id', task.id)
+      .order('order_index', { ascending: true })
+      .limit(3)
+
+    if (error) {
+      console.error('Error loading subtask preview:', error)
+      return
+    }
+    setSubtaskPreview(data || [])
+  }
+
+  const toggleSubtasks = (e: React.MouseEvent) => {
+    e.stopPropagation()
+    if (!showSubtasks && subtaskPreview === null) {
+      loadSubtaskPreview()
+    }
     setShowSubtasks(!showSubtasks)
   }
 
@@ -106,6 +137,10 @@ export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProp
         draggable={canEditTasks && !isUpdating}
         onDragStart={canEditTasks && !isUpdating ? handleDragStart : undefined}
         onDragEnd={handleDragEnd}
+        onPointerEnter={canEditTasks ? preloadTaskModal : undefined}
+        data-testid="task-card"
+        data-priority={task.priority}
+        data-updating={isUpdating || undefined}
       >
         {isUpdating && (
           <div className="absolute inset-0 bg-blue-100/50 dark:bg-blue-900/20 rounded-lg flex items-center justify-center z-10">
@@ -115,7 +150,7 @@ export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProp
         <CardContent className="p-4 space-y-3">
           {/* Title and Priority */}
           <div className="flex items-start justify-between gap-2">
-            <h3 className="font-medium text-sm text-foreground leading-tight">{task.title}</h3>
+            <h3 className="font-medium text-sm text-foreground leading-tight" data-testid="task-card-title">{task.title}</h3>
             <div className="flex items-center gap-1">
               {task.priority === "Critical" && <AlertTriangle className="w-4 h-4 text-red-600" />}
               <Badge variant="outline" className={`text-xs px-2 py-0.5 ${priorityColors[task.priority]}`}>
@@ -150,6 +185,7 @@ export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProp
             <div className="space-y-2">
               <button
                 onClick={toggleSubtasks}
+                data-testid="task-card-subtasks-toggle"
                 className="flex items-center gap-2 text-xs text-muted-foreground hover:text-foreground transition-colors"
               >
                 {showSubtasks ? <ChevronDown className="w-3 h-3" /> : <ChevronRight className="w-3 h-3" />}
@@ -159,8 +195,9 @@ export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProp
               </button>
               
               {showSubtasks && (
-                <div className="pl-4 space-y-1">
-                  {task.subtasks.slice(0, 3).map((subtask, index) => (
+                <div className="pl-4 space-y-1" data-testid="task-card-subtask-preview">
+                  {subtaskPreview === null && <LoadingSpinner size="sm" />}
+                  {(subtaskPreview || []).slice(0, 3).map((subtask, index) => (
                     <div key={subtask.id || index} className="flex items-center gap-2 text-xs">
                       <div className={`w-2 h-2 rounded-full ${subtask.completed ? 'bg-green-500' : 'bg-gray-300'}`} />
                       <span className={subtask.completed ? 'line-through text-muted-foreground' : 'text-foreground'}>
@@ -168,9 +205,9 @@ export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProp
                       </span>
                     </div>
                   ))}
-                  {task.subtasks.length > 3 && (
+                  {totalSubtasks > 3 && (
                     <div className="text-xs text-muted-foreground">
-                      +{task.subtasks.length - 3} more subtasks
+                      +{totalSubtasks - 3} more subtasks
                     </div>
                   )}
                 </div>
@@ -184,40 +221,59 @@ export function TaskCard({ task, onDragStart, isUpdating = false }: TaskCardProp
           {/* Assignees and Progress */}
           <div className="flex items-center justify-between">
             <div className="flex items-center gap-1">
-              {assignees.length > 0 ? (
-                assignees.slice(0, 3).map((assignee, index) => (
-                  <Avatar key={assignee.id} className="w-6 h-6">
+              {assigneeInitials.length > 0 ? (
+                assigneeInitials.slice(0, 3).map((initials, index) => (
+                  <Avatar key={task.assignees[index] || index} className="w-6 h-6">
                     <AvatarFallback className="text-xs bg-secondary text-secondary-foreground">
-                      {assignee.full_name.split(' ').map((n: string) => n[0]).join('').toUpperCase()}
+                      {initials}
                     </AvatarFallback>
                   </Avatar>
                 ))
               ) : (
                 <div className="w-6 h-6" />
               )}
-              {assignees.length > 3 && (
+              {assigneeInitials.length > 3 && (
                 <div className="text-xs text-muted-foreground ml-1">
-                  +{assignees.length - 3}
+                  +{assigneeInitials.length - 3}
                 </div>
               )}
             </div>
 
-            {totalSubtasks > 0 && (
-              <div className="text-xs text-muted-foreground">
-                {completedSubtasks}/{totalSubtasks}
-              </div>
-            )}
+            <div className="flex items-center gap-3 text-xs text-muted-foreground">
+              {commentCount > 0 && (
+                <div className="flex items-center gap-1" data-testid="task-card-comment-count">
+                  <MessageCircle className="w-3 h-3" />
+                  <span>{commentCount}</span>
+                </div>
+              )}
+              {(task.attachmentCount ?? 0) > 0 && (
+                <div className="flex items-center gap-1" data-testid="task-card-attachment-count">
+                  <Paperclip className="w-3 h-3" />
+                  <span>{task.attachmentCount}</span>
+                </div>
+              )}
+              {totalSubtasks > 0 && (
+                <div>
+                  {completedSubtasks}/{totalSubtasks}
+                </div>
+              )}
+            </div>
           </div>
         </CardContent>
       </Card>
 
-      {/* Edit Task Modal */}
-      <TaskModal
-        open={isEditModalOpen}
-        onOpenChange={setIsEditModalOpen}
-        mode="edit"
-        task={task}
-      />
+      {/* Edit Task Modal, mounted (and its chunk loaded) only while open */}
+      {isEditModalOpen && (
+        <TaskModal
+          open={isEditModalOpen}
+          onOpenChange={setIsEditModalOpen}
+          mode="edit"
+          task={task}
+        />
+      )}
     </>
   )
 }
+
+// Memoize so board re-renders (filters, drag state) skip cards whose props are unchanged
+export const TaskCard = memo(TaskCardComponent)
@@ -3,7 +3,7 @@
 import type React from "react"
 
 import { useState, useEffect, useCallback } from "react"
-import { useTaskContext } from "@/contexts/task-context"
+import { useTaskActions } from "@/contexts/task-context"
 import { useSubtaskAssignments } from "@/hooks/use-subtask-assignments"
 import { useAuth } from "@/contexts/auth-context"
 import { Dialog, DialogContent, DialogHeader, DialogTitle } from "@/components/ui/dialog"
@@ -22,7 +22,7 @@ import { LoadingSpinner } from "@/components/ui/loading-spinner"
 import { SubtaskList } from "@/components/subtask-list"
 import { CommentsSection } from "@/components/comments-section"
 import { useTeamMembers } from "@/hooks/use-team-members"
-import { useTaskAssignments } from "@/hooks/use-task-assignments"
+import { useTaskAttachments, type TaskAttachment } from "@/hooks/use-task-attachments"
 import type { Task } from "@/hooks/use-tasks"
 import { supabase } from "@/lib/supabase"
 
@@ -45,10 +45,10 @@ interface TaskFormData {
 }
 
 export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskModalProps) {
-  const { addTask, createTaskWithAssignees, updateTask, deleteTask, fetchTasks, fetchSubtasks, addSubtask, addComment, fetchTaskDetails } = useTaskContext()
+  const { addTask, createTaskWithAssignees, updateTask, deleteTask, fetchSubtasks, addSubtask, addComment, fetchTaskDetails } = useTaskActions()
   const { teamMembers, loading: teamMembersLoading } = useTeamMembers()
-  const { updateTaskAssignments, loading: assignmentLoading } = useTaskAssignments()
   const { assignTeamMembersToSubtask } = useSubtaskAssignments()
+  const { saveTaskAttachments } = useTaskAttachments()
   const { user } = useAuth()
 
   // Permission checks
@@ -126,10 +126,11 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
       return currentComments // Keep current comments
     })
   }, [])
-  const [attachments, setAttachments] = useState(task?.attachments || [])
+  const [attachments, setAttachments] = useState<TaskAttachment[]>(task?.attachments || [])
   const [selectedAssignees, setSelectedAssignees] = useState<string[]>([])
   const [showAssigneeDropdown, setShowAssigneeDropdown] = useState(false)
   const [showDeleteConfirm, setShowDeleteConfirm] = useState(false)
+  const [isSaving, setIsSaving] = useState(false)
   const [showAttachmentPopup, setShowAttachmentPopup] = useState(false)
   const [isDeleting, setIsDeleting] = useState(false)
   const [assigneeSearchTerm, setAssigneeSearchTerm] = useState("")
@@ -137,6 +138,12 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
   const [success, setSuccess] = useState<string | null>(null)
   const [hasInitialized, setHasInitialized] = useState(false)
   const [commentsLoaded, setCommentsLoaded] = useState(false)
+  // The board only carries card fields; description etc. arrive with fetchTaskDetails
+  const [detailsLoaded, setDetailsLoaded] = useState(false)
+  // Edit mode only writes attachments once the real list has loaded; until then
+  // `attachments` is empty and must not be treated as "the user removed everything"
+  const [attachmentsLoaded, setAttachmentsLoaded] = useState(false)
+  const [removedAttachmentIds, setRemovedAttachmentIds] = useState<string[]>([])
 
   const [attachmentForm, setAttachmentForm] = useState({
     description: "",
@@ -210,6 +217,8 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
     setSubtasks([])
     setComments([])
     setAttachments([])
+    setAttachmentsLoaded(false)
+    setRemovedAttachmentIds([])
     setSelectedAssignees([])
     setAttachmentForm({
       description: "",
@@ -227,6 +236,8 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
     // Reset comments loaded flag when switching to a different task
     if (task?.id !== currentTaskId) {
       setCommentsLoaded(false)
+      setAttachmentsLoaded(false)
+      setRemovedAttachmentIds([])
       setCurrentTaskId(task?.id || null)
     }
     
@@ -278,32 +289,6 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
     }
   }, [task, mode, open]) // Removed loadTaskComments and resetFormState from dependencies
 
-  // Load attachments when editing a task
-  useEffect(() => {
-    if (open && task && mode === "edit" && task.documentLinks) {
-      console.log('🔄 TASK MODAL - Loading attachments from task:', task.documentLinks)
-      
-      // Convert documentLinks array to attachments format
-      const loadedAttachments = (task.documentLinks || []).map((link: string, index: number) => {
-        // Ensure the link has a proper protocol
-        let processedLink = link.trim()
-        if (!processedLink.startsWith('http://') && !processedLink.startsWith('https://')) {
-          processedLink = 'https://' + processedLink
-        }
-        
-        return {
-          id: `attachment-${task.id}-${index}`,
-          description: `Attachment ${index + 1}`,
-          link: processedLink,
-          createdAt: new Date().toISOString(),
-        }
-      })
-      
-      console.log('📎 TASK MODAL - Loaded attachments:', loadedAttachments)
-      setAttachments(loadedAttachments)
-    }
-  }, [open, task, mode])
-
   // Refresh subtasks when modal opens in edit mode
   useEffect(() => {
     if (open && task && mode === "edit" && fetchSubtasks) {
@@ -316,6 +301,14 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
       ]).then(([subtasksResult, taskDetailsResult]) => {
         console.log('✅ TASK MODAL - Subtasks and comments fetched successfully')
         
+        if (taskDetailsResult && taskDetailsResult.task) {
+          setFormData(prev => ({
+            ...prev,
+            description: prev.description || taskDetailsResult.task.description || "",
+          }))
+          setDetailsLoaded(true)
+        }
+        
         // If we got task details, update the subtasks with their comments
         if (taskDetailsResult && taskDetailsResult.subtasks) {
           const subtasksWithComments = taskDetailsResult.subtasks.map(subtask => ({
@@ -325,6 +318,14 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
           setSubtasks(subtasksWithComments)
         }
         
+        // Attachments are only loaded here, the board carries just the count
+        if (taskDetailsResult && taskDetailsResult.task && !taskDetailsResult.attachmentsError) {
+          console.log('📎 TASK MODAL - Loaded attachments:', taskDetailsResult.attachments.length)
+          setAttachments(taskDetailsResult.attachments)
+          setRemovedAttachmentIds([])
+          setAttachmentsLoaded(true)
+        }
+        
         // 🔧 FIX: Update task assignees with fresh data from database
         if (taskDetailsResult && taskDetailsResult.taskAssignments) {
           console.log('🔧 ASSIGNEE FIX - Updating task assignees with fresh data:', taskDetailsResult.taskAssignments)
@@ -379,9 +380,6 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
       return
     }
 
-    // Process attachments for database storage
-    const documentLinks = attachments.map(att => att.link).filter(link => link.trim() !== '')
-    
     // Ensure assignees are unique
     const uniqueAssignees = [...new Set(selectedAssignees)]
     
@@ -393,7 +391,10 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
     
     const taskData = {
       title: formData.title.trim(),
-      description: formData.description.trim(),
+      // Don't overwrite a description we haven't loaded yet
+      description: mode === "edit" && !detailsLoaded && !formData.description.trim()
+        ? undefined
+        : formData.description.trim(),
       status: formData.status as "Todo" | "In Progress" | "Completed",
       priority: formData.priority as "Low" | "Medium" | "High" | "Critical",
       startDate: formData.startDate ? (() => {
@@ -418,8 +419,10 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
       assignees: uniqueAssignees,
       subtasks: subtasks, // Include subtasks in both create and edit modes
       comments,
-      attachments,
-      documentLinks, // Add processed document links for database
+      // Leave the card's attachments alone if we never saw the real list
+      ...(mode === "create" || attachmentsLoaded
+        ? { attachments, attachmentCount: attachments.length }
+        : {}),
     }
 
     if (mode === "create") {
@@ -561,18 +564,17 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
             setError('Task created but some comments failed to save.')
           }
                 }
+
+        // Save attachments as task_attachments rows now that the task id exists
+        if (result && attachments.length > 0) {
+          const savedAttachments = await saveTaskAttachments(result.id, attachments)
+          if (!savedAttachments) {
+            setError('Task created but some attachments failed to save.')
+          }
+        }
         
         if (result) {
-          // If we created subtasks, we need to refresh the task data to include them
-          if (subtasks.length > 0) {
-            console.log('🔄 TASK CREATION - Refreshing task data to include new subtasks...')
-            // Give a moment for the database transactions to complete
-            await new Promise(resolve => setTimeout(resolve, 500))
-            // Explicitly refresh the task list to ensure new subtasks are included
-            await fetchTasks()
-            console.log('✅ TASK CREATION - Task list refreshed')
-          }
-          
+          // New subtasks and comments already bumped the card's counters optimistically
           setSuccess('Task created successfully!')
           setTimeout(() => {
             resetFormState() // Reset form state before closing
@@ -589,29 +591,22 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
         setError(error instanceof Error ? error.message : 'An unexpected error occurred')
       }
     } else if (mode === "edit" && task) {
+      setIsSaving(true)
       try {
-        // Update the task first
-        const result = await updateTask(task.id, taskData)
+        // Fields and assignees go out in one write (only what changed), together with any
+        // inline edits to this task still waiting in the write-behind buffer
+        const result = await updateTask(task.id, taskData, { immediate: true })
         if (result) {
           
-          // Update assignments separately
-          console.log('🔍 ASSIGNMENT UPDATE DEBUG - task.assignees:', task.assignees)
-          console.log('🔍 ASSIGNMENT UPDATE DEBUG - selectedAssignees:', selectedAssignees)
-          console.log('🔍 ASSIGNMENT UPDATE DEBUG - task.assignees.sort():', (task.assignees || []).sort())
-          console.log('🔍 ASSIGNMENT UPDATE DEBUG - selectedAssignees.sort():', selectedAssignees.sort())
-          console.log('🔍 ASSIGNMENT UPDATE DEBUG - comparison result:', JSON.stringify(selectedAssignees.sort()) !== JSON.stringify((task.assignees || []).sort()))
-          
-          if (JSON.stringify(selectedAssignees.sort()) !== JSON.stringify((task.assignees || []).sort())) {
-            console.log('🔄 ASSIGNMENT UPDATE - Starting assignment update...')
-            const assignmentResult = await updateTaskAssignments(task.id, selectedAssignees)
-            if (!assignmentResult) {
-              console.warn('⚠️ Task updated but assignment update failed')
-              setError('Task updated but failed to update assignees. Please try again.')
+          // Insert new / delete removed attachment rows (unchanged ones are not rewritten)
+          if (attachmentsLoaded) {
+            const savedAttachments = await saveTaskAttachments(task.id, attachments, removedAttachmentIds)
+            if (!savedAttachments) {
+              setError('Task updated but failed to save attachments. Please try again.')
               return
             }
-            console.log('✅ ASSIGNMENT UPDATE - Assignments updated successfully')
-          } else {
-            console.log('⏭️ ASSIGNMENT UPDATE - No changes detected, skipping assignment update')
+            setAttachments(savedAttachments)
+            setRemovedAttachmentIds([])
           }
           
           setSuccess('Task updated successfully!')
@@ -624,6 +619,8 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
         }
       } catch (error) {
         setError(error instanceof Error ? error.message : 'An unexpected error occurred')
+      } finally {
+        setIsSaving(false)
       }
     }
   }
@@ -712,11 +709,13 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
         processedLink = 'https://' + processedLink
       }
       
-      const newAttachment = {
+      const newAttachment: TaskAttachment = {
         id: crypto.randomUUID(),
         description: attachmentForm.description.trim(),
         link: processedLink,
+        orderIndex: attachments.length,
         createdAt: new Date().toISOString(),
+        persisted: false,
       }
       setAttachments((prev) => [...prev, newAttachment])
       setAttachmentForm({ description: "", link: "" })
@@ -725,13 +724,17 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
   }
 
   const handleRemoveAttachment = (attachmentId: string) => {
+    const removed = attachments.find((att) => att.id === attachmentId)
+    if (removed?.persisted) {
+      setRemovedAttachmentIds((prev) => [...prev, attachmentId])
+    }
     setAttachments((prev) => prev.filter((att) => att.id !== attachmentId))
   }
 
   return (
     <>
       <Dialog open={open} onOpenChange={onOpenChange}>
-        <DialogContent className="max-w-sm sm:max-w-2xl md:max-w-4xl lg:max-w-6xl xl:max-w-7xl max-h-[95vh] sm:max-h-[90vh] overflow-y-auto p-4 sm:p-6 lg:p-8">
+        <DialogContent className="max-w-sm sm:max-w-2xl md:max-w-4xl lg:max-w-6xl xl:max-w-7xl max-h-[95vh] sm:max-h-[90vh] overflow-y-auto p-4 sm:p-6 lg:p-8" data-testid="task-modal" data-mode={mode} data-details-loaded={mode === "edit" ? detailsLoaded : undefined}>
           <DialogHeader className="pb-4 sm:pb-6">
             <DialogTitle className="text-lg sm:text-xl font-semibold">
               {mode === "create" ? "Create New Task" : "Edit Task"}
@@ -741,7 +744,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
           <form onSubmit={handleSubmit} className="space-y-6 sm:space-y-8">
             {/* Error Display */}
             {error && (
-              <div className="bg-red-50 border border-red-200 rounded-md p-4">
+              <div className="bg-red-50 border border-red-200 rounded-md p-4" data-testid="task-modal-error">
                 <div className="flex">
                   <div className="flex-shrink-0">
                     <AlertTriangle className="h-5 w-5 text-red-400" />
@@ -759,7 +762,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
             )}
 
             {success && (
-              <div className="bg-green-50 border border-green-200 rounded-md p-4">
+              <div className="bg-green-50 border border-green-200 rounded-md p-4" data-testid="task-modal-success">
                 <div className="flex">
                   <div className="flex-shrink-0">
                     <div className="h-5 w-5 text-green-400">✓</div>
@@ -790,6 +793,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                     onChange={(e) => setFormData((prev) => ({ ...prev, title: e.target.value }))}
                     onKeyDown={handleInputKeyDown}
                     placeholder="Enter task title..."
+                    data-testid="task-modal-title"
                     className="h-10 sm:h-12 text-sm sm:text-base"
                     autoComplete="off"
                     required
@@ -807,6 +811,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                     onChange={(e) => setFormData((prev) => ({ ...prev, description: e.target.value }))}
                     onKeyDown={handleTextareaKeyDown}
                     placeholder="Enter task description..."
+                    data-testid="task-modal-description"
                     rows={4}
                     className="resize-none text-sm sm:text-base min-h-[100px] sm:min-h-[120px]"
                     autoComplete="off"
@@ -860,7 +865,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                       value={formData.priority}
                       onValueChange={(value) => setFormData((prev) => ({ ...prev, priority: value }))}
                     >
-                      <SelectTrigger id="task-priority" name="priority" autoComplete="off">
+                      <SelectTrigger id="task-priority" name="priority" autoComplete="off" data-testid="task-modal-priority">
                         <SelectValue placeholder="Select priority..." />
                       </SelectTrigger>
                       <SelectContent>
@@ -908,6 +913,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                           className="w-10 h-10 rounded-full border-2 border-dashed border-muted-foreground/30 hover:border-primary/50 hover:bg-primary/5 transition-colors flex items-center justify-center"
                           title="Add assignee"
                           onClick={() => setShowAssigneeDropdown(true)}
+                          data-testid="task-modal-assignee-add"
                         >
                           <span className="text-lg font-bold text-muted-foreground hover:text-primary">+</span>
                         </button>
@@ -946,6 +952,9 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                                   key={member.id}
                                   type="button"
                                   onClick={() => toggleAssignee(member.id)}
+                                  data-testid="task-modal-assignee-option"
+                                  data-member-id={member.id}
+                                  aria-pressed={isSelected}
                                   className={cn(
                                     "flex items-center gap-3 w-full p-2 rounded-md text-left text-sm transition-colors hover:bg-muted/50",
                                     isSelected ? "bg-primary/10 text-primary" : "text-foreground"
@@ -1067,7 +1076,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                     value={formData.department}
                     onValueChange={(value) => setFormData((prev) => ({ ...prev, department: value }))}
                   >
-                    <SelectTrigger id="task-department" name="department" autoComplete="off">
+                    <SelectTrigger id="task-department" name="department" autoComplete="off" data-testid="task-modal-department">
                       <SelectValue placeholder="Select department..." />
                     </SelectTrigger>
                     <SelectContent>
@@ -1090,6 +1099,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                       type="button"
                       variant="outline"
                       onClick={() => setShowAttachmentPopup(true)}
+                      disabled={mode === "edit" && !attachmentsLoaded}
                       className="w-full h-10 justify-start text-left font-normal text-sm"
                     >
                       <Paperclip className="mr-2 h-4 w-4" />
@@ -1145,6 +1155,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                     type="button"
                     variant="destructive"
                     onClick={() => setShowDeleteConfirm(true)}
+                    data-testid="task-modal-delete"
                     className="px-6 h-10"
                     disabled={isDeleting}
                   >
@@ -1163,16 +1174,17 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                 )}
               </div>
               <div className="flex gap-3">
-                <Button type="button" variant="outline" onClick={() => { setHasInitialized(false); setCommentsLoaded(false); onOpenChange(false) }} className="px-6 h-10">
+                <Button type="button" variant="outline" onClick={() => { setHasInitialized(false); setCommentsLoaded(false); onOpenChange(false) }} className="px-6 h-10" data-testid="task-modal-cancel">
                   Cancel
                 </Button>
                 {(mode === "create" && canCreateTasks) || (mode === "edit" && canEditTasks) ? (
                   <Button 
                     type="submit" 
                     className="bg-blue-600 hover:bg-blue-700 px-6 h-10"
-                    disabled={assignmentLoading}
+                    disabled={isSaving}
+                    data-testid="task-modal-save"
                   >
-                    {assignmentLoading ? (
+                    {isSaving ? (
                       <div className="flex items-center gap-2">
                         <LoadingSpinner size="sm" color="white" />
                         <span>Saving...</span>
@@ -1189,7 +1201,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
       </Dialog>
 
       <Dialog open={showDeleteConfirm} onOpenChange={setShowDeleteConfirm}>
-        <DialogContent className="max-w-md">
+        <DialogContent className="max-w-md" data-testid="task-delete-dialog">
           <DialogHeader>
             <DialogTitle className="flex items-center gap-2 text-destructive">
               <AlertTriangle className="w-5 h-5" />
@@ -1208,6 +1220,7 @@ export function TaskModal({ open, onOpenChange, task, mode = "create" }: TaskMod
                 variant="destructive" 
                 onClick={handleDeleteTask}
                 disabled={isDeleting}
+                data-testid="task-delete-confirm"
               >
                 {isDeleting ? (
                   <div className="flex items-center gap-2">
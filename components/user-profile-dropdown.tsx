@@ -3,7 +3,8 @@
 import { useState, useRef, useEffect } from "react"
 import { ChevronDown, User, Users, Palette, LogOut, Sun, Moon, Monitor, X, UserCheck, Plus, Search, Mail, Shield, Edit, Trash2, Camera, Bell } from "lucide-react"
 import { useTheme } from "next-themes"
-import { PhotoUpload } from "./photo-upload"
+import { PhotoUpload } from "./lazy-components"
+import { AvatarPhoto } from "./avatar-photo"
 import { useTeamMembers } from "@/hooks/use-team-members"
 import { useUsers } from "@/hooks/use-users"
 import { useAuth } from "@/contexts/auth-context"
@@ -803,9 +804,10 @@ export function UserProfileDropdown() {
       >
         <div className="relative">
           {userProfile.userPhoto ? (
-            <img
+            <AvatarPhoto
               src={userProfile.userPhoto}
               alt={userProfile.fullName}
+              size={40}
               className="h-10 w-10 rounded-full object-cover"
             />
           ) : (
@@ -839,9 +841,10 @@ export function UserProfileDropdown() {
           <div className="p-4 border-b border-border">
             <div className="flex items-center space-x-3">
               {userProfile.userPhoto ? (
-                <img
+                <AvatarPhoto
                   src={userProfile.userPhoto}
                   alt={userProfile.fullName}
+                  size={64}
                   className="h-16 w-16 rounded-full object-cover"
                 />
               ) : (
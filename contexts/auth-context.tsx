@@ -2,6 +2,8 @@
 
 import { createContext, useContext, useEffect, useState } from "react"
 import { supabase } from "@/lib/supabase"
+import { clearBoardCache } from "@/lib/board-cache"
+import { writeSessionCookie, clearSessionCookie } from "@/lib/session-cookie"
 
 interface User {
   id: string
@@ -74,6 +76,8 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
         }
 
         const { session } = data
+        // Let server components prefetch for this user on the next navigation
+        writeSessionCookie(session)
         
         console.log('🔄 AuthProvider - Session Retrieval:', {
           hasSession: !!session, 
@@ -190,6 +194,7 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
         if (!isMounted) return
         
         console.log('🔄 AuthProvider - Auth state change:', { event, hasSession: !!session, userId: session?.user?.id })
+        writeSessionCookie(session)
         
         if (session?.user) {
           // Use basic user data from session first
@@ -372,6 +377,9 @@ export function AuthProvider({ children }: { children: React.ReactNode }) {
 
   const signOut = async () => {
     try {
+      // Don't leave this user's board or queued edits on a shared device
+      await clearBoardCache()
+      clearSessionCookie()
       const { error } = await supabase.auth.signOut()
       if (error) {
         console.error('Sign out error:', error)
@@ -1,27 +1,40 @@
 "use client"
 
-import { createContext, useContext, useState, useMemo, useEffect, type ReactNode } from "react"
+import { createContext, useContext, useMemo, useEffect, useLayoutEffect, useRef, useCallback, type ReactNode } from "react"
 import { useTasks, type Task, type Subtask, type Comment } from "@/hooks/use-tasks"
 import { useAuth } from "@/contexts/auth-context"
+import type { BoardChangeSet } from "@/lib/board-sync"
+import {
+  createTaskStore,
+  selectFilteredTasks,
+  selectTask,
+  useStoreSelector,
+  type BoardFilter,
+  type EqualityFn,
+  type TaskStore,
+  type TaskStoreState,
+} from "@/lib/task-store"
+import { attachBoardWorker } from "@/lib/board-worker"
+import type { EditOptions } from "@/lib/write-behind"
+import { idsByAssignee, idsByDepartment, idsByPriority, idsByStatus, tasksFor } from "@/lib/board-index"
 
-interface FilterType {
-  type: "all" | "completed" | "attention"
-}
+type FilterType = BoardFilter
 
-interface TaskContextType {
-  tasks: Task[]
-  filter: FilterType
-  searchQuery: string
+interface TaskActions {
   addTask: (task: Omit<Task, "id">) => Promise<Task | null>
   createTaskWithAssignees: (task: Omit<Task, "id">) => Promise<Task | null>
-  updateTask: (id: string, updates: Partial<Task>) => Promise<Task | null>
+  updateTask: (id: string, updates: Partial<Task>, options?: EditOptions) => Promise<Task | null>
   deleteTask: (id: string) => void
   getTasksByStatus: (status: string) => Task[]
+  getTasksByPriority: (priority: string) => Task[]
+  getTasksByDepartment: (department: string) => Task[]
+  getTasksByAssignee: (teamMemberId: string) => Task[]
   fetchTasks: () => Promise<void>
+  syncBoard: () => Promise<void>
   fetchSubtasks: (taskId: string) => Promise<void>
   fetchTaskDetails: (taskId: string) => Promise<any>
   addSubtask: (subtaskData: any) => Promise<any>
-  updateSubtask: (id: string, updates: any) => Promise<any>
+  updateSubtask: (id: string, updates: any, options?: EditOptions) => Promise<any>
   deleteSubtask: (id: string) => Promise<boolean>
   getTempSubtasks: () => any[]
   clearTempSubtasks: () => void
@@ -33,9 +46,51 @@ interface TaskContextType {
   getFilteredTasks: () => Task[]
 }
 
-const TaskContext = createContext<TaskContextType | undefined>(undefined)
+interface TaskContextType extends TaskActions {
+  tasks: Task[]
+  filter: FilterType
+  searchQuery: string
+}
+
+const ACTION_KEYS = [
+  "addTask",
+  "createTaskWithAssignees",
+  "updateTask",
+  "deleteTask",
+  "getTasksByStatus",
+  "getTasksByPriority",
+  "getTasksByDepartment",
+  "getTasksByAssignee",
+  "fetchTasks",
+  "syncBoard",
+  "fetchSubtasks",
+  "fetchTaskDetails",
+  "addSubtask",
+  "updateSubtask",
+  "deleteSubtask",
+  "getTempSubtasks",
+  "clearTempSubtasks",
+  "addComment",
+  "updateComment",
+  "deleteComment",
+  "setFilter",
+  "setSearchQuery",
+  "getFilteredTasks",
+] as const satisfies readonly (keyof TaskActions)[]
+
+// The context value never changes identity: components read state through selectors
+// (useTaskSelector/useTask) and only re-render when their selected slice changes
+const TaskContext = createContext<{ store: TaskStore; actions: TaskActions } | undefined>(undefined)
+
+const useIsomorphicLayoutEffect = typeof window !== "undefined" ? useLayoutEffect : useEffect
 
-export function TaskProvider({ children }: { children: ReactNode }) {
+export function TaskProvider({
+  children,
+  initialBoard = null,
+}: {
+  children: ReactNode
+  initialBoard?: BoardChangeSet | null // board snapshot prefetched by a server component
+}) {
   // Wait for user authentication before initializing useTasks
   const { user, loading: authLoading } = useAuth()
   
@@ -46,8 +101,8 @@ export function TaskProvider({ children }: { children: ReactNode }) {
     createTaskWithAssignees: supabaseCreateTaskWithAssignees,
     updateTask: supabaseUpdateTask,
     deleteTask: supabaseDeleteTask,
-    getTasksByStatus,
     fetchTasks: supabaseFetchTasks,
+    syncBoard: supabaseSyncBoard,
     fetchSubtasks: supabaseFetchSubtasks,
     fetchTaskDetails: supabaseFetchTaskDetails,
     addSubtask: supabaseAddSubtaskOriginal,
@@ -56,13 +111,24 @@ export function TaskProvider({ children }: { children: ReactNode }) {
     addComment: supabaseAddComment,
     updateComment: supabaseUpdateComment,
     deleteComment: supabaseDeleteComment,
-  } = useTasks()
+  } = useTasks(initialBoard)
 
-  const [filter, setFilter] = useState<FilterType>({ type: "all" })
-  const [searchQuery, setSearchQuery] = useState<string>("")
-  
-  // State to track temporary subtasks during task creation
-  const [tempSubtasks, setTempSubtasks] = useState<any[]>([])
+  // Created once; filter and search live in the store alongside the tasks
+  const storeRef = useRef<TaskStore>()
+  if (!storeRef.current) {
+    storeRef.current = createTaskStore(tasks)
+  }
+  const store = storeRef.current
+
+  useIsomorphicLayoutEffect(() => {
+    store.setState({ tasks })
+  }, [store, tasks])
+
+  // Column slices, search and counts are derived in a Web Worker when available
+  useEffect(() => attachBoardWorker(store), [store])
+
+  // Temporary subtasks during task creation; read imperatively by the create modal
+  const tempSubtasksRef = useRef<any[]>([])
   
   // Task fetching is handled by useTasks hook with proper timeout logic
   useEffect(() => {
@@ -105,14 +171,14 @@ export function TaskProvider({ children }: { children: ReactNode }) {
     }
   }
 
-  const updateTask = async (id: string, updates: Partial<Task>) => {
+  const updateTask = async (id: string, updates: Partial<Task>, options?: EditOptions) => {
     if (!user || authLoading) {
       console.error('❌ TaskContext: User not authenticated, cannot update task')
       throw new Error('User not authenticated')
     }
 
     try {
-      const result = await supabaseUpdateTask(id, updates)
+      const result = await supabaseUpdateTask(id, updates, options)
       return result
     } catch (error) {
       console.error('❌ TaskContext updateTask ERROR:', error)
@@ -134,13 +200,13 @@ export function TaskProvider({ children }: { children: ReactNode }) {
     }
   }
 
-  const updateSubtask = async (id: string, updates: any) => {
+  const updateSubtask = async (id: string, updates: any, options?: EditOptions) => {
     if (!user || authLoading) {
       console.error('❌ TaskContext: User not authenticated, cannot update subtask')
       return null
     }
     try {
-      const result = await supabaseUpdateSubtask(id, updates)
+      const result = await supabaseUpdateSubtask(id, updates, options)
       return result
     } catch (error) {
       console.error('❌ TaskContext: updateSubtask error:', error)
@@ -164,7 +230,7 @@ export function TaskProvider({ children }: { children: ReactNode }) {
       }
       
       // Store in temporary state
-      setTempSubtasks(prev => [...prev, tempSubtask])
+      tempSubtasksRef.current = [...tempSubtasksRef.current, tempSubtask]
       
       console.log('✅ TASK CONTEXT - Created temp subtask:', tempSubtask)
       return tempSubtask
@@ -177,48 +243,33 @@ export function TaskProvider({ children }: { children: ReactNode }) {
   }
 
   // Function to get and clear temp subtasks (for task creation)
-  const getTempSubtasks = () => tempSubtasks
-  const clearTempSubtasks = () => setTempSubtasks([])
-
-  const getFilteredTasks = () => {
-    // Ensure tasks is always an array
-    const safeTasks = tasks || []
-    
-    let filteredTasks = safeTasks
-
-    if (searchQuery.trim()) {
-      filteredTasks = filteredTasks.filter(
-        (task) =>
-          task.title.toLowerCase().includes(searchQuery.toLowerCase()) ||
-          (task.description && task.description.toLowerCase().includes(searchQuery.toLowerCase())) ||
-          task.assignees.some((assigneeId) => {
-            return false
-          }),
-      )
-    }
-
-    switch (filter.type) {
-      case "completed":
-        return filteredTasks.filter((task) => task.status === "Completed")
-      case "attention":
-        return filteredTasks.filter((task) => task.priority === "Critical")
-      case "all":
-      default:
-        return filteredTasks
-    }
+  const getTempSubtasks = () => tempSubtasksRef.current
+  const clearTempSubtasks = () => {
+    tempSubtasksRef.current = []
   }
 
-  // Memoize the context value to prevent unnecessary re-renders
-  const contextValue = useMemo(() => ({
-    tasks,
-    filter,
-    searchQuery,
+  const setFilter = (filter: FilterType) => store.setState({ filter })
+  const setSearchQuery = (searchQuery: string) => store.setState({ searchQuery })
+  const getFilteredTasks = () => selectFilteredTasks(store.getState())
+  // Served from the board index: O(result) instead of a scan per call
+  const getTasksByStatus = (status: string) => tasksFor(store.getState().index, idsByStatus(store.getState().index, status))
+  const getTasksByPriority = (priority: string) => tasksFor(store.getState().index, idsByPriority(store.getState().index, priority))
+  const getTasksByDepartment = (department: string) => tasksFor(store.getState().index, idsByDepartment(store.getState().index, department))
+  const getTasksByAssignee = (teamMemberId: string) => tasksFor(store.getState().index, idsByAssignee(store.getState().index, teamMemberId))
+
+  // Latest implementations, called through stable wrappers so consumers never re-render
+  // (or re-run effects) just because the provider rendered
+  const latest: TaskActions = {
     addTask,
     createTaskWithAssignees,
     updateTask,
     deleteTask,
     getTasksByStatus,
+    getTasksByPriority,
+    getTasksByDepartment,
+    getTasksByAssignee,
     fetchTasks: supabaseFetchTasks,
+    syncBoard: supabaseSyncBoard,
     fetchSubtasks: supabaseFetchSubtasks,
     fetchTaskDetails: supabaseFetchTaskDetails,
     addSubtask,
@@ -232,30 +283,19 @@ export function TaskProvider({ children }: { children: ReactNode }) {
     setFilter,
     setSearchQuery,
     getFilteredTasks,
-  }), [
-    tasks,
-    filter,
-    searchQuery,
-    addTask,
-    createTaskWithAssignees,
-    updateTask,
-    deleteTask,
-    getTasksByStatus,
-    supabaseFetchTasks,
-    supabaseFetchSubtasks,
-    supabaseFetchTaskDetails,
-    addSubtask,
-    updateSubtask,
-    supabaseDeleteSubtask,
-    getTempSubtasks,
-    clearTempSubtasks,
-    supabaseAddComment,
-    supabaseUpdateComment,
-    supabaseDeleteComment,
-    setFilter,
-    setSearchQuery,
-    getFilteredTasks,
-  ])
+  }
+  const latestRef = useRef(latest)
+  useIsomorphicLayoutEffect(() => {
+    latestRef.current = latest
+  })
+
+  const contextValue = useMemo(() => {
+    const actions = {} as Record<keyof TaskActions, (...args: any[]) => any>
+    for (const key of ACTION_KEYS) {
+      actions[key] = (...args: any[]) => (latestRef.current[key] as (...args: any[]) => any)(...args)
+    }
+    return { store, actions: actions as unknown as TaskActions }
+  }, [store])
 
   return (
     <TaskContext.Provider value={contextValue}>
@@ -264,10 +304,54 @@ export function TaskProvider({ children }: { children: ReactNode }) {
   )
 }
 
-export function useTaskContext() {
+function useTaskStoreContext() {
   const context = useContext(TaskContext)
   if (context === undefined) {
     throw new Error("useTaskContext must be used within a TaskProvider")
   }
   return context
 }
+
+/** Stable action functions; never causes a re-render on board updates */
+export function useTaskActions(): TaskActions {
+  return useTaskStoreContext().actions
+}
+
+/**
+ * Subscribes to a slice of the board state
+ * Pass a stable (module-level or memoized) selector; re-renders only when `isEqual` says the slice changed
+ */
+export function useTaskSelector<T>(selector: (state: TaskStoreState) => T, isEqual?: EqualityFn<T>): T {
+  return useStoreSelector(useTaskStoreContext().store, selector, isEqual)
+}
+
+/** One task by id, or null once it has been deleted; re-renders only when that task changes */
+export function useTask(id: string): Task | null {
+  const selector = useCallback((state: TaskStoreState) => selectTask(state, id), [id])
+  return useTaskSelector(selector)
+}
+
+const selectFilter = (state: TaskStoreState) => state.filter
+const selectSearchQuery = (state: TaskStoreState) => state.searchQuery
+
+export function useBoardFilter() {
+  const { setFilter, setSearchQuery } = useTaskActions()
+  return {
+    filter: useTaskSelector(selectFilter),
+    searchQuery: useTaskSelector(selectSearchQuery),
+    setFilter,
+    setSearchQuery,
+  }
+}
+
+const selectWholeState = (state: TaskStoreState) => state
+
+/**
+ * Everything at once: re-renders on every board change
+ * Prefer useTaskActions/useTaskSelector/useTask in components rendered per task
+ */
+export function useTaskContext(): TaskContextType {
+  const { actions } = useTaskStoreContext()
+  const { tasks, filter, searchQuery } = useTaskSelector(selectWholeState)
+  return { ...actions, tasks, filter, searchQuery }
+}
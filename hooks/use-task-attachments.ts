@@ -0,0 +1,137 @@
+import { useState, useCallback } from 'react'
+import { supabase } from '@/lib/supabase'
+import { useAuth } from '@/contexts/auth-context'
+import { ensureUrlProtocol, mapAttachmentRowToUI } from '@/lib/task-mappers'
+
+// UI shape of a row in the task_attachments table
+export interface TaskAttachment {
+  id: string
+  taskId?: string
+  subtaskId?: string
+  description: string
+  link: string
+  fileName?: string
+  mimeType?: string
+  sizeBytes?: number
+  checksum?: string
+  uploadedBy?: string
+  orderIndex: number
+  createdAt: string
+  persisted: boolean // false until the row exists in the database
+}
+
+export const TASK_ATTACHMENT_COLUMNS =
+  'id, task_id, subtask_id, description, url, file_name, mime_type, size_bytes, checksum, uploaded_by, order_index, created_at'
+
+export function useTaskAttachments() {
+  const { user } = useAuth()
+  const [loading, setLoading] = useState(false)
+  const [error, setError] = useState<string | null>(null)
+
+  // Get the full attachment list for a task (only needed when the modal opens)
+  const fetchTaskAttachments = useCallback(async (taskId: string): Promise<TaskAttachment[]> => {
+    try {
+      setLoading(true)
+      setError(null)
+
+      const { data, error: fetchError } = await supabase
+        .from('task_attachments')
+        .select(TASK_ATTACHMENT_COLUMNS)
+        .eq('task_id', taskId)
+        .order('order_index', { ascending: true })
+
+      if (fetchError) {
+        console.error('Error fetching task attachments:', fetchError)
+        setError(fetchError.message)
+        return []
+      }
+
+      return (data || []).map(mapAttachmentRowToUI)
+    } catch (err) {
+      console.error('Error in fetchTaskAttachments:', err)
+      setError('Failed to fetch task attachments')
+      return []
+    } finally {
+      setLoading(false)
+    }
+  }, [])
+
+  // Persist the attachment list for a task: insert new rows, delete the ones the user removed.
+  // Only ids passed in removedIds are deleted, so a list that was never loaded (or failed to
+  // load) can't wipe the task's attachments. Rows that already exist are left untouched.
+  const saveTaskAttachments = useCallback(async (
+    taskId: string,
+    attachments: TaskAttachment[],
+    removedIds: string[] = []
+  ): Promise<TaskAttachment[] | null> => {
+    if (!user) {
+      setError('User must be authenticated to update attachments')
+      return null
+    }
+
+    try {
+      setLoading(true)
+      setError(null)
+
+      const toAdd = attachments
+        .map((att, index) => ({ att, index }))
+        .filter(({ att }) => !att.persisted && att.link.trim() !== '')
+        .map(({ att, index }) => ({
+          task_id: taskId,
+          description: att.description.trim() || `Document ${index + 1}`,
+          url: ensureUrlProtocol(att.link),
+          file_name: att.fileName ?? null,
+          mime_type: att.mimeType ?? null,
+          size_bytes: att.sizeBytes ?? null,
+          checksum: att.checksum ?? null,
+          uploaded_by: user.id,
+          order_index: index,
+        }))
+
+      if (removedIds.length > 0) {
+        const { error: deleteError } = await supabase
+          .from('task_attachments')
+          .delete()
+          .eq('task_id', taskId)
+          .in('id', removedIds)
+
+        if (deleteError) {
+          console.error('❌ Error removing attachments:', deleteError)
+          setError(deleteError.message)
+          return null
+        }
+      }
+
+      let inserted: TaskAttachment[] = []
+      if (toAdd.length > 0) {
+        const { data: insertedRows, error: insertError } = await supabase
+          .from('task_attachments')
+          .insert(toAdd)
+          .select(TASK_ATTACHMENT_COLUMNS)
+
+        if (insertError) {
+          console.error('❌ Error adding attachments:', insertError)
+          setError(insertError.message)
+          return null
+        }
+
+        inserted = (insertedRows || []).map(mapAttachmentRowToUI)
+      }
+
+      return [...attachments.filter(att => att.persisted), ...inserted]
+    } catch (err) {
+      console.error('Error in saveTaskAttachments:', err)
+      setError('Failed to save task attachments')
+      return null
+    } finally {
+      setLoading(false)
+    }
+  }, [user])
+
+  return {
+    loading,
+    error,
+    fetchTaskAttachments,
+    saveTaskAttachments,
+  }
+}
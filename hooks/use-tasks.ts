@@ -1,6 +1,6 @@
 "use client"
 
-import { useState, useEffect, useCallback } from "react"
+import { useState, useEffect, useCallback, useRef } from "react"
 import { supabase } from "@/lib/supabase"
 import { useAuth } from '@/contexts/auth-context'
 import { 
@@ -8,8 +8,27 @@ import {
   validateRequiredFields, 
   normaliseDateToYMD,
   mapStatusToDb,
-  mapPriorityToDb 
+  mapPriorityToDb,
+  mapAttachmentRowToUI,
+  mapBoardCardToUITask,
+  mergeTaskRowIntoUITask,
+  TASK_BOARD_CARD_COLUMNS
 } from '@/lib/task-mappers'
+import { TASK_ATTACHMENT_COLUMNS, type TaskAttachment } from '@/hooks/use-task-attachments'
+import { fetchBoardChanges, tombstoneIds, type BoardChangeSet } from '@/lib/board-sync'
+import {
+  loadCachedBoard,
+  saveCachedBoard,
+  enqueueOutbox,
+  listOutbox,
+  removeOutboxEntry,
+  isOffline,
+  isNetworkError,
+  type OutboxKind
+} from '@/lib/board-cache'
+import { mutationQueue, newClientId, unwrap } from '@/lib/mutation-queue'
+import { writeBehind, type EditOptions } from '@/lib/write-behind'
+import { REALTIME_VIA_GATEWAY, subscribeToChanges } from '@/lib/change-stream'
 
 // Task types matching the current UI structure but mapped to Supabase schema
 export interface Task {
@@ -21,11 +40,19 @@ export interface Task {
   startDate?: string
   dueDate?: string
   assignees: string[] // Array of team member IDs
+  assigneeInitials?: string[] // Pre-computed by the board projection
   subtasks: any[]
   comments: any[]
   department?: string
-  attachments?: any[] // Add attachments field
-  documentLinks?: string[] // Add document links for database storage
+  attachments?: TaskAttachment[] // Full list, loaded on demand via fetchTaskDetails
+  // Counts from the board projection, so cards render without the nested rows
+  subtaskCount?: number
+  completedSubtaskCount?: number
+  commentCount?: number
+  attachmentCount?: number
+  created_by?: string
+  created_at?: string
+  updated_at?: string
 }
 
 // Supabase task interface for database operations
@@ -39,7 +66,6 @@ export interface SupabaseTask {
   due_date?: string
   created_by: string
   department?: string
-  document_links?: string[] // For attachments
   created_at: string
   updated_at: string
   completed_at?: string
@@ -75,7 +101,6 @@ export interface Subtask {
   order_index: number
   startDate?: Date
   endDate?: Date
-  document_links?: string[] // For attachments
   completed_at?: string
   created_at: string
   updated_at: string
@@ -102,7 +127,6 @@ export interface CreateTaskData {
   due_date?: string
   created_by: string
   department?: string | null
-  document_links?: string[] // For attachments
 }
 
 // New interface for creating tasks with multiple assignees
@@ -111,6 +135,7 @@ export interface CreateTaskWithAssigneesData extends Omit<CreateTaskData, 'assig
 }
 
 export interface CreateSubtaskData {
+  id?: string // client-generated; see newClientId
   task_id: string
   title: string
   order_index: number
@@ -121,6 +146,7 @@ export interface CreateSubtaskData {
 }
 
 export interface CreateCommentData {
+  id?: string // client-generated; see newClientId
   task_id?: string
   subtask_id?: string
   author_id: string
@@ -128,15 +154,97 @@ export interface CreateCommentData {
   is_internal?: boolean
 }
 
-export function useTasks() {
+// Edits to one record merged by the write-behind buffer (lib/write-behind.ts)
+interface TaskEdit {
+  base: Task | null // the card before the first edit in the window
+  updates: Partial<Task> // merged, newest value wins
+  optimistic: Task | null // what the board shows after the latest edit
+  updatedAt: string
+}
+
+interface SubtaskEdit {
+  base: Subtask | null
+  updates: Record<string, any>
+  optimistic: Subtask | null
+}
+
+function sortByUpdatedAtDesc(tasks: Task[]): Task[] {
+  return [...tasks].sort((a, b) => (b.updated_at || '').localeCompare(a.updated_at || ''))
+}
+
+// True when two id lists hold the same members, in any order
+function sameIds(a: string[] = [], b: string[] = []): boolean {
+  if (a.length !== b.length) return false
+  const ids = new Set(a)
+  return b.every(id => ids.has(id))
+}
+
+// Replace rows that are already present, append new ones, drop tombstoned ids
+function upsertById<T extends { id: string }>(rows: T[], changed: T[], deleted: Set<string>): T[] {
+  if (changed.length === 0 && deleted.size === 0) return rows
+  const changedById = new Map(changed.map(row => [row.id, row]))
+  const merged = rows
+    .filter(row => !deleted.has(row.id))
+    .map(row => changedById.get(row.id) ?? row)
+  const existingIds = new Set(rows.map(row => row.id))
+  return [...merged, ...changed.filter(row => !existingIds.has(row.id) && !deleted.has(row.id))]
+}
+
+// Swaps one row by id; used by optimistic writes and their rollbacks
+function replaceById<T extends { id: string }>(rows: T[], id: string, next: T): T[] {
+  return rows.map(row => row.id === id ? next : row)
+}
+
+// Shifts a card's aggregated counters while its subtasks/comments are not loaded
+function adjustCardCounts(task: Task, delta: { subtasks?: number; completedSubtasks?: number; comments?: number }): Task {
+  return {
+    ...task,
+    subtaskCount: Math.max(0, (task.subtaskCount ?? 0) + (delta.subtasks ?? 0)),
+    completedSubtaskCount: Math.max(0, (task.completedSubtaskCount ?? 0) + (delta.completedSubtasks ?? 0)),
+    commentCount: Math.max(0, (task.commentCount ?? 0) + (delta.comments ?? 0)),
+  }
+}
+
+function mapSubtaskRowToUI(row: any): Subtask {
+  return {
+    ...row,
+    startDate: row.start_date ? new Date(row.start_date) : undefined,
+    endDate: row.end_date ? new Date(row.end_date) : undefined,
+    assignees: [] // Will be populated separately
+  } as Subtask
+}
+
+export function useTasks(initialBoard: BoardChangeSet | null = null) {
   const { user } = useAuth()
   
-  const [tasks, setTasks] = useState<Task[]>([])
+  // A server-prefetched snapshot renders the board on the first paint, before auth resolves
+  const [tasks, setTasks] = useState<Task[]>(() =>
+    initialBoard ? sortByUpdatedAtDesc(initialBoard.cards.map(mapBoardCardToUITask)) : []
+  )
   const [subtasks, setSubtasks] = useState<Subtask[]>([])
   const [comments, setComments] = useState<Comment[]>([])
-  const [loading, setLoading] = useState(true)
+  const [loading, setLoading] = useState(!initialBoard)
   const [error, setError] = useState<string | null>(null)
   
+  // Offline cache state: change_log watermark of the last sync (null until the first
+  // snapshot), whether the board came from cache/server yet (so an empty initial
+  // state is never persisted), and replay flag
+  const watermarkRef = useRef<number | null>(initialBoard?.watermark ?? null)
+  const hydratedRef = useRef(!!initialBoard)
+  const replayingRef = useRef(false)
+  // True until the server snapshot has been reconciled once auth resolves
+  const serverBoardPendingRef = useRef(!!initialBoard)
+  // Set when the tasks channel drops, so the next SUBSCRIBED status triggers a catch-up
+  const channelDroppedRef = useRef(false)
+  // Latest syncBoard for the realtime status callback (registered once per user)
+  const syncBoardRef = useRef<() => Promise<void>>()
+  // Latest tasks and subtasks for optimistic writes, whose rollbacks run after later renders.
+  // Writes also advance them directly, so edits made before the next render build on each other
+  const tasksRef = useRef(tasks)
+  tasksRef.current = tasks
+  const subtasksRef = useRef(subtasks)
+  subtasksRef.current = subtasks
+  
   // Convert Supabase task to UI task format
   const convertSupabaseToUITask = useCallback((supabaseTask: any): Task => {
     // Use subtasks from the passed parameter if available, otherwise fallback to state
@@ -154,13 +262,8 @@ export function useTasks() {
     // Use assignees from the passed parameter if available
     const taskAssignees = supabaseTask.assignees || []
     
-    // Convert document_links to attachments format for UI
-    const attachments = (supabaseTask.document_links || []).map((link: string, index: number) => ({
-      id: `attachment-${index}`,
-      description: `Document ${index + 1}`,
-      link: link,
-      createdAt: supabaseTask.created_at || new Date().toISOString()
-    }))
+    // Attachments live in task_attachments; rows only carry an embedded count
+    const attachmentCount = supabaseTask.task_attachments?.[0]?.count
     
     return {
       id: supabaseTask.id,
@@ -180,8 +283,8 @@ export function useTasks() {
       })),
       comments: taskComments,
       department: supabaseTask.department,
-      attachments: attachments,
-      documentLinks: supabaseTask.document_links || []
+      attachments: [], // Load on-demand when task is opened
+      attachmentCount: attachmentCount
     }
   }, [subtasks]) // Add dependency array for useCallback
 
@@ -237,8 +340,7 @@ export function useTasks() {
       dueDate: uiTask.dueDate,
       assignees: uiTask.assignees,
       department: uiTask.department,
-      created_by: user.id,
-      documentLinks: uiTask.documentLinks || [] // Pass document links
+      created_by: user.id
     });
     
     // Convert to CreateTaskData format
@@ -250,15 +352,14 @@ export function useTasks() {
       start_date: mappedData.start_date || undefined,
       due_date: mappedData.due_date || undefined,
       created_by: mappedData.created_by || '',
-      department: mappedData.department || null,
-      document_links: mappedData.document_links || undefined
+      department: mappedData.department || null
     };
     
     return supabaseTaskData;
   }
 
   // New function to create task with proper multiple assignee support
-  const createTaskWithAssignees = async (uiTask: Omit<Task, "id">): Promise<Task | null> => {
+  const createTaskWithAssignees = async (uiTask: Omit<Task, "id"> & { id?: string }): Promise<Task | null> => {
     
     if (!user) {
       console.error('❌ No user in createTaskWithAssignees')
@@ -270,19 +371,63 @@ export function useTasks() {
       setLoading(true)
       setError(null)
       
-      // Convert UI task to database format
-      const taskData = convertUIToSupabaseTask(uiTask)
-      
+      // Convert UI task to database format; the id is generated here so the card can be
+      // shown right away and the realtime INSERT echo is recognised as the same task.
+      // An outbox replay passes the id it was queued with.
+      const taskData = { ...convertUIToSupabaseTask(uiTask), id: uiTask.id ?? newClientId() }
+      const now = new Date().toISOString()
+      const optimistic: Task = {
+        ...uiTask,
+        id: taskData.id,
+        assignees: uiTask.assignees || [],
+        subtasks: [],
+        comments: [],
+        subtaskCount: 0,
+        completedSubtaskCount: 0,
+        commentCount: 0,
+        attachmentCount: 0,
+        created_by: user.id,
+        created_at: now,
+        updated_at: now,
+      }
+
+      // Show the card and queue the whole create (task and assignees) when offline
+      const queueCreate = async () => {
+        await queueOfflineEdit('createTaskWithAssignees', { ...uiTask, id: taskData.id })
+        setTasks(prev => prev.some(task => task.id === taskData.id) ? prev : [optimistic, ...prev])
+        return optimistic
+      }
+
+      if (shouldQueueOffline()) {
+        return await queueCreate()
+      }
+
       // Create the task first
-      const { data: newTask, error: insertError } = await supabase
-        .from('tasks')
-        .insert(taskData)
-        .select()
-        .single()
-      
-      if (insertError) {
+      let newTask: any
+      try {
+        newTask = await mutationQueue.run({
+          key: `task:${taskData.id}`,
+          label: 'createTaskWithAssignees',
+          // A replayed create is already on the board
+          apply: () => setTasks(prev => prev.some(task => task.id === taskData.id) ? prev : [optimistic, ...prev]),
+          commit: async () => unwrap(await supabase
+            .from('tasks')
+            .upsert(taskData, { onConflict: 'id' })
+            .select()
+            .single()),
+          reconcile: (row) => setTasks(prev => prev.map(task => task.id === row.id ? mergeTaskRowIntoUITask(task, row) : task)),
+          rollback: (error) => {
+            // Offline failures keep the card; the create goes to the outbox below
+            if (shouldQueueOffline(error)) return
+            setTasks(prev => prev.filter(task => task.id !== taskData.id))
+          },
+        })
+      } catch (insertError: any) {
+        if (shouldQueueOffline(insertError)) {
+          return await queueCreate()
+        }
         console.error('❌ Error creating task:', insertError)
-        setError(`Failed to create task: ${insertError.message}`)
+        setError(`Failed to create task: ${insertError?.message}`)
         return null
       }
       
@@ -323,9 +468,10 @@ export function useTasks() {
         
         console.log('🔍 CREATETASK DEBUG - Assignment data:', assignments)
         
+        // Ignoring existing (task, member) pairs lets an outbox replay run this again safely
         const { error: assignmentError } = await supabase
           .from('task_assignments')
-          .insert(assignments)
+          .upsert(assignments, { onConflict: 'task_id,team_member_id', ignoreDuplicates: true })
         
         if (assignmentError) {
           console.error('❌ Error assigning users to task:', assignmentError)
@@ -346,12 +492,8 @@ export function useTasks() {
       // REMOVED: Subtask creation logic (now handled in TaskModal)
       // The subtasks will be created separately after task creation
       
-      // Convert back to UI format and add to state
-      const uiTaskData = convertSupabaseToUITask(newTask)
-      // Note: Task will be added to state via real-time subscription to prevent duplicates
-      // setTasks(prev => [uiTaskData, ...prev]) // Removed to prevent duplicates
-      
-      return uiTaskData
+      // Already on the board (optimistic row, reconciled by id above)
+      return convertSupabaseToUITask(newTask)
       
     } catch (error) {
       console.error('❌ Unexpected error in createTaskWithAssignees:', error)
@@ -397,24 +539,10 @@ export function useTasks() {
         })
       }, 15000)
 
-      // STAGE 1: Fetch basic task data with essential joins only
-      const { data, error: fetchError } = await supabase
-        .from('tasks')
-        .select(`
-          *,
-          task_assignments!left(
-            team_member_id,
-            team_members!task_assignments_team_member_id_fkey(
-              id,
-              full_name,
-              email,
-              role,
-              department
-            )
-          ),
-          subtasks!left(id, title, completed, order_index, start_date, end_date)
-        `)
-        .order('updated_at', { ascending: false })
+      // Fetch the card-only projection as a snapshot together with its change_log
+      // watermark; details load on demand via fetchTaskDetails
+      const { data: snapshot, error: fetchError } = await fetchBoardChanges(supabase, null)
+      const data = snapshot?.cards
 
       if (fetchError) {
         console.error('❌ Error fetching tasks:', fetchError)
@@ -423,73 +551,10 @@ export function useTasks() {
       }
 
       const basicLoadTime = Date.now() - startTime
-      console.log(`🚀 PERFORMANCE: Basic task data loaded in ${basicLoadTime}ms`)
+      console.log(`🚀 PERFORMANCE: Board cards loaded in ${basicLoadTime}ms`)
 
       if (data && data.length > 0) {
-        // Convert to UI format with lightweight data
-        const uiTasks = data.map((task: any) => {
-          // Extract full team member data from assignments
-          const taskAssignees = (task.task_assignments || [])
-            .map((ta: any) => ta.team_members)
-            .filter(Boolean)
-            .map((tm: any) => ({
-              id: tm.id,
-              name: tm.full_name,
-              email: tm.email,
-              role: tm.role,
-              department: tm.department
-            }))
-
-          // Simple subtasks extraction (basic info only)
-          const taskSubtasks = (task.subtasks || []).map((subtask: any) => ({
-            id: subtask.id,
-            title: subtask.title,
-            status: subtask.completed ? 'Completed' : 'Todo', // Map completed boolean to status string
-            order_index: subtask.order_index,
-            task_id: task.id,
-            description: '', // Load on-demand
-            assignees: [], // Load on-demand
-            comments: [], // Load on-demand
-            priority: 'Medium',
-            startDate: subtask.start_date, // Add missing start_date
-            endDate: subtask.end_date, // Add missing end_date
-            due_date: null,
-            created_at: task.created_at,
-            updated_at: task.updated_at
-          })).sort((a, b) => (a.order_index || 0) - (b.order_index || 0)) // Sort by order_index
-
-          return {
-            id: task.id,
-            title: task.title,
-            description: task.description || '',
-            status: task.status,
-            priority: task.priority,
-            startDate: task.start_date, // Add missing start_date
-            dueDate: task.due_date, // Fix: use dueDate instead of due_date to match Task interface
-            department: task.department,
-            assignees: taskAssignees,
-            subtasks: taskSubtasks,
-            comments: [], // Load on-demand when task is opened
-            attachments: (task.document_links || []).map((link: string, index: number) => {
-              // Ensure the link has a proper protocol
-              let processedLink = link.trim()
-              if (!processedLink.startsWith('http://') && !processedLink.startsWith('https://')) {
-                processedLink = 'https://' + processedLink
-              }
-              
-              return {
-                id: `attachment-${index}`,
-                description: `Document ${index + 1}`,
-                link: processedLink,
-                createdAt: task.created_at || new Date().toISOString()
-              }
-            }),
-            documentLinks: task.document_links || [], // Add documentLinks field for editing
-            created_by: task.created_by,
-            created_at: task.created_at,
-            updated_at: task.updated_at
-          }
-        })
+        const uiTasks = data.map(mapBoardCardToUITask)
         
         const totalTime = Date.now() - startTime
         console.log(`🚀 PERFORMANCE: Total task conversion completed in ${totalTime}ms for ${uiTasks.length} tasks`)
@@ -499,6 +564,8 @@ export function useTasks() {
       } else {
         setTasks([])
       }
+      watermarkRef.current = snapshot?.watermark ?? null
+      hydratedRef.current = true
     } catch (err) {
       console.error('❌ Error in fetchTasks:', err)
       setError('Failed to fetch tasks')
@@ -511,13 +578,134 @@ export function useTasks() {
     }
   }, [user])
 
+  // Apply one page of get_board_changes to local state
+  const applyBoardChanges = useCallback((changes: BoardChangeSet) => {
+    const changedCards = (changes.cards || []).map(mapBoardCardToUITask)
+
+    if (changes.reset) {
+      setTasks(sortByUpdatedAtDesc(changedCards))
+    } else {
+      const deletedTasks = tombstoneIds(changes, 'tasks')
+      setTasks(prev => sortByUpdatedAtDesc(upsertById(prev, changedCards, deletedTasks)))
+
+      const changedSubtasks = (changes.subtasks || []).map(mapSubtaskRowToUI)
+      const deletedSubtasks = tombstoneIds(changes, 'subtasks')
+      setSubtasks(prev => upsertById(
+        prev.filter(subtask => !deletedTasks.has(subtask.task_id)),
+        changedSubtasks,
+        deletedSubtasks
+      ))
+
+      const changedComments = (changes.comments || []) as Comment[]
+      const deletedComments = tombstoneIds(changes, 'comments')
+      setComments(prev => upsertById(prev, changedComments, deletedComments))
+    }
+
+    watermarkRef.current = changes.watermark
+  }, [])
+
+  // Catch up from a change_log watermark: only rows changed since then are downloaded,
+  // deletions arrive as tombstones. Pages until the server reports nothing more.
+  const syncBoardSince = useCallback(async (since: number): Promise<boolean> => {
+    if (!user) return false
+
+    try {
+      const startTime = Date.now()
+      let watermark = since
+      let applied = 0
+
+      while (true) {
+        const { data: changes, error: syncError } = await fetchBoardChanges(supabase, watermark)
+
+        if (syncError || !changes) {
+          console.warn('⚠️ Delta sync failed, keeping current board:', syncError)
+          return false
+        }
+
+        applyBoardChanges(changes)
+        applied += changes.cards.length + (changes.deleted?.length || 0)
+        watermark = changes.watermark
+
+        if (!changes.has_more || changes.reset) break
+      }
+
+      console.log(`🚀 PERFORMANCE: Delta sync applied ${applied} changes up to #${watermark} in ${Date.now() - startTime}ms`)
+      return true
+    } catch (err) {
+      console.warn('⚠️ Delta sync error, keeping current board:', err)
+      return false
+    }
+  }, [user, applyBoardChanges])
+
+  // Bring the board up to date: a delta when we have a watermark, a full load otherwise
+  const syncBoard = useCallback(async () => {
+    if (watermarkRef.current === null || !(await syncBoardSince(watermarkRef.current))) {
+      await fetchTasks()
+    }
+  }, [fetchTasks, syncBoardSince])
+  syncBoardRef.current = syncBoard
+
+  // Show the cached board immediately, then reconcile it; cold-fetch only without a cache
+  const hydrateBoard = useCallback(async () => {
+    if (!user) return
+
+    const cached = await loadCachedBoard(user.id)
+    // Caches written before the change_log existed carry no numeric watermark
+    if (cached && cached.tasks.length > 0 && typeof cached.watermark === 'number') {
+      console.log(`🚀 PERFORMANCE: Hydrated ${cached.tasks.length} tasks from local cache`)
+      setTasks(cached.tasks)
+      watermarkRef.current = cached.watermark
+      hydratedRef.current = true
+      setLoading(false)
+
+      if (!isOffline()) {
+        const synced = await syncBoardSince(cached.watermark)
+        if (!synced) {
+          // Cache may be from an incompatible schema or stale beyond repair
+          await fetchTasks()
+        }
+      }
+      return
+    }
+
+    await fetchTasks()
+  }, [user, fetchTasks, syncBoardSince])
+
+  // Queue an edit made while offline; replayed in order once the connection returns
+  const queueOfflineEdit = async (kind: OutboxKind, payload: any) => {
+    if (!user) return
+    console.warn(`📴 Offline: queued ${kind} for replay`)
+    await enqueueOutbox({ userId: user.id, kind, payload })
+  }
+
+  // Card a comment is counted on: its task, or its subtask's task (task_board_cards counts both)
+  const commentCardId = (comment: { task_id?: string | null; subtask_id?: string | null }): string | null =>
+    comment.task_id ?? subtasksRef.current.find(subtask => subtask.id === comment.subtask_id)?.task_id ?? null
+
+  const adjustCommentCount = (taskId: string | null, delta: number) => {
+    if (!taskId) return
+    setTasks(prev => prev.map(task => task.id === taskId ? adjustCardCounts(task, { comments: delta }) : task))
+  }
+
+  // Whether a failed write should go to the outbox instead of surfacing an error
+  const shouldQueueOffline = (error?: any) =>
+    !!user && !replayingRef.current && (isOffline() || isNetworkError(error))
+
   // NEW: Fetch detailed data for a specific task (on-demand)
   const fetchTaskDetails = useCallback(async (taskId: string) => {
     try {
       console.log('🔍 PERFORMANCE: Loading detailed data for task:', taskId)
       
       // Fetch detailed subtasks, comments, and assignments for this specific task
-      const [subtasksResult, commentsResult, taskAssignmentsResult] = await Promise.all([
+      const [taskResult, subtasksResult, commentsResult, taskAssignmentsResult, attachmentsResult] = await Promise.all([
+        // Task fields that the board projection leaves out
+        supabase
+          .from('tasks')
+          .select('id, description, created_by, created_at, updated_at')
+          .eq('id', taskId)
+          .single(),
+
+
         // Detailed subtasks with assignments
         supabase
           .from('subtasks')
@@ -560,7 +748,14 @@ export function useTasks() {
               department
             )
           `)
+          .eq('task_id', taskId),
+
+        // Full attachment list with metadata
+        supabase
+          .from('task_attachments')
+          .select(TASK_ATTACHMENT_COLUMNS)
           .eq('task_id', taskId)
+          .order('order_index', { ascending: true })
       ])
 
       // Now fetch subtask comments separately to avoid complex OR queries
@@ -642,16 +837,20 @@ export function useTasks() {
       const allComments = [...transformedTaskComments, ...subtaskComments]
 
       return {
+        task: taskResult.data,
         subtasks: transformedSubtasks,
         comments: allComments,
         taskAssignments: transformedTaskAssignments,
+        attachments: (attachmentsResult.data || []).map(mapAttachmentRowToUI),
         subtasksError: subtasksResult.error,
         commentsError: commentsResult.error,
-        taskAssignmentsError: taskAssignmentsResult.error
+        taskAssignmentsError: taskAssignmentsResult.error,
+        attachmentsError: attachmentsResult.error,
+        taskError: taskResult.error
       }
     } catch (error) {
       console.error('❌ Error fetching task details:', error)
-      return { subtasks: [], comments: [], taskAssignments: [], subtasksError: error, commentsError: null, taskAssignmentsError: null }
+      return { task: null, subtasks: [], comments: [], taskAssignments: [], attachments: [], subtasksError: error, commentsError: null, taskAssignmentsError: null, attachmentsError: error, taskError: null }
     }
   }, [])
 
@@ -789,7 +988,7 @@ export function useTasks() {
   }, [])
 
   // Add a new task
-  const addTask = async (taskData: Omit<Task, "id">): Promise<Task | null> => {
+  const addTask = async (taskData: Omit<Task, "id"> & { id?: string }): Promise<Task | null> => {
     try {
       // Check authentication status
       if (!user) {
@@ -801,7 +1000,8 @@ export function useTasks() {
       // Check Supabase session
       const { data: { session }, error: sessionError } = await supabase.auth.getSession()
       
-      if (!session) {
+      // Offline an expired session can't be refreshed; the outbox replay checks it again
+      if (!session && !shouldQueueOffline()) {
         console.error('❌ No Supabase session found')
         setError('No active session found')
         return null
@@ -830,11 +1030,58 @@ export function useTasks() {
         return null
       }
 
-      const { data, error: insertError } = await supabase
-        .from('tasks')
-        .insert([supabaseTaskData])
-        .select('id, title, description, priority, status, start_date, due_date, created_by, department, created_at, updated_at')
-        .single()
+      // An outbox replay passes the id it was queued with, so the upsert below stays idempotent
+      const row = { ...supabaseTaskData, id: taskData.id ?? newClientId() }
+      const now = new Date().toISOString()
+      const optimistic: Task = {
+        ...taskData,
+        id: row.id,
+        assignees: taskData.assignees || [],
+        subtasks: [],
+        comments: [],
+        created_by: user.id,
+        created_at: now,
+        updated_at: now,
+      }
+
+      // Show the card and queue the insert when offline
+      const queueAdd = async () => {
+        await queueOfflineEdit('addTask', { ...taskData, id: row.id })
+        setTasks(prev => prev.some(task => task.id === row.id) ? prev : [optimistic, ...prev])
+        return optimistic
+      }
+
+      if (shouldQueueOffline()) {
+        return await queueAdd()
+      }
+
+      let data: any = null
+      let insertError: any = null
+      try {
+        data = await mutationQueue.run({
+          key: `task:${row.id}`,
+          label: 'addTask',
+          // A replayed insert is already on the board
+          apply: () => setTasks(prev => prev.some(task => task.id === row.id) ? prev : [optimistic, ...prev]),
+          commit: async () => unwrap(await supabase
+            .from('tasks')
+            .upsert([row], { onConflict: 'id' })
+            .select('id, title, description, priority, status, start_date, due_date, created_by, department, created_at, updated_at')
+            .single()),
+          reconcile: (saved) => setTasks(prev => prev.map(task => task.id === saved.id ? mergeTaskRowIntoUITask(task, saved) : task)),
+          rollback: (error) => {
+            // Offline failures keep the card; the insert goes to the outbox below
+            if (shouldQueueOffline(error)) return
+            setTasks(prev => prev.filter(task => task.id !== row.id))
+          },
+        })
+      } catch (error) {
+        insertError = error
+      }
+
+      if (insertError && shouldQueueOffline(insertError)) {
+        return await queueAdd()
+      }
 
       if (insertError) {
         console.error('❌ Error adding task:', insertError)
@@ -885,12 +1132,8 @@ export function useTasks() {
         return null;
       }
 
-      // Convert back to UI format and add to state
-      const newUITask = convertSupabaseToUITask(data)
-      
-      setTasks(prev => [newUITask, ...prev])
-      
-      return newUITask
+      // Already on the board (optimistic row, reconciled by id above)
+      return convertSupabaseToUITask(data)
     } catch (err) {
       console.error('❌ Error in addTask:', err)
       setError('Failed to add task')
@@ -899,201 +1142,351 @@ export function useTasks() {
   }
 
   // Update an existing task
-  const updateTask = async (id: string, updates: Partial<Task>): Promise<Task | null> => {
-    try {
-      setError(null)
+  // Edits are applied at once and written behind: edits to one task within a short window are
+  // merged and sent as a single apply_task_edit call carrying only what differs from the row
+  // as it was before the first of them (migration 055)
+  const updateTask = async (id: string, updates: Partial<Task>, options: EditOptions = {}): Promise<Task | null> => {
+    // Apply locally and queue when offline
+    const queueUpdate = async () => {
+      await queueOfflineEdit('updateTask', { id, updates })
+      // From the latest row, not this render's: several offline edits can land before a re-render
+      const existing = tasksRef.current.find(task => task.id === id)
+      if (!existing) return null
+      const updatedTask = { ...existing, ...updates }
+      tasksRef.current = replaceById(tasksRef.current, id, updatedTask)
+      setTasks(prev => replaceById(prev, id, updatedTask))
+      return updatedTask
+    }
 
-      // Convert UI updates to Supabase format
-      const supabaseUpdates: Partial<SupabaseTask> = {}
-      if (updates.title !== undefined) supabaseUpdates.title = updates.title
-      if (updates.description !== undefined) supabaseUpdates.description = updates.description
-      if (updates.priority !== undefined) supabaseUpdates.priority = updates.priority
-      if (updates.status !== undefined) supabaseUpdates.status = updates.status
-      if (updates.startDate !== undefined) supabaseUpdates.start_date = updates.startDate || undefined
-      if (updates.dueDate !== undefined) supabaseUpdates.due_date = updates.dueDate || undefined
-      if (updates.department !== undefined) supabaseUpdates.department = updates.department
-      if (updates.documentLinks !== undefined) supabaseUpdates.document_links = updates.documentLinks
-
-      // Handle assignee updates separately using the new assignment system
-      let assigneeUpdates: { assignee_ids: string[] } | null = null
-      if (updates.assignees !== undefined) {
-        assigneeUpdates = { assignee_ids: updates.assignees }
-      }
+    if (shouldQueueOffline()) {
+      return queueUpdate()
+    }
 
-      const { data, error: updateError } = await supabase
-        .from('tasks')
-        .update({ ...supabaseUpdates, updated_at: new Date().toISOString() })
-        .eq('id', id)
-        .select()
-        .single()
-
-      if (updateError) {
-        console.error('Error updating task:', updateError)
-        setError(updateError.message)
-        return null
-      }
+    // Shown on the board immediately; the write is confirmed (or rolled back) by the queue
+    const previous = tasksRef.current.find(task => task.id === id) ?? null
+    const updatedAt = updates.updated_at ?? new Date().toISOString()
+    const optimistic = previous ? { ...previous, ...updates, updated_at: updatedAt } : null
+    if (optimistic) {
+      tasksRef.current = replaceById(tasksRef.current, id, optimistic)
+      setTasks(prev => sortByUpdatedAtDesc(replaceById(prev, id, optimistic)))
+    }
 
-      // Handle assignee updates if needed
-      if (assigneeUpdates && user) {
-        try {
-          // Get current assignments
-          const { data: currentAssignments, error: fetchError } = await supabase
-            .from('task_assignments')
-            .select('team_member_id') // Changed from user_id to team_member_id
-            .eq('task_id', id)
-
-          if (fetchError) {
-            console.warn('Failed to fetch current assignments:', fetchError)
-          } else {
-            const currentAssigneeIds = currentAssignments?.map(a => a.team_member_id) || [] // Changed from user_id
-            const newAssigneeIds = assigneeUpdates.assignee_ids
-
-            // Find assignees to add
-            const assigneesToAdd = newAssigneeIds.filter(id => !currentAssigneeIds.includes(id))
-            
-            // Find assignees to remove
-            const assigneesToRemove = currentAssigneeIds.filter(id => !newAssigneeIds.includes(id))
-
-            // Remove old assignments
-            if (assigneesToRemove.length > 0) {
-              const { error: deleteError } = await supabase
-                .from('task_assignments')
-                .delete()
-                .eq('task_id', id)
-                .in('team_member_id', assigneesToRemove) // Changed from user_id
-
-              if (deleteError) {
-                console.warn('Failed to remove old assignments:', deleteError)
-              }
-            }
+    const flush = async ({ base, updates, optimistic, updatedAt }: TaskEdit): Promise<Task | null> => {
+      // Convert UI updates to Supabase format, keeping only fields that differ from `base`
+      const changed = (field: keyof Task) => updates[field] !== undefined && (!base || updates[field] !== base[field])
+      const changes: Partial<SupabaseTask> = {}
+      if (changed('title')) changes.title = updates.title
+      if (changed('description')) changes.description = updates.description
+      if (changed('priority')) changes.priority = updates.priority
+      if (changed('status')) changes.status = updates.status
+      if (changed('startDate')) changes.start_date = updates.startDate || undefined
+      if (changed('dueDate')) changes.due_date = updates.dueDate || undefined
+      if (changed('department')) changes.department = updates.department
+
+      // Assignees are sent as the full set; the function inserts/deletes only the difference
+      const assignees = updates.assignees !== undefined && !(base && sameIds(base.assignees, updates.assignees))
+        ? updates.assignees
+        : null
+
+      // updated_at drives board order: an explicit one (drag and drop) is always written
+      const touched = 'updated_at' in updates
+      if (Object.keys(changes).length === 0 && !assignees && !touched) {
+        // Edited back to where it started; nothing to send
+        if (base) setTasks(prev => sortByUpdatedAtDesc(prev.map(task => task === optimistic ? { ...task, updated_at: base.updated_at } : task)))
+        return tasksRef.current.find(task => task.id === id) ?? null
+      }
 
-            // Add new assignments
-            if (assigneesToAdd.length > 0) {
-              const newAssignments = assigneesToAdd.map(userId => ({
-                task_id: id,
-                team_member_id: userId, // Changed from user_id to team_member_id
-                assigned_at: new Date().toISOString(),
-                assigned_by: user.id,
-                role: 'assignee'
-              }))
-
-              const { error: insertError } = await supabase
-                .from('task_assignments')
-                .insert(newAssignments)
-
-              if (insertError) {
-                console.warn('Failed to add new assignments:', insertError)
-              }
-            }
+      const { task: data } = await mutationQueue.run({
+        key: `task:${id}`,
+        label: 'updateTask',
+        // The server gets the same updated_at that was shown optimistically
+        commit: async () => unwrap(await supabase.rpc('apply_task_edit', {
+          p_task_id: id,
+          p_changes: { ...changes, updated_at: updatedAt },
+          p_assignees: assignees,
+        })) as { task: any; card: any | null; changed: boolean },
+        // Server row wins, matched by id; assignee changes come back with the refreshed card
+        reconcile: ({ task: data, card }) => setTasks(prev => prev.map(task => {
+          if (task.id !== id) return task
+          const merged = card
+            ? { ...task, ...mapBoardCardToUITask(card), description: data.description ?? task.description }
+            : mergeTaskRowIntoUITask(task, data)
+          return updates.attachmentCount !== undefined ? { ...merged, attachmentCount: updates.attachmentCount } : merged
+        })),
+        rollback: (error) => {
+          // Offline failures keep the optimistic row; the edit goes to the outbox below
+          if (!base || shouldQueueOffline(error)) return
+          setTasks(prev => sortByUpdatedAtDesc(prev.map(task => task === optimistic ? base : task)))
+          if (!tasksRef.current.includes(optimistic!)) {
+            // A newer change landed on top of the failed one; re-read what the server has
+            syncBoardRef.current?.()
           }
-        } catch (error) {
-          console.warn('Error updating assignments:', error)
-        }
-      }
+        },
+      })
 
-      // Convert back to UI format and update state
-      const updatedUITask = convertSupabaseToUITask(data)
-      setTasks(prev => prev.map(task => task.id === id ? updatedUITask : task))
-      return updatedUITask
-    } catch (err) {
+      return convertSupabaseToUITask(data)
+    }
+
+    try {
+      setError(null)
+
+      return await writeBehind.schedule<TaskEdit, Task | null>(
+        `task:${id}`,
+        // A replayed offline edit is already on the local row, so it is sent without diffing
+        { base: replayingRef.current ? null : previous, updates, optimistic, updatedAt },
+        (pending, next) => ({
+          base: pending.base,
+          updates: { ...pending.updates, ...next.updates },
+          optimistic: next.optimistic,
+          updatedAt: next.updatedAt,
+        }),
+        flush,
+        options.immediate,
+      )
+    } catch (err: any) {
+      if (shouldQueueOffline(err)) {
+        return queueUpdate()
+      }
       console.error('Error in updateTask:', err)
-      setError('Failed to update task')
+      setError(err?.message || 'Failed to update task')
       return null
     }
   }
 
   // Delete a task
   const deleteTask = async (id: string): Promise<boolean> => {
-    try {
-      setError(null)
+    // Remove locally and queue when offline
+    const queueDelete = async () => {
+      await queueOfflineEdit('deleteTask', { id })
+      setTasks(prev => prev.filter(task => task.id !== id))
+      return true
+    }
 
-      const { error: deleteError } = await supabase
-        .from('tasks')
-        .delete()
-        .eq('id', id)
+    if (shouldQueueOffline()) {
+      return queueDelete()
+    }
 
-      if (deleteError) {
-        console.error('Error deleting task:', deleteError)
-        setError(deleteError.message)
-        return false
-      }
+    const previous = tasksRef.current.find(task => task.id === id) ?? null
 
-      setTasks(prev => prev.filter(task => task.id !== id))
+    try {
+      setError(null)
+
+      // Edits still waiting in the write-behind buffer go first, so they cannot land after the delete
+      await writeBehind.flush(`task:${id}`)
+      await mutationQueue.run({
+        key: `task:${id}`,
+        label: 'deleteTask',
+        apply: () => setTasks(prev => prev.filter(task => task.id !== id)),
+        commit: async () => unwrap(await supabase
+          .from('tasks')
+          .delete()
+          .eq('id', id)),
+        rollback: (error) => {
+          if (!previous || shouldQueueOffline(error)) return
+          setTasks(prev => prev.some(task => task.id === id) ? prev : sortByUpdatedAtDesc([previous, ...prev]))
+        },
+      })
       return true
-    } catch (err) {
-      console.error('Error in deleteTask:', err)
-      setError('Failed to delete task')
+    } catch (err: any) {
+      if (shouldQueueOffline(err)) {
+        return queueDelete()
+      }
+      console.error('Error deleting task:', err)
+      setError(err?.message || 'Failed to delete task')
       return false
     }
   }
 
   // Add a subtask
   const addSubtask = async (subtaskData: CreateSubtaskData): Promise<Subtask | null> => {
-    try {
-      console.log('💾 USE-TASKS - addSubtask called with data:', subtaskData)
-      
-      const { data, error: insertError } = await supabase
-        .from('subtasks')
-        .insert([subtaskData])
-        .select()
-        .single()
+    console.log('💾 USE-TASKS - addSubtask called with data:', subtaskData)
+
+    // Client-generated id: the optimistic row and the server row are the same record.
+    // An outbox replay passes the id it was queued with.
+    const now = new Date().toISOString()
+    const row = { ...subtaskData, id: subtaskData.id ?? newClientId() }
+    const optimistic = { ...row, completed: row.completed ?? false, created_at: now, updated_at: now, assignees: [] } as Subtask
+    const countDelta = { subtasks: 1, completedSubtasks: optimistic.completed ? 1 : 0 }
+
+    // Show the subtask (and count it on the card) once, whether it is queued or replayed
+    const showSubtask = () => {
+      if (subtasksRef.current.some(subtask => subtask.id === row.id)) return
+      subtasksRef.current = [...subtasksRef.current, optimistic]
+      setSubtasks(prev => prev.some(subtask => subtask.id === row.id) ? prev : [...prev, optimistic])
+      setTasks(prev => prev.map(task => task.id === row.task_id ? adjustCardCounts(task, countDelta) : task))
+    }
 
-      console.log('📡 USE-TASKS - Supabase response:', { data, error: insertError })
+    // Keep the subtask locally and queue the insert when offline
+    const queueSubtask = async () => {
+      await queueOfflineEdit('addSubtask', row)
+      showSubtask()
+      return optimistic
+    }
 
-      if (insertError) {
-        console.error('❌ USE-TASKS - Error adding subtask:', insertError)
-        return null
-      }
+    if (shouldQueueOffline()) {
+      return queueSubtask()
+    }
+
+    try {
+      const data = await mutationQueue.run({
+        key: `subtask:${row.id}`,
+        label: 'addSubtask',
+        apply: showSubtask,
+        // Upsert on the client id keeps a retried insert from creating a duplicate
+        commit: async () => unwrap(await supabase
+          .from('subtasks')
+          .upsert([row], { onConflict: 'id' })
+          .select()
+          .single()),
+        reconcile: (data) => setSubtasks(prev => replaceById(prev, row.id, data)),
+        rollback: (error) => {
+          // Offline failures keep the subtask; the insert goes to the outbox below
+          if (shouldQueueOffline(error)) return
+          subtasksRef.current = subtasksRef.current.filter(subtask => subtask.id !== row.id)
+          setSubtasks(prev => prev.filter(subtask => subtask.id !== row.id))
+          setTasks(prev => prev.map(task => task.id === row.task_id
+            ? adjustCardCounts(task, { subtasks: -1, completedSubtasks: -countDelta.completedSubtasks })
+            : task))
+        },
+      })
 
       console.log('✅ USE-TASKS - Subtask added successfully:', data)
-      setSubtasks(prev => [...prev, data])
       return data
     } catch (err) {
+      if (shouldQueueOffline(err)) {
+        return queueSubtask()
+      }
       console.error('❌ USE-TASKS - Error in addSubtask:', err)
       return null
     }
   }
 
   // Update a subtask
-  const updateSubtask = async (id: string, updates: Partial<Subtask>): Promise<Subtask | null> => {
-    try {
-      const { data, error: updateError } = await supabase
-        .from('subtasks')
-        .update({ ...updates, updated_at: new Date().toISOString() })
-        .eq('id', id)
-        .select()
-        .single()
+  // Written behind like updateTask: completion toggles, date picks and assignee clicks on one
+  // subtask are merged and sent as a single apply_subtask_edit call. `updates` holds subtasks
+  // columns plus, optionally, `assignees` (the full set of team member ids).
+  const updateSubtask = async (id: string, updates: Partial<Subtask> & Record<string, any>, options: EditOptions = {}): Promise<Subtask | null> => {
+    const previous = subtasksRef.current.find(subtask => subtask.id === id) ?? null
+    const { assignees: _assignees, ...columns } = updates
+    const updatedAt = new Date().toISOString()
+    const optimistic = previous ? { ...previous, ...columns, updated_at: updatedAt } : null
+    // Completing a subtask moves the card's progress bar right away
+    const completedDelta = previous && updates.completed !== undefined && updates.completed !== previous.completed
+      ? (updates.completed ? 1 : -1)
+      : 0
+    const taskId = previous?.task_id
+
+    if (optimistic) {
+      subtasksRef.current = replaceById(subtasksRef.current, id, optimistic)
+      setSubtasks(prev => replaceById(prev, id, optimistic))
+    }
+    if (completedDelta) {
+      setTasks(prev => prev.map(task => task.id === taskId ? adjustCardCounts(task, { completedSubtasks: completedDelta }) : task))
+    }
 
-      if (updateError) {
-        console.error('Error updating subtask:', updateError)
-        return null
+    // The edit is already applied above; queue it when offline
+    const queueUpdate = async () => {
+      await queueOfflineEdit('updateSubtask', { id, updates })
+      return optimistic
+    }
+
+    if (shouldQueueOffline()) {
+      return queueUpdate()
+    }
+
+    const flush = async ({ base, updates, optimistic }: SubtaskEdit): Promise<Subtask | null> => {
+      const { assignees, updated_at: _updatedAt, ...columns } = updates
+      // Only columns that differ from the row before the first edit are sent
+      const changes: Record<string, any> = {}
+      for (const [column, value] of Object.entries(columns)) {
+        if (!base || value !== (base as Record<string, any>)[column]) changes[column] = value
       }
+      if (base && changes.completed === undefined) delete changes.completed_at
 
-      setSubtasks(prev => prev.map(subtask => subtask.id === id ? data : subtask))
+      if (Object.keys(changes).length === 0 && assignees === undefined) {
+        // Toggled back to where it started; nothing to send
+        return optimistic
+      }
+
+      // Undoes the net effect of every edit in this write on the card's progress bar
+      const netCompletedDelta = base && optimistic && optimistic.completed !== base.completed
+        ? (optimistic.completed ? 1 : -1)
+        : 0
+
+      const { subtask: data } = await mutationQueue.run({
+        key: `subtask:${id}`,
+        label: 'updateSubtask',
+        commit: async () => unwrap(await supabase.rpc('apply_subtask_edit', {
+          p_subtask_id: id,
+          p_changes: Object.keys(changes).length > 0 ? { ...changes, updated_at: updatedAt } : {},
+          p_assignees: assignees ?? null,
+        })) as { subtask: Subtask; changed: boolean },
+        reconcile: ({ subtask: data }) => setSubtasks(prev => prev.map(subtask => subtask.id === id ? { ...subtask, ...data } : subtask)),
+        rollback: (error) => {
+          // Offline failures keep the optimistic row; the edit goes to the outbox below
+          if (shouldQueueOffline(error)) return
+          if (base) setSubtasks(prev => prev.map(subtask => subtask === optimistic ? base : subtask))
+          if (netCompletedDelta) {
+            setTasks(prev => prev.map(task => task.id === taskId ? adjustCardCounts(task, { completedSubtasks: -netCompletedDelta }) : task))
+          }
+        },
+      })
       return data
+    }
+
+    try {
+      return await writeBehind.schedule<SubtaskEdit, Subtask | null>(
+        `subtask:${id}`,
+        // A replayed offline edit is already on the local row, so it is sent without diffing
+        { base: replayingRef.current ? null : previous, updates, optimistic },
+        (pending, next) => ({
+          base: pending.base,
+          updates: { ...pending.updates, ...next.updates },
+          optimistic: next.optimistic,
+        }),
+        flush,
+        options.immediate,
+      )
     } catch (err) {
-      console.error('Error in updateSubtask:', err)
+      if (shouldQueueOffline(err)) {
+        return queueUpdate()
+      }
+      console.error('Error updating subtask:', err)
       return null
     }
   }
 
   // Delete a subtask
   const deleteSubtask = async (id: string): Promise<boolean> => {
-    try {
-      const { error: deleteError } = await supabase
-        .from('subtasks')
-        .delete()
-        .eq('id', id)
+    const previous = subtasksRef.current.find(subtask => subtask.id === id) ?? null
+    const countDelta = { subtasks: -1, completedSubtasks: previous?.completed ? -1 : 0 }
 
-      if (deleteError) {
-        console.error('Error deleting subtask:', deleteError)
-        return false
-      }
-
-      setSubtasks(prev => prev.filter(subtask => subtask.id !== id))
+    try {
+      await writeBehind.flush(`subtask:${id}`)
+      await mutationQueue.run({
+        key: `subtask:${id}`,
+        label: 'deleteSubtask',
+        apply: () => {
+          setSubtasks(prev => prev.filter(subtask => subtask.id !== id))
+          if (previous) {
+            setTasks(prev => prev.map(task => task.id === previous.task_id ? adjustCardCounts(task, countDelta) : task))
+          }
+        },
+        commit: async () => unwrap(await supabase
+          .from('subtasks')
+          .delete()
+          .eq('id', id)),
+        rollback: () => {
+          if (!previous) return
+          setSubtasks(prev => prev.some(subtask => subtask.id === id) ? prev : [...prev, previous])
+          setTasks(prev => prev.map(task => task.id === previous.task_id
+            ? adjustCardCounts(task, { subtasks: 1, completedSubtasks: -countDelta.completedSubtasks })
+            : task))
+        },
+      })
       return true
     } catch (err) {
-      console.error('Error in deleteSubtask:', err)
+      console.error('Error deleting subtask:', err)
       return false
     }
   }
@@ -1113,74 +1506,121 @@ export function useTasks() {
       isInternal: commentData.is_internal
     })
     
+    // The id is fixed on the client, so a retry, an outbox replay and the realtime echo all
+    // refer to the same row as the optimistic comment
+    const row = { ...commentData, id: commentData.id ?? newClientId(), is_internal: commentData.is_internal ?? false }
+    const now = new Date().toISOString()
+    const optimistic = { ...row, created_at: now, updated_at: now } as Comment
+    const cardId = commentCardId(row)
+
+    // Keep the comment locally and queue it when offline
+    const queueComment = async () => {
+      await queueOfflineEdit('addComment', row)
+      setComments(prev => prev.some(comment => comment.id === row.id) ? prev : [...prev, optimistic])
+      return optimistic
+    }
+
+    if (shouldQueueOffline()) {
+      adjustCommentCount(cardId, 1)
+      return queueComment()
+    }
+
     try {
       console.log('💾 Inserting comment into database...')
-      const { data, error: insertError } = await supabase
-        .from('comments')
-        .insert([commentData])
-        .select()
-        .single()
-
-      if (insertError) {
-        console.error('❌ Error adding comment:', insertError)
-        console.error('❌ Error code:', insertError.code)
-        console.error('❌ Error message:', insertError.message)
-        console.error('❌ Error details:', insertError.details)
-        console.error('❌ Error hint:', insertError.hint)
-        return null
-      }
+      const data = await mutationQueue.run({
+        key: `comment:${row.id}`,
+        label: 'addComment',
+        apply: () => {
+          // A replayed comment is already shown and counted
+          if (replayingRef.current) {
+            setComments(prev => prev.some(comment => comment.id === row.id) ? prev : [...prev, optimistic])
+            return
+          }
+          setComments(prev => [...prev, optimistic])
+          adjustCommentCount(cardId, 1)
+        },
+        commit: async () => unwrap(await supabase
+          .from('comments')
+          .upsert([row], { onConflict: 'id' })
+          .select()
+          .single()),
+        reconcile: (data) => setComments(prev => replaceById(prev, row.id, data)),
+        rollback: (error) => {
+          if (shouldQueueOffline(error)) return
+          setComments(prev => prev.filter(comment => comment.id !== row.id))
+          adjustCommentCount(cardId, -1)
+        },
+      })
 
       console.log('✅ Comment inserted successfully:', data)
-      setComments(prev => [...prev, data])
       return data
-    } catch (err) {
-      console.error('❌ Error in addComment:', err)
-      console.error('❌ Error type:', typeof err)
-      console.error('❌ Error toString:', err?.toString())
+    } catch (err: any) {
+      if (shouldQueueOffline(err)) {
+        return queueComment()
+      }
+      console.error('❌ Error adding comment:', err)
+      console.error('❌ Error code:', err?.code)
+      console.error('❌ Error message:', err?.message)
       return null
     }
   }
 
   // Update a comment
   const updateComment = async (id: string, updates: Partial<Comment>): Promise<Comment | null> => {
-    try {
-      const { data, error: updateError } = await supabase
-        .from('comments')
-        .update({ ...updates, updated_at: new Date().toISOString() })
-        .eq('id', id)
-        .select()
-        .single()
-
-      if (updateError) {
-        console.error('Error updating comment:', updateError)
-        return null
-      }
+    const previous = comments.find(comment => comment.id === id) ?? null
+    const updatedAt = new Date().toISOString()
+    const optimistic = previous ? { ...previous, ...updates, updated_at: updatedAt } : null
 
-      setComments(prev => prev.map(comment => comment.id === id ? data : comment))
-      return data
+    try {
+      return await mutationQueue.run({
+        key: `comment:${id}`,
+        label: 'updateComment',
+        apply: () => {
+          if (optimistic) setComments(prev => replaceById(prev, id, optimistic))
+        },
+        commit: async () => unwrap(await supabase
+          .from('comments')
+          .update({ ...updates, updated_at: updatedAt })
+          .eq('id', id)
+          .select()
+          .single()),
+        reconcile: (data) => setComments(prev => replaceById(prev, id, data)),
+        rollback: () => {
+          if (previous) setComments(prev => prev.map(comment => comment === optimistic ? previous : comment))
+        },
+      })
     } catch (err) {
-      console.error('Error in updateComment:', err)
+      console.error('Error updating comment:', err)
       return null
     }
   }
 
   // Delete a comment
   const deleteComment = async (id: string): Promise<boolean> => {
-    try {
-      const { error: deleteError } = await supabase
-        .from('comments')
-        .delete()
-        .eq('id', id)
-
-      if (deleteError) {
-        console.error('Error deleting comment:', deleteError)
-        return false
-      }
+    const previous = comments.find(comment => comment.id === id) ?? null
+    const cardId = previous ? commentCardId(previous) : null
 
-      setComments(prev => prev.filter(comment => comment.id !== id))
+    try {
+      await mutationQueue.run({
+        key: `comment:${id}`,
+        label: 'deleteComment',
+        apply: () => {
+          setComments(prev => prev.filter(comment => comment.id !== id))
+          adjustCommentCount(cardId, -1)
+        },
+        commit: async () => unwrap(await supabase
+          .from('comments')
+          .delete()
+          .eq('id', id)),
+        rollback: () => {
+          if (!previous) return
+          setComments(prev => prev.some(comment => comment.id === id) ? prev : [...prev, previous])
+          adjustCommentCount(cardId, 1)
+        },
+      })
       return true
     } catch (err) {
-      console.error('Error in deleteComment:', err)
+      console.error('Error deleting comment:', err)
       return false
     }
   }
@@ -1233,41 +1673,115 @@ export function useTasks() {
   // Initialize data and set up real-time subscriptions
   useEffect(() => {
     // Only fetch tasks if user is authenticated
-    if (user) {
-      fetchTasks()
-    } else {
+    if (user && serverBoardPendingRef.current && watermarkRef.current !== null) {
+      // Already painted from the server snapshot; only catch up on what changed since
+      serverBoardPendingRef.current = false
+      syncBoardSince(watermarkRef.current)
+    } else if (user) {
+      hydrateBoard()
+    } else if (!serverBoardPendingRef.current) {
+      hydratedRef.current = false
+      watermarkRef.current = null
       setTasks([])
       setSubtasks([])
       setComments([])
     }
 
+    // Real-time change handlers; the payloads come from Supabase channels or the gateway stream
+    const handleTaskChange = (payload: any) => {
+      if (payload.eventType === 'INSERT') {
+        // Check if task already exists to prevent duplicates
+        setTasks(prev => {
+          const existingTask = prev.find(task => task.id === payload.new.id)
+          if (!existingTask) {
+            const newUITask = convertSupabaseToUITask(payload.new as SupabaseTask)
+            return [newUITask, ...prev]
+          } else {
+            return prev
+          }
+        })
+      } else if (payload.eventType === 'UPDATE') {
+        setTasks(prev => prev.map(task => task.id === payload.new.id
+          ? mergeTaskRowIntoUITask(task, payload.new)
+          : task))
+      } else if (payload.eventType === 'DELETE') {
+        setTasks(prev => prev.filter(task => task.id !== payload.old.id))
+      }
+    }
+
+    const handleSubtaskChange = (payload: any) => {
+      if (payload.eventType === 'INSERT') {
+        setSubtasks(prev => {
+          // Check if subtask already exists to prevent duplicates
+          const existingSubtask = prev.find(subtask => subtask.id === payload.new.id)
+          if (!existingSubtask) {
+            const newSubtask = {
+              ...payload.new,
+              startDate: payload.new.start_date ? new Date(payload.new.start_date) : undefined,
+              endDate: payload.new.end_date ? new Date(payload.new.end_date) : undefined,
+              assignees: [] // Will be populated separately
+            } as Subtask
+            return [...prev, newSubtask]
+          }
+          return prev
+        })
+      } else if (payload.eventType === 'UPDATE') {
+        const updatedSubtask = {
+          ...payload.new,
+          startDate: payload.new.start_date ? new Date(payload.new.start_date) : undefined,
+          endDate: payload.new.end_date ? new Date(payload.new.end_date) : undefined,
+          assignees: [] // Will be populated separately
+        } as Subtask
+        setSubtasks(prev => prev.map(subtask => subtask.id === payload.new.id ? updatedSubtask : subtask))
+      } else if (payload.eventType === 'DELETE') {
+        setSubtasks(prev => prev.filter(subtask => subtask.id !== payload.old.id))
+      }
+    }
+
+    const handleCommentChange = (payload: any) => {
+      if (payload.eventType === 'INSERT') {
+        setComments(prev => {
+          // Check if comment already exists to prevent duplicates
+          const existingComment = prev.find(comment => comment.id === payload.new.id)
+          if (!existingComment) {
+            return [...prev, payload.new as Comment]
+          }
+          return prev
+        })
+      } else if (payload.eventType === 'UPDATE') {
+        setComments(prev => prev.map(comment => comment.id === payload.new.id ? payload.new as Comment : comment))
+      } else if (payload.eventType === 'DELETE') {
+        setComments(prev => prev.filter(comment => comment.id !== payload.old.id))
+      }
+    }
+
+    if (REALTIME_VIA_GATEWAY) {
+      // One shared SSE stream; the gateway replays missed events on reconnect and only
+      // asks for a resync (from the watermark) when it cannot
+      return subscribeToChanges(
+        { tasks: handleTaskChange, subtasks: handleSubtaskChange, comments: handleCommentChange },
+        () => syncBoardRef.current?.()
+      )
+    }
+
     // Set up real-time subscription for tasks
+    channelDroppedRef.current = false
     const tasksChannel = supabase
       .channel('tasks_changes')
       .on(
         'postgres_changes',
         { event: '*', schema: 'public', table: 'tasks' },
-        (payload) => {
-          if (payload.eventType === 'INSERT') {
-            // Check if task already exists to prevent duplicates
-            setTasks(prev => {
-              const existingTask = prev.find(task => task.id === payload.new.id)
-              if (!existingTask) {
-                const newUITask = convertSupabaseToUITask(payload.new as SupabaseTask)
-                return [newUITask, ...prev]
-              } else {
-                return prev
-              }
-            })
-          } else if (payload.eventType === 'UPDATE') {
-            const updatedUITask = convertSupabaseToUITask(payload.new as SupabaseTask)
-            setTasks(prev => prev.map(task => task.id === payload.new.id ? updatedUITask : task))
-          } else if (payload.eventType === 'DELETE') {
-            setTasks(prev => prev.filter(task => task.id !== payload.old.id))
-          }
-        }
+        handleTaskChange
       )
-      .subscribe()
+      .subscribe((status: string) => {
+        // Events are not replayed after a dropped socket; catch up from the watermark
+        if (status === 'SUBSCRIBED' && channelDroppedRef.current) {
+          channelDroppedRef.current = false
+          syncBoardRef.current?.()
+        } else if (status === 'CHANNEL_ERROR' || status === 'TIMED_OUT' || status === 'CLOSED') {
+          channelDroppedRef.current = true
+        }
+      })
 
     // Set up real-time subscription for subtasks
     const subtasksChannel = supabase
@@ -1275,34 +1789,7 @@ export function useTasks() {
       .on(
         'postgres_changes',
         { event: '*', schema: 'public', table: 'subtasks' },
-        (payload) => {
-          if (payload.eventType === 'INSERT') {
-            setSubtasks(prev => {
-              // Check if subtask already exists to prevent duplicates
-              const existingSubtask = prev.find(subtask => subtask.id === payload.new.id)
-              if (!existingSubtask) {
-                const newSubtask = {
-                  ...payload.new,
-                  startDate: payload.new.start_date ? new Date(payload.new.start_date) : undefined,
-                  endDate: payload.new.end_date ? new Date(payload.new.end_date) : undefined,
-                  assignees: [] // Will be populated separately
-                } as Subtask
-                return [...prev, newSubtask]
-              }
-              return prev
-            })
-          } else if (payload.eventType === 'UPDATE') {
-            const updatedSubtask = {
-              ...payload.new,
-              startDate: payload.new.start_date ? new Date(payload.new.start_date) : undefined,
-              endDate: payload.new.end_date ? new Date(payload.new.end_date) : undefined,
-              assignees: [] // Will be populated separately
-            } as Subtask
-            setSubtasks(prev => prev.map(subtask => subtask.id === payload.new.id ? updatedSubtask : subtask))
-          } else if (payload.eventType === 'DELETE') {
-            setSubtasks(prev => prev.filter(subtask => subtask.id !== payload.old.id))
-          }
-        }
+        handleSubtaskChange
       )
       .subscribe()
 
@@ -1312,22 +1799,7 @@ export function useTasks() {
       .on(
         'postgres_changes',
         { event: '*', schema: 'public', table: 'comments' },
-        (payload) => {
-          if (payload.eventType === 'INSERT') {
-            setComments(prev => {
-              // Check if comment already exists to prevent duplicates
-              const existingComment = prev.find(comment => comment.id === payload.new.id)
-              if (!existingComment) {
-                return [...prev, payload.new as Comment]
-              }
-              return prev
-            })
-          } else if (payload.eventType === 'UPDATE') {
-            setComments(prev => prev.map(comment => comment.id === payload.new.id ? payload.new as Comment : comment))
-          } else if (payload.eventType === 'DELETE') {
-            setComments(prev => prev.filter(comment => comment.id !== payload.old.id))
-          }
-        }
+        handleCommentChange
       )
       .subscribe()
 
@@ -1338,6 +1810,72 @@ export function useTasks() {
     }
   }, [user?.id]) // Only depend on user.id, fetchTasks is stable
 
+  // Persist the board to IndexedDB (debounced) so the next load hydrates instantly
+  useEffect(() => {
+    if (!user || !hydratedRef.current) return
+
+    const saveTimeout = setTimeout(() => {
+      if (watermarkRef.current !== null) {
+        saveCachedBoard(user.id, tasks, watermarkRef.current)
+      }
+    }, 500)
+
+    return () => clearTimeout(saveTimeout)
+  }, [tasks, user?.id])
+
+  // Latest write functions for outbox replay (the replay listener outlives renders)
+  const replayHandlersRef = useRef<Record<OutboxKind, (payload: any) => Promise<unknown>>>()
+  replayHandlersRef.current = {
+    addTask: (payload) => addTask(payload),
+    createTaskWithAssignees: (payload) => createTaskWithAssignees(payload),
+    updateTask: (payload) => updateTask(payload.id, payload.updates, { immediate: true }),
+    deleteTask: (payload) => deleteTask(payload.id),
+    addSubtask: (payload) => addSubtask(payload),
+    updateSubtask: (payload) => updateSubtask(payload.id, payload.updates, { immediate: true }),
+    addComment: (payload) => addComment(payload),
+  }
+
+  // Replay queued offline edits in order when connectivity returns, then catch up
+  useEffect(() => {
+    if (!user) return
+
+    const replayOutbox = async (reconnected: boolean) => {
+      if (replayingRef.current || isOffline()) return
+      replayingRef.current = true
+
+      let replayed = 0
+      try {
+        const entries = await listOutbox(user.id)
+        for (const entry of entries) {
+          const handler = replayHandlersRef.current?.[entry.kind]
+          const result = handler ? await handler(entry.payload) : null
+          if (result === null || result === false) {
+            // Stop at the first failure to keep edits in order; retried on next reconnect
+            console.warn('⚠️ Outbox replay stopped at entry:', entry)
+            break
+          }
+          await removeOutboxEntry(entry.id!)
+          replayed++
+        }
+      } catch (err) {
+        console.error('❌ Error replaying offline edits:', err)
+      } finally {
+        replayingRef.current = false
+      }
+
+      // Realtime events were missed while offline; pull what changed meanwhile
+      if ((reconnected || replayed > 0) && watermarkRef.current !== null) {
+        await syncBoardSince(watermarkRef.current)
+      }
+    }
+
+    const handleOnline = () => replayOutbox(true)
+    window.addEventListener('online', handleOnline)
+    replayOutbox(false)
+
+    return () => window.removeEventListener('online', handleOnline)
+  }, [user?.id])
+
   return {
     // State
     tasks,
@@ -1348,6 +1886,7 @@ export function useTasks() {
     
     // Actions
     fetchTasks,
+    syncBoard, // Delta catch-up from the change_log watermark
     fetchTaskDetails, // NEW: On-demand detailed data loading
     fetchSubtasks,
     fetchComments,
@@ -1,6 +1,7 @@
 import { useState, useEffect } from 'react'
 import { supabase } from '@/lib/supabase'
 import { useToast } from '@/hooks/use-toast'
+import { REALTIME_VIA_GATEWAY, subscribeToChanges } from '@/lib/change-stream'
 
 // Updated interfaces for team_members table
 export interface TeamMember {
@@ -434,6 +435,22 @@ export function useTeamMembers() {
 
   // Subscribe to real-time changes
   useEffect(() => {
+    const handleTeamMemberChange = (payload: any) => {
+      if (payload.eventType === 'INSERT') {
+        setTeamMembers(prev => [payload.new as TeamMember, ...prev])
+      } else if (payload.eventType === 'UPDATE') {
+        setTeamMembers(prev => 
+          prev.map(member => 
+            member.id === payload.new.id ? payload.new as TeamMember : member
+          )
+        )
+      } else if (payload.eventType === 'DELETE') {
+        setTeamMembers(prev => 
+          prev.filter(member => member.id !== payload.old.id)
+        )
+      }
+    }
+
     // Only fetch and setup realtime if we have a session
     const setupDataAndRealtime = async () => {
       try {
@@ -447,6 +464,11 @@ export function useTeamMembers() {
       
       // Fetch team members first
       await fetchTeamMembers()
+
+        if (REALTIME_VIA_GATEWAY) {
+          // Shared SSE stream (lib/change-stream.ts); refetch if the gateway missed changes
+          return subscribeToChanges({ team_members: handleTeamMemberChange }, () => fetchTeamMembers())
+        }
         
         const channel = supabase
           .channel('team_members_changes')
@@ -457,21 +479,7 @@ export function useTeamMembers() {
               schema: 'public',
               table: 'team_members'
             },
-            (payload: any) => {
-              if (payload.eventType === 'INSERT') {
-                setTeamMembers(prev => [payload.new as TeamMember, ...prev])
-              } else if (payload.eventType === 'UPDATE') {
-                setTeamMembers(prev => 
-                  prev.map(member => 
-                    member.id === payload.new.id ? payload.new as TeamMember : member
-                  )
-                )
-              } else if (payload.eventType === 'DELETE') {
-                setTeamMembers(prev => 
-                  prev.filter(member => member.id !== payload.old.id)
-                )
-              }
-            }
+            handleTeamMemberChange
           )
           .subscribe((status: any) => {
             // Handle subscription status silently to reduce console noise
@@ -488,13 +496,18 @@ export function useTeamMembers() {
     }
 
     let channel: any = null
+    let cancelled = false
     
     setupDataAndRealtime().then(ch => {
       channel = ch
+      if (cancelled && typeof channel === 'function') channel()
     })
 
     return () => {
-      if (channel) {
+      cancelled = true
+      if (typeof channel === 'function') {
+        channel() // gateway unsubscribe
+      } else if (channel) {
         try {
           supabase.removeChannel(channel)
         } catch (error) {
@@ -0,0 +1,168 @@
+/**
+ * Persistent client-side cache for the Kanban board (IndexedDB)
+ * Holds the last known board per user so the UI can hydrate instantly on load,
+ * plus an outbox of edits made while offline that are replayed on reconnect.
+ */
+
+import type { Task } from '@/hooks/use-tasks'
+
+const DB_NAME = 'canopus-works'
+const DB_VERSION = 1
+const BOARD_STORE = 'boards'
+const OUTBOX_STORE = 'outbox'
+
+export interface CachedBoard {
+  userId: string
+  tasks: Task[]
+  watermark: number // change_log transaction horizon the cached tasks are current up to
+  savedAt: string
+}
+
+export type OutboxKind =
+  | 'addTask'
+  | 'createTaskWithAssignees'
+  | 'updateTask'
+  | 'deleteTask'
+  | 'addSubtask'
+  | 'updateSubtask'
+  | 'addComment'
+
+export interface OutboxEntry {
+  id?: number // auto-incremented, gives replay order
+  userId: string
+  kind: OutboxKind
+  payload: any
+  queuedAt: string
+}
+
+let dbPromise: Promise<IDBDatabase | null> | null = null
+
+/**
+ * Opens (and upgrades) the database once per page
+ * Resolves to null when IndexedDB is unavailable (SSR, private mode, old browsers)
+ */
+function openDb(): Promise<IDBDatabase | null> {
+  if (typeof window === 'undefined' || !('indexedDB' in window)) {
+    return Promise.resolve(null)
+  }
+
+  if (!dbPromise) {
+    dbPromise = new Promise(resolve => {
+      const request = window.indexedDB.open(DB_NAME, DB_VERSION)
+
+      request.onupgradeneeded = () => {
+        const db = request.result
+        if (!db.objectStoreNames.contains(BOARD_STORE)) {
+          db.createObjectStore(BOARD_STORE, { keyPath: 'userId' })
+        }
+        if (!db.objectStoreNames.contains(OUTBOX_STORE)) {
+          const outbox = db.createObjectStore(OUTBOX_STORE, { keyPath: 'id', autoIncrement: true })
+          outbox.createIndex('userId', 'userId', { unique: false })
+        }
+      }
+
+      request.onsuccess = () => resolve(request.result)
+      request.onerror = () => {
+        console.warn('⚠️ Board cache unavailable:', request.error)
+        resolve(null)
+      }
+    })
+  }
+
+  return dbPromise
+}
+
+/**
+ * Runs a single request against one object store and resolves with its result
+ */
+async function withStore<T>(
+  storeName: string,
+  mode: IDBTransactionMode,
+  run: (store: IDBObjectStore) => IDBRequest<T>
+): Promise<T | null> {
+  const db = await openDb()
+  if (!db) return null
+
+  return new Promise(resolve => {
+    try {
+      const tx = db.transaction(storeName, mode)
+      const request = run(tx.objectStore(storeName))
+      request.onsuccess = () => resolve(request.result)
+      request.onerror = () => {
+        console.warn(`⚠️ Board cache ${storeName} request failed:`, request.error)
+        resolve(null)
+      }
+    } catch (error) {
+      console.warn(`⚠️ Board cache ${storeName} transaction failed:`, error)
+      resolve(null)
+    }
+  })
+}
+
+/**
+ * Loads the cached board for a user, or null if nothing is cached
+ */
+export async function loadCachedBoard(userId: string): Promise<CachedBoard | null> {
+  const board = await withStore<CachedBoard | undefined>(BOARD_STORE, 'readonly', store => store.get(userId))
+  return board ?? null
+}
+
+/**
+ * Replaces the cached board for a user
+ */
+export async function saveCachedBoard(userId: string, tasks: Task[], watermark: number): Promise<void> {
+  const board: CachedBoard = { userId, tasks, watermark, savedAt: new Date().toISOString() }
+  await withStore(BOARD_STORE, 'readwrite', store => store.put(board))
+}
+
+/**
+ * Removes every cached board and queued edit (used on sign out)
+ */
+export async function clearBoardCache(): Promise<void> {
+  await withStore(BOARD_STORE, 'readwrite', store => store.clear())
+  await withStore(OUTBOX_STORE, 'readwrite', store => store.clear())
+}
+
+/**
+ * Queues an edit made while offline
+ */
+export async function enqueueOutbox(entry: Omit<OutboxEntry, 'id' | 'queuedAt'>): Promise<void> {
+  await withStore(OUTBOX_STORE, 'readwrite', store =>
+    store.add({ ...entry, queuedAt: new Date().toISOString() })
+  )
+}
+
+/**
+ * Lists queued edits for a user in the order they were made
+ */
+export async function listOutbox(userId: string): Promise<OutboxEntry[]> {
+  const entries = await withStore<OutboxEntry[]>(OUTBOX_STORE, 'readonly', store =>
+    store.index('userId').getAll(userId)
+  )
+  return (entries || []).sort((a, b) => (a.id ?? 0) - (b.id ?? 0))
+}
+
+/**
+ * Removes a queued edit once it has been replayed
+ */
+export async function removeOutboxEntry(id: number): Promise<void> {
+  await withStore(OUTBOX_STORE, 'readwrite', store => store.delete(id))
+}
+
+/**
+ * True when the browser reports no network connection
+ */
+export function isOffline(): boolean {
+  return typeof navigator !== 'undefined' && navigator.onLine === false
+}
+
+/**
+ * True for errors thrown by fetch when the network is unreachable
+ * (as opposed to errors returned by PostgREST, which carry a code)
+ */
+export function isNetworkError(error: any): boolean {
+  if (!error) return false
+  if (error instanceof TypeError) return true
+  const message = String(error.message || '')
+  return /Failed to fetch|NetworkError|Load failed|network/i.test(message) && !error.code
+}
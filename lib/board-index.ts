@@ -0,0 +1,245 @@
+/**
+ * Incrementally maintained indexes over the board's tasks
+ * Buckets task ids by status, priority, department and assignee, and keeps a token index
+ * over lowercased title/description, so filters and counters cost O(result) instead of
+ * re-scanning (and re-lowercasing) every task on each render.
+ */
+
+import type { Task } from '@/hooks/use-tasks'
+
+type Bucket = Map<string, Set<string>>
+
+interface IndexedTask {
+  task: Task
+  searchText: string // lowercased title + description, built once per task version
+  tokens: string[]
+}
+
+export interface BoardIndex {
+  entries: Map<string, IndexedTask>
+  position: Map<string, number> // index in the board's display order
+  byStatus: Bucket
+  byPriority: Bucket
+  byDepartment: Bucket
+  byAssignee: Bucket
+  tokens: Bucket // search token -> ids of tasks containing it
+}
+
+export const BOARD_STATUSES = ['Todo', 'In Progress', 'Completed'] as const
+
+export type BoardFilterType = 'all' | 'completed' | 'attention'
+
+export interface TaskCounts {
+  total: number
+  completed: number
+  critical: number
+}
+
+const EMPTY: ReadonlySet<string> = new Set()
+// Runs of ASCII letters/digits; any substring match of a query implies each of its runs is
+// contained in one of the text's runs, so the token index never drops a real match
+const TOKEN_PATTERN = /[a-z0-9]+/g
+
+export function tokenize(text: string): string[] {
+  return Array.from(new Set(text.toLowerCase().match(TOKEN_PATTERN) ?? []))
+}
+
+function addTo(bucket: Bucket, key: string | undefined, id: string) {
+  if (!key) return
+  let ids = bucket.get(key)
+  if (!ids) {
+    ids = new Set()
+    bucket.set(key, ids)
+  }
+  ids.add(id)
+}
+
+function removeFrom(bucket: Bucket, key: string | undefined, id: string) {
+  if (!key) return
+  const ids = bucket.get(key)
+  if (!ids) return
+  ids.delete(id)
+  if (ids.size === 0) bucket.delete(key)
+}
+
+function insert(index: BoardIndex, task: Task) {
+  const searchText = `${task.title || ''}\n${task.description || ''}`.toLowerCase()
+  const tokens = tokenize(searchText)
+  index.entries.set(task.id, { task, searchText, tokens })
+  addTo(index.byStatus, task.status, task.id)
+  addTo(index.byPriority, task.priority, task.id)
+  addTo(index.byDepartment, task.department, task.id)
+  for (const assigneeId of task.assignees || []) addTo(index.byAssignee, assigneeId, task.id)
+  for (const token of tokens) addTo(index.tokens, token, task.id)
+}
+
+function remove(index: BoardIndex, entry: IndexedTask) {
+  const { task, tokens } = entry
+  index.entries.delete(task.id)
+  removeFrom(index.byStatus, task.status, task.id)
+  removeFrom(index.byPriority, task.priority, task.id)
+  removeFrom(index.byDepartment, task.department, task.id)
+  for (const assigneeId of task.assignees || []) removeFrom(index.byAssignee, assigneeId, task.id)
+  for (const token of tokens) removeFrom(index.tokens, token, task.id)
+}
+
+export function createBoardIndex(tasks: Task[] = []): BoardIndex {
+  const index: BoardIndex = {
+    entries: new Map(),
+    position: new Map(),
+    byStatus: new Map(),
+    byPriority: new Map(),
+    byDepartment: new Map(),
+    byAssignee: new Map(),
+    tokens: new Map(),
+  }
+  return updateBoardIndex(index, tasks)
+}
+
+/**
+ * Brings the index in line with a new task list, in place
+ * Mutations and realtime events replace only the changed task objects (see upsertById in
+ * use-tasks), so only tasks whose identity changed are re-tokenized and re-bucketed.
+ */
+export function updateBoardIndex(index: BoardIndex, tasks: Task[]): BoardIndex {
+  const seen = new Set<string>()
+
+  tasks.forEach((task, i) => {
+    seen.add(task.id)
+    index.position.set(task.id, i)
+    const entry = index.entries.get(task.id)
+    if (entry?.task === task) return
+    if (entry) remove(index, entry)
+    insert(index, task)
+  })
+
+  if (index.entries.size > seen.size) {
+    for (const [id, entry] of index.entries) {
+      if (!seen.has(id)) {
+        remove(index, entry)
+        index.position.delete(id)
+      }
+    }
+  }
+  return index
+}
+
+/**
+ * Applies an explicit delta (used by the board worker, which receives copies rather than
+ * the main thread's task objects); `order` replaces the display order when given
+ */
+export function applyBoardDelta(index: BoardIndex, upserts: Task[], deleted: string[], order?: string[]): BoardIndex {
+  for (const id of deleted) {
+    const entry = index.entries.get(id)
+    if (entry) remove(index, entry)
+    index.position.delete(id)
+  }
+  for (const task of upserts) {
+    const entry = index.entries.get(task.id)
+    if (entry) remove(index, entry)
+    insert(index, task)
+  }
+  if (order) {
+    index.position.clear()
+    order.forEach((id, i) => index.position.set(id, i))
+  }
+  return index
+}
+
+export function idsByStatus(index: BoardIndex, status: string): ReadonlySet<string> {
+  return index.byStatus.get(status) ?? EMPTY
+}
+
+export function idsByPriority(index: BoardIndex, priority: string): ReadonlySet<string> {
+  return index.byPriority.get(priority) ?? EMPTY
+}
+
+export function idsByDepartment(index: BoardIndex, department: string): ReadonlySet<string> {
+  return index.byDepartment.get(department) ?? EMPTY
+}
+
+export function idsByAssignee(index: BoardIndex, assigneeId: string): ReadonlySet<string> {
+  return index.byAssignee.get(assigneeId) ?? EMPTY
+}
+
+/**
+ * Ids of tasks whose title or description contains `query` (case-insensitive substring,
+ * same semantics as the old linear filter), or null when the query is blank
+ * Candidates come from the token index; only those are checked against the full text.
+ */
+export function searchIds(index: BoardIndex, query: string): ReadonlySet<string> | null {
+  const needle = query.trim().toLowerCase()
+  if (!needle) return null
+
+  const terms = tokenize(needle)
+  let candidates: Set<string> | null = null
+  for (const term of terms) {
+    const matching = new Set<string>()
+    for (const [token, ids] of index.tokens) {
+      if (token.includes(term)) ids.forEach(id => matching.add(id))
+    }
+    candidates = candidates === null ? matching : intersect([candidates, matching])
+    if (candidates.size === 0) return candidates
+  }
+
+  const result = new Set<string>()
+  for (const id of candidates ?? index.entries.keys()) {
+    if (index.entries.get(id)?.searchText.includes(needle)) result.add(id)
+  }
+  return result
+}
+
+/** Intersection of id sets, walking the smallest one */
+export function intersect(sets: ReadonlySet<string>[]): Set<string> {
+  if (sets.length === 0) return new Set()
+  const [smallest, ...rest] = [...sets].sort((a, b) => a.size - b.size)
+  const result = new Set<string>()
+  for (const id of smallest) {
+    if (rest.every(set => set.has(id))) result.add(id)
+  }
+  return result
+}
+
+/** Ids in board display order; O(k log k) for k ids */
+export function orderedIds(index: BoardIndex, ids: Iterable<string>): string[] {
+  const position = index.position
+  return Array.from(ids).sort((a, b) => (position.get(a) ?? 0) - (position.get(b) ?? 0))
+}
+
+export function tasksFor(index: BoardIndex, ids: Iterable<string>): Task[] {
+  return orderedIds(index, ids).map(id => index.entries.get(id)!.task)
+}
+
+/** Id sets a search result and board filter restrict the board to (empty when showing everything) */
+export function constraintsFor(
+  index: BoardIndex,
+  searchMatches: ReadonlySet<string> | null,
+  filterType: BoardFilterType,
+): ReadonlySet<string>[] {
+  const constraints: ReadonlySet<string>[] = []
+  if (searchMatches) constraints.push(searchMatches)
+
+  switch (filterType) {
+    case 'completed':
+      constraints.push(idsByStatus(index, 'Completed'))
+      break
+    case 'attention':
+      constraints.push(idsByPriority(index, 'Critical'))
+      break
+  }
+  return constraints
+}
+
+/** One status column's ids under the given constraints, in board order */
+export function columnIds(index: BoardIndex, status: string, constraints: ReadonlySet<string>[]): string[] {
+  return orderedIds(index, intersect([idsByStatus(index, status), ...constraints]))
+}
+
+/** Unfiltered board totals for the dashboard summary */
+export function boardCounts(index: BoardIndex): TaskCounts {
+  return {
+    total: index.entries.size,
+    completed: idsByStatus(index, 'Completed').size,
+    critical: idsByPriority(index, 'Critical').size,
+  }
+}
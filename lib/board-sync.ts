@@ -0,0 +1,66 @@
+/**
+ * Delta sync against public.change_log (see migration 053)
+ * Shared by useTasks (browser, direct RPC) and /api/sync (server, for non-JS clients)
+ */
+
+import type { SupabaseClient } from '@supabase/supabase-js'
+
+export type BoardChangeTable =
+  | 'tasks'
+  | 'subtasks'
+  | 'task_assignments'
+  | 'subtask_assignments'
+  | 'comments'
+  | 'task_attachments'
+
+export interface BoardTombstone {
+  table: BoardChangeTable
+  id: string
+}
+
+// Shape returned by get_board_changes()
+export interface BoardChangeSet {
+  watermark: number // change_log transaction horizon: every change below it is included
+  reset: boolean // true when cards is a full snapshot rather than a delta
+  has_more: boolean // more changes exist after watermark, call again
+  cards: any[] // task_board_cards rows of every task touched by a change
+  subtasks?: any[]
+  task_assignments?: any[]
+  comments?: any[]
+  deleted?: BoardTombstone[]
+}
+
+export const BOARD_CHANGES_PAGE_SIZE = 5000
+
+/**
+ * Fetches changes after a watermark; a null watermark returns a full card snapshot
+ */
+export async function fetchBoardChanges(
+  client: SupabaseClient,
+  since: number | null,
+  limit: number = BOARD_CHANGES_PAGE_SIZE
+): Promise<{ data: BoardChangeSet | null; error: any }> {
+  const { data, error } = await client.rpc('get_board_changes', {
+    p_since: since,
+    p_limit: limit,
+  })
+
+  if (error) return { data: null, error }
+  return { data: data as BoardChangeSet, error: null }
+}
+
+/**
+ * Parses a watermark query value; anything that is not a non-negative integer means "no watermark"
+ */
+export function parseWatermark(value: string | null | undefined): number | null {
+  if (value === null || value === undefined || !/^\d+$/.test(value)) return null
+  const watermark = Number(value)
+  return Number.isSafeInteger(watermark) ? watermark : null
+}
+
+/**
+ * Ids in a change set's tombstones for one table
+ */
+export function tombstoneIds(changes: BoardChangeSet, table: BoardChangeTable): Set<string> {
+  return new Set((changes.deleted || []).filter(t => t.table === table).map(t => t.id))
+}
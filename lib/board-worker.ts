@@ -0,0 +1,153 @@
+/**
+ * Main-thread side of the board worker (lib/board.worker.ts)
+ * Watches the task store, posts only the tasks whose object identity changed (plus the board
+ * order when it moved), and publishes the worker's column slices and counts back into the
+ * store as `derived`. Without Worker support (SSR, old browsers) nothing is attached and the
+ * store's selectors keep computing on the main thread.
+ */
+
+import type { Task } from '@/hooks/use-tasks'
+import type { BoardFilterType, TaskCounts } from '@/lib/board-index'
+import type { TaskStore, TaskStoreState } from '@/lib/task-store'
+
+export type BoardWorkerRequest =
+  | { type: 'sync'; version: number; upserts: Task[]; deleted: string[]; order?: string[] }
+  | { type: 'query'; seq: number; search: string; filter: BoardFilterType }
+
+export type BoardWorkerResult = {
+  type: 'result'
+  seq: number
+  version: number // sync version the positions refer to
+  columns: Record<string, Int32Array>
+  counts: TaskCounts
+  elapsedMs: number
+}
+
+// Worker results slower than this are logged, to spot boards that outgrow the index
+const SLOW_DERIVATION_MS = 16
+
+// Only the fields the index reads; keeps structured cloning of large boards cheap
+function searchableFields(task: Task): Task {
+  return {
+    id: task.id,
+    title: task.title,
+    description: task.description,
+    status: task.status,
+    priority: task.priority,
+    department: task.department,
+    assignees: task.assignees,
+  } as Task
+}
+
+function sameOrder(a: string[], b: Task[]): boolean {
+  return a.length === b.length && b.every((task, i) => task.id === a[i])
+}
+
+/**
+ * Attaches a board worker to the store; returns a detach function
+ */
+export function attachBoardWorker(store: TaskStore): () => void {
+  if (typeof window === 'undefined' || typeof Worker === 'undefined') {
+    return () => {}
+  }
+
+  let worker: Worker
+  try {
+    worker = new Worker(new URL('./board.worker.ts', import.meta.url))
+  } catch (error) {
+    console.warn('⚠️ Board worker unavailable, deriving columns on the main thread:', error)
+    return () => {}
+  }
+
+  const sent = new Map<string, Task>() // task objects the worker has seen, by id
+  let sentOrder: string[] = []
+  let version = 0
+  const orders = new Map<number, string[]>([[0, sentOrder]]) // board order per sync version
+  let seq = 0
+  let last: Pick<TaskStoreState, 'tasks' | 'searchQuery' | 'filter'> | null = null
+  let scheduled = false
+
+  const syncTasks = (tasks: Task[]) => {
+    const upserts: Task[] = []
+    const seen = new Set<string>()
+    for (const task of tasks) {
+      seen.add(task.id)
+      if (sent.get(task.id) !== task) {
+        sent.set(task.id, task)
+        upserts.push(searchableFields(task))
+      }
+    }
+    const deleted: string[] = []
+    if (sent.size > seen.size) {
+      sent.forEach((_, id) => {
+        if (!seen.has(id)) deleted.push(id)
+      })
+      deleted.forEach(id => sent.delete(id))
+    }
+
+    const orderChanged = !sameOrder(sentOrder, tasks)
+    if (upserts.length === 0 && deleted.length === 0 && !orderChanged) return
+
+    version++
+    if (orderChanged) {
+      sentOrder = tasks.map(task => task.id)
+    }
+    orders.set(version, sentOrder)
+    worker.postMessage({ type: 'sync', version, upserts, deleted, order: orderChanged ? sentOrder : undefined } satisfies BoardWorkerRequest)
+  }
+
+  // Coalesce the store updates of one tick (tasks + filter + search) into a single query
+  const flush = () => {
+    scheduled = false
+    const state = store.getState()
+    if (last && last.tasks === state.tasks && last.searchQuery === state.searchQuery && last.filter === state.filter) {
+      return
+    }
+    if (!last || last.tasks !== state.tasks) {
+      syncTasks(state.tasks)
+    }
+    last = { tasks: state.tasks, searchQuery: state.searchQuery, filter: state.filter }
+    seq++
+    worker.postMessage({ type: 'query', seq, search: state.searchQuery, filter: state.filter.type } satisfies BoardWorkerRequest)
+  }
+
+  const schedule = () => {
+    if (scheduled) return
+    scheduled = true
+    queueMicrotask(flush)
+  }
+
+  worker.onmessage = (event: MessageEvent<BoardWorkerResult>) => {
+    const result = event.data
+    // Older versions can no longer be referenced by a result
+    orders.forEach((_, key) => {
+      if (key < result.version) orders.delete(key)
+    })
+    if (result.seq !== seq) return // superseded by a newer query already in flight
+
+    const order = orders.get(result.version) ?? []
+    const columns: Record<string, string[]> = {}
+    for (const [status, positions] of Object.entries(result.columns)) {
+      columns[status] = Array.from(positions, position => order[position]).filter(Boolean)
+    }
+    if (result.elapsedMs > SLOW_DERIVATION_MS) {
+      console.log(`🚀 PERFORMANCE: Board worker derived columns in ${result.elapsedMs.toFixed(1)}ms`)
+    }
+    store.setState({ derived: { columns, counts: result.counts } })
+  }
+
+  const unsubscribe = store.subscribe(schedule)
+  const detach = () => {
+    unsubscribe()
+    worker.terminate()
+    store.setState({ derived: null })
+  }
+
+  worker.onerror = (event) => {
+    console.error('❌ Board worker error, falling back to main-thread derivation:', event.message)
+    detach()
+  }
+
+  schedule()
+  return detach
+}
@@ -0,0 +1,55 @@
+/**
+ * Board derivation worker
+ * Keeps its own BoardIndex from the task deltas the main thread posts and answers queries
+ * (search + filter) with per-column slices and summary counts. Column slices go back as
+ * Int32Array positions into the board order the main thread sent, transferred rather than copied.
+ */
+
+import {
+  applyBoardDelta,
+  BOARD_STATUSES,
+  boardCounts,
+  columnIds,
+  constraintsFor,
+  createBoardIndex,
+  searchIds,
+} from '@/lib/board-index'
+import type { BoardWorkerRequest, BoardWorkerResult } from '@/lib/board-worker'
+
+// Typed loosely: the project compiles against the DOM lib, not the webworker one
+const ctx = self as unknown as {
+  onmessage: ((event: MessageEvent<BoardWorkerRequest>) => void) | null
+  postMessage: (message: BoardWorkerResult, transfer: Transferable[]) => void
+}
+
+const index = createBoardIndex()
+let version = 0
+
+ctx.onmessage = (event) => {
+  const message = event.data
+
+  if (message.type === 'sync') {
+    applyBoardDelta(index, message.upserts, message.deleted, message.order)
+    version = message.version
+    return
+  }
+
+  const startTime = performance.now()
+  const constraints = constraintsFor(index, searchIds(index, message.search), message.filter)
+  const columns: Record<string, Int32Array> = {}
+  const buffers: ArrayBuffer[] = []
+  for (const status of BOARD_STATUSES) {
+    const positions = Int32Array.from(columnIds(index, status, constraints), id => index.position.get(id) ?? -1)
+    columns[status] = positions
+    buffers.push(positions.buffer)
+  }
+
+  ctx.postMessage({
+    type: 'result',
+    seq: message.seq,
+    version,
+    columns,
+    counts: boardCounts(index),
+    elapsedMs: performance.now() - startTime,
+  }, buffers)
+}
@@ -0,0 +1,145 @@
+/**
+ * Upstream change feeds for the realtime gateway (lib/realtime-gateway.ts)
+ * The Supabase feed is one service-role postgres_changes channel per server process,
+ * replacing a channel per table per browser. The local feed is an in-memory stand-in for
+ * tests and offline development: changes are published to it directly (see
+ * /api/realtime/local) and no database is needed.
+ * Server-only.
+ */
+
+import type { RealtimeChannel, SupabaseClient } from '@supabase/supabase-js'
+import { createServiceSupabaseClient } from '@/lib/supabase-server'
+
+export const FEED_TABLES = ['tasks', 'subtasks', 'comments', 'team_members'] as const
+
+export type FeedTable = (typeof FEED_TABLES)[number]
+
+// Followed only to keep task visibility current; their changes are never sent to clients
+export const SCOPE_TABLES = ['task_assignments'] as const
+
+export type ScopeTable = (typeof SCOPE_TABLES)[number]
+
+// Same shape as a postgres_changes payload, so client handlers work with either transport
+export interface FeedChange {
+  table: FeedTable | ScopeTable
+  eventType: 'INSERT' | 'UPDATE' | 'DELETE'
+  new: Record<string, any>
+  old: Record<string, any>
+  commit_timestamp?: string
+}
+
+// A task_assignments row: the task's assignee is a team member, not a user
+export interface ScopeAssignment {
+  id: string
+  team_member_id: string
+}
+
+// Fields of a task that decide who may see it and its subtasks/comments (RLS, migration 023).
+// tasks.assigned_to is gone (migrations 026/032); assignees live in task_assignments.
+export interface TaskScope {
+  department: string | null
+  created_by: string | null
+  assignments: ScopeAssignment[]
+}
+
+export interface ChangeFeed {
+  kind: 'supabase' | 'local'
+  start: (onChange: (change: FeedChange) => void, onStatus?: (connected: boolean) => void) => () => void
+  // Lookups for rows the feed has not seen yet (e.g. a comment on a task loaded before start)
+  taskScope: (taskId: string) => Promise<TaskScope | null>
+  subtaskTaskId: (subtaskId: string) => Promise<string | null>
+}
+
+export function isFeedTable(table: unknown): table is FeedTable {
+  return typeof table === 'string' && (FEED_TABLES as readonly string[]).includes(table)
+}
+
+export function isScopeTable(table: unknown): table is ScopeTable {
+  return typeof table === 'string' && (SCOPE_TABLES as readonly string[]).includes(table)
+}
+
+export function createSupabaseChangeFeed(client: SupabaseClient = createServiceSupabaseClient()): ChangeFeed {
+  return {
+    kind: 'supabase',
+    start(onChange, onStatus) {
+      let channel: RealtimeChannel = client.channel('realtime_gateway')
+      for (const table of [...FEED_TABLES, ...SCOPE_TABLES]) {
+        channel = channel.on(
+          'postgres_changes' as any,
+          { event: '*', schema: 'public', table },
+          (payload: any) => onChange({
+            table,
+            eventType: payload.eventType,
+            new: payload.new || {},
+            old: payload.old || {},
+            commit_timestamp: payload.commit_timestamp,
+          })
+        )
+      }
+      channel.subscribe((status: string) => {
+        if (status === 'SUBSCRIBED') onStatus?.(true)
+        else if (status === 'CHANNEL_ERROR' || status === 'TIMED_OUT' || status === 'CLOSED') onStatus?.(false)
+      })
+      return () => {
+        client.removeChannel(channel)
+      }
+    },
+    async taskScope(taskId) {
+      const { data } = await client
+        .from('tasks')
+        .select('department, created_by, task_assignments(id, team_member_id)')
+        .eq('id', taskId)
+        .maybeSingle()
+      if (!data) return null
+      return {
+        department: data.department ?? null,
+        created_by: data.created_by ?? null,
+        assignments: (data.task_assignments || []).filter((row: any) => row.team_member_id),
+      }
+    },
+    async subtaskTaskId(subtaskId) {
+      const { data } = await client
+        .from('subtasks')
+        .select('task_id')
+        .eq('id', subtaskId)
+        .maybeSingle()
+      return data?.task_id ?? null
+    },
+  }
+}
+
+// On globalThis: API routes are bundled separately, and the publishing route must reach the
+// listeners the streaming route registered
+const localFeedGlobal = globalThis as unknown as { localChangeListeners?: Set<(change: FeedChange) => void> }
+const localListeners = (localFeedGlobal.localChangeListeners ??= new Set())
+
+/**
+ * Publishes a change to every gateway started on the local feed
+ */
+export function publishLocalChange(change: FeedChange) {
+  localListeners.forEach(listener => listener(change))
+}
+
+export function createLocalChangeFeed(): ChangeFeed {
+  return {
+    kind: 'local',
+    start(onChange, onStatus) {
+      localListeners.add(onChange)
+      onStatus?.(true)
+      return () => {
+        localListeners.delete(onChange)
+      }
+    },
+    // Only rows published through the feed are known; task_assignments changes published
+    // here keep an assigned viewer's visibility current just like the Supabase feed
+    taskScope: async () => null,
+    subtaskTaskId: async () => null,
+  }
+}
+
+/**
+ * Feed selected by REALTIME_FEED: `local` for the stand-in, Supabase otherwise
+ */
+export function createChangeFeed(): ChangeFeed {
+  return process.env.REALTIME_FEED === 'local' ? createLocalChangeFeed() : createSupabaseChangeFeed()
+}
@@ -0,0 +1,67 @@
+/**
+ * Browser side of the realtime gateway (/api/realtime, lib/realtime-gateway.ts)
+ * One EventSource per tab carries tasks, subtasks, comments and team_members changes in
+ * place of a postgres_changes channel per table. Payloads have the postgres_changes shape
+ * ({ eventType, new, old }), so the same handlers serve either transport.
+ * Enabled with NEXT_PUBLIC_REALTIME_TRANSPORT=sse; Supabase channels are used otherwise.
+ */
+
+export const REALTIME_VIA_GATEWAY = process.env.NEXT_PUBLIC_REALTIME_TRANSPORT === 'sse'
+
+export type ChangeTable = 'tasks' | 'subtasks' | 'comments' | 'team_members'
+
+export interface ChangePayload {
+  eventType: 'INSERT' | 'UPDATE' | 'DELETE'
+  new: Record<string, any>
+  old: Record<string, any>
+  commit_timestamp?: string
+}
+
+type ChangeHandlers = Partial<Record<ChangeTable, (payload: ChangePayload) => void>>
+
+interface Subscription {
+  handlers: ChangeHandlers
+  onReset?: () => void
+}
+
+const subscriptions = new Set<Subscription>()
+let source: EventSource | null = null
+
+function open() {
+  // The access token cookie (lib/session-cookie.ts) authenticates the stream; the browser
+  // reconnects by itself and sends Last-Event-ID, so missed changes are replayed
+  source = new EventSource('/api/realtime')
+
+  source.addEventListener('change', (event) => {
+    const { table, ...payload } = JSON.parse((event as MessageEvent<string>).data)
+    subscriptions.forEach(subscription => subscription.handlers[table as ChangeTable]?.(payload))
+  })
+
+  // The gateway could not replay what this tab missed; reload state from the server
+  source.addEventListener('reset', () => {
+    console.warn('⚠️ Realtime gateway asked for a resync')
+    subscriptions.forEach(subscription => subscription.onReset?.())
+  })
+}
+
+/**
+ * Subscribes handlers per table to the shared stream; returns an unsubscribe function
+ * `onReset` runs when changes were missed and state must be refetched.
+ */
+export function subscribeToChanges(handlers: ChangeHandlers, onReset?: () => void): () => void {
+  if (typeof window === 'undefined' || typeof EventSource === 'undefined') {
+    return () => {}
+  }
+
+  const subscription: Subscription = { handlers, onReset }
+  subscriptions.add(subscription)
+  if (!source) open()
+
+  return () => {
+    subscriptions.delete(subscription)
+    if (subscriptions.size === 0 && source) {
+      source.close()
+      source = null
+    }
+  }
+}
@@ -0,0 +1,237 @@
+/**
+ * Department snapshots for wall displays (andon mode)
+ * One hub per department per server process builds a read-only snapshot of that
+ * department's board, rebuilds it when the board tables change (get_table_versions, migration
+ * 054), and writes the same pre-encoded SSE frame to every display subscribed to it.
+ * Fifty screens on one department cost one version check per poll and one query per change,
+ * instead of fifty authenticated clients with their own realtime channels.
+ * Server-only: uses the service role, so every query here is scoped by department.
+ */
+
+import { createHash, timingSafeEqual } from 'crypto'
+import { createServiceSupabaseClient } from '@/lib/supabase-server'
+import { BOARD_STATUSES } from '@/lib/board-index'
+import { fetchTableVersions, type VersionedTable } from '@/lib/table-versions'
+
+export interface DisplayCard {
+  id: string
+  title: string
+  priority: string
+  status: string
+  dueDate: string | null
+  assigneeInitials: string[]
+  subtaskTotal: number
+  subtaskDone: number
+}
+
+export interface DisplayCounts {
+  total: number
+  inProgress: number
+  completed: number
+  critical: number
+  overdue: number
+}
+
+export interface DisplaySnapshot {
+  department: string
+  version: string // table versions the snapshot was built from; also the SSE event id
+  generatedAt: string
+  columns: Record<string, DisplayCard[]>
+  counts: DisplayCounts
+}
+
+type Subscriber = (frame: Uint8Array) => void
+
+interface DisplayHub {
+  department: string
+  subscribers: Set<Subscriber>
+  snapshot: DisplaySnapshot | null
+  frame: Uint8Array | null
+  content: string | null // snapshot body without version/time, to skip pushes that change nothing
+  building: Promise<void> | null
+  queuedVersion: string | null // version that arrived while a rebuild was running
+}
+
+// Everything a display card is built from (see the task_board_cards view)
+const DISPLAY_TABLES: VersionedTable[] = ['tasks', 'task_assignments', 'subtasks', 'team_members']
+const DISPLAY_CARD_COLUMNS = 'id, title, priority, status, due_date, assignee_initials, subtask_total, subtask_done, order_index, updated_at'
+const VERSION_POLL_MS = 5000
+const HEARTBEAT_MS = 25000 // below common proxy idle timeouts
+const RETRY_MS = 5000
+
+const encoder = new TextEncoder()
+const hubs = new Map<string, DisplayHub>()
+let versionTimer: ReturnType<typeof setInterval> | null = null
+let heartbeatTimer: ReturnType<typeof setInterval> | null = null
+let currentVersion: string | null = null
+let checking = false
+
+/**
+ * True when `key` matches DISPLAY_ACCESS_KEY; display mode is off while it is unset
+ */
+export function isDisplayKeyValid(key: string | null): boolean {
+  const expected = process.env.DISPLAY_ACCESS_KEY
+  if (!expected || !key) return false
+  const digest = (value: string) => createHash('sha256').update(value).digest()
+  return timingSafeEqual(digest(key), digest(expected))
+}
+
+function todayYMD(): string {
+  return new Date().toISOString().slice(0, 10)
+}
+
+function buildSnapshot(department: string, version: string, rows: any[]): DisplaySnapshot {
+  const today = todayYMD()
+  const columns: Record<string, DisplayCard[]> = {}
+  for (const status of BOARD_STATUSES) columns[status] = []
+  const counts: DisplayCounts = { total: 0, inProgress: 0, completed: 0, critical: 0, overdue: 0 }
+
+  for (const row of rows) {
+    const card: DisplayCard = {
+      id: row.id,
+      title: row.title,
+      priority: row.priority,
+      status: row.status,
+      dueDate: row.due_date ?? null,
+      assigneeInitials: row.assignee_initials || [],
+      subtaskTotal: row.subtask_total ?? 0,
+      subtaskDone: row.subtask_done ?? 0,
+    }
+    if (!columns[card.status]) columns[card.status] = []
+    columns[card.status].push(card)
+
+    counts.total++
+    if (card.status === 'In Progress') counts.inProgress++
+    if (card.status === 'Completed') counts.completed++
+    if (card.priority === 'Critical' && card.status !== 'Completed') counts.critical++
+    if (card.dueDate && card.dueDate.slice(0, 10) < today && card.status !== 'Completed') counts.overdue++
+  }
+
+  return { department, version, generatedAt: new Date().toISOString(), columns, counts }
+}
+
+function snapshotFrame(snapshot: DisplaySnapshot): Uint8Array {
+  return encoder.encode(`id: ${snapshot.version}\nevent: snapshot\ndata: ${JSON.stringify(snapshot)}\n\n`)
+}
+
+function broadcast(hub: DisplayHub, frame: Uint8Array) {
+  hub.subscribers.forEach(send => send(frame))
+}
+
+async function rebuild(hub: DisplayHub, version: string): Promise<void> {
+  const startTime = Date.now()
+  const { data, error } = await createServiceSupabaseClient()
+    .from('task_board_cards')
+    .select(DISPLAY_CARD_COLUMNS)
+    .eq('department', hub.department)
+    .order('order_index', { ascending: true })
+    .order('updated_at', { ascending: false })
+
+  if (error) {
+    console.error(`❌ Display snapshot for ${hub.department} failed:`, error)
+    currentVersion = null // retry on the next poll
+    return
+  }
+
+  const snapshot = buildSnapshot(hub.department, version, data || [])
+  const content = JSON.stringify([snapshot.columns, snapshot.counts])
+  if (content === hub.content) return // a change in another department
+
+  hub.snapshot = snapshot
+  hub.content = content
+  hub.frame = snapshotFrame(snapshot)
+  broadcast(hub, hub.frame)
+  console.log(`🚀 PERFORMANCE: Display snapshot for ${hub.department} rebuilt in ${Date.now() - startTime}ms, pushed to ${hub.subscribers.size} display(s)`)
+}
+
+function scheduleRebuild(hub: DisplayHub, version: string): Promise<void> {
+  // Rebuilds of one hub never overlap; a version that arrives mid-rebuild runs right after
+  if (hub.building) {
+    hub.queuedVersion = version
+    return hub.building
+  }
+  hub.building = rebuild(hub, version)
+    .catch(error => {
+      console.error(`❌ Display snapshot for ${hub.department} failed:`, error)
+      currentVersion = null
+    })
+    .finally(() => {
+      hub.building = null
+      const queued = hub.queuedVersion
+      hub.queuedVersion = null
+      if (queued && hubs.get(hub.department) === hub) scheduleRebuild(hub, queued)
+    })
+  return hub.building
+}
+
+async function checkVersions() {
+  if (checking) return
+  checking = true
+  try {
+    const { data, error } = await fetchTableVersions(createServiceSupabaseClient(), DISPLAY_TABLES)
+    if (error || !data) {
+      console.warn('⚠️ Display version check failed:', error)
+      return
+    }
+    const version = createHash('sha1')
+      .update(DISPLAY_TABLES.map(table => data[table] ?? '0').join('.'))
+      .digest('base64url')
+      .slice(0, 16)
+    if (version === currentVersion) return
+    currentVersion = version
+    await Promise.all(Array.from(hubs.values(), hub => scheduleRebuild(hub, version)))
+  } catch (error) {
+    console.warn('⚠️ Display version check failed:', error)
+  } finally {
+    checking = false
+  }
+}
+
+function startTimers() {
+  if (versionTimer) return
+  versionTimer = setInterval(checkVersions, VERSION_POLL_MS)
+  heartbeatTimer = setInterval(() => {
+    const ping = encoder.encode(': ping\n\n')
+    hubs.forEach(hub => broadcast(hub, ping))
+  }, HEARTBEAT_MS)
+}
+
+function stopTimersIfIdle() {
+  if (hubs.size > 0) return
+  if (versionTimer) clearInterval(versionTimer)
+  if (heartbeatTimer) clearInterval(heartbeatTimer)
+  versionTimer = heartbeatTimer = null
+  currentVersion = null // versions may move while nobody watches
+}
+
+/**
+ * Subscribes a display to its department's snapshots; returns an unsubscribe function
+ * The current snapshot is sent right away unless `lastEventId` shows the display
+ * (reconnecting after a drop) already has it.
+ */
+export function subscribeDisplay(department: string, send: Subscriber, lastEventId: string | null = null): () => void {
+  let hub = hubs.get(department)
+  if (!hub) {
+    hub = { department, subscribers: new Set(), snapshot: null, frame: null, content: null, building: null, queuedVersion: null }
+    hubs.set(department, hub)
+  }
+  hub.subscribers.add(send)
+  send(encoder.encode(`retry: ${RETRY_MS}\n\n`))
+
+  if (hub.frame && hub.snapshot) {
+    if (hub.snapshot.version !== lastEventId) send(hub.frame)
+  } else if (currentVersion) {
+    scheduleRebuild(hub, currentVersion)
+  }
+  startTimers()
+  if (!currentVersion) checkVersions() // first display: don't wait for the first poll
+
+  const joined = hub
+  return () => {
+    joined.subscribers.delete(send)
+    if (joined.subscribers.size === 0 && hubs.get(department) === joined) {
+      hubs.delete(department)
+      stopTimersIfIdle()
+    }
+  }
+}
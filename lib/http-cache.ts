@@ -0,0 +1,81 @@
+/**
+ * HTTP caching helpers for the JSON API routes
+ * Responses carry a strong ETag (a content hash, or a caller-supplied version such as a
+ * change sequence) so clients revalidate with If-None-Match and get an empty 304 when
+ * nothing changed. Per-user responses stay `private` and vary on Authorization, so a shared
+ * tablet never sees another user's cached data.
+ */
+
+import { createHash } from 'crypto'
+import { NextResponse } from 'next/server'
+
+export interface JsonCacheOptions {
+  scope?: 'public' | 'private'
+  maxAge?: number // seconds the response is fresh without revalidating
+  staleWhileRevalidate?: number // seconds a stale response may be served while revalidating
+  etag?: string // validator to use instead of hashing the body (e.g. a change sequence)
+  status?: number
+  headers?: Record<string, string>
+}
+
+export function cacheControl({ scope = 'private', maxAge = 0, staleWhileRevalidate = 0 }: JsonCacheOptions = {}): string {
+  // max-age=0 alone would still let caches reuse the response without asking; no-cache
+  // means "store, but revalidate every time", which is what makes 304s work
+  const directives = [scope, maxAge > 0 ? `max-age=${maxAge}` : 'no-cache']
+  if (staleWhileRevalidate > 0) directives.push(`stale-while-revalidate=${staleWhileRevalidate}`)
+  return directives.join(', ')
+}
+
+export function quoteEtag(value: string): string {
+  return value.startsWith('"') || value.startsWith('W/"') ? value : `"${value}"`
+}
+
+export function hashEtag(body: string): string {
+  return `"${createHash('sha1').update(body).digest('base64url')}"`
+}
+
+/**
+ * True when the request's If-None-Match already names `etag`
+ * Uses the weak comparison RFC 9110 prescribes for If-None-Match.
+ */
+export function etagMatches(request: Request, etag: string): boolean {
+  const header = request.headers.get('if-none-match')
+  if (!header) return false
+  if (header.trim() === '*') return true
+  const opaque = (tag: string) => tag.trim().replace(/^W\//, '')
+  return header.split(',').some(tag => opaque(tag) === opaque(etag))
+}
+
+function cacheHeaders(etag: string, options: JsonCacheOptions): Record<string, string> {
+  const headers: Record<string, string> = {
+    ...options.headers,
+    'Cache-Control': cacheControl(options),
+    ETag: etag,
+  }
+  if ((options.scope ?? 'private') === 'private') {
+    headers.Vary = 'Authorization'
+  }
+  return headers
+}
+
+/** Empty 304 for a client whose cached copy carries `etag` */
+export function notModified(etag: string, options: JsonCacheOptions = {}): NextResponse {
+  return new NextResponse(null, { status: 304, headers: cacheHeaders(quoteEtag(etag), options) })
+}
+
+/**
+ * JSON response with ETag and Cache-Control; answers 304 Not Modified when the client's
+ * cached copy is current
+ */
+export function cachedJson(request: Request, data: unknown, options: JsonCacheOptions = {}): NextResponse {
+  const body = JSON.stringify(data)
+  const etag = options.etag ? quoteEtag(options.etag) : hashEtag(body)
+
+  if (etagMatches(request, etag)) {
+    return notModified(etag, options)
+  }
+  return new NextResponse(body, {
+    status: options.status ?? 200,
+    headers: { ...cacheHeaders(etag, options), 'Content-Type': 'application/json' },
+  })
+}
@@ -0,0 +1,139 @@
+/**
+ * Client mutation queue for optimistic writes
+ * Every task, subtask and comment write goes through one queue: the change is applied to
+ * local state immediately, sent to Supabase in order per record, retried with backoff on
+ * transient failures, reconciled with the server row by id, and rolled back if it fails.
+ * Offline edits still go to the IndexedDB outbox (lib/board-cache.ts) for replay.
+ */
+
+import { isNetworkError, isOffline } from '@/lib/board-cache'
+
+export interface Mutation<T> {
+  key: string // record the write targets, e.g. `task:<id>`; writes to one key run in order
+  label: string // for logs, e.g. 'updateTask'
+  apply?: () => void // optimistic local change
+  commit: () => Promise<T> // server call; throws to fail (see unwrap)
+  reconcile?: (result: T) => void // replace the optimistic data with the server's row
+  rollback?: (error: any) => void // undo `apply` after the last attempt failed
+}
+
+export interface MutationQueueOptions {
+  maxAttempts?: number
+  baseDelayMs?: number
+  maxDelayMs?: number
+}
+
+// PostgREST/HTTP statuses worth retrying: timeouts, rate limits, gateway errors
+const TRANSIENT_STATUSES = new Set([408, 429, 500, 502, 503, 504])
+
+/**
+ * True for failures a retry can fix (network drops, 5xx, rate limits),
+ * false for constraint, permission and validation errors that would fail again
+ */
+export function isTransientError(error: any): boolean {
+  if (!error) return false
+  if (isNetworkError(error)) return true
+  const status = Number(error.status ?? error.statusCode)
+  return TRANSIENT_STATUSES.has(status) || error.code === '57014' // statement timeout
+}
+
+/**
+ * Unwraps a supabase-js `{ data, error }` response, throwing its error so the queue sees it
+ */
+export function unwrap<T>(response: { data: T | null; error: any }): T {
+  if (response.error) throw response.error
+  return response.data as T
+}
+
+/**
+ * Random UUID for rows created on the client
+ * Optimistic rows carry the id they will have on the server, so reconciliation (and realtime
+ * echoes of our own inserts) match by id and a retried insert can be made idempotent.
+ */
+export function newClientId(): string {
+  if (typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function') {
+    return crypto.randomUUID()
+  }
+  // RFC 4122 v4 from Math.random for older browsers
+  return 'xxxxxxxx-xxxx-4xxx-yxxx-xxxxxxxxxxxx'.replace(/[xy]/g, c => {
+    const r = (Math.random() * 16) | 0
+    return (c === 'x' ? r : (r & 0x3) | 0x8).toString(16)
+  })
+}
+
+function sleep(ms: number): Promise<void> {
+  return new Promise(resolve => setTimeout(resolve, ms))
+}
+
+export class MutationQueue {
+  private tails = new Map<string, Promise<unknown>>()
+  private pending = 0
+  private listeners = new Set<(pending: number) => void>()
+  private maxAttempts: number
+  private baseDelayMs: number
+  private maxDelayMs: number
+
+  constructor({ maxAttempts = 4, baseDelayMs = 300, maxDelayMs = 5000 }: MutationQueueOptions = {}) {
+    this.maxAttempts = maxAttempts
+    this.baseDelayMs = baseDelayMs
+    this.maxDelayMs = maxDelayMs
+  }
+
+  /**
+   * Applies the mutation optimistically and resolves with the server result once committed
+   * Rejects (after rolling back) when the last attempt fails.
+   */
+  run<T>(mutation: Mutation<T>): Promise<T> {
+    mutation.apply?.()
+    this.setPending(this.pending + 1)
+
+    const previous = this.tails.get(mutation.key) ?? Promise.resolve()
+    const result = previous.catch(() => undefined).then(() => this.attempt(mutation))
+    const tail = result.catch(() => undefined)
+    this.tails.set(mutation.key, tail)
+    tail.then(() => {
+      if (this.tails.get(mutation.key) === tail) this.tails.delete(mutation.key)
+      this.setPending(this.pending - 1)
+    })
+    return result
+  }
+
+  /** Number of writes applied locally but not yet confirmed */
+  get size(): number {
+    return this.pending
+  }
+
+  subscribe(listener: (pending: number) => void): () => void {
+    this.listeners.add(listener)
+    return () => this.listeners.delete(listener)
+  }
+
+  private setPending(pending: number) {
+    this.pending = pending
+    this.listeners.forEach(listener => listener(pending))
+  }
+
+  private async attempt<T>(mutation: Mutation<T>): Promise<T> {
+    for (let attempt = 1; ; attempt++) {
+      try {
+        const result = await mutation.commit()
+        mutation.reconcile?.(result)
+        return result
+      } catch (error) {
+        // Once the browser is offline the caller hands the edit to the outbox instead
+        if (attempt >= this.maxAttempts || !isTransientError(error) || isOffline()) {
+          console.error(`❌ ${mutation.label} failed after ${attempt} attempt(s), rolling back:`, error)
+          mutation.rollback?.(error)
+          throw error
+        }
+        // Exponential backoff with jitter so a burst of failed writes does not retry in lockstep
+        const delay = Math.min(this.maxDelayMs, this.baseDelayMs * 2 ** (attempt - 1)) * (0.5 + Math.random() / 2)
+        console.warn(`⚠️ ${mutation.label} attempt ${attempt} failed, retrying in ${Math.round(delay)}ms`)
+        await sleep(delay)
+      }
+    }
+  }
+}
+
+// Shared by every write in useTasks, so ordering holds across components
+export const mutationQueue = new MutationQueue()
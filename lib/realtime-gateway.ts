@@ -0,0 +1,331 @@
+/**
+ * Server-Sent Events fan-out for board changes
+ * One upstream change feed per server process (lib/change-feed.ts) instead of four
+ * postgres_changes channels per browser: the realtime server evaluates one subscription,
+ * and visibility is decided here, in-process, from each viewer's role and department
+ * using the same rules as the tasks RLS policy (migration 023), with task_assignments in
+ * place of the dropped tasks.assigned_to. Every event is encoded once and written to each
+ * viewer allowed to see it.
+ *
+ * DELETEs carry only the old row's primary key (no table has REPLICA IDENTITY FULL), and by
+ * the time they arrive the row can no longer be looked up. One whose owning task is not
+ * known from earlier events is sent to every viewer, reduced to that key, as the
+ * postgres_changes channels did: Realtime does not apply RLS to deletes either.
+ *
+ * Event ids are `<epoch>:<seq>`. A reconnecting EventSource sends Last-Event-ID and is
+ * replayed what it missed from a ring buffer; when that is impossible (restart, buffer
+ * overrun, upstream outage) it gets a `reset` event and resyncs from its change_log
+ * watermark instead.
+ * Server-only.
+ */
+
+import {
+  createChangeFeed,
+  type ChangeFeed,
+  type FeedChange,
+  type FeedTable,
+  type TaskScope,
+} from '@/lib/change-feed'
+
+export interface Viewer {
+  id: string
+  role: string
+  department: string | null
+  teamMemberIds: string[] // team_members rows for this user (matched by email); assignees are team members
+}
+
+export interface GatewayFilter {
+  department?: string | null // only changes belonging to this department's tasks
+  tables?: FeedTable[]
+}
+
+interface GatewayEvent {
+  seq: number
+  change: FeedChange
+  scope: TaskScope | null // owning task's scope; null when it could not be resolved
+  shared: boolean // visible to every signed-in user (team directory, unscoped deletes)
+  frame: Uint8Array
+}
+
+interface GatewayClient {
+  viewer: Viewer
+  filter: GatewayFilter
+  send: (frame: Uint8Array) => void
+}
+
+const BUFFER_SIZE = 2000
+const HEARTBEAT_MS = 25000
+const RETRY_MS = 3000
+// Keep the feed (and the resume buffer) through brief gaps with no clients, e.g. page reloads
+const IDLE_STOP_MS = 30000
+
+const encoder = new TextEncoder()
+
+/**
+ * True when `viewer` may see a change on a task with `scope`; mirrors the tasks SELECT policy
+ */
+export function canViewTask(viewer: Viewer, scope: TaskScope | null): boolean {
+  if (viewer.role === 'administrator') return true
+  if (!scope) return false
+  const own = scope.created_by === viewer.id ||
+    scope.assignments.some(assignment => viewer.teamMemberIds.includes(assignment.team_member_id))
+  if (viewer.role === 'manager') {
+    return own || (!!viewer.department && scope.department === viewer.department)
+  }
+  return viewer.role === 'viewer' && own
+}
+
+function frame(event: string, id: string | null, data: unknown): Uint8Array {
+  return encoder.encode(`${id ? `id: ${id}\n` : ''}event: ${event}\ndata: ${JSON.stringify(data)}\n\n`)
+}
+
+export class RealtimeGateway {
+  private feed: ChangeFeed
+  private epoch = Date.now().toString(36)
+  private seq = 0
+  private buffer: GatewayEvent[] = []
+  private clients = new Set<GatewayClient>()
+  private taskScopes = new Map<string, TaskScope>()
+  private subtaskTasks = new Map<string, string>()
+  private ingesting: Promise<void> = Promise.resolve()
+  private stopFeed: (() => void) | null = null
+  private upstreamDropped = false
+  private heartbeatTimer: ReturnType<typeof setInterval> | null = null
+  private idleTimer: ReturnType<typeof setTimeout> | null = null
+
+  constructor(feed: ChangeFeed) {
+    this.feed = feed
+  }
+
+  get feedKind() {
+    return this.feed.kind
+  }
+
+  get clientCount() {
+    return this.clients.size
+  }
+
+  /**
+   * Adds a client; returns a function that removes it
+   * Without `lastEventId` the client starts from now; with one it is replayed what it
+   * missed, or told to reset when the gap cannot be filled.
+   */
+  connect(viewer: Viewer, filter: GatewayFilter, send: (frame: Uint8Array) => void, lastEventId: string | null = null): () => void {
+    const client: GatewayClient = { viewer, filter, send }
+    this.start()
+    send(encoder.encode(`retry: ${RETRY_MS}\n\n`))
+
+    const resumeFrom = lastEventId ? this.resumePosition(lastEventId) : null
+    if (lastEventId && resumeFrom === null) {
+      send(frame('reset', this.currentId(), { reason: 'missed-events' }))
+    } else if (resumeFrom !== null) {
+      for (const event of this.buffer) {
+        if (event.seq > resumeFrom && this.visible(client, event)) send(event.frame)
+      }
+    } else {
+      // Gives the EventSource a Last-Event-ID even if it drops before the first change
+      send(frame('ready', this.currentId(), { feed: this.feed.kind }))
+    }
+
+    this.clients.add(client)
+    return () => {
+      this.clients.delete(client)
+      this.scheduleIdleStop()
+    }
+  }
+
+  private currentId() {
+    return `${this.epoch}:${this.seq}`
+  }
+
+  // Sequence number to replay after, or null when the client's position is not in the buffer
+  private resumePosition(lastEventId: string): number | null {
+    const [epoch, seqText] = lastEventId.split(':')
+    const seq = Number(seqText)
+    if (epoch !== this.epoch || !Number.isSafeInteger(seq) || seq > this.seq) return null
+    const oldest = this.buffer.length > 0 ? this.buffer[0].seq : this.seq + 1
+    return seq >= oldest - 1 ? seq : null
+  }
+
+  private visible(client: GatewayClient, event: GatewayEvent): boolean {
+    const { filter, viewer } = client
+    if (filter.tables && !filter.tables.includes(event.change.table as FeedTable)) return false
+    if (event.shared) return true
+    if (filter.department && event.scope?.department !== filter.department) return false
+    return canViewTask(viewer, event.scope)
+  }
+
+  private start() {
+    if (this.idleTimer) {
+      clearTimeout(this.idleTimer)
+      this.idleTimer = null
+    }
+    if (this.stopFeed) return
+
+    this.stopFeed = this.feed.start(
+      change => this.enqueue(change),
+      connected => this.onUpstreamStatus(connected),
+    )
+    this.heartbeatTimer = setInterval(() => {
+      const ping = encoder.encode(': ping\n\n')
+      this.clients.forEach(client => client.send(ping))
+    }, HEARTBEAT_MS)
+  }
+
+  private scheduleIdleStop() {
+    if (this.clients.size > 0 || this.idleTimer) return
+    this.idleTimer = setTimeout(() => {
+      this.idleTimer = null
+      if (this.clients.size > 0) return
+      this.stopFeed?.()
+      this.stopFeed = null
+      if (this.heartbeatTimer) clearInterval(this.heartbeatTimer)
+      this.heartbeatTimer = null
+      this.startNewEpoch() // changes while stopped were not seen
+    }, IDLE_STOP_MS)
+  }
+
+  private startNewEpoch() {
+    this.epoch = Date.now().toString(36)
+    this.seq = 0
+    this.buffer = []
+    this.taskScopes.clear()
+    this.subtaskTasks.clear()
+  }
+
+  private onUpstreamStatus(connected: boolean) {
+    if (!connected) {
+      this.upstreamDropped = true
+      return
+    }
+    if (!this.upstreamDropped) return
+    // postgres_changes does not replay what happened while the channel was down
+    this.upstreamDropped = false
+    this.startNewEpoch()
+    const reset = frame('reset', this.currentId(), { reason: 'upstream-reconnected' })
+    this.clients.forEach(client => client.send(reset))
+    console.warn('⚠️ Realtime gateway feed reconnected, clients told to resync')
+  }
+
+  // Changes are processed one at a time so lookups never reorder them
+  private enqueue(change: FeedChange) {
+    this.ingesting = this.ingesting
+      .then(() => this.ingest(change))
+      .catch(error => console.error('❌ Realtime gateway failed to process a change:', error))
+  }
+
+  private async ingest(change: FeedChange) {
+    if (change.table === 'task_assignments') {
+      this.applyAssignment(change)
+      return
+    }
+
+    const scope = change.table === 'team_members' ? null : await this.scopeFor(change)
+    const unscopedDelete = change.table !== 'team_members' && change.eventType === 'DELETE' && !scope
+    const shared = change.table === 'team_members' || unscopedDelete
+    if (unscopedDelete) {
+      // Only the primary key goes out to viewers who may never have seen the row
+      change = { ...change, new: {}, old: { id: change.old.id } }
+    }
+
+    this.seq++
+    const id = this.currentId()
+    const event: GatewayEvent = {
+      seq: this.seq,
+      change,
+      scope,
+      shared,
+      frame: frame('change', id, change),
+    }
+    this.buffer.push(event)
+    if (this.buffer.length > BUFFER_SIZE) this.buffer.shift()
+
+    let delivered = 0
+    this.clients.forEach(client => {
+      if (this.visible(client, event)) {
+        client.send(event.frame)
+        delivered++
+      }
+    })
+    if (change.table === 'tasks' && change.eventType === 'DELETE') {
+      this.taskScopes.delete(change.old.id)
+    }
+    if (delivered > 0 && this.clients.size >= 50) {
+      console.log(`🚀 PERFORMANCE: Realtime gateway fanned ${change.table} ${change.eventType} out to ${delivered}/${this.clients.size} clients`)
+    }
+  }
+
+  private async scopeFor(change: FeedChange): Promise<TaskScope | null> {
+    const row = change.eventType === 'DELETE' ? change.old : change.new
+
+    if (change.table === 'tasks') {
+      if (change.eventType !== 'DELETE' && 'department' in row) {
+        // Assignees are not on the row: keep the known ones, or look them up (none yet on INSERT)
+        const assignments = change.eventType === 'INSERT'
+          ? this.taskScopes.get(row.id)?.assignments ?? []
+          : (this.taskScopes.get(row.id) ?? await this.feed.taskScope(row.id))?.assignments ?? []
+        const scope = { department: row.department ?? null, created_by: row.created_by ?? null, assignments }
+        this.taskScopes.set(row.id, scope)
+        return scope
+      }
+      return this.taskScope(row.id)
+    }
+
+    let taskId: string | null = row.task_id ?? null
+    if (change.table === 'subtasks') {
+      if (taskId) this.subtaskTasks.set(row.id, taskId)
+      else taskId = await this.subtaskTask(row.id)
+      if (change.eventType === 'DELETE') this.subtaskTasks.delete(row.id)
+    } else if (!taskId && row.subtask_id) {
+      taskId = await this.subtaskTask(row.subtask_id)
+    }
+    return taskId ? this.taskScope(taskId) : null
+  }
+
+  // Keeps cached scopes in step with task_assignments; uncached tasks are looked up when needed.
+  // A DELETE carries only the old row's id unless the table has REPLICA IDENTITY FULL.
+  private applyAssignment(change: FeedChange) {
+    if (change.eventType === 'DELETE') {
+      const id = change.old.id
+      this.taskScopes.forEach((scope, taskId) => {
+        if (scope.assignments.some(assignment => assignment.id === id)) {
+          this.taskScopes.set(taskId, { ...scope, assignments: scope.assignments.filter(assignment => assignment.id !== id) })
+        }
+      })
+      return
+    }
+
+    const { id, task_id: taskId, team_member_id: teamMemberId } = change.new
+    if (!taskId) return
+    const scope = this.taskScopes.get(taskId)
+    if (!scope) return
+    const assignments = scope.assignments.filter(assignment => assignment.id !== id)
+    if (teamMemberId) assignments.push({ id, team_member_id: teamMemberId })
+    this.taskScopes.set(taskId, { ...scope, assignments })
+  }
+
+  private async taskScope(taskId: string): Promise<TaskScope | null> {
+    const known = this.taskScopes.get(taskId)
+    if (known) return known
+    const scope = await this.feed.taskScope(taskId)
+    if (scope) this.taskScopes.set(taskId, scope)
+    return scope
+  }
+
+  private async subtaskTask(subtaskId: string): Promise<string | null> {
+    const known = this.subtaskTasks.get(subtaskId)
+    if (known) return known
+    const taskId = await this.feed.subtaskTaskId(subtaskId)
+    if (taskId) this.subtaskTasks.set(subtaskId, taskId)
+    return taskId
+  }
+}
+
+// On globalThis so every route bundle (and dev hot reloads) share one gateway and one feed
+const gatewayGlobal = globalThis as unknown as { realtimeGateway?: RealtimeGateway }
+
+/** The process-wide gateway, created on first use with the feed REALTIME_FEED selects */
+export function getRealtimeGateway(): RealtimeGateway {
+  if (!gatewayGlobal.realtimeGateway) gatewayGlobal.realtimeGateway = new RealtimeGateway(createChangeFeed())
+  return gatewayGlobal.realtimeGateway
+}
@@ -0,0 +1,35 @@
+/**
+ * Mirrors the Supabase access token into a cookie so server components can
+ * prefetch data for the signed-in user. The session itself still lives in
+ * localStorage (lib/supabase.ts); this cookie is only a read-only copy of the
+ * short-lived access token, refreshed on every auth state change.
+ */
+
+export const ACCESS_TOKEN_COOKIE = 'sb-access-token'
+
+/**
+ * Writes (or clears, when there is no session) the access token cookie
+ */
+export function writeSessionCookie(session: { access_token?: string; expires_at?: number } | null) {
+  if (typeof document === 'undefined') return
+
+  if (!session?.access_token) {
+    clearSessionCookie()
+    return
+  }
+
+  const maxAge = session.expires_at
+    ? Math.max(0, session.expires_at - Math.floor(Date.now() / 1000))
+    : 3600
+  const secure = window.location.protocol === 'https:' ? '; Secure' : ''
+
+  document.cookie = `${ACCESS_TOKEN_COOKIE}=${session.access_token}; Path=/; Max-Age=${maxAge}; SameSite=Lax${secure}`
+}
+
+/**
+ * Removes the access token cookie (used on sign out)
+ */
+export function clearSessionCookie() {
+  if (typeof document === 'undefined') return
+  document.cookie = `${ACCESS_TOKEN_COOKIE}=; Path=/; Max-Age=0; SameSite=Lax`
+}
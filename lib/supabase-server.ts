@@ -0,0 +1,102 @@
+/**
+ * Server-side Supabase access on behalf of the signed-in user
+ * Used by server components and API routes; never import from client components.
+ */
+
+import { cookies } from 'next/headers'
+import { createClient, type SupabaseClient } from '@supabase/supabase-js'
+import { ACCESS_TOKEN_COOKIE } from '@/lib/session-cookie'
+import { fetchBoardChanges, type BoardChangeSet } from '@/lib/board-sync'
+
+/**
+ * Creates a client that forwards the user's access token, so RLS applies as for the browser
+ */
+export function createServerSupabaseClient(accessToken: string): SupabaseClient {
+  return createClient(
+    process.env.NEXT_PUBLIC_SUPABASE_URL!,
+    process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY!,
+    {
+      auth: {
+        autoRefreshToken: false,
+        persistSession: false
+      },
+      global: {
+        headers: { Authorization: `Bearer ${accessToken}` }
+      }
+    }
+  )
+}
+
+/**
+ * Creates a service-role client for server work that runs without a user session
+ * (wall displays). Bypasses RLS, so callers must scope every query themselves.
+ */
+export function createServiceSupabaseClient(): SupabaseClient {
+  return createClient(
+    process.env.NEXT_PUBLIC_SUPABASE_URL!,
+    process.env.SUPABASE_SERVICE_ROLE_KEY!,
+    {
+      auth: {
+        autoRefreshToken: false,
+        persistSession: false
+      }
+    }
+  )
+}
+
+/**
+ * Seconds-since-epoch expiry of a JWT, or null if it cannot be read.
+ * Only used to skip obviously expired tokens; Supabase still verifies the signature.
+ */
+function tokenExpiry(token: string): number | null {
+  try {
+    const payload = JSON.parse(Buffer.from(token.split('.')[1], 'base64url').toString('utf8'))
+    return typeof payload.exp === 'number' ? payload.exp : null
+  } catch {
+    return null
+  }
+}
+
+/**
+ * Reads the access token mirrored into cookies by the browser, if present and unexpired
+ */
+export async function getServerAccessToken(): Promise<string | null> {
+  if (!process.env.NEXT_PUBLIC_SUPABASE_URL || !process.env.NEXT_PUBLIC_SUPABASE_ANON_KEY) {
+    return null
+  }
+
+  const cookieStore = await cookies()
+  const token = cookieStore.get(ACCESS_TOKEN_COOKIE)?.value
+  if (!token) return null
+
+  const expiry = tokenExpiry(token)
+  if (expiry !== null && expiry <= Math.floor(Date.now() / 1000)) return null
+
+  return token
+}
+
+/**
+ * Prefetches the board card snapshot (with its change_log watermark) for the
+ * user in the request cookies. Returns null when there is no usable session,
+ * in which case the client falls back to loading the board itself.
+ */
+export async function fetchServerBoardSnapshot(): Promise<BoardChangeSet | null> {
+  const accessToken = await getServerAccessToken()
+  if (!accessToken) return null
+
+  try {
+    const startTime = Date.now()
+    const { data, error } = await fetchBoardChanges(createServerSupabaseClient(accessToken), null)
+
+    if (error || !data) {
+      console.warn('⚠️ Server board prefetch failed, client will load the board:', error)
+      return null
+    }
+
+    console.log(`🚀 PERFORMANCE: Server prefetched ${data.cards.length} board cards in ${Date.now() - startTime}ms`)
+    return data
+  } catch (error) {
+    console.warn('⚠️ Server board prefetch error, client will load the board:', error)
+    return null
+  }
+}
@@ -0,0 +1,57 @@
+/**
+ * Per-table change versions (see migration 054) for conditional GETs
+ * An API route reads the versions of the tables its response depends on, derives a weak
+ * ETag from them, and answers 304 before running its query when the client is current.
+ * Versions are opaque strings derived from change_log; only equality is meaningful.
+ */
+
+import { createHash } from 'crypto'
+import type { SupabaseClient } from '@supabase/supabase-js'
+
+export type VersionedTable =
+  | 'tasks'
+  | 'subtasks'
+  | 'task_assignments'
+  | 'subtask_assignments'
+  | 'comments'
+  | 'task_attachments'
+  | 'team_members'
+  | 'users'
+
+export type TableVersions = Partial<Record<VersionedTable, string>>
+
+export async function fetchTableVersions(
+  client: SupabaseClient,
+  tables: readonly VersionedTable[]
+): Promise<{ data: TableVersions | null; error: any }> {
+  const { data, error } = await client.rpc('get_table_versions', { p_tables: tables })
+
+  if (error) return { data: null, error }
+
+  const versions: TableVersions = {}
+  for (const row of (data || []) as { table_name: string; version: string }[]) {
+    versions[row.table_name as VersionedTable] = row.version
+  }
+  return { data: versions, error: null }
+}
+
+/**
+ * Weak ETag for a response built from `tables` at `versions`
+ * `variant` covers everything else the body depends on (caller and query string), so one
+ * user's or one filter's tag never validates another's response.
+ *
+ * The versions are read before the data, so a write landing in between yields a body newer
+ * than its tag; the next request then sees a changed version and gets a full response.
+ */
+export function tableVersionsEtag(
+  tables: readonly VersionedTable[],
+  versions: TableVersions,
+  variant: string
+): string {
+  const version = createHash('sha1')
+    .update(tables.map(table => versions[table] ?? '0').join('.'))
+    .digest('base64url')
+    .slice(0, 16)
+  const scope = createHash('sha1').update(variant).digest('base64url').slice(0, 16)
+  return `W/"${version}-${scope}"`
+}
@@ -3,6 +3,8 @@
  * Provides robust data validation and normalization
  */
 
+import type { Task } from '@/hooks/use-tasks';
+
 /**
  * Normalizes dates to YYYY-MM-DD format for database storage
  * Handles various input types gracefully
@@ -131,7 +133,6 @@ export function mapUITaskToDatabase(uiTask: {
   assignees?: string[];
   department?: string;
   created_by: string;
-  documentLinks?: string[]; // Add document links support
 }): Record<string, any> {
   // Build the payload with transformations
   const payload = {
@@ -143,9 +144,107 @@ export function mapUITaskToDatabase(uiTask: {
     due_date: normaliseDateToYMD(uiTask.dueDate),
     created_by: uiTask.created_by,
     department: safeTrim(uiTask.department) ?? 'Production', // Default to Production
-    document_links: uiTask.documentLinks || [], // Map document links to database field
   };
   
   // Filter out undefined values and return
   return filterUndefinedValues(payload);
-} 
\ No newline at end of file
+}
+
+/**
+ * Ensures a link has an http(s) protocol so it opens as an absolute URL
+ */
+export function ensureUrlProtocol(link: string): string {
+  const trimmed = link.trim();
+  if (trimmed.startsWith('http://') || trimmed.startsWith('https://')) {
+    return trimmed;
+  }
+  return 'https://' + trimmed;
+}
+
+/**
+ * Maps a task_attachments row to the attachment shape used by the UI
+ */
+export function mapAttachmentRowToUI(row: {
+  id: string;
+  task_id?: string | null;
+  subtask_id?: string | null;
+  description: string;
+  url: string;
+  file_name?: string | null;
+  mime_type?: string | null;
+  size_bytes?: number | null;
+  checksum?: string | null;
+  uploaded_by?: string | null;
+  order_index?: number | null;
+  created_at?: string | null;
+}) {
+  return {
+    id: row.id,
+    taskId: row.task_id ?? undefined,
+    subtaskId: row.subtask_id ?? undefined,
+    description: row.description,
+    link: ensureUrlProtocol(row.url),
+    fileName: row.file_name ?? undefined,
+    mimeType: row.mime_type ?? undefined,
+    sizeBytes: row.size_bytes ?? undefined,
+    checksum: row.checksum ?? undefined,
+    uploadedBy: row.uploaded_by ?? undefined,
+    orderIndex: row.order_index ?? 0,
+    createdAt: row.created_at || new Date().toISOString(),
+    persisted: true,
+  };
+}
+
+/**
+ * Columns of the task_board_cards view (see migration 052)
+ * Only what a Kanban card renders; details are loaded on demand
+ */
+export const TASK_BOARD_CARD_COLUMNS =
+  'id, title, priority, status, start_date, due_date, department, created_by, order_index, created_at, updated_at, ' +
+  'assignee_ids, assignee_initials, subtask_total, subtask_done, comment_count, attachment_count';
+
+/**
+ * Maps a task_board_cards row to the UI task format
+ * Subtasks, comments and attachments are left empty until fetchTaskDetails runs
+ */
+export function mapBoardCardToUITask(row: any): Task {
+  return {
+    id: row.id,
+    title: row.title,
+    priority: row.priority,
+    status: row.status,
+    startDate: row.start_date ?? undefined,
+    dueDate: row.due_date ?? undefined,
+    department: row.department ?? undefined,
+    assignees: row.assignee_ids || [],
+    assigneeInitials: row.assignee_initials || [],
+    subtasks: [], // Load on-demand when task is opened
+    comments: [], // Load on-demand when task is opened
+    attachments: [], // Load on-demand when task is opened
+    subtaskCount: row.subtask_total ?? 0,
+    completedSubtaskCount: row.subtask_done ?? 0,
+    commentCount: row.comment_count ?? 0,
+    attachmentCount: row.attachment_count ?? 0,
+    created_by: row.created_by,
+    created_at: row.created_at,
+    updated_at: row.updated_at,
+  };
+}
+
+/**
+ * Applies the plain columns of a tasks row (update response or realtime payload)
+ * to an existing UI task, keeping the aggregated card fields and loaded details
+ */
+export function mergeTaskRowIntoUITask(existing: Task, row: any): Task {
+  return {
+    ...existing,
+    title: row.title ?? existing.title,
+    description: row.description ?? existing.description,
+    priority: row.priority ?? existing.priority,
+    status: row.status ?? existing.status,
+    startDate: row.start_date !== undefined ? row.start_date ?? undefined : existing.startDate,
+    dueDate: row.due_date !== undefined ? row.due_date ?? undefined : existing.dueDate,
+    department: row.department ?? existing.department,
+    updated_at: row.updated_at ?? existing.updated_at,
+  };
+}
@@ -0,0 +1,170 @@
+/**
+ * External store for the Kanban board state
+ * Components subscribe to a selected slice (one task, a column's ids, the summary counts)
+ * through useSyncExternalStore, so a realtime update to one task re-renders only the
+ * card showing it and the counts/columns whose selected value actually changed.
+ * Selectors answer from the incrementally maintained BoardIndex (lib/board-index.ts), or
+ * from the board worker's last result once one is attached (lib/board-worker.ts).
+ */
+
+import { useCallback, useRef, useSyncExternalStore } from 'react'
+import type { Task } from '@/hooks/use-tasks'
+import {
+  boardCounts,
+  columnIds,
+  constraintsFor,
+  createBoardIndex,
+  intersect,
+  searchIds,
+  tasksFor,
+  updateBoardIndex,
+  type BoardFilterType,
+  type BoardIndex,
+  type TaskCounts,
+} from '@/lib/board-index'
+
+export type { TaskCounts }
+
+export interface BoardFilter {
+  type: BoardFilterType
+}
+
+// Column slices and counts computed off the main thread for the current tasks/search/filter
+export interface BoardDerivation {
+  columns: Record<string, string[]>
+  counts: TaskCounts
+}
+
+export interface TaskStoreState {
+  tasks: Task[]
+  index: BoardIndex // updated in place; a new state object is published on every change
+  filter: BoardFilter
+  searchQuery: string
+  derived: BoardDerivation | null // latest worker result; null until a worker answers (or without one)
+}
+
+export interface TaskStore {
+  getState: () => TaskStoreState
+  setState: (updates: Partial<Omit<TaskStoreState, 'index'>>) => void
+  subscribe: (listener: () => void) => () => void
+}
+
+export type EqualityFn<T> = (a: T, b: T) => boolean
+
+export function createTaskStore(initialTasks: Task[] = []): TaskStore {
+  let state: TaskStoreState = {
+    tasks: initialTasks,
+    index: createBoardIndex(initialTasks),
+    filter: { type: 'all' },
+    searchQuery: '',
+    derived: null,
+  }
+  const listeners = new Set<() => void>()
+
+  return {
+    getState: () => state,
+    setState: (updates) => {
+      const changed = (Object.keys(updates) as (keyof typeof updates)[])
+        .some(key => updates[key] !== state[key])
+      if (!changed) return
+
+      if (updates.tasks && updates.tasks !== state.tasks) {
+        // Unchanged tasks keep their object identity, so only changed ones are re-indexed
+        // and per-task selectors stay equal
+        updateBoardIndex(state.index, updates.tasks)
+      }
+      state = { ...state, ...updates }
+      listeners.forEach(listener => listener())
+    },
+    subscribe: (listener) => {
+      listeners.add(listener)
+      return () => listeners.delete(listener)
+    },
+  }
+}
+
+export function shallowEqual<T>(a: T, b: T): boolean {
+  if (Object.is(a, b)) return true
+  if (typeof a !== 'object' || typeof b !== 'object' || a === null || b === null) return false
+  if (Array.isArray(a) !== Array.isArray(b)) return false
+
+  const keysA = Object.keys(a) as (keyof T)[]
+  const keysB = Object.keys(b)
+  if (keysA.length !== keysB.length) return false
+  return keysA.every(key => Object.prototype.hasOwnProperty.call(b, key) && Object.is(a[key], b[key]))
+}
+
+/**
+ * Subscribes a component to `selector(store.getState())`
+ * The component re-renders only when the selected value changes according to `isEqual`;
+ * the previous selection is returned otherwise so memoized children keep their props.
+ */
+export function useStoreSelector<T>(
+  store: TaskStore,
+  selector: (state: TaskStoreState) => T,
+  isEqual: EqualityFn<T> = Object.is,
+): T {
+  const cache = useRef<{ state: TaskStoreState; selector: typeof selector; value: T } | null>(null)
+
+  const getSelection = useCallback(() => {
+    const state = store.getState()
+    const cached = cache.current
+    if (cached && cached.state === state && cached.selector === selector) {
+      return cached.value
+    }
+    const next = selector(state)
+    const value = cached && isEqual(cached.value, next) ? cached.value : next
+    cache.current = { state, selector, value }
+    return value
+  }, [store, selector, isEqual])
+
+  return useSyncExternalStore(store.subscribe, getSelection, getSelection)
+}
+
+// Selectors
+
+export function selectTask(state: TaskStoreState, id: string): Task | null {
+  return state.index.entries.get(id)?.task ?? null
+}
+
+const searchCache = new WeakMap<TaskStoreState, ReadonlySet<string> | null>()
+
+function selectSearchIds(state: TaskStoreState): ReadonlySet<string> | null {
+  if (!searchCache.has(state)) {
+    searchCache.set(state, searchIds(state.index, state.searchQuery))
+  }
+  return searchCache.get(state)!
+}
+
+function activeConstraints(state: TaskStoreState): ReadonlySet<string>[] {
+  return constraintsFor(state.index, selectSearchIds(state), state.filter.type)
+}
+
+const filteredCache = new WeakMap<TaskStoreState, Task[]>()
+
+export function selectFilteredTasks(state: TaskStoreState): Task[] {
+  const cached = filteredCache.get(state)
+  if (cached) return cached
+
+  const constraints = activeConstraints(state)
+  const filteredTasks = constraints.length === 0 ? state.tasks : tasksFor(state.index, intersect(constraints))
+  filteredCache.set(state, filteredTasks)
+  return filteredTasks
+}
+
+const NO_IDS: string[] = []
+
+/**
+ * Ids of the filtered tasks in one status column, in board order; compare with shallowEqual
+ * Reads the worker's result when one is attached, so a realtime burst costs the main thread
+ * only the index update; the columns follow as soon as the worker posts back.
+ */
+export function selectColumnTaskIds(state: TaskStoreState, status: string): string[] {
+  if (state.derived) return state.derived.columns[status] ?? NO_IDS
+  return columnIds(state.index, status, activeConstraints(state))
+}
+
+/** Unfiltered board totals for the dashboard summary; compare with shallowEqual */
+export function selectTaskCounts(state: TaskStoreState): TaskCounts {
+  return state.derived?.counts ?? boardCounts(state.index)
+}
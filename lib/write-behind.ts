@@ -0,0 +1,118 @@
+/**
+ * Write-behind buffer for rapid edits
+ * Edits to one record inside a short window are merged into one pending write, which is sent
+ * once the record has been quiet for `delayMs` (and at most `maxWaitMs` after the first edit).
+ * A burst of status toggles, date picks or assignee clicks becomes a single round trip; the
+ * flush itself goes through the mutation queue (lib/mutation-queue.ts), which keeps ordering
+ * with other writes to the record, retries and rolls back.
+ * Everything pending is flushed when the tab is hidden or closed.
+ */
+
+export interface WriteBehindOptions {
+  delayMs?: number
+  maxWaitMs?: number
+}
+
+export interface EditOptions {
+  immediate?: boolean // send now (with anything already pending) instead of after the window
+}
+
+interface PendingWrite<P, T> {
+  patch: P
+  flush: (patch: P) => Promise<T>
+  timer: ReturnType<typeof setTimeout> | null
+  firstEditAt: number
+  edits: number
+  waiters: { resolve: (result: T) => void; reject: (error: any) => void }[]
+}
+
+export class WriteBehind {
+  private pending = new Map<string, PendingWrite<any, any>>()
+  private delayMs: number
+  private maxWaitMs: number
+
+  constructor({ delayMs = 400, maxWaitMs = 2000 }: WriteBehindOptions = {}) {
+    this.delayMs = delayMs
+    this.maxWaitMs = maxWaitMs
+  }
+
+  /**
+   * Merges `patch` into the pending write for `key`; resolves with the result of the flush
+   * that carried it. Every edit coalesced into one write gets the same result (or error).
+   * `merge` folds a newer patch into the pending one, `flush` sends the merged patch; the
+   * most recent `flush` is used. `immediate` sends the merged write right away.
+   */
+  schedule<P, T>(
+    key: string,
+    patch: P,
+    merge: (pending: P, next: P) => P,
+    flush: (patch: P) => Promise<T>,
+    immediate = false,
+  ): Promise<T> {
+    let entry = this.pending.get(key) as PendingWrite<P, T> | undefined
+    if (entry) {
+      entry.patch = merge(entry.patch, patch)
+      entry.flush = flush
+      entry.edits++
+    } else {
+      entry = { patch, flush, timer: null, firstEditAt: Date.now(), edits: 1, waiters: [] }
+      this.pending.set(key, entry)
+    }
+
+    const result = new Promise<T>((resolve, reject) => entry!.waiters.push({ resolve, reject }))
+
+    if (entry.timer) clearTimeout(entry.timer)
+    const wait = immediate ? 0 : Math.min(this.delayMs, Math.max(0, entry.firstEditAt + this.maxWaitMs - Date.now()))
+    if (wait === 0) {
+      entry.timer = null
+      void this.flush(key)
+    } else {
+      entry.timer = setTimeout(() => void this.flush(key), wait)
+    }
+    return result
+  }
+
+  /** Sends the pending write for `key`, if any; resolves once it has settled */
+  async flush(key: string): Promise<void> {
+    const entry = this.pending.get(key)
+    if (!entry) return
+    this.pending.delete(key)
+    if (entry.timer) clearTimeout(entry.timer)
+
+    if (entry.edits > 1) {
+      console.log(`🚀 PERFORMANCE: Coalesced ${entry.edits} edits to ${key} into one write`)
+    }
+    try {
+      const result = await entry.flush(entry.patch)
+      entry.waiters.forEach(waiter => waiter.resolve(result))
+    } catch (error) {
+      entry.waiters.forEach(waiter => waiter.reject(error))
+    }
+  }
+
+  /** Sends every pending write */
+  async flushAll(): Promise<void> {
+    await Promise.all([...this.pending.keys()].map(key => this.flush(key)))
+  }
+
+  /** True while an edit to `key` is waiting to be sent */
+  has(key: string): boolean {
+    return this.pending.has(key)
+  }
+
+  /** Number of records with edits waiting to be sent */
+  get size(): number {
+    return this.pending.size
+  }
+}
+
+// Shared by task and subtask edits in useTasks, keyed like the mutation queue (`task:<id>`)
+export const writeBehind = new WriteBehind()
+
+if (typeof window !== 'undefined') {
+  // Requests started while the page is being hidden still go out; waiting for the timer would not
+  window.addEventListener('pagehide', () => void writeBehind.flushAll())
+  document.addEventListener('visibilitychange', () => {
+    if (document.visibilityState === 'hidden') void writeBehind.flushAll()
+  })
+}
@@ -1,3 +1,12 @@
+// Avatars live in Supabase Storage; only that host is run through the image optimizer
+// (https in production, http://127.0.0.1:54321 on the local stack)
+const supabaseUrl = process.env.NEXT_PUBLIC_SUPABASE_URL ? new URL(process.env.NEXT_PUBLIC_SUPABASE_URL) : null
+
+// HTML that depends on the signed-in user or carries auth tokens: never stored, so a shared
+// plant tablet cannot show the previous user's board or replay an auth callback.
+// Wall displays carry their access key in the URL.
+const noStorePaths = ['/kanban', '/dashboard', '/auth/:path*', '/display/:path*']
+
 /** @type {import('next').NextConfig} */
 const nextConfig = {
   eslint: {
@@ -6,22 +15,46 @@ const nextConfig = {
   typescript: {
     ignoreBuildErrors: true,
   },
+  // Served by the app's own /_next/image endpoint, no external image CDN
   images: {
-    unoptimized: true,
+    formats: ['image/avif', 'image/webp'],
+    // Avatars render at 40-128px; keep the generated widths close to those
+    imageSizes: [32, 40, 48, 64, 96, 128, 256],
+    // Optimized variants are reused for a day before the source is fetched again
+    minimumCacheTTL: 60 * 60 * 24,
+    remotePatterns: supabaseUrl
+      ? [{
+          protocol: supabaseUrl.protocol.replace(':', ''),
+          hostname: supabaseUrl.hostname,
+          ...(supabaseUrl.port ? { port: supabaseUrl.port } : {}),
+          pathname: '/storage/v1/object/public/**',
+        }]
+      : [],
   },
-  // Prevent HTML caching issues during development
+  // Hashed /_next/static assets already get `public, max-age=31536000, immutable` from Next
+  // in production; these rules only cover HTML documents
   async headers() {
     return [
       {
+        // Other pages may be stored but are revalidated on every load (ETag -> 304)
         source: '/:path*',
-        has: [{ type: 'header', key: 'Accept', value: 'text/html' }],
+        has: [{ type: 'header', key: 'Accept', value: '(.*)text/html(.*)' }],
         headers: [
           {
             key: 'Cache-Control',
-            value: 'no-cache, no-store, must-revalidate',
+            value: 'no-cache, must-revalidate',
           },
         ],
       },
+      ...noStorePaths.map((source) => ({
+        source,
+        headers: [
+          {
+            key: 'Cache-Control',
+            value: 'private, no-cache, no-store, must-revalidate',
+          },
+        ],
+      })),
     ];
   },
 }
@@ -0,0 +1,119 @@
+#!/usr/bin/env node
+
+/**
+ * Bundle size budget check
+ * Runs after `next build`: sums the gzipped first-load JavaScript of every App Router
+ * route (shared runtime + root layout + the route's own chunks) and compares it with
+ * bundle-budgets.json. Exits non-zero when a route is over budget, failing the build.
+ * Routes without a budget (no route entry and no defaultFirstLoadKb) are reported only.
+ *
+ * Until a build has been measured, every route is held to `defaultFirstLoadKb`, a generous
+ * ceiling (500 KB) that still fails on a runaway import. `--record` tightens it: it writes
+ * each route's current first load plus `headroomPercent` (default 10) to bundle-budgets.json,
+ * with the build it came from.
+ *
+ * Usage: node scripts/check-bundle-size.mjs [--json] [--record]
+ */
+
+import { execSync } from 'node:child_process'
+import { existsSync, readFileSync, writeFileSync } from 'node:fs'
+import { join } from 'node:path'
+import { gzipSync } from 'node:zlib'
+
+const root = process.cwd()
+const distDir = join(root, '.next')
+const budgetsPath = join(root, 'bundle-budgets.json')
+
+function readJson(path) {
+  return JSON.parse(readFileSync(path, 'utf8'))
+}
+
+if (!existsSync(join(distDir, 'app-build-manifest.json'))) {
+  console.error('❌ .next/app-build-manifest.json not found - run `next build` first')
+  process.exit(1)
+}
+
+const appManifest = readJson(join(distDir, 'app-build-manifest.json'))
+const buildManifest = readJson(join(distDir, 'build-manifest.json'))
+const budgets = readJson(budgetsPath)
+
+const gzipCache = new Map()
+function gzipSize(file) {
+  if (!gzipCache.has(file)) {
+    const path = join(distDir, file)
+    gzipCache.set(file, existsSync(path) ? gzipSync(readFileSync(path), { level: 9 }).length : 0)
+  }
+  return gzipCache.get(file)
+}
+
+const isJs = (file) => file.endsWith('.js')
+const sum = (files) => files.reduce((total, file) => total + gzipSize(file), 0)
+const kb = (bytes) => (bytes / 1024).toFixed(1)
+
+const pages = appManifest.pages || {}
+// Loaded on every route: the React/Next runtime and the root layout's client components
+const shared = new Set([...(buildManifest.rootMainFiles || []), ...(pages['/layout'] || [])].filter(isJs))
+
+const results = Object.entries(pages)
+  .filter(([entry]) => entry.endsWith('/page'))
+  .map(([entry, files]) => {
+    const own = files.filter((file) => isJs(file) && !shared.has(file))
+    const route = entry.replace(/\/page$/, '') || '/'
+    const firstLoad = sum([...shared, ...own])
+    const budgetKb = budgets.routes?.[route] ?? budgets.defaultFirstLoadKb ?? null
+    return { route, ownBytes: sum(own), firstLoadBytes: firstLoad, budgetKb, over: budgetKb !== null && firstLoad > budgetKb * 1024 }
+  })
+  .sort((a, b) => a.route.localeCompare(b.route))
+
+if (process.argv.includes('--record')) {
+  const headroom = 1 + (budgets.headroomPercent ?? 10) / 100
+  const budgetFor = (bytes) => Math.ceil((bytes * headroom) / 1024)
+  let commit = null
+  try {
+    commit = execSync('git rev-parse --short HEAD', { encoding: 'utf8', stdio: ['ignore', 'pipe', 'ignore'] }).trim()
+  } catch {
+    // not a git checkout
+  }
+  const recorded = {
+    ...budgets,
+    defaultFirstLoadKb: budgetFor(Math.max(...results.map((result) => result.firstLoadBytes))),
+    routes: Object.fromEntries(results.map((result) => [result.route, budgetFor(result.firstLoadBytes)])),
+    measured: {
+      commit,
+      date: new Date().toISOString().slice(0, 10),
+      sharedKb: Number(kb(sum([...shared]))),
+      firstLoadKb: Object.fromEntries(results.map((result) => [result.route, Number(kb(result.firstLoadBytes))])),
+    },
+  }
+  writeFileSync(budgetsPath, `${JSON.stringify(recorded, null, 2)}\n`)
+  console.log(`📝 Recorded budgets for ${results.length} route(s) in bundle-budgets.json (+${Math.round((headroom - 1) * 100)}% headroom)`)
+  process.exit(0)
+}
+
+if (process.argv.includes('--json')) {
+  console.log(JSON.stringify({ sharedBytes: sum([...shared]), routes: results }, null, 2))
+} else {
+  console.log(`\n📦 First-load JS per route (gzip), shared ${kb(sum([...shared]))} KB`)
+  for (const result of results) {
+    const status = result.budgetKb === null ? '➖' : result.over ? '❌' : '✅'
+    console.log(
+      `${status} ${result.route.padEnd(32)} ${kb(result.firstLoadBytes).padStart(7)} KB / ${String(result.budgetKb ?? '-').padStart(4)} KB` +
+        `  (route ${kb(result.ownBytes)} KB)`,
+    )
+  }
+}
+
+const overBudget = results.filter((result) => result.over)
+if (overBudget.length > 0) {
+  console.error(`\n❌ ${overBudget.length} route(s) over the bundle budget in bundle-budgets.json:`)
+  for (const result of overBudget) {
+    console.error(`   ${result.route}: ${kb(result.firstLoadBytes)} KB > ${result.budgetKb} KB`)
+  }
+  console.error('   Lazy-load the new heavy imports (components/lazy-components.tsx) or raise the budget deliberately.')
+  process.exit(1)
+}
+
+if (results.some((result) => result.budgetKb === null)) {
+  console.warn('\n⚠️ Some routes have no budget yet; run `npm run check:bundle -- --record` after a build to set them')
+}
+console.log('\n✅ All budgeted routes within bundle budget')
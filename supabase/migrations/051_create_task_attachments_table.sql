@@ -0,0 +1,134 @@
+-- Migration: Normalized task_attachments table
+-- Replaces the tasks.document_links / subtasks.document_links TEXT[] columns with
+-- one row per attachment so that:
+-- 1. Attachments have stable ids and real descriptions (no more "Document N")
+-- 2. Metadata (size, mime type, checksum, uploader) can be stored
+-- 3. Adding/removing one attachment no longer rewrites the whole task row
+-- 4. The board can fetch attachment counts only, full lists load on demand
+
+-- Step 1: Create the attachments table
+CREATE TABLE IF NOT EXISTS public.task_attachments (
+  id UUID PRIMARY KEY DEFAULT uuid_generate_v4(),
+  task_id UUID REFERENCES public.tasks(id) ON DELETE CASCADE,
+  subtask_id UUID REFERENCES public.subtasks(id) ON DELETE CASCADE,
+  description VARCHAR(255) NOT NULL,
+  url TEXT NOT NULL,
+  file_name VARCHAR(255),
+  mime_type VARCHAR(255),
+  size_bytes BIGINT CHECK (size_bytes IS NULL OR size_bytes >= 0),
+  checksum VARCHAR(128), -- hex encoded sha-256 of the file contents, when known
+  uploaded_by UUID REFERENCES public.users(id) ON DELETE SET NULL,
+  order_index INTEGER NOT NULL DEFAULT 0,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  CHECK (
+    (task_id IS NOT NULL AND subtask_id IS NULL) OR
+    (task_id IS NULL AND subtask_id IS NOT NULL)
+  )
+);
+
+-- Step 2: Create indexes for the board (counts per task) and the modal (ordered lists)
+CREATE INDEX IF NOT EXISTS idx_task_attachments_task_id
+ON public.task_attachments(task_id, order_index)
+WHERE task_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_task_attachments_subtask_id
+ON public.task_attachments(subtask_id, order_index)
+WHERE subtask_id IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_task_attachments_uploaded_by
+ON public.task_attachments(uploaded_by);
+
+-- Step 3: Keep updated_at current
+DROP TRIGGER IF EXISTS update_task_attachments_updated_at ON public.task_attachments;
+CREATE TRIGGER update_task_attachments_updated_at BEFORE UPDATE ON public.task_attachments
+  FOR EACH ROW EXECUTE FUNCTION public.update_updated_at_column();
+
+-- Step 4: Enable Row Level Security
+ALTER TABLE public.task_attachments ENABLE ROW LEVEL SECURITY;
+
+-- Step 5: RLS policies (mirror the comments table: everyone signed in can read,
+-- managers/administrators and the original uploader can change)
+DROP POLICY IF EXISTS "Authenticated users can view task attachments" ON public.task_attachments;
+CREATE POLICY "Authenticated users can view task attachments" ON public.task_attachments
+  FOR SELECT USING (auth.role() = 'authenticated');
+
+DROP POLICY IF EXISTS "Managers can create task attachments" ON public.task_attachments;
+CREATE POLICY "Managers can create task attachments" ON public.task_attachments
+  FOR INSERT WITH CHECK (
+    EXISTS (
+      SELECT 1 FROM public.users u
+      WHERE u.id = auth.uid() AND u.role IN ('administrator', 'manager')
+    )
+  );
+
+DROP POLICY IF EXISTS "Uploaders and managers can update task attachments" ON public.task_attachments;
+CREATE POLICY "Uploaders and managers can update task attachments" ON public.task_attachments
+  FOR UPDATE USING (
+    uploaded_by = auth.uid() OR
+    EXISTS (
+      SELECT 1 FROM public.users u
+      WHERE u.id = auth.uid() AND u.role IN ('administrator', 'manager')
+    )
+  );
+
+DROP POLICY IF EXISTS "Uploaders and managers can delete task attachments" ON public.task_attachments;
+CREATE POLICY "Uploaders and managers can delete task attachments" ON public.task_attachments
+  FOR DELETE USING (
+    uploaded_by = auth.uid() OR
+    EXISTS (
+      SELECT 1 FROM public.users u
+      WHERE u.id = auth.uid() AND u.role IN ('administrator', 'manager')
+    )
+  );
+
+-- Step 6: Backfill from the legacy document_links arrays, keeping array order
+INSERT INTO public.task_attachments (task_id, description, url, uploaded_by, order_index, created_at)
+SELECT
+  t.id,
+  'Document ' || link.ordinality,
+  CASE
+    WHEN btrim(link.url) ~* '^https?://' THEN btrim(link.url)
+    ELSE 'https://' || btrim(link.url)
+  END,
+  t.created_by,
+  link.ordinality - 1,
+  t.created_at
+FROM public.tasks t
+CROSS JOIN LATERAL unnest(t.document_links) WITH ORDINALITY AS link(url, ordinality)
+WHERE COALESCE(btrim(link.url), '') <> ''
+AND NOT EXISTS (
+  SELECT 1 FROM public.task_attachments ta WHERE ta.task_id = t.id
+);
+
+INSERT INTO public.task_attachments (subtask_id, description, url, order_index, created_at)
+SELECT
+  s.id,
+  'Document ' || link.ordinality,
+  CASE
+    WHEN btrim(link.url) ~* '^https?://' THEN btrim(link.url)
+    ELSE 'https://' || btrim(link.url)
+  END,
+  link.ordinality - 1,
+  s.created_at
+FROM public.subtasks s
+CROSS JOIN LATERAL unnest(s.document_links) WITH ORDINALITY AS link(url, ordinality)
+WHERE COALESCE(btrim(link.url), '') <> ''
+AND NOT EXISTS (
+  SELECT 1 FROM public.task_attachments ta WHERE ta.subtask_id = s.id
+);
+
+-- Step 7: Enable realtime for the new table
+DO $$
+BEGIN
+  ALTER PUBLICATION supabase_realtime ADD TABLE public.task_attachments;
+EXCEPTION
+  WHEN duplicate_object THEN NULL;
+  WHEN undefined_object THEN NULL;
+END $$;
+
+-- Step 8: Add comments for documentation
+COMMENT ON TABLE public.task_attachments IS 'One row per attachment (link or uploaded file) on a task or subtask';
+COMMENT ON COLUMN public.task_attachments.checksum IS 'Hex encoded sha-256 of the file contents, NULL for plain links';
+COMMENT ON COLUMN public.tasks.document_links IS 'DEPRECATED: superseded by public.task_attachments, no longer written by the app';
+COMMENT ON COLUMN public.subtasks.document_links IS 'DEPRECATED: superseded by public.task_attachments, no longer written by the app';
@@ -0,0 +1,74 @@
+-- Migration: Lightweight board projection for Kanban cards
+-- fetchTasks used to pull every task with nested task_assignments -> team_members
+-- and all subtasks just to draw cards. This view returns only what task-card.tsx
+-- renders, with the nested data pre-aggregated into counts and initials.
+-- Everything else (description, subtasks, comments, attachments) stays behind
+-- fetchTaskDetails and is loaded when a task modal opens.
+
+-- security_invoker makes the view evaluate the RLS policies of the caller,
+-- so it exposes exactly the rows the underlying tables would.
+CREATE OR REPLACE VIEW public.task_board_cards
+WITH (security_invoker = true) AS
+SELECT
+  t.id,
+  t.title,
+  t.priority,
+  t.status,
+  t.start_date,
+  t.due_date,
+  t.department,
+  t.created_by,
+  t.order_index,
+  t.created_at,
+  t.updated_at,
+  COALESCE(a.assignee_ids, ARRAY[]::UUID[]) AS assignee_ids,
+  COALESCE(a.assignee_initials, ARRAY[]::TEXT[]) AS assignee_initials,
+  COALESCE(s.subtask_total, 0) AS subtask_total,
+  COALESCE(s.subtask_done, 0) AS subtask_done,
+  COALESCE(c.comment_count, 0) + COALESCE(sc.comment_count, 0) AS comment_count,
+  COALESCE(f.attachment_count, 0) AS attachment_count
+FROM public.tasks t
+LEFT JOIN LATERAL (
+  SELECT
+    ARRAY_AGG(tm.id ORDER BY ta.assigned_at) AS assignee_ids,
+    -- "Alex Johnson" -> "AJ", same as the initials task-card.tsx used to compute
+    ARRAY_AGG(
+      upper(regexp_replace(btrim(tm.full_name), '(\S)\S*\s*', '\1', 'g'))
+      ORDER BY ta.assigned_at
+    ) AS assignee_initials
+  FROM public.task_assignments ta
+  JOIN public.team_members tm ON tm.id = ta.team_member_id
+  WHERE ta.task_id = t.id
+) a ON true
+LEFT JOIN LATERAL (
+  SELECT
+    COUNT(*)::INTEGER AS subtask_total,
+    COUNT(*) FILTER (WHERE st.completed)::INTEGER AS subtask_done
+  FROM public.subtasks st
+  WHERE st.task_id = t.id
+) s ON true
+LEFT JOIN LATERAL (
+  SELECT COUNT(*)::INTEGER AS comment_count
+  FROM public.comments cm
+  WHERE cm.task_id = t.id
+) c ON true
+LEFT JOIN LATERAL (
+  SELECT COUNT(*)::INTEGER AS comment_count
+  FROM public.comments cm
+  JOIN public.subtasks st ON st.id = cm.subtask_id
+  WHERE st.task_id = t.id
+) sc ON true
+LEFT JOIN LATERAL (
+  SELECT COUNT(*)::INTEGER AS attachment_count
+  FROM public.task_attachments att
+  WHERE att.task_id = t.id
+) f ON true;
+
+-- Indexes backing the lateral lookups (most already exist, kept idempotent)
+CREATE INDEX IF NOT EXISTS idx_task_assignments_task_id ON public.task_assignments(task_id);
+CREATE INDEX IF NOT EXISTS idx_subtasks_task_id_completed ON public.subtasks(task_id, completed);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON public.tasks(updated_at DESC);
+
+GRANT SELECT ON public.task_board_cards TO authenticated;
+
+COMMENT ON VIEW public.task_board_cards IS 'Card-only projection of tasks for the Kanban board (counts and initials instead of nested rows)';
@@ -0,0 +1,282 @@
+-- Migration: Board change log and delta sync
+-- Reconnecting clients and drag/drop used to re-download the whole board.
+-- Every write to the board tables now appends to change_log with a sequence
+-- number and the writing transaction's id; get_board_changes(since) returns only
+-- what changed after that watermark, with tombstones for deleted rows.
+--
+-- The watermark is a transaction horizon, not a seq: sequence values are drawn
+-- in call order but become visible in commit order, so a transaction holding a
+-- lower seq can commit after a reader has moved past it. A delta covers the
+-- transactions with xid in [since, horizon), where horizon is the xmin of the
+-- reader's snapshot: every transaction below it has finished, so nothing can
+-- still appear in that range.
+
+-- Step 1: Change log table; seq orders changes to one record, xid places them in time
+CREATE SEQUENCE IF NOT EXISTS public.change_log_seq;
+
+CREATE TABLE IF NOT EXISTS public.change_log (
+  seq BIGINT PRIMARY KEY DEFAULT nextval('public.change_log_seq'),
+  xid XID8 NOT NULL DEFAULT pg_current_xact_id(),
+  table_name VARCHAR(64) NOT NULL,
+  record_id UUID, -- NULL only on reset markers
+  task_id UUID, -- owning task, so the affected card can be re-sent
+  -- I/U/D for row changes; R marks a point before which changes may be missing
+  -- (log pruned, bulk load without triggers), so older watermarks must reset
+  op CHAR(1) NOT NULL CHECK (op IN ('I', 'U', 'D', 'R')),
+  changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  CHECK (op = 'R' OR record_id IS NOT NULL)
+);
+
+ALTER SEQUENCE public.change_log_seq OWNED BY public.change_log.seq;
+
+CREATE INDEX IF NOT EXISTS idx_change_log_xid ON public.change_log(xid, seq);
+CREATE INDEX IF NOT EXISTS idx_change_log_record ON public.change_log(table_name, record_id, seq DESC);
+CREATE INDEX IF NOT EXISTS idx_change_log_changed_at ON public.change_log(changed_at);
+CREATE INDEX IF NOT EXISTS idx_change_log_resets ON public.change_log(xid) WHERE op = 'R';
+
+-- Step 2: Trigger function that records every change with its owning task
+CREATE OR REPLACE FUNCTION public.log_board_change()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_row RECORD;
+  v_task_id UUID;
+  v_subtask_id UUID;
+BEGIN
+  IF TG_OP = 'DELETE' THEN
+    v_row := OLD;
+  ELSE
+    v_row := NEW;
+  END IF;
+
+  IF TG_TABLE_NAME = 'tasks' THEN
+    v_task_id := v_row.id;
+  ELSIF TG_TABLE_NAME IN ('subtasks', 'task_assignments') THEN
+    v_task_id := v_row.task_id;
+  ELSIF TG_TABLE_NAME = 'subtask_assignments' THEN
+    v_subtask_id := v_row.subtask_id;
+  ELSIF TG_TABLE_NAME IN ('team_members', 'users') THEN
+    NULL; -- logged for table versions (migration 054), not part of any card
+  ELSE
+    -- comments and task_attachments belong to either a task or a subtask
+    v_task_id := v_row.task_id;
+    v_subtask_id := v_row.subtask_id;
+  END IF;
+
+  IF v_task_id IS NULL AND v_subtask_id IS NOT NULL THEN
+    SELECT s.task_id INTO v_task_id FROM public.subtasks s WHERE s.id = v_subtask_id;
+  END IF;
+
+  INSERT INTO public.change_log (table_name, record_id, task_id, op)
+  VALUES (TG_TABLE_NAME, v_row.id, v_task_id, left(TG_OP, 1));
+
+  RETURN NULL;
+END;
+$$;
+
+-- Step 3: Attach the trigger to every table the board is built from
+DROP TRIGGER IF EXISTS log_board_change_tasks ON public.tasks;
+CREATE TRIGGER log_board_change_tasks
+  AFTER INSERT OR UPDATE OR DELETE ON public.tasks
+  FOR EACH ROW EXECUTE FUNCTION public.log_board_change();
+
+DROP TRIGGER IF EXISTS log_board_change_subtasks ON public.subtasks;
+CREATE TRIGGER log_board_change_subtasks
+  AFTER INSERT OR UPDATE OR DELETE ON public.subtasks
+  FOR EACH ROW EXECUTE FUNCTION public.log_board_change();
+
+DROP TRIGGER IF EXISTS log_board_change_task_assignments ON public.task_assignments;
+CREATE TRIGGER log_board_change_task_assignments
+  AFTER INSERT OR UPDATE OR DELETE ON public.task_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.log_board_change();
+
+DROP TRIGGER IF EXISTS log_board_change_subtask_assignments ON public.subtask_assignments;
+CREATE TRIGGER log_board_change_subtask_assignments
+  AFTER INSERT OR UPDATE OR DELETE ON public.subtask_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.log_board_change();
+
+DROP TRIGGER IF EXISTS log_board_change_comments ON public.comments;
+CREATE TRIGGER log_board_change_comments
+  AFTER INSERT OR UPDATE OR DELETE ON public.comments
+  FOR EACH ROW EXECUTE FUNCTION public.log_board_change();
+
+DROP TRIGGER IF EXISTS log_board_change_task_attachments ON public.task_attachments;
+CREATE TRIGGER log_board_change_task_attachments
+  AFTER INSERT OR UPDATE OR DELETE ON public.task_attachments
+  FOR EACH ROW EXECUTE FUNCTION public.log_board_change();
+
+-- Step 4: Row Level Security - readable by signed-in users, written only by the trigger
+ALTER TABLE public.change_log ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Authenticated users can read the change log" ON public.change_log;
+CREATE POLICY "Authenticated users can read the change log" ON public.change_log
+  FOR SELECT USING (auth.role() = 'authenticated');
+
+-- Step 5: Delta function
+-- p_since NULL, a watermark at or before a reset marker, or any watermark against
+-- an empty log returns a full card snapshot with reset = true. Otherwise returns,
+-- for changes by transactions with xid in [p_since, watermark):
+--   cards             board projection rows of every task touched by a change
+--   subtasks          current rows of inserted/updated subtasks
+--   task_assignments  current rows of inserted/updated task assignments
+--   comments          current rows of inserted/updated comments
+--   deleted           tombstones [{ table, id }]
+-- A page holds about p_limit changes but never splits a transaction; has_more means
+-- call again with the returned watermark. Rows committed after the horizon but
+-- visible in this snapshot may be sent again next time, which is harmless.
+-- The function is STABLE so the log and the data are read from one snapshot, and
+-- SECURITY INVOKER so the caller's RLS policies apply to the returned rows.
+CREATE OR REPLACE FUNCTION public.get_board_changes(
+  p_since BIGINT DEFAULT NULL,
+  p_limit INTEGER DEFAULT 5000
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  v_horizon XID8;
+  v_since XID8;
+  v_upto XID8;
+  v_watermark BIGINT;
+  v_has_more BOOLEAN;
+  v_result JSONB;
+BEGIN
+  -- Every transaction below the snapshot's xmin has committed or aborted
+  v_horizon := pg_snapshot_xmin(pg_current_snapshot());
+  v_since := p_since::TEXT::XID8;
+
+  IF p_since IS NULL
+    OR NOT EXISTS (SELECT 1 FROM public.change_log)
+    OR EXISTS (SELECT 1 FROM public.change_log cl WHERE cl.op = 'R' AND cl.xid >= v_since)
+  THEN
+    RETURN jsonb_build_object(
+      'watermark', v_horizon::TEXT::BIGINT,
+      'reset', true,
+      'has_more', false,
+      'cards', COALESCE(
+        (SELECT jsonb_agg(to_jsonb(c) ORDER BY c.updated_at DESC) FROM public.task_board_cards c),
+        '[]'::jsonb
+      )
+    );
+  END IF;
+
+  -- Last transaction of this page; the page is extended to include all of its rows
+  SELECT max(w.xid) INTO v_upto
+  FROM (
+    SELECT cl.xid FROM public.change_log cl
+    WHERE cl.xid >= v_since AND cl.xid < v_horizon
+    ORDER BY cl.xid, cl.seq
+    LIMIT p_limit
+  ) w;
+
+  v_has_more := v_upto IS NOT NULL AND EXISTS (
+    SELECT 1 FROM public.change_log cl WHERE cl.xid > v_upto AND cl.xid < v_horizon
+  );
+  v_watermark := CASE
+    WHEN v_has_more THEN v_upto::TEXT::BIGINT + 1
+    ELSE GREATEST(v_horizon::TEXT::BIGINT, p_since)
+  END;
+  v_upto := COALESCE(v_upto, v_since);
+
+  WITH latest AS (
+    -- Only the last operation per record matters
+    SELECT DISTINCT ON (cl.table_name, cl.record_id)
+      cl.table_name, cl.record_id, cl.task_id, cl.op
+    FROM public.change_log cl
+    WHERE cl.xid >= v_since AND cl.xid <= v_upto AND cl.xid < v_horizon AND cl.op <> 'R'
+      AND cl.table_name IN ('tasks', 'subtasks', 'task_assignments', 'subtask_assignments', 'comments', 'task_attachments')
+    ORDER BY cl.table_name, cl.record_id, cl.seq DESC
+  ),
+  touched_tasks AS (
+    SELECT DISTINCT l.task_id FROM latest l WHERE l.task_id IS NOT NULL
+  ),
+  live AS (
+    SELECT l.table_name, l.record_id FROM latest l WHERE l.op <> 'D'
+  )
+  SELECT jsonb_build_object(
+    'watermark', v_watermark,
+    'reset', false,
+    'has_more', v_has_more,
+    'cards', COALESCE(
+      (SELECT jsonb_agg(to_jsonb(c)) FROM public.task_board_cards c
+       WHERE c.id IN (SELECT t.task_id FROM touched_tasks t)),
+      '[]'::jsonb
+    ),
+    'subtasks', COALESCE(
+      (SELECT jsonb_agg(to_jsonb(s)) FROM public.subtasks s
+       WHERE s.id IN (SELECT record_id FROM live WHERE table_name = 'subtasks')),
+      '[]'::jsonb
+    ),
+    'task_assignments', COALESCE(
+      (SELECT jsonb_agg(to_jsonb(ta)) FROM public.task_assignments ta
+       WHERE ta.id IN (SELECT record_id FROM live WHERE table_name = 'task_assignments')),
+      '[]'::jsonb
+    ),
+    'comments', COALESCE(
+      (SELECT jsonb_agg(to_jsonb(cm)) FROM public.comments cm
+       WHERE cm.id IN (SELECT record_id FROM live WHERE table_name = 'comments')),
+      '[]'::jsonb
+    ),
+    'deleted', COALESCE(
+      (SELECT jsonb_agg(jsonb_build_object('table', l.table_name, 'id', l.record_id))
+       FROM latest l WHERE l.op = 'D'),
+      '[]'::jsonb
+    )
+  ) INTO v_result;
+
+  RETURN v_result;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.get_board_changes(BIGINT, INTEGER) TO authenticated;
+
+-- Step 6: Retention. Pruning leaves a reset marker, so clients whose watermark falls
+-- behind it get a reset snapshot: pruning never loses data, it only forces a full reload.
+CREATE OR REPLACE FUNCTION public.prune_change_log(p_keep INTERVAL DEFAULT INTERVAL '7 days')
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_deleted INTEGER;
+BEGIN
+  DELETE FROM public.change_log WHERE changed_at < NOW() - p_keep;
+  GET DIAGNOSTICS v_deleted = ROW_COUNT;
+
+  -- Written by this transaction, so its xid is above every pruned row's
+  IF v_deleted > 0 THEN
+    INSERT INTO public.change_log (table_name, op) VALUES ('change_log', 'R');
+  END IF;
+
+  RETURN v_deleted;
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.prune_change_log(INTERVAL) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.prune_change_log(INTERVAL) TO service_role;
+
+-- Every board write appends a row, so the log must be pruned on a schedule or it (and the
+-- per-table version probes of migration 054) grows without bound. Run it daily with pg_cron;
+-- where the extension is not available the migration still applies, and the job has to be
+-- scheduled outside the database (see env.example).
+DO $$
+BEGIN
+  CREATE EXTENSION IF NOT EXISTS pg_cron;
+  -- Scheduling under an existing job name replaces that job, so re-running is safe
+  PERFORM cron.schedule('prune-change-log', '17 3 * * *', 'SELECT public.prune_change_log()');
+EXCEPTION
+  WHEN OTHERS THEN
+    RAISE WARNING 'change_log pruning not scheduled (%): run SELECT public.prune_change_log() daily as service_role', SQLERRM;
+END $$;
+
+-- Step 7: Add comments for documentation
+COMMENT ON TABLE public.change_log IS 'Append-only log of board changes (tasks, subtasks, assignments, comments, attachments) for delta sync';
+COMMENT ON FUNCTION public.get_board_changes IS 'Returns board changes after a change_log transaction-horizon watermark, with tombstones; NULL or reset watermark returns a full card snapshot';
+COMMENT ON FUNCTION public.prune_change_log IS 'Deletes change_log rows older than the given interval and leaves a reset marker; scheduled daily as pg_cron job prune-change-log';
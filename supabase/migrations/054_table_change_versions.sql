@@ -0,0 +1,102 @@
+-- Migration: Per-table change versions for conditional GETs
+-- /api/tasks, /api/comments and /api/team-members answer If-None-Match with 304.
+-- Their ETags are built from a version per table, derived from change_log (migration 053),
+-- so checking freshness is a few index probes instead of re-running the query and hashing
+-- the result. Writers only append to change_log: there is no shared counter row to lock,
+-- so concurrent writes to a table are not serialized and cannot deadlock on it.
+
+-- Step 1: Log the tables the API responses read that the board log does not cover yet.
+-- users is included because RLS decides task/comment visibility from users.role.
+-- get_board_changes ignores these rows; they only feed the versions below.
+DROP TRIGGER IF EXISTS log_board_change_team_members ON public.team_members;
+CREATE TRIGGER log_board_change_team_members
+  AFTER INSERT OR UPDATE OR DELETE ON public.team_members
+  FOR EACH ROW EXECUTE FUNCTION public.log_board_change();
+
+DROP TRIGGER IF EXISTS log_board_change_users ON public.users;
+CREATE TRIGGER log_board_change_users
+  AFTER INSERT OR UPDATE OR DELETE ON public.users
+  FOR EACH ROW EXECUTE FUNCTION public.log_board_change();
+
+-- Step 2: TRUNCATE fires no row triggers; record it as a reset marker for the table
+CREATE OR REPLACE FUNCTION public.log_table_truncate()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO public.change_log (table_name, op) VALUES (TG_TABLE_NAME, 'R');
+  RETURN NULL;
+END;
+$$;
+
+DO $$
+DECLARE
+  v_table TEXT;
+BEGIN
+  FOREACH v_table IN ARRAY ARRAY[
+    'tasks', 'subtasks', 'task_assignments', 'subtask_assignments',
+    'comments', 'task_attachments', 'team_members', 'users'
+  ]
+  LOOP
+    EXECUTE format('DROP TRIGGER IF EXISTS log_table_truncate_%1$s ON public.%1$I', v_table);
+    EXECUTE format(
+      'CREATE TRIGGER log_table_truncate_%1$s
+         AFTER TRUNCATE ON public.%1$I
+         FOR EACH STATEMENT EXECUTE FUNCTION public.log_table_truncate()',
+      v_table
+    );
+  END LOOP;
+END;
+$$;
+
+CREATE INDEX IF NOT EXISTS idx_change_log_table_xid ON public.change_log(table_name, xid);
+
+-- Step 3: Version function
+-- A table's version must change whenever a transaction writing to it commits, but the
+-- largest seq (or xid) does not: a transaction holding a lower one can commit later.
+-- So, with horizon = xmin of the reader's snapshot (every transaction below it has ended):
+--   the newest settled transaction (xid below the horizon)  - grows when one settles
+--   count and newest of the transactions at/above it        - grows when one commits
+--   the newest prune marker                                 - pruning can only lower the rest
+-- Any commit touching the table moves at least one of these.
+CREATE OR REPLACE FUNCTION public.get_table_versions(p_tables TEXT[])
+RETURNS TABLE (table_name TEXT, version TEXT)
+LANGUAGE sql
+STABLE
+SECURITY INVOKER
+SET search_path = public
+AS $$
+  WITH horizon AS (
+    SELECT pg_snapshot_xmin(pg_current_snapshot()) AS xmin
+  ),
+  pruned AS (
+    SELECT max(cl.xid) AS xid FROM public.change_log cl
+    WHERE cl.table_name = 'change_log' AND cl.op = 'R'
+  )
+  SELECT
+    t.name,
+    concat_ws('-',
+      COALESCE(settled.xid::TEXT, '0'),
+      recent.transactions,
+      COALESCE(recent.xid::TEXT, '0'),
+      COALESCE(pruned.xid::TEXT, '0'))
+  FROM horizon h
+  CROSS JOIN pruned
+  CROSS JOIN unnest(p_tables) AS t(name)
+  CROSS JOIN LATERAL (
+    SELECT max(cl.xid) AS xid FROM public.change_log cl
+    WHERE cl.table_name = t.name AND cl.xid < h.xmin
+  ) settled
+  CROSS JOIN LATERAL (
+    SELECT count(DISTINCT cl.xid) AS transactions, max(cl.xid) AS xid FROM public.change_log cl
+    WHERE cl.table_name = t.name AND cl.xid >= h.xmin
+  ) recent;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.get_table_versions(TEXT[]) TO authenticated, service_role;
+
+-- Step 4: Add comments for documentation
+COMMENT ON FUNCTION public.get_table_versions IS 'Current change version per table, derived from change_log; API routes build ETags from it';
+COMMENT ON FUNCTION public.log_table_truncate IS 'Statement trigger that records a TRUNCATE as a change_log reset marker';
@@ -0,0 +1,173 @@
+-- Migration: Single-call, diff-based task and subtask edits
+-- Saving a task used to update the row, read its task_assignments, then delete removed
+-- and insert added assignments: 3-4 round trips, each logged in change_log (migration 053).
+-- The client now coalesces rapid edits (lib/write-behind.ts) and sends them here in one
+-- call. Only columns whose value actually changes are written and only assignments that
+-- differ are inserted or deleted; a statement with nothing to do is skipped entirely, so
+-- toggling a field back and forth leaves no trace in change_log or the versions built from it.
+-- Both functions are SECURITY INVOKER: the caller's RLS policies apply as before.
+
+-- Step 1: Task edits
+-- p_changes   snake_case columns to set; absent keys are left alone
+-- p_assignees full set of assigned team members, or NULL to leave assignments unchanged
+-- Returns { task, card, changed }: the task row, the board card when assignments changed
+-- (its aggregated assignee fields are stale otherwise), and whether anything was written.
+CREATE OR REPLACE FUNCTION public.apply_task_edit(
+  p_task_id UUID,
+  p_changes JSONB DEFAULT '{}'::jsonb,
+  p_assignees UUID[] DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  v_old public.tasks;
+  v_new public.tasks;
+  v_to_add UUID[] := ARRAY[]::UUID[];
+  v_to_remove UUID[] := ARRAY[]::UUID[];
+  v_row_changed BOOLEAN := FALSE;
+BEGIN
+  SELECT * INTO v_old FROM public.tasks WHERE id = p_task_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Task % not found', p_task_id USING ERRCODE = 'P0002';
+  END IF;
+
+  -- Keys missing from p_changes keep the current value
+  v_new := jsonb_populate_record(v_old, COALESCE(p_changes, '{}'::jsonb));
+  v_row_changed := (v_new.title, v_new.description, v_new.priority, v_new.status,
+                    v_new.start_date, v_new.due_date, v_new.department, v_new.updated_at)
+    IS DISTINCT FROM (v_old.title, v_old.description, v_old.priority, v_old.status,
+                      v_old.start_date, v_old.due_date, v_old.department, v_old.updated_at);
+
+  IF v_row_changed THEN
+    UPDATE public.tasks
+    SET title = v_new.title,
+        description = v_new.description,
+        priority = v_new.priority,
+        status = v_new.status,
+        start_date = v_new.start_date,
+        due_date = v_new.due_date,
+        department = v_new.department,
+        updated_at = CASE WHEN p_changes ? 'updated_at' THEN v_new.updated_at ELSE NOW() END
+    WHERE id = p_task_id
+    RETURNING * INTO v_old;
+  END IF;
+
+  IF p_assignees IS NOT NULL THEN
+    SELECT COALESCE(array_agg(m), ARRAY[]::UUID[]) INTO v_to_add
+    FROM unnest(p_assignees) AS m
+    WHERE NOT EXISTS (
+      SELECT 1 FROM public.task_assignments ta
+      WHERE ta.task_id = p_task_id AND ta.team_member_id = m
+    );
+
+    SELECT COALESCE(array_agg(ta.team_member_id), ARRAY[]::UUID[]) INTO v_to_remove
+    FROM public.task_assignments ta
+    WHERE ta.task_id = p_task_id AND NOT (ta.team_member_id = ANY (p_assignees));
+
+    IF cardinality(v_to_remove) > 0 THEN
+      DELETE FROM public.task_assignments
+      WHERE task_id = p_task_id AND team_member_id = ANY (v_to_remove);
+    END IF;
+
+    IF cardinality(v_to_add) > 0 THEN
+      INSERT INTO public.task_assignments (task_id, team_member_id, assigned_at, assigned_by)
+      SELECT p_task_id, m, NOW(), auth.uid() FROM unnest(v_to_add) AS m
+      ON CONFLICT DO NOTHING;
+    END IF;
+  END IF;
+
+  RETURN jsonb_build_object(
+    'task', to_jsonb(v_old),
+    'card', CASE
+      WHEN cardinality(v_to_add) + cardinality(v_to_remove) > 0 THEN
+        (SELECT to_jsonb(c) FROM public.task_board_cards c WHERE c.id = p_task_id)
+      END,
+    'changed', v_row_changed OR cardinality(v_to_add) + cardinality(v_to_remove) > 0
+  );
+END;
+$$;
+
+-- Step 2: Subtask edits, same contract
+-- Returns { subtask, changed }
+CREATE OR REPLACE FUNCTION public.apply_subtask_edit(
+  p_subtask_id UUID,
+  p_changes JSONB DEFAULT '{}'::jsonb,
+  p_assignees UUID[] DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY INVOKER
+SET search_path = public
+AS $$
+DECLARE
+  v_old public.subtasks;
+  v_new public.subtasks;
+  v_to_add UUID[] := ARRAY[]::UUID[];
+  v_to_remove UUID[] := ARRAY[]::UUID[];
+  v_row_changed BOOLEAN := FALSE;
+BEGIN
+  SELECT * INTO v_old FROM public.subtasks WHERE id = p_subtask_id FOR UPDATE;
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Subtask % not found', p_subtask_id USING ERRCODE = 'P0002';
+  END IF;
+
+  v_new := jsonb_populate_record(v_old, COALESCE(p_changes, '{}'::jsonb));
+  v_row_changed := (v_new.title, v_new.description, v_new.completed, v_new.completed_at,
+                    v_new.start_date, v_new.end_date)
+    IS DISTINCT FROM (v_old.title, v_old.description, v_old.completed, v_old.completed_at,
+                      v_old.start_date, v_old.end_date);
+
+  -- updated_at alone is not a change worth writing for a subtask
+  IF v_row_changed THEN
+    UPDATE public.subtasks
+    SET title = v_new.title,
+        description = v_new.description,
+        completed = v_new.completed,
+        completed_at = v_new.completed_at,
+        start_date = v_new.start_date,
+        end_date = v_new.end_date,
+        updated_at = CASE WHEN p_changes ? 'updated_at' THEN v_new.updated_at ELSE NOW() END
+    WHERE id = p_subtask_id
+    RETURNING * INTO v_old;
+  END IF;
+
+  IF p_assignees IS NOT NULL THEN
+    SELECT COALESCE(array_agg(m), ARRAY[]::UUID[]) INTO v_to_add
+    FROM unnest(p_assignees) AS m
+    WHERE NOT EXISTS (
+      SELECT 1 FROM public.subtask_assignments sa
+      WHERE sa.subtask_id = p_subtask_id AND sa.team_member_id = m
+    );
+
+    SELECT COALESCE(array_agg(sa.team_member_id), ARRAY[]::UUID[]) INTO v_to_remove
+    FROM public.subtask_assignments sa
+    WHERE sa.subtask_id = p_subtask_id AND NOT (sa.team_member_id = ANY (p_assignees));
+
+    IF cardinality(v_to_remove) > 0 THEN
+      DELETE FROM public.subtask_assignments
+      WHERE subtask_id = p_subtask_id AND team_member_id = ANY (v_to_remove);
+    END IF;
+
+    IF cardinality(v_to_add) > 0 THEN
+      INSERT INTO public.subtask_assignments (subtask_id, team_member_id, assigned_at, assigned_by)
+      SELECT p_subtask_id, m, NOW(), auth.uid() FROM unnest(v_to_add) AS m
+      ON CONFLICT DO NOTHING;
+    END IF;
+  END IF;
+
+  RETURN jsonb_build_object(
+    'subtask', to_jsonb(v_old),
+    'changed', v_row_changed OR cardinality(v_to_add) + cardinality(v_to_remove) > 0
+  );
+END;
+$$;
+
+-- Step 3: Permissions
+GRANT EXECUTE ON FUNCTION public.apply_task_edit(UUID, JSONB, UUID[]) TO authenticated;
+GRANT EXECUTE ON FUNCTION public.apply_subtask_edit(UUID, JSONB, UUID[]) TO authenticated;
+
+COMMENT ON FUNCTION public.apply_task_edit IS 'Applies a coalesced task edit (columns + assignee set) in one call, writing only what differs';
+COMMENT ON FUNCTION public.apply_subtask_edit IS 'Applies a coalesced subtask edit (columns + assignee set) in one call, writing only what differs';
@@ -0,0 +1,12 @@
+-- Migration: Stream task_assignments to the realtime gateway
+-- Assignees live in task_assignments since tasks.assigned_to was dropped (migrations 026/032).
+-- The SSE gateway (lib/realtime-gateway.ts) follows this table to decide which viewers an
+-- assigned task is visible to; its changes are not forwarded to browsers.
+
+DO $$
+BEGIN
+  ALTER PUBLICATION supabase_realtime ADD TABLE public.task_assignments;
+EXCEPTION
+  WHEN duplicate_object THEN NULL;
+  WHEN undefined_object THEN NULL;
+END $$;
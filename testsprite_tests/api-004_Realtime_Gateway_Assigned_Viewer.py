@@ -0,0 +1,109 @@
+import json
+import queue
+import threading
+import time
+import uuid
+
+import requests
+
+# Needs the app running with REALTIME_FEED=local (non-production), so changes can be
+# published to the gateway without a database
+BASE_URL = "http://localhost:3000"
+TIMEOUT = 30
+
+
+def read_events(response, events):
+    event = {}
+    for line in response.iter_lines(decode_unicode=True):
+        if line is None:
+            continue
+        if line == "":
+            if "data" in event:
+                events.put(event)
+            event = {}
+        elif line.startswith("event: "):
+            event["event"] = line[len("event: "):]
+        elif line.startswith("data: "):
+            event["data"] = json.loads(line[len("data: "):])
+
+
+def publish(session, table, event_type, new=None, old=None):
+    response = session.post(
+        f"{BASE_URL}/api/realtime/local",
+        json={"table": table, "eventType": event_type, "new": new or {}, "old": old or {}},
+        timeout=TIMEOUT,
+    )
+    assert response.status_code == 200, f"Publishing {table} {event_type} failed: {response.status_code} {response.text}"
+
+
+def test_realtime_gateway_assigned_viewer():
+    session = requests.Session()
+    viewer_id = str(uuid.uuid4())
+    team_member_id = str(uuid.uuid4())
+    assigned_task = str(uuid.uuid4())
+    other_task = str(uuid.uuid4())
+    assignment_id = str(uuid.uuid4())
+    marker = str(uuid.uuid4())
+
+    # A viewer sees tasks they created or are assigned to through task_assignments
+    stream = session.get(
+        f"{BASE_URL}/api/realtime",
+        params={"role": "viewer", "userId": viewer_id, "teamMemberIds": team_member_id},
+        stream=True,
+        timeout=TIMEOUT,
+    )
+    assert stream.status_code == 200, f"Stream failed: {stream.status_code} {stream.text}"
+    events = queue.Queue()
+    threading.Thread(target=read_events, args=(stream, events), daemon=True).start()
+    time.sleep(0.5)
+
+    try:
+        someone_else = str(uuid.uuid4())
+        publish(session, "tasks", "INSERT", new={"id": assigned_task, "department": "Production", "created_by": someone_else})
+        publish(session, "tasks", "INSERT", new={"id": other_task, "department": "Production", "created_by": someone_else})
+        publish(session, "task_assignments", "INSERT",
+                new={"id": assignment_id, "task_id": assigned_task, "team_member_id": team_member_id})
+        publish(session, "comments", "INSERT", new={"id": "visible-comment", "task_id": assigned_task})
+        publish(session, "comments", "INSERT", new={"id": "hidden-comment", "task_id": other_task})
+        # A DELETE carries only the primary key; the comment's task can no longer be looked up
+        publish(session, "comments", "DELETE", old={"id": "visible-comment"})
+        # Unassigned again; a DELETE only carries the assignment id
+        publish(session, "task_assignments", "DELETE", old={"id": assignment_id})
+        publish(session, "comments", "INSERT", new={"id": "after-unassign-comment", "task_id": assigned_task})
+        # Team directory changes reach everyone, so this marks the end of the sequence
+        publish(session, "team_members", "UPDATE", new={"id": marker})
+
+        seen = []
+        deleted = []
+        finished = False
+        deadline = time.time() + TIMEOUT
+        while time.time() < deadline:
+            try:
+                event = events.get(timeout=max(deadline - time.time(), 0.1))
+            except queue.Empty:
+                break
+            if event.get("event") != "change":
+                continue
+            change = event["data"]
+            assert change["table"] != "task_assignments", "task_assignments changes must not be streamed"
+            if change["table"] == "team_members" and change["new"].get("id") == marker:
+                finished = True
+                break
+            if change["eventType"] == "DELETE":
+                assert set(change["old"]) == {"id"}, f"A delete sent more than the primary key: {change}"
+                deleted.append(change["old"]["id"])
+            else:
+                seen.append(change["new"].get("id"))
+
+        assert finished, f"End marker never arrived: {seen}"
+
+        assert "visible-comment" in seen, f"Assigned viewer missed a comment on their task: {seen}"
+        assert "visible-comment" in deleted, f"Assigned viewer missed a comment delete: {deleted}"
+        assert "hidden-comment" not in seen, f"Viewer saw a comment on a task they are not assigned to: {seen}"
+        assert "after-unassign-comment" not in seen, f"Viewer still saw the task after being unassigned: {seen}"
+        assert other_task not in seen, f"Viewer saw a task they are not assigned to: {seen}"
+    finally:
+        stream.close()
+
+
+test_realtime_gateway_assigned_viewer()
@@ -0,0 +1,6 @@
+"""Shared helpers for the testsprite_tests suite.
+
+Run modules from the testsprite_tests directory, e.g.::
+
+    cd testsprite_tests && python -m harness.datagen --preset smoke --out-dir /tmp/dataset
+"""
@@ -0,0 +1,55 @@
+"""Supabase GoTrue password sign-in and token refresh for harness clients."""
+
+import time
+from dataclasses import dataclass
+
+from harness.config import SUPABASE_URL, SUPABASE_ANON_KEY, TEST_USER_EMAIL, TEST_USER_PASSWORD
+
+
+@dataclass
+class Session:
+    access_token: str
+    refresh_token: str
+    expires_at: float  # epoch seconds
+    user_id: str
+    raw: dict  # full GoTrue response, e.g. for seeding a browser's localStorage
+
+    def expires_within(self, seconds):
+        return self.expires_at - time.time() < seconds
+
+
+def _session_from_response(payload):
+    expires_at = payload.get("expires_at") or (time.time() + payload.get("expires_in", 3600))
+    return Session(
+        access_token=payload["access_token"],
+        refresh_token=payload["refresh_token"],
+        expires_at=float(expires_at),
+        user_id=payload["user"]["id"],
+        raw=payload,
+    )
+
+
+async def sign_in(http, email=TEST_USER_EMAIL, password=TEST_USER_PASSWORD):
+    """Password grant against GoTrue; ``http`` is an httpx.AsyncClient."""
+    if not password:
+        raise RuntimeError("Set TEST_USER_PASSWORD to sign in the test user")
+    response = await http.post(
+        f"{SUPABASE_URL}/auth/v1/token",
+        params={"grant_type": "password"},
+        headers={"apikey": SUPABASE_ANON_KEY},
+        json={"email": email, "password": password},
+    )
+    response.raise_for_status()
+    return _session_from_response(response.json())
+
+
+async def refresh(http, session):
+    """Exchange a refresh token for a new session."""
+    response = await http.post(
+        f"{SUPABASE_URL}/auth/v1/token",
+        params={"grant_type": "refresh_token"},
+        headers={"apikey": SUPABASE_ANON_KEY},
+        json={"refresh_token": session.refresh_token},
+    )
+    response.raise_for_status()
+    return _session_from_response(response.json())
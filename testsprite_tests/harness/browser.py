@@ -0,0 +1,44 @@
+"""Shared Playwright helpers: launch options and pre-authenticated contexts.
+
+Signing in through the login form costs several seconds per context, so
+contexts are seeded with an existing Supabase session instead: the session
+JSON goes into localStorage (where supabase-js looks for it) and the access
+token into the cookie the server components read.
+"""
+
+import json
+from urllib.parse import urlparse
+
+from harness.config import BASE_URL, SUPABASE_URL
+
+LAUNCH_ARGS = [
+    "--window-size=1280,720",
+    "--disable-dev-shm-usage",
+    "--ipc=host",
+]
+
+ACCESS_TOKEN_COOKIE = "sb-access-token"  # mirrors lib/session-cookie.ts
+
+
+def auth_storage_key():
+    """localStorage key supabase-js uses for the session (sb-<project ref>-auth-token)."""
+    return f"sb-{urlparse(SUPABASE_URL).hostname.split('.')[0]}-auth-token"
+
+
+async def launch_chromium(playwright, headless=True):
+    return await playwright.chromium.launch(headless=headless, args=LAUNCH_ARGS)
+
+
+async def new_signed_in_context(browser, session, **context_options):
+    """Browser context that starts out signed in as ``session`` (a harness.auth.Session)."""
+    context = await browser.new_context(**context_options)
+    await context.add_init_script(
+        f"window.localStorage.setItem({json.dumps(auth_storage_key())}, {json.dumps(json.dumps(session.raw))})"
+    )
+    await context.add_cookies([{
+        "name": ACCESS_TOKEN_COOKIE,
+        "value": session.access_token,
+        "url": BASE_URL,
+        "sameSite": "Lax",
+    }])
+    return context
@@ -0,0 +1,272 @@
+"""Shared async client for the Next.js /api routes and Supabase REST/RPC/storage.
+
+The generated backend scripts hard-code ``BASE_URL`` and a bearer token and
+call ``requests.post(..., timeout=30)``, opening a new TCP (and TLS)
+connection per request. ``ApiClient`` keeps one pooled ``httpx.AsyncClient``
+per test or load generator:
+
+* keep-alive pooling (``max_connections`` sockets reused across calls)
+* HTTP/2 when the ``h2`` package is installed (one multiplexed connection
+  to Supabase), HTTP/1.1 keep-alive otherwise
+* token refresh - the GoTrue session is refreshed shortly before it expires,
+  and once more on a 401, with a lock so concurrent calls refresh only once
+* helpers for tasks, comments, assignments and attachments that return
+  ``Task``/``Comment`` dataclasses or plain row dicts
+* conditional GETs - ``app_cached`` remembers each route's ETag and reuses
+  the previous body when the server answers 304 Not Modified
+
+Usage::
+
+    async with ApiClient() as api:                     # signs in TEST_USER_EMAIL
+        task = await api.create_task("Calibrate press 4", department="Engineering")
+        await api.assign(task.id, [member_id])
+        await api.add_comment(task.id, "Calibrated")
+        changes = await api.board_changes(since=None)   # GET /api/sync
+        cards = await api.app_cached("/api/tasks")        # 304 -> previous body
+        await api.delete_task(task.id)
+
+Requires ``httpx`` (``pip install 'httpx[http2]'`` for HTTP/2).
+"""
+
+import asyncio
+import hashlib
+import uuid
+from dataclasses import dataclass
+
+from harness.auth import refresh, sign_in
+from harness.config import BASE_URL, SUPABASE_ANON_KEY, SUPABASE_URL, TIMEOUT
+
+REFRESH_MARGIN_S = 60
+TASK_COLUMNS = "id,title,description,priority,status,department,start_date,due_date,created_by,created_at,updated_at"
+COMMENT_COLUMNS = "id,task_id,subtask_id,author_id,content,created_at"
+
+
+@dataclass
+class Task:
+    id: str
+    title: str
+    status: str
+    priority: str
+    department: str = None
+    description: str = None
+    start_date: str = None
+    due_date: str = None
+    created_by: str = None
+    created_at: str = None
+    updated_at: str = None
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**{name: row.get(name) for name in cls.__dataclass_fields__})
+
+
+@dataclass
+class Comment:
+    id: str
+    content: str
+    author_id: str
+    task_id: str = None
+    subtask_id: str = None
+    created_at: str = None
+
+    @classmethod
+    def from_row(cls, row):
+        return cls(**{name: row.get(name) for name in cls.__dataclass_fields__})
+
+
+class ApiError(Exception):
+    def __init__(self, status, method, url, body=""):
+        super().__init__(f"{method} {url} -> {status}: {body[:300]}")
+        self.status = status
+        self.body = body
+
+
+def _new_http(max_connections, http2, timeout):
+    import httpx
+
+    limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    try:
+        return httpx.AsyncClient(http2=http2, limits=limits, timeout=timeout)
+    except ImportError:
+        # httpx raises ImportError for http2=True without the h2 package
+        return httpx.AsyncClient(limits=limits, timeout=timeout)
+
+
+class ApiClient:
+    def __init__(self, session=None, email=None, password=None, base_url=BASE_URL, supabase_url=SUPABASE_URL,
+                 max_connections=20, http2=True, timeout=TIMEOUT):
+        self.session = session
+        self.credentials = {key: value for key, value in (("email", email), ("password", password)) if value}
+        self.base_url = base_url.rstrip("/")
+        self.supabase_url = supabase_url.rstrip("/")
+        self.max_connections = max_connections
+        self.http2 = http2
+        self.timeout = timeout
+        self.http = None
+        self._refresh_lock = asyncio.Lock()
+        self._etag_cache = {}  # url -> (etag, body) for app_cached
+        self.not_modified = 0  # 304s served from _etag_cache
+
+    async def __aenter__(self):
+        self.http = _new_http(self.max_connections, self.http2, self.timeout)
+        if self.session is None:
+            self.session = await sign_in(self.http, **self.credentials)
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.http.aclose()
+
+    @property
+    def user_id(self):
+        return self.session.user_id
+
+    async def _fresh_token(self, force=False):
+        if force or self.session.expires_within(REFRESH_MARGIN_S):
+            stale = self.session
+            async with self._refresh_lock:
+                if self.session is stale:  # another caller may have refreshed while we waited
+                    self.session = await refresh(self.http, stale)
+        return self.session.access_token
+
+    async def request(self, method, url, headers=None, **kwargs):
+        """Authenticated request; refreshes the token and retries once on 401. Returns the response."""
+        for attempt in range(2):
+            token = await self._fresh_token(force=attempt > 0)
+            response = await self.http.request(method, url, headers={
+                "apikey": SUPABASE_ANON_KEY,
+                "Authorization": f"Bearer {token}",
+                **(headers or {}),
+            }, **kwargs)
+            if response.status_code != 401:
+                break
+        if response.status_code >= 400:
+            raise ApiError(response.status_code, method, url, response.text)
+        return response
+
+    # Transports
+
+    async def app(self, method, path, **kwargs):
+        """Next.js route under BASE_URL, e.g. ``await api.app("GET", "/api/sync")``."""
+        response = await self.request(method, f"{self.base_url}{path}", **kwargs)
+        return response.json() if response.content else None
+
+    async def app_cached(self, path, params=None):
+        """GET a Next.js route with If-None-Match; on 304 returns the body cached for that URL."""
+        url = str(self.http.build_request("GET", f"{self.base_url}{path}", params=params).url)
+        cached = self._etag_cache.get(url)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = await self.request("GET", url, headers=headers)
+        if response.status_code == 304 and cached:
+            self.not_modified += 1
+            return cached[1]
+        body = response.json() if response.content else None
+        etag = response.headers.get("etag")
+        if etag:
+            self._etag_cache[url] = (etag, body)
+        return body
+
+    async def rest(self, method, table, params=None, json=None, prefer="return=representation"):
+        """PostgREST call; ``params`` uses PostgREST filter syntax ({"id": "eq.<uuid>"})."""
+        response = await self.request(
+            method, f"{self.supabase_url}/rest/v1/{table}", params=params, json=json, headers={"Prefer": prefer},
+        )
+        return response.json() if response.content else None
+
+    async def rpc(self, function, **arguments):
+        response = await self.request("POST", f"{self.supabase_url}/rest/v1/rpc/{function}", json=arguments)
+        return response.json() if response.content else None
+
+    # Tasks
+
+    async def list_tasks(self, limit=100, **filters):
+        """Tasks ordered newest first; filters are column=value equality matches."""
+        params = {"select": TASK_COLUMNS, "order": "created_at.desc", "limit": str(limit)}
+        params.update({column: f"eq.{value}" for column, value in filters.items()})
+        return [Task.from_row(row) for row in await self.rest("GET", "tasks", params=params)]
+
+    async def create_task(self, title, department, priority="Medium", status="Todo", description=None,
+                          start_date=None, due_date=None):
+        rows = await self.rest("POST", "tasks", params={"select": TASK_COLUMNS}, json={
+            "title": title, "department": department, "priority": priority, "status": status,
+            "description": description, "start_date": start_date, "due_date": due_date,
+            "created_by": self.user_id,
+        })
+        return Task.from_row(rows[0])
+
+    async def update_task(self, task_id, **fields):
+        rows = await self.rest("PATCH", "tasks", params={"id": f"eq.{task_id}", "select": TASK_COLUMNS}, json=fields)
+        return Task.from_row(rows[0])
+
+    async def delete_task(self, task_id):
+        await self.rest("DELETE", "tasks", params={"id": f"eq.{task_id}"}, prefer="return=minimal")
+
+    async def board_changes(self, since=None, limit=None):
+        """Delta (or full snapshot when ``since`` is None) from GET /api/sync."""
+        params = {key: str(value) for key, value in (("since", since), ("limit", limit)) if value is not None}
+        return await self.app("GET", "/api/sync", params=params)
+
+    # Comments
+
+    async def list_comments(self, task_id=None, subtask_id=None):
+        params = {"select": COMMENT_COLUMNS, "order": "created_at.asc"}
+        if task_id:
+            params["task_id"] = f"eq.{task_id}"
+        if subtask_id:
+            params["subtask_id"] = f"eq.{subtask_id}"
+        return [Comment.from_row(row) for row in await self.rest("GET", "comments", params=params)]
+
+    async def add_comment(self, task_id, content, subtask_id=None):
+        rows = await self.rest("POST", "comments", params={"select": COMMENT_COLUMNS}, json={
+            "task_id": task_id, "subtask_id": subtask_id, "author_id": self.user_id, "content": content,
+        })
+        return Comment.from_row(rows[0])
+
+    async def delete_comment(self, comment_id):
+        await self.rest("DELETE", "comments", params={"id": f"eq.{comment_id}"}, prefer="return=minimal")
+
+    # Assignments
+
+    async def assignees(self, task_id):
+        rows = await self.rest("GET", "task_assignments", params={"select": "team_member_id", "task_id": f"eq.{task_id}"})
+        return [row["team_member_id"] for row in rows]
+
+    async def assign(self, task_id, member_ids, role="assignee"):
+        """Add team members to a task; existing assignments are left alone."""
+        if not member_ids:
+            return []
+        return await self.rest("POST", "task_assignments", params={"on_conflict": "task_id,team_member_id"}, json=[
+            {"task_id": task_id, "team_member_id": member_id, "assigned_by": self.user_id, "role": role}
+            for member_id in member_ids
+        ], prefer="resolution=ignore-duplicates,return=representation")
+
+    async def unassign(self, task_id, member_ids):
+        if member_ids:
+            await self.rest("DELETE", "task_assignments", params={
+                "task_id": f"eq.{task_id}", "team_member_id": f"in.({','.join(member_ids)})",
+            }, prefer="return=minimal")
+
+    # Attachments
+
+    async def upload_attachment(self, task_id, file_name, content, *, bucket, mime_type="application/octet-stream",
+                                description=None):
+        """Store ``content`` (bytes) in ``bucket`` and register it as a task attachment row.
+
+        The app itself does not use Storage and no migration creates a bucket, so the
+        caller must name one that exists on the target project. ``add_attachment_link``
+        is the supported path: it creates the same row the task modal does.
+        """
+        path = f"{task_id}/{uuid.uuid4().hex}-{file_name}"
+        await self.request("POST", f"{self.supabase_url}/storage/v1/object/{bucket}/{path}", content=content,
+                           headers={"Content-Type": mime_type, "x-upsert": "false"})
+        return await self.add_attachment_link(
+            task_id, f"{self.supabase_url}/storage/v1/object/authenticated/{bucket}/{path}",
+            description=description or file_name, file_name=file_name, mime_type=mime_type,
+            size_bytes=len(content), checksum=hashlib.sha256(content).hexdigest(),
+        )
+
+    async def add_attachment_link(self, task_id, url, description, **metadata):
+        """Attachment row pointing at an external link, as the task modal creates them."""
+        rows = await self.rest("POST", "task_attachments", json={
+            "task_id": task_id, "url": url, "description": description, "uploaded_by": self.user_id, **metadata,
+        })
+        return rows[0]
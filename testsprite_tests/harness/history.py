@@ -0,0 +1,254 @@
+"""Performance history store and regression comparison report.
+
+Every run's timing samples (endpoint latencies, page vitals, realtime
+latency, suite wall time) are stored in a local SQLite database keyed by git
+SHA. ``compare`` runs a Mann-Whitney U test per metric between two SHAs and
+flags metrics that got significantly *and* materially worse, so a slowdown in
+useTasks or an RLS policy shows up in the commit that introduced it.
+
+Usage (from the testsprite_tests directory)::
+
+    python -m harness.history record --vitals tmp/results/web-vitals.json --realtime tmp/results/realtime-latency.json
+    python -m harness.history compare --base origin/main --head HEAD --fail-on-regression
+    python -m harness.history export-parquet tmp/results/perf-history.parquet   # needs pyarrow
+
+In code::
+
+    with History() as history:
+        run_id = history.start_run(suite="api")
+        history.add_samples(run_id, "endpoint:GET /api/sync", [12.1, 11.8, 13.0])
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+from statistics import median
+
+from harness.config import RESULTS_DIR
+from harness.stats import mann_whitney_u
+
+DEFAULT_DB_PATH = os.path.join(RESULTS_DIR, "perf-history.sqlite")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  sha TEXT NOT NULL,
+  branch TEXT,
+  suite TEXT NOT NULL,
+  host TEXT,
+  recorded_at REAL NOT NULL,
+  wall_time_s REAL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_sha ON runs(sha);
+CREATE TABLE IF NOT EXISTS samples (
+  run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+  metric TEXT NOT NULL,
+  value REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_samples_metric ON samples(metric, run_id);
+"""
+
+
+def git(*args):
+    try:
+        return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def resolve_sha(ref="HEAD"):
+    return git("rev-parse", ref) or ref
+
+
+class History:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.commit()
+        self.conn.close()
+
+    def start_run(self, suite, sha=None, wall_time_s=None):
+        cursor = self.conn.execute(
+            "INSERT INTO runs (sha, branch, suite, host, recorded_at, wall_time_s) VALUES (?, ?, ?, ?, ?, ?)",
+            (sha or resolve_sha(), git("rev-parse", "--abbrev-ref", "HEAD"), suite, platform.node(), time.time(), wall_time_s),
+        )
+        if wall_time_s is not None:
+            self.add_samples(cursor.lastrowid, f"suite:{suite}:wall_time_s", [wall_time_s])
+        return cursor.lastrowid
+
+    def add_samples(self, run_id, metric, values):
+        self.conn.executemany(
+            "INSERT INTO samples (run_id, metric, value) VALUES (?, ?, ?)",
+            [(run_id, metric, float(value)) for value in values if value is not None],
+        )
+
+    def samples_for(self, sha):
+        """{metric: [values]} across every run recorded for a SHA."""
+        rows = self.conn.execute(
+            "SELECT s.metric, s.value FROM samples s JOIN runs r ON r.id = s.run_id WHERE r.sha = ?", (sha,)
+        )
+        samples = {}
+        for metric, value in rows:
+            samples.setdefault(metric, []).append(value)
+        return samples
+
+    def import_vitals(self, run_id, path):
+        with open(path) as handle:
+            pages = json.load(handle)["pages"]
+        for page_name, result in pages.items():
+            for sample in result["samples"]:
+                for metric, value in sample.items():
+                    self.add_samples(run_id, f"vitals:{page_name}:{metric}", [value])
+
+    def import_network(self, run_id, path):
+        with open(path) as handle:
+            profiles = json.load(handle)["profiles"]
+        for profile_name, journeys in profiles.items():
+            for journey_name, result in journeys.items():
+                self.add_samples(run_id, f"journey:{profile_name}:{journey_name}:ms", result["samples_ms"])
+
+    def import_requests(self, run_id, path):
+        with open(path) as handle:
+            journeys = json.load(handle)["journeys"]
+        for journey_name, summary in journeys.items():
+            if summary.get("error"):
+                continue
+            for metric in ("count", "kilobytes", "serial_depth", "duplicate_count"):
+                self.add_samples(run_id, f"requests:{journey_name}:{metric}", [summary[metric]])
+
+    def import_realtime(self, run_id, path):
+        with open(path) as handle:
+            rounds = json.load(handle)["rounds"]
+        for result in rounds:
+            for name in ("write_to_delivery", "commit_to_delivery", "write_to_render"):
+                summary = result.get(name)
+                if summary and summary["count"]:
+                    for stat in ("p50", "p90", "p99"):
+                        self.add_samples(run_id, f"realtime:{result['mode']}:{result['viewers']}:{name}:{stat}", [summary[stat]])
+
+
+def compare(base_samples, head_samples, alpha=0.05, min_change=0.05):
+    """Per-metric comparison rows; ``status`` is regression, improvement or unchanged."""
+    rows = []
+    for metric in sorted(set(base_samples) & set(head_samples)):
+        base, head = base_samples[metric], head_samples[metric]
+        base_median, head_median = median(base), median(head)
+        _, p_value = mann_whitney_u(base, head)
+        change = (head_median - base_median) / base_median if base_median else 0.0
+        worse = change > 0  # every recorded metric is a duration, size or count: smaller is better
+        significant = p_value is not None and p_value < alpha and abs(change) >= min_change
+        rows.append({
+            "metric": metric,
+            "base_median": base_median,
+            "head_median": head_median,
+            "change": change,
+            "p_value": p_value,
+            "n": (len(base), len(head)),
+            "status": ("regression" if worse else "improvement") if significant else "unchanged",
+        })
+    return rows
+
+
+def render_report(rows, base_sha, head_sha):
+    lines = [
+        f"# Performance comparison {base_sha[:8]} -> {head_sha[:8]}",
+        "",
+        "| Metric | Base median | Head median | Change | p-value | n (base/head) | Status |",
+        "|---|---:|---:|---:|---:|---:|---|",
+    ]
+    icons = {"regression": "❌ regression", "improvement": "✅ improvement", "unchanged": "unchanged"}
+    for row in sorted(rows, key=lambda r: (r["status"] != "regression", r["metric"])):
+        p_value = f"{row['p_value']:.4f}" if row["p_value"] is not None else "-"
+        lines.append(
+            f"| {row['metric']} | {row['base_median']:.2f} | {row['head_median']:.2f} | {row['change']:+.1%} "
+            f"| {p_value} | {row['n'][0]}/{row['n'][1]} | {icons[row['status']]} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Store result files for the current SHA")
+    record.add_argument("--suite", default="perf")
+    record.add_argument("--sha", default=None, help="Defaults to git HEAD")
+    record.add_argument("--vitals", help="web-vitals.json written by harness.vitals")
+    record.add_argument("--realtime", help="realtime-latency.json written by harness.realtime_bench")
+    record.add_argument("--network", help="network-profiles.json written by harness.network")
+    record.add_argument("--requests", help="journey-requests.json written by harness.traffic")
+    record.add_argument("--wall-time", type=float, help="Suite wall time in seconds")
+
+    report = commands.add_parser("compare", help="Compare two SHAs")
+    report.add_argument("--base", required=True, help="Git ref or SHA")
+    report.add_argument("--head", default="HEAD", help="Git ref or SHA")
+    report.add_argument("--alpha", type=float, default=0.05)
+    report.add_argument("--min-change", type=float, default=0.05, help="Ignore changes smaller than this fraction")
+    report.add_argument("--output", default=os.path.join(RESULTS_DIR, "perf-comparison.md"))
+    report.add_argument("--fail-on-regression", action="store_true")
+
+    export = commands.add_parser("export-parquet", help="Write all samples to a Parquet file")
+    export.add_argument("path")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    with History(args.db) as history:
+        if args.command == "record":
+            run_id = history.start_run(args.suite, sha=args.sha and resolve_sha(args.sha), wall_time_s=args.wall_time)
+            if args.vitals:
+                history.import_vitals(run_id, args.vitals)
+            if args.realtime:
+                history.import_realtime(run_id, args.realtime)
+            if args.network:
+                history.import_network(run_id, args.network)
+            if args.requests:
+                history.import_requests(run_id, args.requests)
+            print(f"✅ Recorded run {run_id} for {resolve_sha(args.sha or 'HEAD')[:8]}")
+
+        elif args.command == "compare":
+            base_sha, head_sha = resolve_sha(args.base), resolve_sha(args.head)
+            rows = compare(history.samples_for(base_sha), history.samples_for(head_sha), args.alpha, args.min_change)
+            if not rows:
+                sys.exit(f"❌ No metrics recorded for both {base_sha[:8]} and {head_sha[:8]}")
+            report = render_report(rows, base_sha, head_sha)
+            os.makedirs(os.path.dirname(args.output), exist_ok=True)
+            with open(args.output, "w") as handle:
+                handle.write(report)
+            print(report)
+            regressions = [row for row in rows if row["status"] == "regression"]
+            if regressions and args.fail_on_regression:
+                sys.exit(1)
+
+        elif args.command == "export-parquet":
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                sys.exit("pyarrow is required for Parquet export: pip install pyarrow")
+            rows = history.conn.execute(
+                "SELECT r.sha, r.branch, r.suite, r.recorded_at, s.metric, s.value "
+                "FROM samples s JOIN runs r ON r.id = s.run_id ORDER BY r.recorded_at"
+            ).fetchall()
+            columns = ["sha", "branch", "suite", "recorded_at", "metric", "value"]
+            pq.write_table(pa.table({name: [row[i] for row in rows] for i, name in enumerate(columns)}), args.path)
+            print(f"✅ Exported {len(rows):,} samples to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
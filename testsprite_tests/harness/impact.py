@@ -0,0 +1,313 @@
+"""Test-impact selection: map each test to the app modules it exercises and pick tests for a diff.
+
+A test's footprint is the set of URLs it touches:
+
+* recorded - ``python -m harness.runner --record-impact`` runs every script
+  with a hook (impact_hook/sitecustomize.py) that logs each URL requested by
+  Playwright and ``requests``; ``python -m harness.impact build`` folds the
+  logs into tmp/results/test-impact.json;
+* static - for tests without a recording, path literals in the script
+  (``"/api/tasks"``, ``"http://localhost:3000/kanban"``).
+
+Page paths resolve to app/**/page.tsx plus their layouts, API paths to
+app/api/**/route.ts, and both expand through the TypeScript import graph
+(``@/`` aliases and relative imports) to every component, hook, context and
+lib module they load. Supabase paths (``/rest/v1/tasks``, ``/rest/v1/rpc/x``)
+are kept as table and function names and matched against changed migrations.
+
+A changed file selects every test whose footprint contains it. Files the
+graph cannot place (package.json, next.config.mjs, middleware) select
+everything, as does a UI test that was never recorded and only visits "/",
+because it navigates by clicking and its static footprint is meaningless.
+
+Usage (from the testsprite_tests directory)::
+
+    python -m harness.runner --record-impact          # record footprints while running the suite
+    python -m harness.impact build                    # fold the logs into the impact map
+    python -m harness.impact select --changed-since origin/main
+    python -m harness.runner --changed-since origin/main
+"""
+
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+from urllib.parse import urlsplit
+
+from harness.config import BASE_URL, RESULTS_DIR, SUPABASE_URL
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_ROOT = os.path.dirname(TESTS_DIR)
+HOOK_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "impact_hook")
+LOG_DIR = os.path.join(RESULTS_DIR, "impact")
+DEFAULT_MAP_PATH = os.path.join(RESULTS_DIR, "test-impact.json")
+
+SOURCE_DIRS = ("app", "components", "contexts", "hooks", "lib")
+SOURCE_EXTENSIONS = (".ts", ".tsx", ".js", ".jsx")
+ROUTE_SUPPORT_FILES = ("layout", "template", "loading", "error", "not-found")
+# Changes here cannot affect what the scripts exercise
+IGNORED_PATTERNS = ("*.md", "testsprite_tests/harness/*", "testsprite_tests/*.json", "requests.jsonl", "*.html")
+IMPORT_PATTERN = re.compile(r"""(?:import|export)\s[^'"]*?from\s*['"]([^'"]+)['"]|import\s*\(?\s*['"]([^'"]+)['"]""")
+PATH_LITERAL_PATTERN = re.compile(r"""['"](?:https?://localhost:\d+|\{\w+\})?(/(?:api|kanban|dashboard|auth|rest/v1)[^'"\s?#{}]*)""")
+
+
+def _matches(path, patterns):
+    return any(fnmatch.fnmatch(path, pattern) for pattern in patterns)
+
+
+class ImportGraph:
+    """Module -> imported modules for the app's TypeScript sources (repo-relative paths)."""
+
+    def __init__(self, root=REPO_ROOT):
+        self.root = root
+        self.edges = {}
+        for directory in SOURCE_DIRS:
+            for path in glob.glob(os.path.join(root, directory, "**", "*"), recursive=True):
+                if path.endswith(SOURCE_EXTENSIONS):
+                    module = os.path.relpath(path, root)
+                    self.edges[module] = self._imports(module)
+
+    def _imports(self, module):
+        with open(os.path.join(self.root, module), encoding="utf-8", errors="replace") as handle:
+            source = handle.read()
+        imports = set()
+        for match in IMPORT_PATTERN.finditer(source):
+            # Type-only imports are erased at build time and change nothing a test can observe
+            if re.match(r"(?:import|export)\s+type\s", match.group(0)):
+                continue
+            resolved = self._resolve(module, match.group(1) or match.group(2))
+            if resolved:
+                imports.add(resolved)
+        return imports
+
+    def _resolve(self, module, specifier):
+        if specifier.startswith("@/"):
+            base = specifier[2:]
+        elif specifier.startswith("."):
+            base = os.path.normpath(os.path.join(os.path.dirname(module), specifier))
+        else:
+            return None  # package import
+        candidates = [base] + [base + ext for ext in SOURCE_EXTENSIONS] + [os.path.join(base, "index" + ext) for ext in SOURCE_EXTENSIONS]
+        for candidate in candidates:
+            if os.path.isfile(os.path.join(self.root, candidate)):
+                return candidate
+        return None
+
+    def closure(self, modules):
+        seen, stack = set(), [module for module in modules if module in self.edges]
+        while stack:
+            module = stack.pop()
+            if module in seen:
+                continue
+            seen.add(module)
+            stack.extend(self.edges.get(module, ()))
+        return seen
+
+
+def _route_pattern(directory):
+    """app/api/tasks/[id] -> regex matching /api/tasks/<anything>; route groups are dropped."""
+    parts = []
+    for segment in directory.split("/")[1:]:
+        if segment.startswith("(") and segment.endswith(")"):
+            continue
+        if segment.startswith("[[..."):
+            parts.append(r"(?:/.*)?")
+        elif segment.startswith("[..."):
+            parts.append(r"/.+")
+        elif segment.startswith("["):
+            parts.append(r"/[^/]+")
+        else:
+            parts.append("/" + re.escape(segment))
+    return re.compile("^" + ("".join(parts) or "/") + "/?$")
+
+
+class RouteTable:
+    """URL path -> entry files (a page plus its enclosing layouts, or a route handler alone)."""
+
+    def __init__(self, root=REPO_ROOT):
+        self.routes = []
+        for path in sorted(glob.glob(os.path.join(root, "app", "**", "*"), recursive=True)):
+            name, ext = os.path.splitext(os.path.basename(path))
+            if name in ("page", "route") and ext in SOURCE_EXTENSIONS:
+                module = os.path.relpath(path, root)
+                directory = os.path.dirname(module)
+                entry = {module}
+                # Layouts and boundaries from app/ down to the page's own directory;
+                # they never wrap route handlers
+                prefix = ""
+                for segment in directory.split("/") if name == "page" else ():
+                    prefix = os.path.join(prefix, segment)
+                    for support in ROUTE_SUPPORT_FILES:
+                        for support_ext in SOURCE_EXTENSIONS:
+                            candidate = os.path.join(prefix, support + support_ext)
+                            if os.path.isfile(os.path.join(root, candidate)):
+                                entry.add(candidate)
+                self.routes.append((_route_pattern(directory), entry))
+
+    def entries(self, path):
+        matched = set()
+        for pattern, entry in self.routes:
+            if pattern.match(path):
+                matched |= entry
+        return matched
+
+
+def classify_url(url):
+    """Footprint key for a requested URL, or None for assets and third parties."""
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc}"
+    if origin == SUPABASE_URL.rstrip("/"):
+        match = re.match(r"^/rest/v1/(rpc/)?([^/?]+)", parts.path)
+        return f"supabase:{match.group(2)}" if match else None
+    if origin == BASE_URL.rstrip("/") or not parts.netloc:
+        if parts.path.startswith(("/_next/", "/__nextjs")) or re.search(r"\.\w{2,5}$", parts.path):
+            return None
+        return f"path:{parts.path or '/'}"
+    return None
+
+
+def static_footprint(script_path):
+    with open(script_path, encoding="utf-8", errors="replace") as handle:
+        source = handle.read()
+    keys = set()
+    for match in PATH_LITERAL_PATTERN.finditer(source):
+        path = match.group(1)
+        rest = re.match(r"^/rest/v1/(rpc/)?([^/]+)", path)
+        keys.add(f"supabase:{rest.group(2)}" if rest else f"path:{path}")
+    if "localhost:3000" in source and not keys:
+        keys.add("path:/")
+    return keys
+
+
+def recorded_footprints(log_dir=LOG_DIR):
+    footprints = {}
+    for path in glob.glob(os.path.join(log_dir, "*.log")):
+        test = os.path.basename(path)[:-len(".log")]
+        with open(path, encoding="utf-8") as handle:
+            keys = {key for key in (classify_url(line.strip()) for line in handle) if key}
+        footprints[test] = keys
+    return footprints
+
+
+def build_map(tests, log_dir=LOG_DIR, root=REPO_ROOT):
+    """{test: {"source": recorded|static, "modules": [...], "supabase": [...], "select_always": bool}}."""
+    graph, routes = ImportGraph(root), RouteTable(root)
+    recorded = recorded_footprints(log_dir)
+    impact = {}
+    for test in tests:
+        source = "recorded" if test in recorded else "static"
+        keys = recorded.get(test) or static_footprint(os.path.join(TESTS_DIR, test))
+        paths = {key[len("path:"):] for key in keys if key.startswith("path:")}
+        entries = set()
+        for path in paths:
+            entries |= routes.entries(path)
+        impact[test] = {
+            "source": source,
+            "paths": sorted(paths),
+            "supabase": sorted(key[len("supabase:"):] for key in keys if key.startswith("supabase:")),
+            "modules": sorted(graph.closure(entries)),
+            # An unrecorded UI test that only loads "/" reaches everything else by clicking
+            "select_always": source == "static" and (not keys or paths == {"/"}),
+        }
+    return impact
+
+
+def changed_files(ref, root=REPO_ROOT):
+    """Files changed between ``ref`` and the working tree, plus untracked files."""
+    diff = subprocess.run(["git", "diff", "--name-only", ref], cwd=root, capture_output=True, text=True, check=True).stdout
+    untracked = subprocess.run(["git", "ls-files", "--others", "--exclude-standard"], cwd=root, capture_output=True, text=True).stdout
+    return sorted({line for line in (diff + untracked).splitlines() if line})
+
+
+def select(impact, changed, root=REPO_ROOT):
+    """(selected tests, reasons) for a list of changed repo-relative files."""
+    tests_prefix = os.path.relpath(TESTS_DIR, root) + "/"
+    known_modules = set(ImportGraph(root).edges)
+    reasons = {}
+
+    def pick(test, reason):
+        reasons.setdefault(test, []).append(reason)
+
+    for path in changed:
+        if _matches(path, IGNORED_PATTERNS):
+            continue
+        if path.startswith(tests_prefix):
+            test = path[len(tests_prefix):]
+            if test in impact:
+                pick(test, f"{path} changed")
+            continue
+        if path.startswith("supabase/migrations/") and path.endswith(".sql"):
+            full_path = os.path.join(root, path)
+            sql = open(full_path, encoding="utf-8", errors="replace").read() if os.path.exists(full_path) else ""
+            for test, entry in impact.items():
+                touched = [name for name in entry["supabase"] if re.search(rf"\b{re.escape(name)}\b", sql)]
+                if touched:
+                    pick(test, f"{path} touches {', '.join(touched)}")
+            continue
+        if path in known_modules:
+            for test, entry in impact.items():
+                if path in entry["modules"]:
+                    pick(test, f"imports {path}")
+            continue
+        # Configuration, dependencies, middleware, styles: impact unknown, run everything
+        for test in impact:
+            pick(test, f"{path} has unknown impact")
+
+    if any(not _matches(path, IGNORED_PATTERNS) for path in changed):
+        for test, entry in impact.items():
+            if entry["select_always"]:
+                pick(test, "no recorded footprint")
+    return sorted(reasons), reasons
+
+
+def load_map(path=DEFAULT_MAP_PATH, tests=None):
+    """Impact map from disk, falling back to static footprints for tests missing from it."""
+    impact = {}
+    if os.path.exists(path):
+        with open(path) as handle:
+            impact = json.load(handle)
+    missing = [test for test in (tests or []) if test not in impact]
+    if missing:
+        impact.update(build_map(missing))
+    return impact
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--map", default=DEFAULT_MAP_PATH)
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("build", help="Build the impact map from recorded logs and static footprints")
+    choose = commands.add_parser("select", help="List tests affected by changes since a git ref")
+    choose.add_argument("--changed-since", required=True, help="Git ref, e.g. origin/main")
+    choose.add_argument("--explain", action="store_true", help="Print why each test was selected")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    from harness.runner import discover
+
+    args = parse_args(argv)
+    tests = discover()
+    if args.command == "build":
+        impact = build_map(tests)
+        os.makedirs(os.path.dirname(args.map), exist_ok=True)
+        with open(args.map, "w") as handle:
+            json.dump(impact, handle, indent=2)
+        recorded = sum(1 for entry in impact.values() if entry["source"] == "recorded")
+        print(f"✅ Impact map for {len(impact)} tests ({recorded} recorded) written to {args.map}")
+    elif args.command == "select":
+        selected, reasons = select(load_map(args.map, tests), changed_files(args.changed_since))
+        for test in selected:
+            print(test)
+            if args.explain:
+                for reason in reasons[test]:
+                    print(f"    {reason}")
+        print(f"✅ {len(selected)} of {len(tests)} tests affected", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
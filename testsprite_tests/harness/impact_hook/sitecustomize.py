@@ -0,0 +1,57 @@
+"""Logs every URL a test script requests, for harness.impact (loaded via PYTHONPATH by the runner).
+
+Active only when TEST_IMPACT_LOG is set. Playwright contexts get a request
+listener; ``requests`` sessions log before sending. One URL per line.
+"""
+
+import os
+
+LOG_PATH = os.environ.get("TEST_IMPACT_LOG")
+
+
+def _log(url):
+    with open(LOG_PATH, "a", encoding="utf-8") as handle:
+        handle.write(url + "\n")
+
+
+def _patch_playwright():
+    try:
+        from playwright.async_api import Browser, BrowserType
+    except ImportError:
+        return
+
+    def watch(context):
+        context.on("request", lambda request: _log(request.url))
+        return context
+
+    new_context = Browser.new_context
+    launch_persistent_context = BrowserType.launch_persistent_context
+
+    async def patched_new_context(self, *args, **kwargs):
+        return watch(await new_context(self, *args, **kwargs))
+
+    async def patched_launch_persistent_context(self, *args, **kwargs):
+        return watch(await launch_persistent_context(self, *args, **kwargs))
+
+    # Browser.new_page creates its own context through new_context
+    Browser.new_context = patched_new_context
+    BrowserType.launch_persistent_context = patched_launch_persistent_context
+
+
+def _patch_requests():
+    try:
+        from requests import Session
+    except ImportError:
+        return
+    send = Session.request
+
+    def patched_request(self, method, url, *args, **kwargs):
+        _log(str(url))
+        return send(self, method, url, *args, **kwargs)
+
+    Session.request = patched_request
+
+
+if LOG_PATH:
+    _patch_playwright()
+    _patch_requests()
@@ -0,0 +1,95 @@
+"""Named UI journeys shared by the network, request-budget and vitals harnesses.
+
+A journey is an async function taking a signed-in Playwright page that has
+already loaded /kanban. It performs one user-visible flow and returns once
+the UI reflects the result, so callers can time it or count its requests.
+"""
+
+import time
+import uuid
+
+from harness.config import TIMEOUT
+from harness.pages import KanbanPage
+
+TIMEOUT_MS = TIMEOUT * 1000
+JOURNEY_TASK_PREFIX = "Journey task"
+
+
+async def open_board(page):
+    """Navigate to /kanban and wait for the first card."""
+    await KanbanPage(page).goto()
+
+
+async def open_task_modal(page):
+    """Open the first card's edit modal and wait for its details (fetchTaskDetails) to load."""
+    modal = await KanbanPage(page).card(0).open()
+    await modal.wait_for_details()
+    await modal.close()
+
+
+async def create_task(page):
+    """Create a task through the modal and wait for its card to appear."""
+    title = f"{JOURNEY_TASK_PREFIX} {uuid.uuid4().hex[:8]}"
+    board = KanbanPage(page)
+    modal = await board.new_task()
+    await modal.fill(title=title)
+    await modal.choose("department", "Engineering")
+    await modal.save()
+    await board.card_titled(title).root.wait_for(timeout=TIMEOUT_MS)
+    await page.keyboard.press("Escape")
+
+
+async def edit_task(page):
+    """Change the first card's description and save it (TC008)."""
+    modal = await KanbanPage(page).card(0).open()
+    await modal.wait_for_details()
+    await modal.fill(description=f"Edited by journey {uuid.uuid4().hex[:8]}")
+    await modal.save()
+    await modal.wait_for_saved()
+
+
+async def assign_members(page):
+    """Toggle two team members on the first card and save (TC012)."""
+    modal = await KanbanPage(page).card(0).open()
+    await modal.wait_for_details()
+    await modal.toggle_assignees(2)
+    await modal.save()
+    await modal.wait_for_saved()
+
+
+async def delete_task(page):
+    """Delete a task created by ``create_task`` and wait for its card to go (TC010)."""
+    card = KanbanPage(page).card_titled(JOURNEY_TASK_PREFIX, exact=False)
+    modal = await card.open()
+    await modal.delete()
+    await card.root.wait_for(state="detached", timeout=TIMEOUT_MS)
+
+
+JOURNEYS = {
+    "open_board": open_board,
+    "open_task_modal": open_task_modal,
+    "create_task": create_task,
+    "edit_task": edit_task,
+    "assign_members": assign_members,
+    "delete_task": delete_task,
+}
+
+# Untimed steps a journey needs after the board has loaded
+SETUP = {
+    "delete_task": create_task,
+}
+
+
+async def prepare(page, journey_name):
+    """Load the board and run any setup so only the journey itself is measured."""
+    if journey_name != "open_board":
+        await open_board(page)
+    if journey_name in SETUP:
+        await SETUP[journey_name](page)
+
+
+async def timed(journey, page):
+    """Run a journey and return its wall time in milliseconds."""
+    started = time.perf_counter()
+    await journey(page)
+    return (time.perf_counter() - started) * 1000
@@ -0,0 +1,153 @@
+"""Network-condition profiles for UI tests (CDP throttling and offline toggle).
+
+Plants run the app over shop-floor Wi-Fi and tablets, so round-trip-heavy
+flows behave very differently than on loopback. Profiles are applied through
+the Chromium DevTools protocol (Network.emulateNetworkConditions), which
+throttles every request of the page, including the Supabase websocket.
+
+Usage (from the testsprite_tests directory)::
+
+    python -m harness.network --profiles loopback,shop_floor_wifi,3g --journeys open_board,open_task_modal
+
+In tests::
+
+    await apply_profile(page, "shop_floor_wifi")
+    await set_offline(context, True)   # e.g. to exercise the offline outbox
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+from dataclasses import dataclass
+
+from harness.config import RESULTS_DIR, TIMEOUT
+
+
+@dataclass(frozen=True)
+class NetworkProfile:
+    latency_ms: float  # added round-trip latency
+    download_kbps: float  # -1 disables the limit
+    upload_kbps: float
+    packet_loss: float = 0.0  # percent, honoured by recent Chromium builds
+    offline: bool = False
+
+
+PROFILES = {
+    "loopback": NetworkProfile(latency_ms=0, download_kbps=-1, upload_kbps=-1),
+    "shop_floor_wifi": NetworkProfile(latency_ms=80, download_kbps=5_000, upload_kbps=2_000, packet_loss=2),
+    "3g": NetworkProfile(latency_ms=300, download_kbps=1_600, upload_kbps=750),
+    "high_latency_vpn": NetworkProfile(latency_ms=250, download_kbps=20_000, upload_kbps=10_000),
+    "offline": NetworkProfile(latency_ms=0, download_kbps=0, upload_kbps=0, offline=True),
+}
+
+
+def _throughput(kbps):
+    return -1 if kbps < 0 else kbps * 1000 / 8  # CDP expects bytes per second
+
+
+async def apply_profile(page, profile):
+    """Throttle a page; ``profile`` is a name from PROFILES or a NetworkProfile. Returns the CDP session."""
+    if isinstance(profile, str):
+        profile = PROFILES[profile]
+    cdp = await page.context.new_cdp_session(page)
+    await cdp.send("Network.enable")
+    conditions = {
+        "offline": profile.offline,
+        "latency": profile.latency_ms,
+        "downloadThroughput": _throughput(profile.download_kbps),
+        "uploadThroughput": _throughput(profile.upload_kbps),
+    }
+    if profile.packet_loss:
+        conditions["packetLoss"] = profile.packet_loss
+    try:
+        await cdp.send("Network.emulateNetworkConditions", conditions)
+    except Exception:
+        # Older Chromium rejects packetLoss; keep latency and bandwidth limits
+        conditions.pop("packetLoss", None)
+        await cdp.send("Network.emulateNetworkConditions", conditions)
+    return cdp
+
+
+async def set_offline(context, offline=True):
+    """Toggle connectivity for every page in a context (fires the browser's online/offline events)."""
+    await context.set_offline(offline)
+
+
+async def run(profile_names, journey_names, runs):
+    from playwright.async_api import async_playwright
+    import httpx
+    from harness.auth import sign_in
+    from harness.browser import launch_chromium, new_signed_in_context
+    from harness.journeys import JOURNEYS, prepare, timed
+
+    async with httpx.AsyncClient(timeout=TIMEOUT) as http:
+        session = await sign_in(http)
+
+    results = {}
+    async with async_playwright() as playwright:
+        browser = await launch_chromium(playwright)
+        for profile_name in profile_names:
+            results[profile_name] = {}
+            for journey_name in journey_names:
+                samples = []
+                for _ in range(runs):
+                    context = await new_signed_in_context(browser, session)
+                    page = await context.new_page()
+                    await prepare(page, journey_name)
+                    await apply_profile(page, profile_name)
+                    try:
+                        samples.append(await timed(JOURNEYS[journey_name], page))
+                    except Exception as error:
+                        print(f"⚠️ {journey_name} failed on {profile_name}: {error}")
+                    await context.close()
+                results[profile_name][journey_name] = {
+                    "samples_ms": samples,
+                    "median_ms": statistics.median(samples) if samples else None,
+                    "failures": runs - len(samples),
+                }
+        await browser.close()
+    return results
+
+
+def render_table(results, journey_names):
+    header = f"{'profile':<18}" + "".join(f"{name:>18}" for name in journey_names)
+    lines = [header, "-" * len(header)]
+    for profile_name, journeys in results.items():
+        cells = []
+        for name in journey_names:
+            median = journeys[name]["median_ms"]
+            cells.append(f"{median:>16.0f}ms" if median is not None else f"{'failed':>18}")
+        lines.append(f"{profile_name:<18}" + "".join(cells))
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    from harness.journeys import JOURNEYS
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--profiles", default="loopback,shop_floor_wifi,3g,high_latency_vpn",
+                        help="Comma separated subset of: " + ", ".join(PROFILES))
+    parser.add_argument("--journeys", default=",".join(JOURNEYS), help="Comma separated subset of: " + ", ".join(JOURNEYS))
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "network-profiles.json"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    profile_names = [name.strip() for name in args.profiles.split(",") if name.strip()]
+    journey_names = [name.strip() for name in args.journeys.split(",") if name.strip()]
+    results = asyncio.run(run(profile_names, journey_names, args.runs))
+
+    print(render_table(results, journey_names))
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as handle:
+        json.dump({"recorded_at": time.time(), "profiles": results}, handle, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""Page objects for the kanban UI, built on the components' ``data-testid`` attributes.
+
+The generated TC scripts locate elements with absolute xpaths such as
+``html/body/div[5]/form/div[2]/div[2]/button[2]``, which break whenever a
+wrapper div is added and push authors toward ``wait_for_timeout`` sleeps.
+These objects resolve elements by test id instead (``get_by_test_id``, a
+single attribute lookup) and wait once, on the state that proves the UI is
+ready, rather than sleeping or retrying clicks.
+
+Test ids live on the components themselves: kanban-board.tsx, task-card.tsx,
+task-modal.tsx, subtask-list.tsx and comments-section.tsx. Rows and cards
+also carry their ids (``data-task-id``, ``data-subtask-id``,
+``data-comment-id``) so a test can target one record directly.
+
+Usage::
+
+    board = KanbanPage(page)
+    await board.goto()
+    modal = await board.card(0).open()
+    await modal.wait_for_details()
+    await modal.subtasks.add("Check torque settings")
+    await modal.comments.post("Done on line 3")
+    await modal.save()
+"""
+
+from harness.config import BASE_URL, TIMEOUT
+
+TIMEOUT_MS = TIMEOUT * 1000
+
+
+class KanbanPage:
+    def __init__(self, page):
+        self.page = page
+        self.root = page.get_by_test_id("kanban-board")
+        self.search_input = page.get_by_test_id("board-search")
+        self.cards = page.get_by_test_id("task-card")
+
+    async def goto(self):
+        """Load /kanban, expand every column and wait for the first rendered card."""
+        await self.page.goto(f"{BASE_URL}/kanban", wait_until="domcontentloaded")
+        # Columns start collapsed and list tasks as compact rows; cards only render expanded
+        first_task = self.page.locator('[data-testid="task-card"], [data-testid="kanban-task-row"]').first
+        await first_task.wait_for(timeout=TIMEOUT_MS)
+        await self.expand_columns()
+        await self.cards.first.wait_for(timeout=TIMEOUT_MS)
+        return self
+
+    async def expand_columns(self):
+        """Expand every collapsed column so its tasks render as full cards."""
+        collapsed = self.page.locator('[data-testid="kanban-column-toggle"][aria-expanded="false"]')
+        while await collapsed.count():
+            await collapsed.first.click()
+
+    def column(self, column_id):
+        """Column by id: ``todo``, ``inProgress`` or ``completed``."""
+        return self.page.locator(f'[data-testid="kanban-column"][data-column-id="{column_id}"]')
+
+    async def column_count(self, column_id):
+        return int(await self.column(column_id).get_by_test_id("kanban-column-count").inner_text())
+
+    def card(self, index_or_task_id):
+        """Card by position on the board or by task id."""
+        if isinstance(index_or_task_id, int):
+            return TaskCard(self.page, self.cards.nth(index_or_task_id))
+        return TaskCard(self.page, self.page.locator(f'[data-task-id="{index_or_task_id}"]').get_by_test_id("task-card"))
+
+    def card_titled(self, title, exact=True):
+        title_locator = self.page.get_by_test_id("task-card-title").get_by_text(title, exact=exact)
+        return TaskCard(self.page, self.cards.filter(has=title_locator).first)
+
+    async def search(self, query):
+        await self.search_input.fill(query)
+
+    async def clear_filters(self):
+        await self.page.get_by_test_id("board-clear-filters").click()
+
+    async def new_task(self):
+        """Open the create modal."""
+        await self.page.get_by_test_id("board-add-task").click()
+        modal = TaskModal(self.page, mode="create")
+        await modal.root.wait_for(timeout=TIMEOUT_MS)
+        return modal
+
+    async def drag_card_to(self, card, column_id):
+        await card.root.drag_to(self.column(column_id))
+
+
+class TaskCard:
+    def __init__(self, page, root):
+        self.page = page
+        self.root = root
+
+    async def title(self):
+        return await self.root.get_by_test_id("task-card-title").inner_text()
+
+    async def comment_count(self):
+        counter = self.root.get_by_test_id("task-card-comment-count")
+        return int(await counter.inner_text()) if await counter.count() else 0
+
+    async def toggle_subtasks(self):
+        await self.root.get_by_test_id("task-card-subtasks-toggle").click()
+
+    async def open(self):
+        """Click the card and return its edit modal once visible."""
+        await self.root.click()
+        modal = TaskModal(self.page, mode="edit")
+        await modal.root.wait_for(timeout=TIMEOUT_MS)
+        return modal
+
+
+class TaskModal:
+    def __init__(self, page, mode="edit"):
+        self.page = page
+        self.root = page.locator(f'[data-testid="task-modal"][data-mode="{mode}"]')
+        self.title = self.root.get_by_test_id("task-modal-title")
+        self.description = self.root.get_by_test_id("task-modal-description")
+        self.subtasks = SubtaskList(page, self.root.get_by_test_id("subtask-list"))
+        # The first comments-section inside the modal is the task's own thread
+        self.comments = CommentsSection(page, self.root.get_by_test_id("comments-section").first)
+
+    async def wait_for_details(self):
+        """Wait until fetchTaskDetails has filled description, subtasks and attachments (edit mode)."""
+        await self.page.locator('[data-testid="task-modal"][data-details-loaded="true"]').wait_for(timeout=TIMEOUT_MS)
+
+    async def fill(self, title=None, description=None):
+        if title is not None:
+            await self.title.fill(title)
+        if description is not None:
+            await self.description.fill(description)
+
+    async def choose(self, field, option):
+        """Pick a Select option; ``field`` is ``priority`` or ``department``."""
+        await self.root.get_by_test_id(f"task-modal-{field}").click()
+        await self.page.get_by_role("option", name=option, exact=True).click()
+
+    async def toggle_assignees(self, count):
+        """Flip the first ``count`` members in the assignee picker (adds or removes each)."""
+        await self.root.get_by_test_id("task-modal-assignee-add").click()
+        options = self.page.get_by_test_id("task-modal-assignee-option")
+        for index in range(count):
+            await options.nth(index).click()
+        await self.page.keyboard.press("Escape")
+
+    async def save(self):
+        await self.root.get_by_test_id("task-modal-save").click()
+
+    async def wait_for_saved(self):
+        """Wait for the success banner shown after updateTask/addTask resolves."""
+        await self.root.get_by_test_id("task-modal-success").wait_for(timeout=TIMEOUT_MS)
+
+    async def cancel(self):
+        await self.root.get_by_test_id("task-modal-cancel").click()
+        await self.root.wait_for(state="hidden", timeout=TIMEOUT_MS)
+
+    async def close(self):
+        await self.page.keyboard.press("Escape")
+        await self.root.wait_for(state="hidden", timeout=TIMEOUT_MS)
+
+    async def delete(self):
+        await self.root.get_by_test_id("task-modal-delete").click()
+        await self.page.get_by_test_id("task-delete-confirm").click()
+        await self.root.wait_for(state="hidden", timeout=TIMEOUT_MS)
+
+    async def error(self):
+        banner = self.root.get_by_test_id("task-modal-error")
+        return await banner.inner_text() if await banner.count() else None
+
+
+class SubtaskList:
+    def __init__(self, page, root):
+        self.page = page
+        self.root = root
+        self.items = root.get_by_test_id("subtask-item")
+
+    def item(self, index_or_subtask_id):
+        if isinstance(index_or_subtask_id, int):
+            return self.items.nth(index_or_subtask_id)
+        return self.root.locator(f'[data-testid="subtask-item"][data-subtask-id="{index_or_subtask_id}"]')
+
+    async def add(self, title):
+        """Create a subtask and wait for its row."""
+        before = await self.items.count()
+        await self.root.get_by_test_id("subtask-new").click()
+        await self.root.get_by_test_id("subtask-new-title").fill(title)
+        await self.root.get_by_test_id("subtask-add").click()
+        await self.items.nth(before).wait_for(timeout=TIMEOUT_MS)
+
+    async def toggle(self, index_or_subtask_id):
+        await self.item(index_or_subtask_id).get_by_test_id("subtask-toggle").click()
+
+    async def toggle_assignee(self, index_or_subtask_id, member_id):
+        """Open the row's assignee popover and flip one member (toggleSubtaskAssignee)."""
+        await self.item(index_or_subtask_id).get_by_test_id("subtask-assignee-trigger").click()
+        option = self.page.locator(f'[data-testid="subtask-assignee-option"][data-member-id="{member_id}"]')
+        await option.click()
+        await self.page.keyboard.press("Escape")
+
+    async def delete(self, index_or_subtask_id):
+        await self.item(index_or_subtask_id).get_by_test_id("subtask-delete").click()
+
+
+class CommentsSection:
+    def __init__(self, page, root):
+        self.page = page
+        self.root = root
+        self.items = root.get_by_test_id("comment-item")
+
+    async def post(self, text):
+        """Post a comment and wait until the optimistic entry is confirmed by the server."""
+        await self.root.get_by_test_id("comment-input").fill(text)
+        await self.root.get_by_test_id("comment-submit").click()
+        confirmed = self.root.locator('[data-testid="comment-item"][data-upload-status="success"]')
+        await confirmed.filter(has_text=text).first.wait_for(timeout=TIMEOUT_MS)
+
+    async def texts(self):
+        return await self.root.get_by_test_id("comment-content").all_inner_texts()
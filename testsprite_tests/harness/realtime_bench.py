@@ -0,0 +1,339 @@
+"""Realtime end-to-end latency benchmark (write -> websocket -> rendered card).
+
+Opens N viewers subscribed to postgres_changes the way hooks/use-tasks.ts
+does, writes through the Supabase REST API and records, per delivery:
+
+* ``write_to_delivery`` - client clock from issuing the write to receiving the event
+* ``commit_to_delivery`` - the event's commit_timestamp to receipt (needs synced clocks)
+* ``write_to_render`` - browser viewers only: write to the card text changing in the DOM
+
+Raw websocket viewers are cheap, so a sweep can go from 10 to 1,000
+concurrent viewers in one process. ``--transport sse`` swaps them for
+clients of the Next.js SSE gateway (GET /api/realtime), to compare one
+upstream subscription fanned out by the app with a channel per viewer.
+Browser viewers load /kanban in real Playwright contexts and are meant for
+small N.
+
+Usage (from the testsprite_tests directory)::
+
+    python -m harness.realtime_bench --viewers 10,100,1000 --writes 50
+    python -m harness.realtime_bench --viewers 10,100,1000 --transport sse
+    python -m harness.realtime_bench --viewers 5 --browser --writes 20
+
+Requires ``httpx`` and ``websockets`` (plus ``playwright`` for --browser) and
+TEST_USER_PASSWORD / SUPABASE_ANON_KEY in the environment.
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import time
+import uuid
+from datetime import datetime
+
+from harness.client import ApiClient
+from harness.config import BASE_URL, RESULTS_DIR, SUPABASE_ANON_KEY, SUPABASE_URL, TIMEOUT
+from harness.stats import LatencyHistogram
+
+HEARTBEAT_SECONDS = 25
+
+
+def realtime_url():
+    scheme = "wss" if SUPABASE_URL.startswith("https") else "ws"
+    host = SUPABASE_URL.split("://", 1)[1].rstrip("/")
+    return f"{scheme}://{host}/realtime/v1/websocket?apikey={SUPABASE_ANON_KEY}&vsn=1.0.0"
+
+
+def parse_commit_timestamp(value):
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+class RealtimeViewer:
+    """One websocket client joined to a postgres_changes channel (Phoenix protocol)."""
+
+    def __init__(self, index, access_token, table):
+        self.index = index
+        self.access_token = access_token
+        self.table = table
+        self.deliveries = {}  # record id -> (received_at, commit_timestamp)
+        self.ready = asyncio.Event()
+        self._refs = itertools.count(1)
+        self._socket = None
+        self._tasks = []
+
+    async def connect(self):
+        import websockets
+
+        self._socket = await websockets.connect(realtime_url(), max_size=None, open_timeout=TIMEOUT)
+        await self._send(f"realtime:bench_{self.table}_{self.index}", "phx_join", {
+            "config": {
+                "broadcast": {"ack": False, "self": False},
+                "presence": {"key": ""},
+                "postgres_changes": [{"event": "*", "schema": "public", "table": self.table}],
+                "private": False,
+            },
+            "access_token": self.access_token,
+        })
+        self._tasks = [asyncio.create_task(self._receive()), asyncio.create_task(self._heartbeat())]
+        await asyncio.wait_for(self.ready.wait(), TIMEOUT)
+
+    async def _send(self, topic, event, payload):
+        ref = str(next(self._refs))
+        await self._socket.send(json.dumps({"topic": topic, "event": event, "payload": payload, "ref": ref, "join_ref": ref}))
+
+    async def _heartbeat(self):
+        while True:
+            await asyncio.sleep(HEARTBEAT_SECONDS)
+            await self._send("phoenix", "heartbeat", {})
+
+    async def _receive(self):
+        async for raw in self._socket:
+            received_at = time.time()
+            message = json.loads(raw)
+            event, payload = message.get("event"), message.get("payload") or {}
+            if event == "system" and payload.get("status") == "ok":
+                self.ready.set()  # "Subscribed to PostgreSQL"
+            elif event == "postgres_changes":
+                data = payload.get("data") or {}
+                record = data.get("record") or data.get("old_record") or {}
+                if record.get("id"):
+                    self.deliveries.setdefault(record["id"], (received_at, data.get("commit_timestamp")))
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        if self._socket is not None:
+            await self._socket.close()
+
+
+class SseViewer:
+    """One EventSource-style client of the realtime gateway, filtered to one table."""
+
+    def __init__(self, index, access_token, table, http):
+        self.index = index
+        self.access_token = access_token
+        self.table = table
+        self.http = http
+        self.deliveries = {}  # record id -> (received_at, commit_timestamp)
+        self.ready = asyncio.Event()
+        self._task = None
+
+    async def connect(self):
+        self._task = asyncio.create_task(self._receive())
+        await asyncio.wait_for(self.ready.wait(), TIMEOUT)
+
+    async def _receive(self):
+        headers = {"Authorization": f"Bearer {self.access_token}", "Accept": "text/event-stream"}
+        async with self.http.stream("GET", f"{BASE_URL}/api/realtime", params={"tables": self.table},
+                                    headers=headers, timeout=None) as response:
+            event, data = None, []
+            async for line in response.aiter_lines():
+                if line:
+                    field, _, value = line.partition(":")
+                    if field == "event":
+                        event = value.strip()
+                    elif field == "data":
+                        data.append(value.strip())
+                    continue
+                # Blank line dispatches the event
+                received_at = time.time()
+                if event == "ready":
+                    self.ready.set()
+                elif event == "change" and data:
+                    change = json.loads("\n".join(data))
+                    record = change.get("new") or change.get("old") or {}
+                    if record.get("id"):
+                        self.deliveries.setdefault(record["id"], (received_at, change.get("commit_timestamp")))
+                event, data = None, []
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+
+
+class BrowserViewer:
+    """A real /kanban page; records when the benchmark card's title changes in the DOM."""
+
+    def __init__(self, context, task_id):
+        self.context = context
+        self.task_id = task_id
+        self.page = None
+
+    async def open(self):
+        self.page = await self.context.new_page()
+        await self.page.goto(f"{BASE_URL}/kanban", wait_until="domcontentloaded")
+        selector = f'[data-task-id="{self.task_id}"]'
+        await self.page.wait_for_selector(selector, timeout=TIMEOUT * 1000)
+        await self.page.evaluate("""(selector) => {
+            window.__renders = {}
+            new MutationObserver(() => {
+                const text = document.querySelector(selector)?.textContent || ''
+                for (const marker of text.match(/rt-[0-9a-f]{8}/g) || []) {
+                    window.__renders[marker] ??= Date.now()
+                }
+            }).observe(document.body, { subtree: true, childList: true, characterData: true })
+        }""", selector)
+
+    async def renders(self):
+        return await self.page.evaluate("window.__renders")
+
+
+class Writer:
+    """Issues benchmark writes through PostgREST as the signed-in user."""
+
+    def __init__(self, api):
+        self.api = api
+
+    async def create_task(self):
+        task = await self.api.create_task("Realtime benchmark", department="Engineering", priority="Low")
+        return task.id
+
+    async def delete_task(self, task_id):
+        await self.api.delete_task(task_id)
+
+    async def add_comment(self, task_id):
+        return (await self.api.add_comment(task_id, "realtime benchmark")).id
+
+    async def rename_task(self, task_id, marker):
+        await self.api.update_task(task_id, title=f"Realtime benchmark {marker}")
+
+
+async def run_socket_round(writer, session, task_id, viewers, writes, interval, drain, transport="socket"):
+    """Comment inserts observed by raw websocket (or SSE gateway) viewers."""
+    http = None
+    if transport == "sse":
+        import httpx
+
+        # Each stream holds its own HTTP/1.1 connection
+        http = httpx.AsyncClient(limits=httpx.Limits(max_connections=viewers + 10))
+        clients = [SseViewer(i, session.access_token, "comments", http) for i in range(viewers)]
+    else:
+        clients = [RealtimeViewer(i, session.access_token, "comments") for i in range(viewers)]
+    connect_limit = asyncio.Semaphore(50)
+
+    async def connect(client):
+        async with connect_limit:
+            await client.connect()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connect(client) for client in clients))
+    print(f"🔌 {viewers} viewers subscribed in {time.perf_counter() - started:.1f}s")
+
+    sent = {}
+    for _ in range(writes):
+        issued_at = time.time()
+        sent[await writer.add_comment(task_id)] = issued_at
+        await asyncio.sleep(interval)
+    await asyncio.sleep(drain)
+
+    write_hist, commit_hist = LatencyHistogram(), LatencyHistogram()
+    for client in clients:
+        for record_id, issued_at in sent.items():
+            delivery = client.deliveries.get(record_id)
+            if delivery is None:
+                write_hist.missing += 1
+                continue
+            received_at, commit_timestamp = delivery
+            write_hist.add((received_at - issued_at) * 1000)
+            if commit_timestamp:
+                commit_hist.add((received_at - parse_commit_timestamp(commit_timestamp)) * 1000)
+
+    await asyncio.gather(*(client.close() for client in clients), return_exceptions=True)
+    if http is not None:
+        await http.aclose()
+    return {"write_to_delivery": write_hist, "commit_to_delivery": commit_hist}
+
+
+async def run_browser_round(writer, session, task_id, viewers, writes, interval, drain):
+    """Task renames observed as DOM changes on /kanban pages."""
+    from playwright.async_api import async_playwright
+    from harness.browser import launch_chromium, new_signed_in_context
+
+    render_hist = LatencyHistogram()
+    async with async_playwright() as playwright:
+        browser = await launch_chromium(playwright)
+        pages = []
+        for _ in range(viewers):
+            viewer = BrowserViewer(await new_signed_in_context(browser, session), task_id)
+            await viewer.open()
+            pages.append(viewer)
+
+        sent = {}
+        for _ in range(writes):
+            marker = f"rt-{uuid.uuid4().hex[:8]}"
+            sent[marker] = time.time() * 1000
+            await writer.rename_task(task_id, marker)
+            await asyncio.sleep(interval)
+        await asyncio.sleep(drain)
+
+        for viewer in pages:
+            renders = await viewer.renders()
+            for marker, issued_at in sent.items():
+                if marker in renders:
+                    render_hist.add(renders[marker] - issued_at)
+                else:
+                    render_hist.missing += 1
+        await browser.close()
+    return {"write_to_render": render_hist}
+
+
+async def run(viewer_counts, writes, interval, drain, browser, transport="socket"):
+    results = []
+    async with ApiClient() as api:
+        session = api.session
+        writer = Writer(api)
+        task_id = await writer.create_task()
+        try:
+            mode = "browser" if browser else transport
+            for viewers in viewer_counts:
+                if browser:
+                    histograms = await run_browser_round(writer, session, task_id, viewers, writes, interval, drain)
+                else:
+                    histograms = await run_socket_round(writer, session, task_id, viewers, writes, interval, drain,
+                                                        transport)
+                print(f"\n🚀 PERFORMANCE: {viewers} {mode} viewers, {writes} writes")
+                for name, histogram in histograms.items():
+                    summary = histogram.summary()
+                    if summary["count"]:
+                        print(f"  {name}: p50={summary['p50']:.0f}ms p90={summary['p90']:.0f}ms "
+                              f"p99={summary['p99']:.0f}ms max={summary['max']:.0f}ms missing={summary['missing']}")
+                        print(histogram.render())
+                results.append({
+                    "viewers": viewers,
+                    "mode": mode,
+                    "writes": writes,
+                    **{name: histogram.summary() for name, histogram in histograms.items()},
+                })
+        finally:
+            await writer.delete_task(task_id)
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--viewers", default="10,100,1000", help="Comma separated viewer counts to sweep")
+    parser.add_argument("--writes", type=int, default=50, help="Writes per round")
+    parser.add_argument("--interval", type=float, default=0.2, help="Seconds between writes")
+    parser.add_argument("--drain", type=float, default=5.0, help="Seconds to wait for late deliveries")
+    parser.add_argument("--browser", action="store_true", help="Measure DOM render latency in Playwright pages")
+    parser.add_argument("--transport", choices=("socket", "sse"), default="socket",
+                        help="Viewer transport: Supabase realtime websocket or the /api/realtime SSE gateway")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "realtime-latency.json"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    viewer_counts = [int(value) for value in args.viewers.split(",") if value.strip()]
+    results = asyncio.run(run(viewer_counts, args.writes, args.interval, args.drain, args.browser, args.transport))
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as handle:
+        json.dump({"recorded_at": time.time(), "rounds": results}, handle, indent=2)
+    print(f"\n✅ Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
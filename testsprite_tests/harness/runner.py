@@ -0,0 +1,313 @@
+"""Parallel runner for the TC*/api-* scripts with retry analytics and flaky-test quarantine.
+
+Every test script is a standalone program (exit code 0 = pass), so each one
+runs in its own subprocess. The runner keeps a per-test history of outcome
+and duration in SQLite and uses it to:
+
+* retry failures in isolation - after the parallel pass, each failed test is
+  rerun alone (one at a time) so contention with other browsers is ruled out;
+* quarantine flaky tests - a test whose first attempt failed but a retry
+  passed in at least ``--flaky-threshold`` of its recent runs is flaky; its
+  failures are reported but do not fail the suite;
+* schedule - tests are ordered by expected cost (median duration inflated by
+  retry rate), longest first, so the slowest and flakiest start immediately
+  instead of extending the tail. ``--flaky-workers`` reserves workers for
+  quarantined tests so they never block the stable ones.
+
+Usage (from the testsprite_tests directory)::
+
+    python -m harness.runner                          # everything, 4 workers, 2 isolated retries
+    python -m harness.runner --pattern 'TC01*' --workers 2
+    python -m harness.runner --report                 # flakiness table from history only
+    python -m harness.runner --changed-since origin/main   # only tests affected by the diff (harness.impact)
+    python -m harness.runner --record-impact          # also log each test's URLs for the impact map
+
+Results go to tmp/results/test-run.json; history to tmp/results/test-history.sqlite.
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+from statistics import median
+
+from harness.config import RESULTS_DIR
+from harness.history import resolve_sha
+
+TESTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(RESULTS_DIR, "test-history.sqlite")
+TEST_GLOBS = ("TC*.py", "api-*.py")
+DEFAULT_DURATION_S = 60.0  # assumed cost of a test without history
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS test_results (
+  id INTEGER PRIMARY KEY AUTOINCREMENT,
+  run_id TEXT NOT NULL,
+  sha TEXT NOT NULL,
+  test TEXT NOT NULL,
+  attempt INTEGER NOT NULL,
+  outcome TEXT NOT NULL,
+  duration_s REAL NOT NULL,
+  recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_test_results_test ON test_results(test, recorded_at);
+"""
+
+
+def discover(patterns=None):
+    """Test script names (file names relative to testsprite_tests), sorted."""
+    names = sorted({os.path.basename(path) for pattern in TEST_GLOBS for path in glob.glob(os.path.join(TESTS_DIR, pattern))})
+    if patterns:
+        names = [name for name in names if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)]
+    return names
+
+
+class TestHistory:
+    def __init__(self, path=DEFAULT_DB_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.conn.commit()
+        self.conn.close()
+
+    def record(self, run_id, sha, result):
+        self.conn.execute(
+            "INSERT INTO test_results (run_id, sha, test, attempt, outcome, duration_s, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (run_id, sha, result["test"], result["attempt"], result["outcome"], result["duration_s"], time.time()),
+        )
+
+    def stats(self, window=20):
+        """Per-test stats over the last ``window`` runs of each test.
+
+        ``flake_rate`` is the share of runs whose first attempt failed but a retry
+        passed; ``fail_rate`` the share that failed on every attempt.
+        """
+        rows = self.conn.execute(
+            "SELECT test, run_id, attempt, outcome, duration_s FROM test_results ORDER BY recorded_at DESC"
+        )
+        runs = {}
+        for test, run_id, attempt, outcome, duration_s in rows:
+            per_test = runs.setdefault(test, {})
+            if run_id not in per_test and len(per_test) >= window:
+                continue
+            per_test.setdefault(run_id, []).append((attempt, outcome, duration_s))
+
+        stats = {}
+        for test, per_run in runs.items():
+            flaky = failed = 0
+            durations = []
+            for attempts in per_run.values():
+                attempts.sort()
+                outcomes = [outcome for _, outcome, _ in attempts]
+                if outcomes[0] != "pass" and "pass" in outcomes:
+                    flaky += 1
+                elif "pass" not in outcomes:
+                    failed += 1
+                durations.append(attempts[0][2])
+            total = len(per_run)
+            stats[test] = {
+                "runs": total,
+                "flake_rate": flaky / total,
+                "fail_rate": failed / total,
+                "median_duration_s": median(durations),
+            }
+        return stats
+
+
+def expected_cost(test, stats, retries):
+    """Median duration inflated by the expected number of extra attempts."""
+    entry = stats.get(test)
+    if not entry:
+        return DEFAULT_DURATION_S
+    retry_rate = entry["flake_rate"] + entry["fail_rate"]
+    return entry["median_duration_s"] * (1 + retry_rate * retries)
+
+
+def schedule(tests, stats, retries, flaky_threshold):
+    """Split into (stable, quarantined), each ordered longest expected cost first."""
+    by_cost = sorted(tests, key=lambda test: expected_cost(test, stats, retries), reverse=True)
+    quarantined = [test for test in by_cost if stats.get(test, {}).get("flake_rate", 0) >= flaky_threshold]
+    stable = [test for test in by_cost if test not in quarantined]
+    return stable, quarantined
+
+
+def impact_env(test):
+    """Environment that loads the URL-logging hook for harness.impact."""
+    from harness.impact import HOOK_DIR, LOG_DIR
+
+    os.makedirs(LOG_DIR, exist_ok=True)
+    log_path = os.path.join(LOG_DIR, f"{os.path.basename(test)}.log")
+    if os.path.exists(log_path):
+        os.remove(log_path)  # keep only the latest footprint
+    python_path = os.pathsep.join(filter(None, [HOOK_DIR, TESTS_DIR, os.environ.get("PYTHONPATH")]))
+    return {**os.environ, "PYTHONPATH": python_path, "TEST_IMPACT_LOG": log_path}
+
+
+async def run_script(test, attempt, timeout_s, record_impact=False):
+    started = time.perf_counter()
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, test, cwd=TESTS_DIR, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT,
+        env=impact_env(test) if record_impact and attempt == 1 else None,
+    )
+    try:
+        output, _ = await asyncio.wait_for(process.communicate(), timeout_s)
+        outcome = "pass" if process.returncode == 0 else "fail"
+    except asyncio.TimeoutError:
+        process.kill()
+        output, _ = await process.communicate()
+        outcome = "timeout"
+    return {
+        "test": test,
+        "attempt": attempt,
+        "outcome": outcome,
+        "duration_s": time.perf_counter() - started,
+        "output_tail": output.decode(errors="replace")[-2000:],
+    }
+
+
+async def run_queue(queue, workers, attempt, timeout_s, on_result, record_impact=False):
+    """Drain an ordered list of tests with ``workers`` concurrent subprocesses."""
+    pending = list(queue)
+
+    async def worker():
+        while pending:
+            result = await run_script(pending.pop(0), attempt, timeout_s, record_impact)
+            on_result(result)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(workers, len(queue))))))
+
+
+async def run_suite(stable, quarantined, workers, flaky_workers, retries, timeout_s, on_result, record_impact=False):
+    """Parallel first pass (quarantined tests on their own workers), then isolated retries."""
+    results = {}
+
+    def collect(result):
+        results.setdefault(result["test"], []).append(result)
+        on_result(result)
+
+    if flaky_workers and quarantined:
+        await asyncio.gather(
+            run_queue(stable, max(1, workers - flaky_workers), 1, timeout_s, collect, record_impact),
+            run_queue(quarantined, flaky_workers, 1, timeout_s, collect, record_impact),
+        )
+    else:
+        # Highest expected cost first across both groups
+        await run_queue(stable + quarantined, workers, 1, timeout_s, collect, record_impact)
+
+    for attempt in range(2, retries + 2):
+        failed = [test for test, attempts in results.items() if attempts[-1]["outcome"] != "pass"]
+        if not failed:
+            break
+        await run_queue(failed, 1, attempt, timeout_s, collect)
+    return results
+
+
+def classify(attempts):
+    outcomes = [attempt["outcome"] for attempt in attempts]
+    if outcomes[0] == "pass":
+        return "passed"
+    return "flaky" if "pass" in outcomes else "failed"
+
+
+def render_stats(stats, flaky_threshold):
+    lines = [f"{'test':<60} {'runs':>5} {'flaky':>7} {'failed':>7} {'median':>8}"]
+    for test, entry in sorted(stats.items(), key=lambda item: (-item[1]["flake_rate"], -item[1]["fail_rate"], item[0])):
+        marker = "  quarantined" if entry["flake_rate"] >= flaky_threshold else ""
+        lines.append(
+            f"{test:<60} {entry['runs']:>5} {entry['flake_rate']:>7.0%} {entry['fail_rate']:>7.0%} "
+            f"{entry['median_duration_s']:>7.1f}s{marker}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pattern", action="append", help="Glob over script names, repeatable (default: all)")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--flaky-workers", type=int, default=0, help="Workers reserved for quarantined tests")
+    parser.add_argument("--retries", type=int, default=2, help="Isolated reruns of a failed test")
+    parser.add_argument("--flaky-threshold", type=float, default=0.1, help="Flake rate at which a test is quarantined")
+    parser.add_argument("--window", type=int, default=20, help="Recent runs per test used for flake rates")
+    parser.add_argument("--timeout", type=float, default=300, help="Per-attempt timeout in seconds")
+    parser.add_argument("--report", action="store_true", help="Print flakiness stats from history and exit")
+    parser.add_argument("--changed-since", metavar="REF", help="Run only tests affected by changes since a git ref")
+    parser.add_argument("--record-impact", action="store_true", help="Log each test's URLs for harness.impact")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "test-run.json"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None, tests=None):
+    args = parse_args(argv)
+
+    with TestHistory(args.db) as history:
+        stats = history.stats(args.window)
+        if args.report:
+            print(render_stats(stats, args.flaky_threshold))
+            return
+
+        tests = discover(args.pattern) if tests is None else tests
+        if args.changed_since:
+            from harness.impact import changed_files, load_map, select
+
+            affected, _ = select(load_map(tests=tests), changed_files(args.changed_since))
+            print(f"🚀 {len(affected)} of {len(tests)} tests affected by changes since {args.changed_since}")
+            tests = [test for test in tests if test in affected]
+        if not tests:
+            print("✅ No tests selected")
+            return
+        stable, quarantined = schedule(tests, stats, args.retries, args.flaky_threshold)
+        print(f"🚀 Running {len(tests)} tests on {args.workers} workers "
+              f"({len(quarantined)} quarantined: {', '.join(quarantined) or 'none'})")
+
+        run_id, sha = f"{time.time():.0f}-{os.getpid()}", resolve_sha()
+
+        def on_result(result):
+            history.record(run_id, sha, result)
+            icon = "✅" if result["outcome"] == "pass" else "❌"
+            print(f"{icon} {result['test']} attempt {result['attempt']}: {result['outcome']} in {result['duration_s']:.1f}s")
+
+        started = time.perf_counter()
+        results = asyncio.run(run_suite(
+            stable, quarantined, args.workers, args.flaky_workers, args.retries, args.timeout, on_result,
+            args.record_impact,
+        ))
+        wall_time_s = time.perf_counter() - started
+
+    verdicts = {test: classify(attempts) for test, attempts in results.items()}
+    blocking = [test for test, verdict in verdicts.items() if verdict == "failed" and test not in quarantined]
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as handle:
+        json.dump({
+            "recorded_at": time.time(),
+            "sha": sha,
+            "wall_time_s": wall_time_s,
+            "quarantined": quarantined,
+            "verdicts": verdicts,
+            "attempts": results,
+        }, handle, indent=2)
+
+    counts = {verdict: sum(1 for value in verdicts.values() if value == verdict) for verdict in ("passed", "flaky", "failed")}
+    print(f"🚀 PERFORMANCE: suite wall time {wall_time_s:.1f}s - "
+          f"{counts['passed']} passed, {counts['flaky']} flaky, {counts['failed']} failed")
+    for test in quarantined:
+        if verdicts.get(test) == "failed":
+            print(f"⚠️ {test} failed but is quarantined")
+    for test in blocking:
+        print(f"❌ {test} failed after {len(results[test])} attempts")
+    print(f"✅ Results written to {args.output}")
+    sys.exit(1 if blocking else 0)
+
+
+if __name__ == "__main__":
+    main()
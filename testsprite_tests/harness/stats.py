@@ -0,0 +1,96 @@
+"""Small, dependency-free statistics helpers for benchmark results."""
+
+import math
+
+
+def percentile(sorted_values, fraction):
+    """Linear-interpolated percentile of an already sorted list (fraction in 0..1)."""
+    if not sorted_values:
+        return None
+    position = (len(sorted_values) - 1) * fraction
+    lower, upper = math.floor(position), math.ceil(position)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class LatencyHistogram:
+    """Collects latencies in milliseconds and summarizes them with log-spaced buckets."""
+
+    BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+    def __init__(self):
+        self.samples = []
+        self.missing = 0  # expected deliveries that never arrived
+
+    def add(self, latency_ms):
+        self.samples.append(latency_ms)
+
+    def summary(self):
+        values = sorted(self.samples)
+        counts = [0] * (len(self.BUCKETS_MS) + 1)
+        for value in values:
+            index = next((i for i, bound in enumerate(self.BUCKETS_MS) if value <= bound), len(self.BUCKETS_MS))
+            counts[index] += 1
+        return {
+            "count": len(values),
+            "missing": self.missing,
+            "min": values[0] if values else None,
+            "p50": percentile(values, 0.50),
+            "p90": percentile(values, 0.90),
+            "p99": percentile(values, 0.99),
+            "max": values[-1] if values else None,
+            "mean": sum(values) / len(values) if values else None,
+            "buckets": {
+                (f"<={bound}ms" if i < len(self.BUCKETS_MS) else f">{self.BUCKETS_MS[-1]}ms"): counts[i]
+                for i, bound in enumerate(self.BUCKETS_MS + [None])
+            },
+        }
+
+    def render(self, width=40):
+        """Text bars for terminal output."""
+        summary = self.summary()
+        peak = max(summary["buckets"].values()) or 1
+        return "\n".join(
+            f"{label:>10} {'#' * round(width * count / peak):<{width}} {count}"
+            for label, count in summary["buckets"].items()
+        )
+
+
+def rank_with_ties(values):
+    """1-based ranks, ties get the average rank; returns (ranks, tie group sizes)."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    ties = []
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        if j > i:
+            ties.append(j - i + 1)
+        i = j + 1
+    return ranks, ties
+
+
+def mann_whitney_u(base, head):
+    """Two-sided Mann-Whitney U test (normal approximation with tie and continuity correction).
+
+    Returns (U for head, p-value). Needs a handful of samples per side to be
+    meaningful; with fewer than ~5 each the p-value is only indicative.
+    """
+    n1, n2 = len(head), len(base)
+    if n1 == 0 or n2 == 0:
+        return None, None
+    ranks, ties = rank_with_ties(list(head) + list(base))
+    u_head = sum(ranks[:n1]) - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    mean = n1 * n2 / 2
+    tie_term = sum(t ** 3 - t for t in ties) / (n * (n - 1)) if n > 1 else 0
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term)
+    if variance <= 0:
+        return u_head, 1.0
+    z = (abs(u_head - mean) - 0.5) / math.sqrt(variance)
+    return u_head, min(1.0, math.erfc(max(z, 0) / math.sqrt(2)))
@@ -0,0 +1,299 @@
+"""Per-journey API request accounting with HAR/trace capture and request budgets.
+
+Flows such as editing a task (TC008), deleting one (TC010) or assigning
+several members (TC012) fan out into Supabase REST/RPC calls that nobody has
+counted. ``RequestRecorder`` listens to a page's requests while one journey
+runs and summarizes the API traffic:
+
+* count and bytes (request + response bodies, from ``Request.sizes()``)
+* serial depth - the longest chain of requests where each one started only
+  after the previous finished, i.e. dependent round trips on the critical path
+* duplicates - identical method + URL + body issued more than once
+
+Only API traffic is counted: Supabase ``/rest/v1``, ``/auth/v1`` and
+``/storage/v1`` plus the app's own ``/api`` routes. Static assets and the
+realtime websocket are ignored.
+
+Usage (from the testsprite_tests directory)::
+
+    python -m harness.traffic                                  # every journey, HAR + trace per journey
+    python -m harness.traffic --journeys open_task_modal,edit_task --no-trace
+
+In tests::
+
+    async with RequestRecorder(page) as recorder:
+        await open_task_modal(page)
+    assert_within_budget("open_task_modal", recorder.summary())
+
+Budgets live in the ``journeys`` section of perf_budgets.json; the CLI exits
+non-zero when any journey exceeds one. Results go to
+tmp/results/journey-requests.json, HAR files and traces to tmp/results/traces.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from urllib.parse import urlsplit
+
+from harness.config import BASE_URL, RESULTS_DIR, SUPABASE_URL, TIMEOUT
+from harness.vitals import BUDGETS_PATH, load_budgets
+
+API_PREFIXES = (
+    f"{SUPABASE_URL}/rest/v1/",
+    f"{SUPABASE_URL}/auth/v1/",
+    f"{SUPABASE_URL}/storage/v1/",
+    f"{BASE_URL}/api/",
+)
+
+BUDGET_KEYS = {
+    "requests": "count",
+    "serial_depth": "serial_depth",
+    "duplicates": "duplicate_count",
+    "kilobytes": "kilobytes",
+}
+
+
+def is_api_request(url):
+    return url.startswith(API_PREFIXES)
+
+
+def endpoint_name(method, url):
+    """``GET rest/v1/tasks`` style label without query string or host."""
+    path = urlsplit(url).path.lstrip("/")
+    return f"{method} {path}"
+
+
+class RequestRecorder:
+    """Records API requests issued by a page between ``start()`` and ``stop()``."""
+
+    def __init__(self, page, settle_ms=500):
+        self.page = page
+        self.settle_ms = settle_ms
+        self.entries = []
+        self._pending = {}
+        self._finishing = set()
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.stop()
+
+    def start(self):
+        self.entries = []
+        self._origin = time.perf_counter()
+        self.page.on("request", self._on_request)
+        self.page.on("requestfinished", self._on_finished)
+        self.page.on("requestfailed", self._on_failed)
+
+    async def stop(self):
+        """Wait until no API request has been in flight for ``settle_ms``, then detach."""
+        quiet_since = time.perf_counter()
+        deadline = quiet_since + TIMEOUT
+        while time.perf_counter() < deadline:
+            if self._pending or self._finishing:
+                quiet_since = time.perf_counter()
+            elif (time.perf_counter() - quiet_since) * 1000 >= self.settle_ms:
+                break
+            await asyncio.sleep(0.05)
+        self.page.remove_listener("request", self._on_request)
+        self.page.remove_listener("requestfinished", self._on_finished)
+        self.page.remove_listener("requestfailed", self._on_failed)
+        for entry in self._pending.values():
+            entry["failed"] = "still pending when recording stopped"
+            self.entries.append(entry)
+        self._pending = {}
+
+    def _now_ms(self):
+        return (time.perf_counter() - self._origin) * 1000
+
+    def _on_request(self, request):
+        if not is_api_request(request.url):
+            return
+        self._pending[request] = {
+            "method": request.method,
+            "url": request.url,
+            "endpoint": endpoint_name(request.method, request.url),
+            "body": request.post_data,
+            "start_ms": self._now_ms(),
+            "end_ms": None,
+            "status": None,
+            "bytes": 0,
+            "failed": None,
+        }
+
+    def _on_finished(self, request):
+        entry = self._pending.pop(request, None)
+        if entry is None:
+            return
+        entry["end_ms"] = self._now_ms()
+        task = asyncio.ensure_future(self._complete(request, entry))
+        self._finishing.add(task)
+        task.add_done_callback(self._finishing.discard)
+
+    async def _complete(self, request, entry):
+        try:
+            sizes = await request.sizes()
+            entry["bytes"] = sizes["requestBodySize"] + sizes["responseBodySize"]
+            response = await request.response()
+            entry["status"] = response.status if response else None
+        except Exception as error:
+            entry["failed"] = str(error)
+        self.entries.append(entry)
+
+    def _on_failed(self, request):
+        entry = self._pending.pop(request, None)
+        if entry is None:
+            return
+        entry["end_ms"] = self._now_ms()
+        entry["failed"] = request.failure
+        self.entries.append(entry)
+
+    def summary(self):
+        return summarize(self.entries)
+
+
+def serial_depth(entries):
+    """Longest chain of requests where each starts after the previous one finished."""
+    ordered = sorted(entries, key=lambda entry: entry["start_ms"])
+    depths = []
+    for i, entry in enumerate(ordered):
+        before = [depths[j] for j in range(i) if ordered[j]["end_ms"] is not None and ordered[j]["end_ms"] <= entry["start_ms"]]
+        depths.append(1 + max(before, default=0))
+    return max(depths, default=0)
+
+
+def summarize(entries):
+    seen = {}
+    for entry in entries:
+        key = (entry["method"], entry["url"], entry["body"])
+        seen[key] = seen.get(key, 0) + 1
+    duplicates = [
+        {"endpoint": endpoint_name(method, url), "url": url, "times": times}
+        for (method, url, _), times in seen.items()
+        if times > 1
+    ]
+    by_endpoint = {}
+    for entry in entries:
+        by_endpoint[entry["endpoint"]] = by_endpoint.get(entry["endpoint"], 0) + 1
+    total_bytes = sum(entry["bytes"] for entry in entries)
+    return {
+        "count": len(entries),
+        "bytes": total_bytes,
+        "kilobytes": total_bytes / 1024,
+        "serial_depth": serial_depth(entries),
+        "duplicate_count": sum(item["times"] - 1 for item in duplicates),
+        "duplicates": duplicates,
+        "failed": sum(1 for entry in entries if entry["failed"] or (entry["status"] or 0) >= 400),
+        "by_endpoint": dict(sorted(by_endpoint.items(), key=lambda item: -item[1])),
+        "requests": sorted(
+            ({key: entry[key] for key in ("endpoint", "status", "bytes", "start_ms", "end_ms", "failed")} for entry in entries),
+            key=lambda entry: entry["start_ms"],
+        ),
+    }
+
+
+def check_budget(journey_name, summary, budget):
+    """List of human readable budget violations for one journey."""
+    violations = []
+    for budget_key, summary_key in BUDGET_KEYS.items():
+        limit = budget.get(budget_key)
+        if limit is not None and summary[summary_key] > limit:
+            violations.append(f"{journey_name}: {budget_key} {summary[summary_key]:.0f} exceeds budget {limit}")
+    return violations
+
+
+def assert_within_budget(journey_name, summary, budgets=None):
+    """Raise AssertionError listing every exceeded limit (for use inside UI tests)."""
+    budgets = budgets if budgets is not None else load_budgets()
+    violations = check_budget(journey_name, summary, budgets.get("journeys", {}).get(journey_name, {}))
+    if violations:
+        endpoints = ", ".join(f"{name} x{count}" for name, count in summary["by_endpoint"].items())
+        raise AssertionError("; ".join(violations) + f" ({endpoints})")
+
+
+async def run(journey_names, har=True, trace=True):
+    from playwright.async_api import async_playwright
+    import httpx
+    from harness.auth import sign_in
+    from harness.browser import launch_chromium, new_signed_in_context
+    from harness.journeys import JOURNEYS, prepare
+
+    async with httpx.AsyncClient(timeout=TIMEOUT) as http:
+        session = await sign_in(http)
+
+    traces_dir = os.path.join(RESULTS_DIR, "traces")
+    os.makedirs(traces_dir, exist_ok=True)
+    results = {}
+    async with async_playwright() as playwright:
+        browser = await launch_chromium(playwright)
+        for journey_name in journey_names:
+            options = {}
+            if har:
+                # The HAR covers the whole context (setup included); the summary covers only the journey
+                options = {"record_har_path": os.path.join(traces_dir, f"{journey_name}.har"), "record_har_content": "omit"}
+            context = await new_signed_in_context(browser, session, **options)
+            if trace:
+                await context.tracing.start(screenshots=True, snapshots=True)
+            page = await context.new_page()
+            error = None
+            try:
+                await prepare(page, journey_name)
+                async with RequestRecorder(page) as recorder:
+                    await JOURNEYS[journey_name](page)
+            except Exception as exc:
+                error = str(exc)
+                print(f"⚠️ {journey_name} failed: {error}")
+            if trace:
+                await context.tracing.stop(path=os.path.join(traces_dir, f"{journey_name}.zip"))
+            await context.close()  # flushes the HAR
+            results[journey_name] = {"error": error} if error else {**recorder.summary(), "error": None}
+        await browser.close()
+    return results
+
+
+def parse_args(argv=None):
+    from harness.journeys import JOURNEYS
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--journeys", default=",".join(JOURNEYS), help="Comma separated subset of: " + ", ".join(JOURNEYS))
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--no-har", action="store_true")
+    parser.add_argument("--no-trace", action="store_true")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "journey-requests.json"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    journey_names = [name.strip() for name in args.journeys.split(",") if name.strip()]
+    budgets = load_budgets(args.budgets).get("journeys", {})
+    results = asyncio.run(run(journey_names, har=not args.no_har, trace=not args.no_trace))
+
+    violations = []
+    for journey_name, summary in results.items():
+        if summary.get("error"):
+            violations.append(f"{journey_name}: journey failed ({summary['error']})")
+            continue
+        print(f"🚀 PERFORMANCE: {journey_name}: {summary['count']} requests, {summary['kilobytes']:.1f} KB, "
+              f"serial depth {summary['serial_depth']}, {summary['duplicate_count']} duplicates")
+        for name, count in summary["by_endpoint"].items():
+            print(f"    {count:>3} x {name}")
+        violations += check_budget(journey_name, summary, budgets.get(journey_name, {}))
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as handle:
+        json.dump({"recorded_at": time.time(), "journeys": results, "violations": violations}, handle, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    for violation in violations:
+        print(f"❌ {violation}")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Core Web Vitals and render-timing capture for Playwright page visits.
+
+An init script registers PerformanceObservers before any app code runs:
+
+* LCP - last ``largest-contentful-paint`` entry
+* CLS - largest session window of ``layout-shift`` entries without recent input
+* INP - worst interaction latency from ``event`` timing entries (grouped by interactionId)
+* long tasks - count and total duration of ``longtask`` entries
+* React commits - a minimal ``__REACT_DEVTOOLS_GLOBAL_HOOK__`` records every commit and,
+  in development/profiling builds, its ``actualDuration``
+
+JS heap size comes from the CDP ``Performance.getMetrics`` domain (Chromium only).
+
+Usage (from the testsprite_tests directory)::
+
+    python -m harness.vitals                      # all pages, 3 runs each
+    python -m harness.vitals --pages kanban --runs 5
+
+Exits non-zero when the median of any metric exceeds its budget in
+perf_budgets.json; results go to tmp/results/web-vitals.json.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+from harness.config import BASE_URL, RESULTS_DIR, TIMEOUT
+
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "perf_budgets.json")
+
+# name -> (path, needs a signed-in session)
+# /dashboard is not sampled: it renders nothing of its own. A signed-in session is redirected
+# to /kanban on the server and a signed-out one to / on the client, so it would only measure
+# one of those pages again plus a redirect.
+PAGES = {
+    "landing": ("/", False),
+    "auth": ("/auth/reset-password", False),
+    "kanban": ("/kanban", True),
+}
+
+VITALS_INIT_SCRIPT = """
+(() => {
+  const vitals = window.__vitals = {
+    lcp: null, cls: 0, inp: null, longTaskCount: 0, longTaskTotal: 0,
+    reactCommits: 0, reactCommitDurations: [],
+  }
+  const observe = (type, callback, options = {}) => {
+    try {
+      new PerformanceObserver(list => list.getEntries().forEach(callback))
+        .observe({ type, buffered: true, ...options })
+    } catch (error) { /* entry type unsupported in this browser */ }
+  }
+
+  observe('largest-contentful-paint', entry => { vitals.lcp = entry.startTime })
+
+  let sessionValue = 0, sessionEntries = []
+  observe('layout-shift', entry => {
+    if (entry.hadRecentInput) return
+    const first = sessionEntries[0], last = sessionEntries[sessionEntries.length - 1]
+    if (last && (entry.startTime - last.startTime > 1000 || entry.startTime - first.startTime > 5000)) {
+      sessionValue = 0
+      sessionEntries = []
+    }
+    sessionValue += entry.value
+    sessionEntries.push(entry)
+    vitals.cls = Math.max(vitals.cls, sessionValue)
+  })
+
+  const interactions = new Map()
+  observe('event', entry => {
+    if (!entry.interactionId) return
+    interactions.set(entry.interactionId, Math.max(interactions.get(entry.interactionId) || 0, entry.duration))
+    vitals.inp = Math.max(...interactions.values())
+  }, { durationThreshold: 16 })
+
+  observe('longtask', entry => {
+    vitals.longTaskCount += 1
+    vitals.longTaskTotal += entry.duration
+  })
+
+  // React DevTools hook stub: React calls onCommitFiberRoot after every commit
+  if (!window.__REACT_DEVTOOLS_GLOBAL_HOOK__) {
+    window.__REACT_DEVTOOLS_GLOBAL_HOOK__ = {
+      supportsFiber: true,
+      renderers: new Map(),
+      inject(renderer) { const id = this.renderers.size + 1; this.renderers.set(id, renderer); return id },
+      onScheduleFiberRoot() {},
+      onCommitFiberRoot(id, root) {
+        vitals.reactCommits += 1
+        const duration = root && root.current && root.current.actualDuration
+        if (typeof duration === 'number') vitals.reactCommitDurations.push(duration)
+      },
+      onPostCommitFiberRoot() {},
+      onCommitFiberUnmount() {},
+      checkDCE() {},
+    }
+  }
+})()
+"""
+
+# Interactions that give INP something to measure on each page
+INTERACTIONS = {
+    "landing": [("click", "body")],
+    "auth": [("click", "body")],
+    "kanban": [("fill", '[data-testid="board-search"]', "pump"), ("fill", '[data-testid="board-search"]', "")],
+}
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path) as handle:
+        return json.load(handle)
+
+
+def budget_for(budgets, page_name):
+    vitals = budgets.get("vitals", {})
+    return {**vitals.get("default", {}), **vitals.get(page_name, {})}
+
+
+async def install(context):
+    """Register the observers in every page the context opens."""
+    await context.add_init_script(VITALS_INIT_SCRIPT)
+
+
+async def collect(page):
+    """Snapshot of the page's vitals plus CDP heap metrics, in budget units."""
+    vitals = await page.evaluate("window.__vitals")
+    heap_mb = None
+    try:
+        cdp = await page.context.new_cdp_session(page)
+        await cdp.send("Performance.enable")
+        metrics = {metric["name"]: metric["value"] for metric in (await cdp.send("Performance.getMetrics"))["metrics"]}
+        heap_mb = metrics.get("JSHeapUsedSize", 0) / (1024 * 1024)
+        await cdp.detach()
+    except Exception:
+        pass  # non-Chromium browsers have no CDP
+
+    durations = sorted(vitals["reactCommitDurations"])
+    return {
+        "lcp_ms": vitals["lcp"],
+        "cls": vitals["cls"],
+        "inp_ms": vitals["inp"],
+        "long_task_count": vitals["longTaskCount"],
+        "long_task_total_ms": vitals["longTaskTotal"],
+        "js_heap_mb": heap_mb,
+        "react_commits": vitals["reactCommits"],
+        "react_commit_p95_ms": durations[int(0.95 * (len(durations) - 1))] if durations else None,
+        "react_commit_total_ms": sum(durations) if durations else None,
+    }
+
+
+async def visit(context, page_name, settle_ms=1500):
+    """Load one page, perform its interactions and return collected metrics."""
+    path, _ = PAGES[page_name]
+    page = await context.new_page()
+    started = time.perf_counter()
+    await page.goto(f"{BASE_URL}{path}", wait_until="load", timeout=TIMEOUT * 1000)
+    try:
+        await page.wait_for_load_state("networkidle", timeout=TIMEOUT * 1000)
+    except Exception:
+        pass  # realtime websockets can keep the network busy
+    load_ms = (time.perf_counter() - started) * 1000
+
+    for action, selector, *value in INTERACTIONS.get(page_name, []):
+        locator = page.locator(selector).first
+        if action == "fill":
+            await locator.fill(value[0])
+        else:
+            await locator.click()
+    await page.wait_for_timeout(settle_ms)
+
+    metrics = {"load_ms": load_ms, **await collect(page)}
+    await page.close()
+    return metrics
+
+
+def check_budget(page_name, medians, budget):
+    """List of human readable budget violations for one page."""
+    return [
+        f"{page_name}: {metric} median {medians[metric]:.2f} exceeds budget {limit}"
+        for metric, limit in budget.items()
+        if medians.get(metric) is not None and medians[metric] > limit
+    ]
+
+
+def summarize(runs):
+    metrics = runs[0].keys()
+    return {
+        metric: statistics.median(values) if (values := [run[metric] for run in runs if run[metric] is not None]) else None
+        for metric in metrics
+    }
+
+
+async def run(page_names, runs, context_options=None):
+    from playwright.async_api import async_playwright
+    import httpx
+    from harness.auth import sign_in
+    from harness.browser import launch_chromium, new_signed_in_context
+
+    session = None
+    if any(PAGES[name][1] for name in page_names):
+        async with httpx.AsyncClient(timeout=TIMEOUT) as http:
+            session = await sign_in(http)
+
+    results = {}
+    async with async_playwright() as playwright:
+        browser = await launch_chromium(playwright)
+        for page_name in page_names:
+            samples = []
+            for _ in range(runs):
+                # Fresh context per run so caches and IndexedDB do not leak between samples
+                if PAGES[page_name][1]:
+                    context = await new_signed_in_context(browser, session, **(context_options or {}))
+                else:
+                    context = await browser.new_context(**(context_options or {}))
+                await install(context)
+                samples.append(await visit(context, page_name))
+                await context.close()
+            results[page_name] = {"samples": samples, "median": summarize(samples)}
+        await browser.close()
+    return results
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--pages", default=",".join(PAGES), help="Comma separated subset of: " + ", ".join(PAGES))
+    parser.add_argument("--runs", type=int, default=3, help="Samples per page (medians are compared to budgets)")
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, "web-vitals.json"))
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    page_names = [name.strip() for name in args.pages.split(",") if name.strip()]
+    budgets = load_budgets(args.budgets)
+    results = asyncio.run(run(page_names, args.runs))
+
+    violations = []
+    for page_name, result in results.items():
+        median = result["median"]
+        print(f"🚀 PERFORMANCE: {page_name}: " + ", ".join(
+            f"{metric}={value:.2f}" for metric, value in median.items() if value is not None))
+        violations += check_budget(page_name, median, budget_for(budgets, page_name))
+
+    os.makedirs(os.path.dirname(args.output), exist_ok=True)
+    with open(args.output, "w") as handle:
+        json.dump({"recorded_at": time.time(), "pages": results, "violations": violations}, handle, indent=2)
+    print(f"✅ Results written to {args.output}")
+
+    for violation in violations:
+        print(f"❌ {violation}")
+    sys.exit(1 if violations else 0)
+
+
+if __name__ == "__main__":
+    main()